@@ -0,0 +1,100 @@
+import atexit
+import logging
+import os
+import threading
+from multiprocessing import util as multiprocessing_util
+from typing import Any, Callable, List, Optional
+
+
+# 크롤러용 버퍼 인서트
+# 워커 스레드는 add() 로 버퍼에 넣기만 하고 (DB 대기 없음),
+# 백그라운드 스레드가 건수(max_size) 또는 시간(flush_interval) 기준으로 모아서 인서트한다.
+# 정상 종료(atexit), 멀티프로세싱 워커 종료(Finalize) 시에도 남은 데이터를 flush 한다.
+# write_batch 는 실패한 건수를 돌려줄 수 있고(예외면 배치 전체 실패), 실패 건수는 take_failed_count() 로 확인한다.
+class BufferedBatchWriter:
+    def __init__(
+        self,
+        name: str,
+        write_batch: Callable[[List[Any]], Optional[int]],
+        max_size: int = 200,
+        flush_interval: float = 30.0,
+    ):
+        self.name = name
+        self.write_batch = write_batch
+        self.max_size = max_size
+        self.flush_interval = flush_interval
+        self._buffer: List[Any] = []
+        self._failed = 0
+        self._buffer_lock = threading.Lock()
+        self._write_lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._closed = threading.Event()
+        self._thread = None
+        self._pid = None
+
+    def _ensure_started(self) -> None:
+        # fork 된 자식 프로세스에서는 부모의 스레드가 없으므로 프로세스마다 새로 시작
+        if self._thread is not None and self._pid == os.getpid():
+            return
+        with self._buffer_lock:
+            if self._thread is not None and self._pid == os.getpid():
+                return
+            self._pid = os.getpid()
+            self._closed.clear()
+            self._thread = threading.Thread(
+                target=self._run, name=f"{self.name}-writer", daemon=True
+            )
+            self._thread.start()
+            atexit.register(self.close)
+            multiprocessing_util.Finalize(self, self.close, exitpriority=10)
+
+    def add(self, record: Any) -> None:
+        self._ensure_started()
+        with self._buffer_lock:
+            self._buffer.append(record)
+            full = len(self._buffer) >= self.max_size
+        if full:
+            self._wakeup.set()
+
+    def _run(self) -> None:
+        while not self._closed.is_set():
+            self._wakeup.wait(self.flush_interval)
+            self._wakeup.clear()
+            self.flush()
+
+    # 이번 flush 에서 인서트하지 못한 건수 반환
+    def flush(self) -> int:
+        with self._write_lock:
+            with self._buffer_lock:
+                records, self._buffer = self._buffer, []
+            if not records:
+                return 0
+
+            failed = 0
+            for start in range(0, len(records), self.max_size):
+                batch = records[start:start + self.max_size]
+                try:
+                    failed += self.write_batch(batch) or 0
+                except Exception as e:
+                    failed += len(batch)
+                    logging.getLogger(__name__).error(
+                        f"[{self.name}] Error flushing {len(batch)} records: {e}"
+                    )
+
+            if failed:
+                with self._buffer_lock:
+                    self._failed += failed
+            return failed
+
+    # 마지막 확인 이후 (백그라운드 flush 포함) 인서트하지 못한 건수, 확인하면 0 으로 초기화
+    def take_failed_count(self) -> int:
+        with self._buffer_lock:
+            failed, self._failed = self._failed, 0
+        return failed
+
+    def close(self) -> None:
+        self._closed.set()
+        self._wakeup.set()
+        if self._thread is not None and self._thread is not threading.current_thread():
+            self._thread.join(timeout=self.flush_interval)
+        self.flush()
@@ -10,6 +10,7 @@ from app.schemas.commercial_district import (
     CommercialDistrictSubDistrictDetailCategoryId,
     CommercialDistrictWeightedAvgStatistics,
 )
+from app.crud.batch_writer import BufferedBatchWriter
 from app.db.connect import (
     get_db_connection,
     close_connection,
@@ -19,52 +20,102 @@ from app.db.connect import (
 )
 
 
-def insert_commercial_district(data: CommercialDistrictInsert):
+COMMERCIAL_DISTRICT_INSERT_QUERY = """
+    INSERT INTO commercial_district (
+        city_id, district_id, sub_district_id, 
+        biz_main_category_id, biz_sub_category_id, biz_detail_category_id,
+        national_density, city_density, district_density, sub_district_density,
+        market_size, average_payment, usage_count,
+        average_sales, operating_cost, food_cost, employee_cost, rental_cost, tax_cost, 
+        family_employee_cost, ceo_cost, etc_cost, average_profit,
+        avg_profit_per_mon, avg_profit_per_tue, avg_profit_per_wed, avg_profit_per_thu, avg_profit_per_fri, avg_profit_per_sat, avg_profit_per_sun,
+        avg_profit_per_06_09, avg_profit_per_09_12, avg_profit_per_12_15, avg_profit_per_15_18, avg_profit_per_18_21, avg_profit_per_21_24, avg_profit_per_24_06,
+        avg_client_per_m_20, avg_client_per_m_30, avg_client_per_m_40, avg_client_per_m_50, avg_client_per_m_60,
+        avg_client_per_f_20, avg_client_per_f_30, avg_client_per_f_40, avg_client_per_f_50, avg_client_per_f_60,
+        top_menu_1, top_menu_2, top_menu_3, top_menu_4, top_menu_5, y_m
+    ) VALUES (
+        %(city_id)s, %(district_id)s, %(sub_district_id)s, 
+        %(biz_main_category_id)s, %(biz_sub_category_id)s, %(biz_detail_category_id)s,
+        %(national_density)s, %(city_density)s, %(district_density)s, %(sub_district_density)s,
+        %(market_size)s, %(average_payment)s, %(usage_count)s,
+        %(average_sales)s, %(operating_cost)s, %(food_cost)s, %(employee_cost)s, %(rental_cost)s, %(tax_cost)s, 
+        %(family_employee_cost)s, %(ceo_cost)s, %(etc_cost)s, %(average_profit)s,
+        %(avg_profit_per_mon)s, %(avg_profit_per_tue)s, %(avg_profit_per_wed)s, %(avg_profit_per_thu)s, %(avg_profit_per_fri)s, %(avg_profit_per_sat)s, %(avg_profit_per_sun)s,
+        %(avg_profit_per_06_09)s, %(avg_profit_per_09_12)s, %(avg_profit_per_12_15)s, %(avg_profit_per_15_18)s, %(avg_profit_per_18_21)s, %(avg_profit_per_21_24)s, %(avg_profit_per_24_06)s,
+        %(avg_client_per_m_20)s, %(avg_client_per_m_30)s, %(avg_client_per_m_40)s, %(avg_client_per_m_50)s, %(avg_client_per_m_60)s,
+        %(avg_client_per_f_20)s, %(avg_client_per_f_30)s, %(avg_client_per_f_40)s, %(avg_client_per_f_50)s, %(avg_client_per_f_60)s,
+        %(top_menu_1)s, %(top_menu_2)s, %(top_menu_3)s, %(top_menu_4)s, %(top_menu_5)s, %(y_m)s
+    );
+    """
+
+
+# 같은 (sub_district_id, biz_detail_category_id, y_m) 의 기존 행을 지우고 인서트하므로
+# 재시도(작업 재큐잉)로 같은 소분류를 다시 넣어도 중복되지 않음 (유니크 키 없이 멱등)
+def delete_commercial_district_keys(cursor, data_list: List[CommercialDistrictInsert]) -> None:
+    keys = {
+        (data["sub_district_id"], data["biz_detail_category_id"], data["y_m"])
+        for data in data_list
+    }
+    placeholders = ", ".join(["(%s, %s, %s)"] * len(keys))
+    cursor.execute(
+        f"""
+        DELETE FROM commercial_district
+        WHERE (sub_district_id, biz_detail_category_id, y_m) IN ({placeholders})
+        """,
+        [value for key in keys for value in key],
+    )
+
+
+# 성공 여부 반환
+def insert_commercial_district(data: CommercialDistrictInsert) -> bool:
     connection = get_db_connection()
     cursor = connection.cursor()
     logger = logging.getLogger(__name__)
 
     try:
-        insert_query = """
-        INSERT INTO commercial_district (
-            city_id, district_id, sub_district_id, 
-            biz_main_category_id, biz_sub_category_id, biz_detail_category_id,
-            national_density, city_density, district_density, sub_district_density,
-            market_size, average_payment, usage_count,
-            average_sales, operating_cost, food_cost, employee_cost, rental_cost, tax_cost, 
-            family_employee_cost, ceo_cost, etc_cost, average_profit,
-            avg_profit_per_mon, avg_profit_per_tue, avg_profit_per_wed, avg_profit_per_thu, avg_profit_per_fri, avg_profit_per_sat, avg_profit_per_sun,
-            avg_profit_per_06_09, avg_profit_per_09_12, avg_profit_per_12_15, avg_profit_per_15_18, avg_profit_per_18_21, avg_profit_per_21_24, avg_profit_per_24_06,
-            avg_client_per_m_20, avg_client_per_m_30, avg_client_per_m_40, avg_client_per_m_50, avg_client_per_m_60,
-            avg_client_per_f_20, avg_client_per_f_30, avg_client_per_f_40, avg_client_per_f_50, avg_client_per_f_60,
-            top_menu_1, top_menu_2, top_menu_3, top_menu_4, top_menu_5, y_m
-        ) VALUES (
-            %(city_id)s, %(district_id)s, %(sub_district_id)s, 
-            %(biz_main_category_id)s, %(biz_sub_category_id)s, %(biz_detail_category_id)s,
-            %(national_density)s, %(city_density)s, %(district_density)s, %(sub_district_density)s,
-            %(market_size)s, %(average_payment)s, %(usage_count)s,
-            %(average_sales)s, %(operating_cost)s, %(food_cost)s, %(employee_cost)s, %(rental_cost)s, %(tax_cost)s, 
-            %(family_employee_cost)s, %(ceo_cost)s, %(etc_cost)s, %(average_profit)s,
-            %(avg_profit_per_mon)s, %(avg_profit_per_tue)s, %(avg_profit_per_wed)s, %(avg_profit_per_thu)s, %(avg_profit_per_fri)s, %(avg_profit_per_sat)s, %(avg_profit_per_sun)s,
-            %(avg_profit_per_06_09)s, %(avg_profit_per_09_12)s, %(avg_profit_per_12_15)s, %(avg_profit_per_15_18)s, %(avg_profit_per_18_21)s, %(avg_profit_per_21_24)s, %(avg_profit_per_24_06)s,
-            %(avg_client_per_m_20)s, %(avg_client_per_m_30)s, %(avg_client_per_m_40)s, %(avg_client_per_m_50)s, %(avg_client_per_m_60)s,
-            %(avg_client_per_f_20)s, %(avg_client_per_f_30)s, %(avg_client_per_f_40)s, %(avg_client_per_f_50)s, %(avg_client_per_f_60)s,
-            %(top_menu_1)s, %(top_menu_2)s, %(top_menu_3)s, %(top_menu_4)s, %(top_menu_5)s, %(y_m)s
-        );
-        """
-
-        cursor.execute(insert_query, data)
+        delete_commercial_district_keys(cursor, [data])
+        cursor.execute(COMMERCIAL_DISTRICT_INSERT_QUERY, data)
         connection.commit()
         # logger.info("Executing query: %s with data: %s", insert_query, data)
+        return True
 
     except pymysql.MySQLError as e:
         connection.rollback()
         logger.error(f"Error inserting data: {e}")
+        return False
     finally:
         close_cursor(cursor)
         close_connection(connection)
 
 
+# 여러 건을 다중 행 INSERT 로 한 번에 인서트 (실패 시 한 건씩 재시도해 정상 행은 살림)
+# 끝내 인서트하지 못한 건수 반환
+def insert_commercial_district_batch(data_list: List[CommercialDistrictInsert]) -> int:
+    connection = get_db_connection()
+    cursor = connection.cursor()
+    logger = logging.getLogger(__name__)
+
+    try:
+        delete_commercial_district_keys(cursor, data_list)
+        cursor.executemany(COMMERCIAL_DISTRICT_INSERT_QUERY, data_list)
+        connection.commit()
+        return 0
+
+    except pymysql.MySQLError as e:
+        connection.rollback()
+        logger.error(f"Error inserting batch of {len(data_list)} rows, retrying one by one: {e}")
+        return sum(not insert_commercial_district(data) for data in data_list)
+    finally:
+        close_cursor(cursor)
+        close_connection(connection)
+
+
+# 크롤러 공용 버퍼 (스레드는 add 만 하고 인서트는 백그라운드에서 모아서 처리)
+commercial_district_writer = BufferedBatchWriter(
+    "commercial_district", insert_commercial_district_batch, max_size=200, flush_interval=30.0
+)
+
+
 # 시장 규모
 def select_market_size_has_value() -> List[CommercialDistrictStatisticsBase]:
     connection = get_db_connection()
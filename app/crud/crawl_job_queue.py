@@ -0,0 +1,250 @@
+import json
+import logging
+import os
+import sqlite3
+import time
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+
+# 크롤링 작업 큐 (SQLite, 여러 워커 프로세스가 같은 파일을 공유)
+# 작업 단위별 상태(pending/running/done/failed)와 시도 횟수를 기록해 중단된 곳부터 재개한다.
+# running 상태로 lease 가 지난 작업(워커가 죽은 경우)은 다시 가져갈 수 있다.
+
+CRAWL_JOB_PENDING = "pending"
+CRAWL_JOB_RUNNING = "running"
+CRAWL_JOB_DONE = "done"
+CRAWL_JOB_FAILED = "failed"
+
+CRAWL_JOB_MAX_ATTEMPTS = int(os.getenv("CRAWL_JOB_MAX_ATTEMPTS", "3"))
+CRAWL_JOB_LEASE_SECONDS = float(os.getenv("CRAWL_JOB_LEASE_SECONDS", "1800"))
+
+
+class CrawlJob(NamedTuple):
+    job_id: int
+    job_kind: str
+    job_key: Dict[str, Any]
+    attempts: int
+
+
+def _encode_key(job_key: Dict[str, Any]) -> str:
+    return json.dumps(job_key, sort_keys=True, ensure_ascii=False)
+
+
+class CrawlJobQueue:
+    def __init__(
+        self,
+        path: str,
+        queue_name: str,
+        max_attempts: int = CRAWL_JOB_MAX_ATTEMPTS,
+        lease_seconds: float = CRAWL_JOB_LEASE_SECONDS,
+    ):
+        self.path = path
+        self.queue_name = queue_name
+        self.max_attempts = max_attempts
+        self.lease_seconds = lease_seconds
+        self._connection = None
+        self._pid = None
+
+    # sqlite 연결은 fork 후 공유하면 안 되므로 프로세스마다 새로 연결
+    def _connect(self) -> sqlite3.Connection:
+        if self._connection is not None and self._pid == os.getpid():
+            return self._connection
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        connection = sqlite3.connect(self.path, timeout=60, isolation_level=None)
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=NORMAL")
+        connection.execute("""
+            CREATE TABLE IF NOT EXISTS crawl_job (
+                job_id INTEGER PRIMARY KEY AUTOINCREMENT,
+                queue_name TEXT NOT NULL,
+                job_kind TEXT NOT NULL,
+                job_key TEXT NOT NULL,
+                status TEXT NOT NULL DEFAULT 'pending',
+                attempts INTEGER NOT NULL DEFAULT 0,
+                last_error TEXT,
+                worker TEXT,
+                lease_expires_at REAL,
+                created_at REAL NOT NULL,
+                updated_at REAL NOT NULL,
+                UNIQUE (queue_name, job_kind, job_key)
+            )
+        """)
+        connection.execute("""
+            CREATE INDEX IF NOT EXISTS idx_crawl_job_status
+            ON crawl_job (queue_name, status, job_id)
+        """)
+        self._connection = connection
+        self._pid = os.getpid()
+        return connection
+
+    def _transaction(self, work):
+        connection = self._connect()
+        # 쓰기 잠금을 먼저 잡아서 여러 워커가 같은 작업을 가져가지 않도록 함
+        connection.execute("BEGIN IMMEDIATE")
+        try:
+            result = work(connection)
+            connection.execute("COMMIT")
+            return result
+        except Exception:
+            connection.execute("ROLLBACK")
+            raise
+
+    @staticmethod
+    def _insert_jobs(connection, queue_name: str, jobs: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        now = time.time()
+        cursor = connection.executemany(
+            """
+            INSERT OR IGNORE INTO crawl_job (queue_name, job_kind, job_key, created_at, updated_at)
+            VALUES (?, ?, ?, ?, ?)
+            """,
+            [(queue_name, kind, _encode_key(key), now, now) for kind, key in jobs],
+        )
+        return cursor.rowcount
+
+    # 이미 있는 작업(같은 kind, key)은 무시
+    def enqueue_many(self, jobs: Iterable[Tuple[str, Dict[str, Any]]]) -> int:
+        jobs = list(jobs)
+        if not jobs:
+            return 0
+        return self._transaction(lambda connection: self._insert_jobs(connection, self.queue_name, jobs))
+
+    def claim(self, worker: str) -> Optional[CrawlJob]:
+        def work(connection):
+            now = time.time()
+            # lease 가 지난 작업 중 시도 횟수를 다 쓴 작업(매번 워커를 죽이거나 멈추는 작업)은 failed
+            # (다시 가져가지 않고, has_unfinished 에도 잡히지 않도록)
+            expired = connection.execute(
+                """
+                UPDATE crawl_job
+                SET status = ?, last_error = ?, lease_expires_at = NULL, updated_at = ?
+                WHERE queue_name = ? AND status = ? AND lease_expires_at < ? AND attempts >= ?
+                """,
+                (
+                    CRAWL_JOB_FAILED, "lease expired", now,
+                    self.queue_name, CRAWL_JOB_RUNNING, now, self.max_attempts,
+                ),
+            ).rowcount
+            if expired:
+                logging.getLogger(__name__).error(
+                    f"[{self.queue_name}] {expired} jobs failed after lease expired {self.max_attempts} times"
+                )
+
+            # 나중에 추가된(더 깊은 단계) 작업부터 처리해 결과가 빨리 쌓이도록 job_id 역순
+            row = connection.execute(
+                """
+                SELECT job_id, job_kind, job_key, attempts
+                FROM crawl_job
+                WHERE queue_name = ?
+                  AND (status = ? OR (status = ? AND lease_expires_at < ?))
+                ORDER BY job_id DESC
+                LIMIT 1
+                """,
+                (self.queue_name, CRAWL_JOB_PENDING, CRAWL_JOB_RUNNING, now),
+            ).fetchone()
+            if row is None:
+                return None
+
+            connection.execute(
+                """
+                UPDATE crawl_job
+                SET status = ?, attempts = attempts + 1, worker = ?,
+                    lease_expires_at = ?, updated_at = ?
+                WHERE job_id = ?
+                """,
+                (CRAWL_JOB_RUNNING, worker, now + self.lease_seconds, now, row[0]),
+            )
+            return CrawlJob(row[0], row[1], json.loads(row[2]), row[3] + 1)
+
+        return self._transaction(work)
+
+    # 완료 처리와 하위 작업 추가를 한 트랜잭션으로 (체크포인트)
+    def complete(self, job_ids: List[int], children: Iterable[Tuple[str, Dict[str, Any]]] = ()) -> None:
+        children = list(children)
+
+        def work(connection):
+            now = time.time()
+            connection.executemany(
+                """
+                UPDATE crawl_job
+                SET status = ?, last_error = NULL, lease_expires_at = NULL, updated_at = ?
+                WHERE job_id = ?
+                """,
+                [(CRAWL_JOB_DONE, now, job_id) for job_id in job_ids],
+            )
+            if children:
+                self._insert_jobs(connection, self.queue_name, children)
+
+        self._transaction(work)
+
+    # 최대 시도 횟수 전까지는 다시 pending, 넘으면 failed
+    def fail(self, job: CrawlJob, error: str) -> None:
+        status = CRAWL_JOB_FAILED if job.attempts >= self.max_attempts else CRAWL_JOB_PENDING
+        if status == CRAWL_JOB_FAILED:
+            logging.getLogger(__name__).error(
+                f"[{self.queue_name}] {job.job_kind} {job.job_key} failed after {job.attempts} attempts: {error}"
+            )
+
+        def work(connection):
+            connection.execute(
+                """
+                UPDATE crawl_job
+                SET status = ?, last_error = ?, lease_expires_at = NULL, updated_at = ?
+                WHERE job_id = ?
+                """,
+                (status, error, time.time(), job.job_id),
+            )
+
+        self._transaction(work)
+
+    # failed 작업을 다시 시도하도록 되돌림
+    def retry_failed(self) -> int:
+        def work(connection):
+            return connection.execute(
+                """
+                UPDATE crawl_job
+                SET status = ?, attempts = 0, updated_at = ?
+                WHERE queue_name = ? AND status = ?
+                """,
+                (CRAWL_JOB_PENDING, time.time(), self.queue_name, CRAWL_JOB_FAILED),
+            ).rowcount
+
+        return self._transaction(work)
+
+    # pending 또는 running 작업이 남았는지 (running 작업이 끝나면서 하위 작업이 추가될 수 있음)
+    def has_unfinished(self) -> bool:
+        row = self._connect().execute(
+            """
+            SELECT 1
+            FROM crawl_job
+            WHERE queue_name = ? AND status IN (?, ?)
+            LIMIT 1
+            """,
+            (self.queue_name, CRAWL_JOB_PENDING, CRAWL_JOB_RUNNING),
+        ).fetchone()
+        return row is not None
+
+    # {job_kind: {status: count}}
+    def status_counts(self) -> Dict[str, Dict[str, int]]:
+        counts: Dict[str, Dict[str, int]] = {}
+        rows = self._connect().execute(
+            """
+            SELECT job_kind, status, COUNT(*)
+            FROM crawl_job
+            WHERE queue_name = ?
+            GROUP BY job_kind, status
+            """,
+            (self.queue_name,),
+        ).fetchall()
+        for job_kind, status, count in rows:
+            counts.setdefault(job_kind, {})[status] = count
+        return counts
+
+    def close(self) -> None:
+        if self._connection is not None and self._pid == os.getpid():
+            self._connection.close()
+        self._connection = None
+        self._pid = None
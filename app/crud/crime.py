@@ -19,31 +19,51 @@ def get_crime_by_city_id(cursor, city_id: int, quarter: str):
 
 
 
-def insert_crime_data(connection, df, city_id, quarter):
+CRIME_INSERT_QUERY = """
+    INSERT INTO crime (
+        CITY_ID, QUARTER, CRIME_MAJOR_CATEGORY, CRIME_MINOR_CATEGORY, 
+        INCIDENT_COUNT, ARREST_COUNT, INCIDENT_TO_ARREST_RATIO, 
+        ARREST_PERSONNEL, LEGAL_ENTITY
+    ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
+"""
+
+
+def crime_data_rows(df, city_id, quarter):
     # "-" 값을 0으로 변환하고, NaN 값을 0으로 변환
-    df.replace('-', 0, inplace=True)
-    df.fillna(0, inplace=True)
+    df = df.replace('-', 0).fillna(0)
+
+    return [
+        (
+            city_id,
+            quarter,
+            row.MajorCategory,
+            row.MinorCategory,
+            int(row.IncidentCount),
+            int(row.ArrestCount),
+            float(row.ArrestRatio),
+            int(row.ArrestPersonnel),
+            int(row.LegalEntity),
+        )
+        for row in df.itertuples(index=False)
+    ]
+
+
+def insert_crime_data(connection, df, city_id, quarter):
+    insert_crime_data_batch(connection, [(city_id, quarter, df)])
+
+
+# (city_id, quarter, df) 목록을 executemany 로 묶어서 인서트 후 한 번만 커밋
+def insert_crime_data_batch(connection, crime_frames, batch_size: int = 5000):
+    rows = [
+        row
+        for city_id, quarter, df in crime_frames
+        for row in crime_data_rows(df, city_id, quarter)
+    ]
 
     # 데이터 삽입
     with connection.cursor() as cursor:
-        for index, row in df.iterrows():
-            cursor.execute("""
-                INSERT INTO crime (
-                    CITY_ID, QUARTER, CRIME_MAJOR_CATEGORY, CRIME_MINOR_CATEGORY, 
-                    INCIDENT_COUNT, ARREST_COUNT, INCIDENT_TO_ARREST_RATIO, 
-                    ARREST_PERSONNEL, LEGAL_ENTITY
-                ) VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s)
-            """, (
-                city_id,
-                quarter,
-                row['MajorCategory'],
-                row['MinorCategory'],
-                int(row['IncidentCount']),
-                int(row['ArrestCount']),
-                float(row['ArrestRatio']),
-                int(row['ArrestPersonnel']),
-                int(row['LegalEntity'])
-            ))
+        for start in range(0, len(rows), batch_size):
+            cursor.executemany(CRIME_INSERT_QUERY, rows[start:start + batch_size])
 
     # 트랜잭션 커밋
     commit(connection)
@@ -0,0 +1,187 @@
+import logging
+from threading import Lock
+from typing import Dict, Hashable, Optional, Tuple
+from app.crud.biz_detail_category import (
+    get_biz_categories_id_by_biz_detail_category_name,
+)
+from app.db.connect import (
+    get_db_connection,
+    close_all_pools,
+    close_connection,
+    close_cursor,
+    commit,
+    rollback,
+)
+
+
+# 차원 테이블 -> (id 컬럼, 키 컬럼들)
+# 키 컬럼 순서대로 값을 넘기면 id 를 돌려줌
+DIMENSION_TABLES: Dict[str, Tuple[str, Tuple[str, ...]]] = {
+    "city": ("city_id", ("city_name",)),
+    "district": ("district_id", ("city_id", "district_name")),
+    "sub_district": ("sub_district_id", ("city_id", "district_id", "sub_district_name")),
+    "biz_main_category": ("biz_main_category_id", ("biz_main_category_name",)),
+    "biz_sub_category": ("biz_sub_category_id", ("biz_main_category_id", "biz_sub_category_name")),
+    "biz_detail_category": ("biz_detail_category_id", ("biz_sub_category_id", "biz_detail_category_name")),
+}
+
+# 다른 프로세스와 동시에 같은 값을 인서트하지 않도록 MySQL 네임드 락 사용
+DIMENSION_LOCK_TIMEOUT = 10
+
+
+# 크롤러용 시/도, 시/군/구, 읍/면/동, 업종 분류 id 캐시
+# 시작 시 전체를 한 번 로드하고, 없는 값만 DB 에 조회/인서트 후 캐시에 기록 (write-through)
+class DimensionCache:
+    def __init__(self):
+        self._ids: Dict[str, Dict[Tuple, int]] = {table: {} for table in DIMENSION_TABLES}
+        self._detail_categories: Dict[str, Tuple[int, int, int]] = {}
+        self._locks = {table: Lock() for table in DIMENSION_TABLES}
+        self._preload_lock = Lock()
+        self._loaded = False
+
+    def preload(self) -> None:
+        logger = logging.getLogger(__name__)
+        connection = None
+        cursor = None
+
+        try:
+            connection = get_db_connection()
+            cursor = connection.cursor()
+            for table, (id_column, key_columns) in DIMENSION_TABLES.items():
+                cursor.execute(f"SELECT {id_column}, {', '.join(key_columns)} FROM {table}")
+                self._ids[table].update({tuple(row[1:]): row[0] for row in cursor.fetchall()})
+
+            cursor.execute("""
+                SELECT
+                    bdc.biz_detail_category_name,
+                    bmc.biz_main_category_id,
+                    bsc.biz_sub_category_id,
+                    bdc.biz_detail_category_id
+                FROM
+                    biz_detail_category bdc
+                JOIN
+                    biz_sub_category bsc ON bdc.biz_sub_category_id = bsc.biz_sub_category_id
+                JOIN
+                    biz_main_category bmc ON bsc.biz_main_category_id = bmc.biz_main_category_id
+            """)
+            for row in cursor.fetchall():
+                # 같은 이름이 여러 개면 기존 조회(fetchone)처럼 처음 값 사용
+                self._detail_categories.setdefault(row[0], tuple(row[1:]))
+
+            logger.info(
+                "Dimension cache loaded: "
+                + ", ".join(f"{table}={len(ids)}" for table, ids in self._ids.items())
+            )
+
+        except Exception as e:
+            logger.error(f"Error preloading dimension cache: {e}")
+        finally:
+            # 실패해도 재시도하지 않고 없는 값은 개별 조회 경로로 처리
+            self._loaded = True
+            close_cursor(cursor)
+            close_connection(connection)
+
+    def _ensure_loaded(self) -> None:
+        if self._loaded:
+            return
+        with self._preload_lock:
+            if not self._loaded:
+                self.preload()
+
+    def get_or_create(self, table: str, *key: Hashable) -> Optional[int]:
+        self._ensure_loaded()
+        cached = self._ids[table].get(key)
+        if cached is not None:
+            return cached
+
+        # 같은 프로세스의 스레드끼리는 Lock, 다른 프로세스와는 GET_LOCK 으로 조회-인서트를 직렬화
+        with self._locks[table]:
+            cached = self._ids[table].get(key)
+            if cached is not None:
+                return cached
+
+            dimension_id = self._select_or_insert(table, key)
+            if dimension_id is not None:
+                self._ids[table][key] = dimension_id
+            return dimension_id
+
+    def _select_or_insert(self, table: str, key: Tuple) -> Optional[int]:
+        id_column, key_columns = DIMENSION_TABLES[table]
+        lock_name = f"dimension_cache:{table}"
+        logger = logging.getLogger(__name__)
+        connection = None
+        cursor = None
+
+        try:
+            # 풀에서 빌리지 못하면 None 이 반환되므로 try 안에서 (AttributeError 대신 None 반환)
+            connection = get_db_connection()
+            cursor = connection.cursor()
+            cursor.execute("SELECT GET_LOCK(%s, %s)", (lock_name, DIMENSION_LOCK_TIMEOUT))
+            if cursor.fetchone()[0] != 1:
+                raise RuntimeError(f"Failed to acquire lock {lock_name}")
+
+            try:
+                where_clause = " AND ".join(f"{column} = %s" for column in key_columns)
+                cursor.execute(f"SELECT {id_column} FROM {table} WHERE {where_clause}", key)
+                result = cursor.fetchone()
+                if result:
+                    return result[0]
+
+                cursor.execute(
+                    f"INSERT INTO {table} ({', '.join(key_columns)}) VALUES ({', '.join(['%s'] * len(key_columns))})",
+                    key,
+                )
+                commit(connection)
+                return cursor.lastrowid
+            finally:
+                cursor.execute("SELECT RELEASE_LOCK(%s)", (lock_name,))
+
+        except Exception as e:
+            rollback(connection)
+            logger.error(f"Error in dimension cache get_or_create {table} {key}: {e}")
+            return None
+        finally:
+            close_cursor(cursor)
+            close_connection(connection)
+
+    def city_id(self, city_name: str) -> Optional[int]:
+        return self.get_or_create("city", city_name)
+
+    def district_id(self, city_id: int, district_name: str) -> Optional[int]:
+        return self.get_or_create("district", city_id, district_name)
+
+    def sub_district_id(self, city_id: int, district_id: int, sub_district_name: str) -> Optional[int]:
+        return self.get_or_create("sub_district", city_id, district_id, sub_district_name)
+
+    def biz_main_category_id(self, biz_main_category_name: str) -> Optional[int]:
+        return self.get_or_create("biz_main_category", biz_main_category_name)
+
+    def biz_sub_category_id(self, biz_main_category_id: int, biz_sub_category_name: str) -> Optional[int]:
+        return self.get_or_create("biz_sub_category", biz_main_category_id, biz_sub_category_name)
+
+    def biz_detail_category_id(self, biz_sub_category_id: int, biz_detail_category_name: str) -> Optional[int]:
+        return self.get_or_create("biz_detail_category", biz_sub_category_id, biz_detail_category_name)
+
+    # 소분류명으로 (대분류 id, 중분류 id, 소분류 id) 조회 (조회 전용, 없으면 None)
+    def biz_categories_by_detail_name(self, biz_detail_category_name: str) -> Optional[Tuple[int, int, int]]:
+        self._ensure_loaded()
+        cached = self._detail_categories.get(biz_detail_category_name)
+        if cached is not None:
+            return cached
+
+        result = get_biz_categories_id_by_biz_detail_category_name(biz_detail_category_name)
+        if result is not None:
+            self._detail_categories[biz_detail_category_name] = tuple(result)
+        return result
+
+
+# 프로세스별 공유 인스턴스
+dimension_cache = DimensionCache()
+
+
+# multiprocessing.Pool 을 만들기 직전(fork 전)에 호출하므로
+# 로드에 쓴 풀 커넥션을 닫아서 부모에 살아있는 커넥션이 남지 않도록 함
+def preload_dimension_cache() -> DimensionCache:
+    dimension_cache.preload()
+    close_all_pools()
+    return dimension_cache
@@ -9,7 +9,9 @@ from app.schemas.loc_info_statistics import (
     LocInfoJScorePer,
     MzPopJScorePer,
     LocInfoJScorePerNonOutLiers,
-    MzPopJScorePerNonOutLiers
+    MzPopJScorePerNonOutLiers,
+    LocInfoJScoreComponents,
+    MzPopJScoreComponents
 )
 import logging
 from pymysql import MySQLError
@@ -194,6 +196,64 @@ def select_district_loc_info_by_region(
     return results
 
 
+# 전체 지역 타겟 입지 정보값 일괄 조회 (전국/시도/시군구 통계 공용)
+def select_loc_info_by_all_regions(
+    connection, ref_date:date, target_item:str
+) -> List[NationLocInfoOutPut]:
+
+    cursor = connection.cursor(pymysql.cursors.DictCursor)
+    logger = logging.getLogger(__name__)
+    results: List[NationLocInfoOutPut] = []
+
+    try:
+        if connection.open:
+            select_query = f"""
+                SELECT
+                    LI.CITY_ID,
+                    LI.DISTRICT_ID,
+                    LI.SUB_DISTRICT_ID,
+                    LI.Y_M as REF_DATE,
+                    LI.REFERENCE_ID,
+                    LI.{target_item} as TARGET_ITEM  -- target 컬럼을 동적으로 추가
+                FROM
+                    loc_info LI
+                JOIN sub_district SD
+                    ON SD.CITY_ID = LI.CITY_ID
+                    AND SD.DISTRICT_ID = LI.DISTRICT_ID
+                    AND SD.SUB_DISTRICT_ID = LI.SUB_DISTRICT_ID
+                WHERE 
+                    LI.Y_M = %s
+            """
+
+            cursor.execute(select_query, (ref_date,))
+            rows = cursor.fetchall()
+
+            for row in rows:
+                loc_info_by_region = NationLocInfoOutPut(
+                    city_id= row.get("CITY_ID"),
+                    district_id= row.get("DISTRICT_ID"),
+                    sub_district_id=row.get("SUB_DISTRICT_ID"),
+                    ref_date= row.get("REF_DATE"),
+                    reference_id= row.get("REFERENCE_ID"),
+                    target_item= row.get("TARGET_ITEM")
+                )
+                results.append(loc_info_by_region)
+
+            return results
+        
+    except pymysql.MySQLError as e:
+        logger.error(f"MySQL Error: {e}")
+        rollback(connection)
+    except Exception as e:
+        logger.error(f"Unexpected Error: {e}")
+        rollback(connection)
+    finally:
+        if cursor:
+            close_cursor(cursor)
+
+    return results
+
+
 # 4. 인서트용
 def insert_loc_info_statistics(connection, data):
 
@@ -590,6 +650,124 @@ def select_mz_j_score_per_non_outliers(
 
 
 
+########### 전체 지역 일괄 조회
+
+
+# 가중치 계산 위한 입지 J-Score 구성값(rank, per, per_non_outliers) 전체 지역 일괄 조회
+def select_loc_info_j_score_components(
+        connection, target_items: List[str], ref_date: date
+) -> List[LocInfoJScoreComponents]:
+
+    cursor = connection.cursor(pymysql.cursors.DictCursor)
+    logger = logging.getLogger(__name__)
+    results: List[LocInfoJScoreComponents] = []
+
+    try:
+        if connection.open:
+            in_params = ", ".join(["%s"] * len(target_items))
+            select_query = f"""
+                SELECT
+                    CITY_ID,
+                    DISTRICT_ID,
+                    SUB_DISTRICT_ID,
+                    TARGET_ITEM,
+                    J_SCORE_RANK,
+                    J_SCORE_PER,
+                    J_SCORE_PER_NON_OUTLIERS
+                FROM
+                    loc_info_statistics
+                WHERE 
+                    target_item IN ({in_params})
+                    AND stat_level = '전국'
+                    AND REF_DATE = %s
+            """
+
+            cursor.execute(select_query, (*target_items, ref_date))
+            rows = cursor.fetchall()
+
+            for row in rows:
+                j_score_components = LocInfoJScoreComponents(
+                    city_id=row.get("CITY_ID"),
+                    district_id=row.get("DISTRICT_ID"),
+                    sub_district_id=row.get("SUB_DISTRICT_ID"),
+                    target_item=row.get("TARGET_ITEM"),
+                    j_score_rank=row.get("J_SCORE_RANK"),
+                    j_score_per=row.get("J_SCORE_PER"),
+                    j_score_per_non_outliers=row.get("J_SCORE_PER_NON_OUTLIERS")
+                )
+                results.append(j_score_components)
+
+            return results
+        
+    except pymysql.MySQLError as e:
+        logger.error(f"MySQL Error: {e}")
+        rollback(connection)
+    except Exception as e:
+        logger.error(f"Unexpected Error: {e}")
+        rollback(connection)
+    finally:
+        if cursor:
+            close_cursor(cursor)
+
+    return results
+
+
+# 가중치 계산 위한 mz 인구 J-Score 구성값 전체 지역 일괄 조회
+def select_mz_j_score_components(
+    connection, ref_date: date
+) -> List[MzPopJScoreComponents]:
+
+    cursor = connection.cursor(pymysql.cursors.DictCursor)
+    logger = logging.getLogger(__name__)
+    results: List[MzPopJScoreComponents] = []
+
+    try:
+        if connection.open:
+            select_query = """
+                SELECT
+                    CITY_ID,
+                    DISTRICT_ID,
+                    SUB_DISTRICT_ID,
+                    J_SCORE_RANK,
+                    J_SCORE_PER,
+                    J_SCORE_PER_NON_OUTLIERS
+                FROM
+                    population_info_mz_statistics
+                WHERE 
+                    REF_DATE = %s
+            """
+
+            cursor.execute(select_query, (ref_date,))
+            rows = cursor.fetchall()
+
+            for row in rows:
+                j_score_components = MzPopJScoreComponents(
+                    city_id=row.get("CITY_ID"),
+                    district_id=row.get("DISTRICT_ID"),
+                    sub_district_id=row.get("SUB_DISTRICT_ID"),
+                    j_score_rank=row.get("J_SCORE_RANK"),
+                    j_score_per=row.get("J_SCORE_PER"),
+                    j_score_per_non_outliers=row.get("J_SCORE_PER_NON_OUTLIERS")
+                )
+                results.append(j_score_components)
+
+            return results
+        
+    except pymysql.MySQLError as e:
+        logger.error(f"MySQL Error: {e}")
+        rollback(connection)
+    except Exception as e:
+        logger.error(f"Unexpected Error: {e}")
+        rollback(connection)
+    finally:
+        if cursor:
+            close_cursor(cursor)
+
+    return results
+
+
+
+
 # 15. 가중치 적용 평균 j_score_rank 인서트용
 def insert_loc_info_statistics_avg_j_score(data):
     connection = get_db_connection()
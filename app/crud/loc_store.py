@@ -170,6 +170,146 @@ def update_data_to_old_local_store(cursor, data_dict):
 
 
 
+########### 분기 CSV 일괄 적재 (임시 테이블 + 집합 연산)
+
+# LocalStore 필드 순서 = local_store 컬럼 순서 (IS_EXIST 제외)
+LOCAL_STORE_COLUMNS = [
+    "city_id", "district_id", "sub_district_id",
+    "store_business_number", "store_name", "branch_name",
+    "large_category_code", "large_category_name",
+    "medium_category_code", "medium_category_name",
+    "small_category_code", "small_category_name",
+    "industry_code", "industry_name",
+    "province_code", "province_name", "district_code",
+    "district_name", "administrative_dong_code", "administrative_dong_name",
+    "legal_dong_code", "legal_dong_name",
+    "lot_number_code", "land_category_code", "land_category_name",
+    "lot_main_number", "lot_sub_number", "lot_address",
+    "road_name_code", "road_name", "building_main_number",
+    "building_sub_number", "building_management_number", "building_name",
+    "road_name_address", "old_postal_code", "new_postal_code",
+    "dong_info", "floor_info", "unit_info",
+    "longitude", "latitude", "local_year", "local_quarter",
+]
+
+
+# 적재용 임시 테이블 생성
+# tmp_local_store_previous : 직전 분기 매장 번호 (업데이트/인서트 판단 및 없어진 매장 판단 기준)
+# tmp_local_store_chunk    : 현재 청크 데이터
+# tmp_local_store_processed: 이번 분기 CSV 에 등장한 매장 번호
+# 풀 연결은 재사용되므로 이전 실행이 남긴 임시 테이블을 먼저 지움
+def create_local_store_staging_tables(cursor):
+    columns = ", ".join(LOCAL_STORE_COLUMNS)
+
+    drop_local_store_staging_tables(cursor)
+
+    cursor.execute("""
+        CREATE TEMPORARY TABLE tmp_local_store_previous (PRIMARY KEY (STORE_BUSINESS_NUMBER))
+        SELECT DISTINCT
+            STORE_BUSINESS_NUMBER
+        FROM 
+            local_store
+        WHERE 
+            (LOCAL_YEAR, LOCAL_QUARTER) = (
+                SELECT LOCAL_YEAR, LOCAL_QUARTER
+                FROM local_store
+                ORDER BY LOCAL_YEAR DESC, LOCAL_QUARTER DESC
+                LIMIT 1
+            )
+    """)
+    cursor.execute(f"""
+        CREATE TEMPORARY TABLE tmp_local_store_chunk (INDEX (STORE_BUSINESS_NUMBER))
+        SELECT {columns}, IS_EXIST FROM local_store LIMIT 0
+    """)
+    cursor.execute("""
+        CREATE TEMPORARY TABLE tmp_local_store_processed (PRIMARY KEY (STORE_BUSINESS_NUMBER))
+        SELECT STORE_BUSINESS_NUMBER FROM local_store LIMIT 0
+    """)
+
+
+def drop_local_store_staging_tables(cursor):
+    cursor.execute("""
+        DROP TEMPORARY TABLE IF EXISTS
+            tmp_local_store_previous, tmp_local_store_chunk, tmp_local_store_processed
+    """)
+
+
+# 청크 적재 후 기존 매장 업데이트 / 신규 매장 인서트를 각각 한 번의 쿼리로 처리
+# 반환: (업데이트 건수, 인서트 건수)
+def upsert_local_store_chunk(cursor, rows, processed_store_business_numbers):
+    try:
+        columns = ", ".join(LOCAL_STORE_COLUMNS)
+
+        cursor.execute("DELETE FROM tmp_local_store_chunk")
+        cursor.executemany(
+            f"INSERT INTO tmp_local_store_chunk ({columns}, IS_EXIST) VALUES ({', '.join(['%s'] * (len(LOCAL_STORE_COLUMNS) + 1))})",
+            rows,
+        )
+        cursor.executemany(
+            "INSERT IGNORE INTO tmp_local_store_processed (STORE_BUSINESS_NUMBER) VALUES (%s)",
+            [(store_business_number,) for store_business_number in processed_store_business_numbers],
+        )
+
+        # 기존 매장 업데이트 (직전 분기에 있던 매장)
+        update_columns = ",\n                ".join(
+            f"ls.{column} = c.{column}" for column in LOCAL_STORE_COLUMNS
+        )
+        cursor.execute(f"""
+            UPDATE local_store ls
+            JOIN tmp_local_store_chunk c ON c.STORE_BUSINESS_NUMBER = ls.STORE_BUSINESS_NUMBER
+            JOIN tmp_local_store_previous p ON p.STORE_BUSINESS_NUMBER = c.STORE_BUSINESS_NUMBER
+            SET
+                {update_columns},
+                ls.CREATED_AT = now(), ls.UPDATED_AT = now(),
+                ls.IS_EXIST = c.IS_EXIST
+        """)
+
+        # 신규 매장 인서트
+        insert_count = cursor.execute(f"""
+            INSERT INTO local_store ({columns}, CREATED_AT, UPDATED_AT, IS_EXIST)
+            SELECT
+                {", ".join(f"c.{column}" for column in LOCAL_STORE_COLUMNS)}, NOW(), NOW(), c.IS_EXIST
+            FROM tmp_local_store_chunk c
+            LEFT JOIN tmp_local_store_previous p ON p.STORE_BUSINESS_NUMBER = c.STORE_BUSINESS_NUMBER
+            WHERE p.STORE_BUSINESS_NUMBER IS NULL
+        """)
+
+        return len(rows) - insert_count, insert_count
+
+    except Exception as e:
+        print(f"Error upserting data in local_store: {e}")
+        raise
+
+
+# 없어진 매장 업데이트 (직전 분기에 있었지만 이번 분기 CSV 에 없는 매장을 한 번에 처리)
+def update_vanished_local_store(cursor):
+    try:
+        cursor.execute("""
+            SELECT COUNT(*)
+            FROM tmp_local_store_previous p
+            LEFT JOIN tmp_local_store_processed n ON n.STORE_BUSINESS_NUMBER = p.STORE_BUSINESS_NUMBER
+            WHERE n.STORE_BUSINESS_NUMBER IS NULL
+        """)
+        vanished_count = cursor.fetchone()[0]
+
+        cursor.execute("""
+            UPDATE local_store ls
+            JOIN tmp_local_store_previous p ON p.STORE_BUSINESS_NUMBER = ls.STORE_BUSINESS_NUMBER
+            LEFT JOIN tmp_local_store_processed n ON n.STORE_BUSINESS_NUMBER = ls.STORE_BUSINESS_NUMBER
+            SET
+                ls.IS_EXIST = 0
+            WHERE n.STORE_BUSINESS_NUMBER IS NULL
+        """)
+
+        return vanished_count
+
+    except Exception as e:
+        print(f"Error updating old data in local_store: {e}")
+        raise
+
+
+
+
 
 
 from app.db.connect import *
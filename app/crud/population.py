@@ -1,6 +1,7 @@
 from app.schemas.population import Population
 from app.db.connect import get_db_connection
 import pymysql
+from typing import List
 
 def check_previous_month_data_exists(connection, previous_month):
     """저번 달 데이터가 DB에 존재하는지 확인하는 함수."""
@@ -192,3 +193,40 @@ def insert_population_data(connection, population_data: Population):
         print(f"Error inserting data into local_store: {e}")
         connection.rollback()
         raise
+
+
+# 배치 인서트용 컬럼 (population_data 필드 순서 = INSERT 컬럼 순서)
+POPULATION_AGE_FIELDS = [f"age_{age}" for age in range(110)] + ["age_110_over"]
+POPULATION_INSERT_FIELDS = [
+    "city_id", "district_id", "sub_district_id", "gender_id", "admin_code", "reference_date",
+    "province_name", "district_name", "sub_district_name",
+    "total_population", "male_population", "female_population",
+    *POPULATION_AGE_FIELDS,
+]
+
+
+def insert_population_data_batch(connection, population_data_list: List[Population], batch_size: int = 5000):
+    """인구 데이터를 executemany 로 묶어서 인서트 (커밋은 호출하는 쪽에서 한 번에)"""
+    # 행 튜플 = POPULATION_INSERT_FIELDS 값 + (created_at, updated_at, reference_id)
+    columns = [*POPULATION_INSERT_FIELDS, "created_at", "updated_at", "reference_id"]
+    insert_query = """
+        INSERT INTO population ({}) VALUES ({})
+    """.format(", ".join(columns), ", ".join(["%s"] * len(columns)))
+
+    try:
+        with connection.cursor() as cursor:
+            # NOW() 를 VALUES 에 두면 executemany 가 다중 행 INSERT 로 묶이지 않으므로 DB 시간을 한 번 조회해 파라미터로 전달
+            cursor.execute("SELECT NOW()")
+            now = cursor.fetchone()[0]
+
+            for start in range(0, len(population_data_list), batch_size):
+                rows = [
+                    tuple(getattr(population_data, field) for field in POPULATION_INSERT_FIELDS) + (now, now, 2)
+                    for population_data in population_data_list[start:start + batch_size]
+                ]
+                cursor.executemany(insert_query, rows)
+
+    except pymysql.MySQLError as e:
+        print(f"Error inserting data into population: {e}")
+        connection.rollback()
+        raise
@@ -2,7 +2,8 @@ from app.schemas.sub_district import AllRegionIdOutPut
 from app.schemas.population_age import PopAgeByRegionOutPut
 import logging
 from pymysql import MySQLError
-from typing import List, Optional
+from itertools import groupby
+from typing import Iterator, List, Optional
 import pymysql
 from datetime import date
 
@@ -15,19 +16,8 @@ from app.db.connect import (
 )
 
 
-# 1. 지역 별 연령별 인구 조회
-def select_pop_age_by_region(
-        city_id:int, district_id:int, sub_district_id:int, ref_date: date
-) -> List[PopAgeByRegionOutPut]:
-    connection = get_db_connection()
-    cursor = connection.cursor(pymysql.cursors.DictCursor)
-    logger = logging.getLogger(__name__)
-    results: List[PopAgeByRegionOutPut] = []
-
-    try:
-        if connection.open:
-            select_query = """
-                SELECT
+# 연령대별 인구 합계 컬럼 (population 한 행 = 한 지역의 한 성별)
+POP_AGE_SELECT_COLUMNS = """
                     CITY_ID,
                     DISTRICT_ID,
                     SUB_DISTRICT_ID,
@@ -58,53 +48,76 @@ def select_pop_age_by_region(
                     age_90 + age_91 + age_92 + age_93 + age_94 + age_95 + age_96 + age_97 + age_98 + age_99 + 
                     age_100 + age_101 + age_102 + age_103 + age_104 + age_105 + age_106 + age_107 + age_108 + 
                     age_109 + age_110_over) AS TOTAL_POPULATION_BY_GENDER
+"""
+
+
+# 같은 지역의 남/여 두 행씩 묶어 총 인구수(TOTAL_POPULATION)를 더한 결과로 변환
+def combine_gender_rows(temp_list: List[dict]) -> List[PopAgeByRegionOutPut]:
+    results: List[PopAgeByRegionOutPut] = []
+    # 총 인구수 값 더하기
+    rows = []
+    for i in range(0, len(temp_list), 2):
+        if i + 1 < len(temp_list):
+            # 남자와 여자의 총 인구수 합산
+            combined_total = temp_list[i]["TOTAL_POPULATION_BY_GENDER"] + temp_list[i + 1]["TOTAL_POPULATION_BY_GENDER"]
+
+            # 남자 데이터에 합산 값을 추가
+            male_data = temp_list[i].copy()  # 딕셔너리 복사
+            male_data["TOTAL_POPULATION"] = combined_total  # 합산 값을 추가
+
+            # 여자 데이터에 합산 값을 추가
+            female_data = temp_list[i + 1].copy()  # 딕셔너리 복사
+            female_data["TOTAL_POPULATION"] = combined_total  # 합산 값을 추가
+
+            # 결과 리스트에 추가
+            rows.append(male_data)
+            rows.append(female_data)
+
+    for row in rows:
+        pop_age_by_region = PopAgeByRegionOutPut(
+            city_id= row.get("CITY_ID"),
+            district_id= row.get("DISTRICT_ID"),
+            sub_district_id=row.get("SUB_DISTRICT_ID"),
+            gender_id= row.get("GENDER_ID"),
+            reference_id = row.get("REFERENCE_ID"),
+            ref_date= row.get("REF_DATE"),
+            age_under_10s= row.get("AGE_UNDER_10s"),
+            age_10s= row.get("AGE_10s"),
+            age_20s= row.get("AGE_20s"),
+            age_30s= row.get("AGE_30s"),
+            age_40s= row.get("AGE_40s"),
+            age_50s= row.get("AGE_50s"),
+            age_plus_60s= row.get("AGE_PLUS_60s"),
+            total_population_by_gender= row.get("TOTAL_POPULATION_BY_GENDER"),
+            total_population= row.get("TOTAL_POPULATION")
+        )
+        results.append(pop_age_by_region)
+    return results
+
+
+# 1. 지역 별 연령별 인구 조회
+def select_pop_age_by_region(
+        city_id:int, district_id:int, sub_district_id:int, ref_date: date
+) -> List[PopAgeByRegionOutPut]:
+    connection = get_db_connection()
+    cursor = connection.cursor(pymysql.cursors.DictCursor)
+    logger = logging.getLogger(__name__)
+    results: List[PopAgeByRegionOutPut] = []
+
+    try:
+        if connection.open:
+            select_query = """
+                SELECT
+                    {}
                 FROM
                     population
                 where city_id = %s and district_id = %s and sub_district_id = %s and reference_date = %s
-            """
+            """.format(POP_AGE_SELECT_COLUMNS)
 
             cursor.execute(select_query, (city_id, district_id, sub_district_id, ref_date))
             temp_list = cursor.fetchall()
-            
-
-            # 총 인구수 값 더하기
-            rows = []
-            for i in range(0, len(temp_list), 2):
-                if i + 1 < len(temp_list):
-                    # 남자와 여자의 총 인구수 합산
-                    combined_total = temp_list[i]["TOTAL_POPULATION_BY_GENDER"] + temp_list[i + 1]["TOTAL_POPULATION_BY_GENDER"]
-                    
-                    # 남자 데이터에 합산 값을 추가
-                    male_data = temp_list[i].copy()  # 딕셔너리 복사
-                    male_data["TOTAL_POPULATION"] = combined_total  # 합산 값을 추가
-
-                    # 여자 데이터에 합산 값을 추가
-                    female_data = temp_list[i + 1].copy()  # 딕셔너리 복사
-                    female_data["TOTAL_POPULATION"] = combined_total  # 합산 값을 추가
-                    
-                    # 결과 리스트에 추가
-                    rows.append(male_data)
-                    rows.append(female_data)
-
-            for row in rows:
-                pop_age_by_region = PopAgeByRegionOutPut(
-                    city_id= row.get("CITY_ID"),
-                    district_id= row.get("DISTRICT_ID"),
-                    sub_district_id=row.get("SUB_DISTRICT_ID"),
-                    gender_id= row.get("GENDER_ID"),
-                    reference_id = row.get("REFERENCE_ID"),
-                    ref_date= row.get("REF_DATE"),
-                    age_under_10s= row.get("AGE_UNDER_10s"),
-                    age_10s= row.get("AGE_10s"),
-                    age_20s= row.get("AGE_20s"),
-                    age_30s= row.get("AGE_30s"),
-                    age_40s= row.get("AGE_40s"),
-                    age_50s= row.get("AGE_50s"),
-                    age_plus_60s= row.get("AGE_PLUS_60s"),
-                    total_population_by_gender= row.get("TOTAL_POPULATION_BY_GENDER"),
-                    total_population= row.get("TOTAL_POPULATION")
-                )
-                results.append(pop_age_by_region)
+
+            results = combine_gender_rows(temp_list)
             return results
         
     except pymysql.MySQLError as e:
@@ -122,6 +135,66 @@ def select_pop_age_by_region(
     return results
 
 
+# 2. 전체 지역 연령별 인구를 쿼리 한 번으로 조회 (batch_size 건 이상 모일 때마다 나눠서 반환)
+# 서버 측 커서(SSDictCursor)로 읽어 전체 결과를 메모리에 올리지 않음
+# (인서트는 별도 풀 연결에서 하므로 읽는 도중 같은 연결을 쓰지 않음)
+def select_pop_age_all_regions(ref_date: date, batch_size: int = 5000) -> Iterator[List[PopAgeByRegionOutPut]]:
+    connection = get_db_connection()
+    cursor = connection.cursor(pymysql.cursors.SSDictCursor)
+    logger = logging.getLogger(__name__)
+
+    try:
+        if connection.open:
+            # sub_district 에 있는 지역만 (지역별로 조회하던 것과 같은 대상), 지역별 남/여 순서로 정렬
+            select_query = """
+                SELECT
+                    {}
+                FROM
+                    population p
+                WHERE p.reference_date = %s
+                  AND EXISTS (
+                      SELECT 1 FROM sub_district sd
+                      WHERE sd.CITY_ID = p.CITY_ID
+                        AND sd.DISTRICT_ID = p.DISTRICT_ID
+                        AND sd.SUB_DISTRICT_ID = p.SUB_DISTRICT_ID
+                  )
+                ORDER BY p.CITY_ID, p.DISTRICT_ID, p.SUB_DISTRICT_ID, p.GENDER_ID
+            """.format(POP_AGE_SELECT_COLUMNS)
+
+            cursor.execute(select_query, (ref_date,))
+
+            def fetch_rows():
+                while True:
+                    rows = cursor.fetchmany(batch_size)
+                    if not rows:
+                        break
+                    yield from rows
+
+            results: List[PopAgeByRegionOutPut] = []
+            for _, region_rows in groupby(
+                fetch_rows(),
+                key=lambda row: (row["CITY_ID"], row["DISTRICT_ID"], row["SUB_DISTRICT_ID"]),
+            ):
+                results.extend(combine_gender_rows(list(region_rows)))
+                if len(results) >= batch_size:
+                    yield results
+                    results = []
+            if results:
+                yield results
+
+    except pymysql.MySQLError as e:
+        logger.error(f"MySQL Error: {e}")
+        rollback(connection)
+    except Exception as e:
+        logger.error(f"Unexpected Error: {e}")
+        rollback(connection)
+    finally:
+        if cursor:
+            close_cursor(cursor)
+        if connection:
+            close_connection(connection)
+
+
 # 3. 각 지역에 해당하는 연령 별 인구 수 인서트
 def insert_pop_age_by_region(all_pop_age_by_region: List[PopAgeByRegionOutPut]) -> None:
     connection = get_db_connection()
@@ -143,9 +216,9 @@ def insert_pop_age_by_region(all_pop_age_by_region: List[PopAgeByRegionOutPut])
                 )
             """
 
-            # 각 PopAgeByRegionOutPut 객체를 인서트
-            for pop_age in all_pop_age_by_region:
-                cursor.execute(insert_query, (
+            # 각 PopAgeByRegionOutPut 객체를 executemany 로 묶어서 인서트
+            values = [
+                (
                     pop_age.city_id,
                     pop_age.district_id,
                     pop_age.sub_district_id,
@@ -161,7 +234,10 @@ def insert_pop_age_by_region(all_pop_age_by_region: List[PopAgeByRegionOutPut])
                     pop_age.age_plus_60s,
                     pop_age.total_population_by_gender,
                     pop_age.total_population
-                ))
+                )
+                for pop_age in all_pop_age_by_region
+            ]
+            cursor.executemany(insert_query, values)
 
             # 변경사항 커밋
             connection.commit()
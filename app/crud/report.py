@@ -1,7 +1,9 @@
 from collections import defaultdict
+from contextlib import contextmanager
 import logging
+import os
 from statistics import mean
-from typing import Dict, List
+from typing import Dict, Iterator, List, Optional, Set, Tuple
 import pymysql
 from tqdm import tqdm
 
@@ -31,17 +33,324 @@ from app.schemas.report import (
     LocalStoreSubdistrictId,
     LocalStoreTop5Menu,
     Report,
+    ReportSnapshot,
+)
+from app.crud.report_snapshot import get_report_snapshot
+from app.crud.report_cache import (
+    commercial_district_average_cache,
+    district_average_sales_cache,
+    j_score_weighted_average_cache,
+    make_store_key,
 )
 
 
 ##################### SELECT ##############################
+# 서버 측 커서는 결과를 다 읽을 때까지 서버가 전송을 기다리므로
+# 소비 쪽(upsert)이 밀려 읽기가 멈춰도 연결이 끊기지 않도록 세션 net_write_timeout 을 늘림
+REPORT_STREAM_NET_WRITE_TIMEOUT = int(os.getenv("REPORT_STREAM_NET_WRITE_TIMEOUT", "600"))
+
+
+# 풀 연결은 재사용되므로 스트리밍이 끝나면 (실패해도) 원래 값으로 되돌림
+# 서버 측 커서보다 먼저 with 에 넣어 커서를 닫은 뒤에 되돌리도록 사용
+@contextmanager
+def stream_net_write_timeout(connection) -> Iterator[None]:
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT @@SESSION.net_write_timeout")
+        previous = cursor.fetchone()[0]
+        cursor.execute(
+            "SET SESSION net_write_timeout = %s", (REPORT_STREAM_NET_WRITE_TIMEOUT,)
+        )
+    try:
+        yield
+    finally:
+        with connection.cursor() as cursor:
+            cursor.execute("SET SESSION net_write_timeout = %s", (previous,))
+
+
 ##################### 컬럼추가 테이블 정보 옮기기 ##############################
-def select_report_table(batch_size: int = 5000) -> List[Report]:
+def report_from_row(row: dict) -> Report:
+    return Report(
+        store_business_number=row["STORE_BUSINESS_NUMBER"],
+        city_name=row["CITY_NAME"],
+        district_name=row["DISTRICT_NAME"],
+        sub_district_name=row["SUB_DISTRICT_NAME"],
+        detail_category_name=row["DETAIL_CATEGORY_NAME"],
+        store_name=row["STORE_NAME"],
+        road_name=row["ROAD_NAME"],
+        building_name=row["BUILDING_NAME"],
+        floor_info=row["FLOOR_INFO"],
+        latitude=row["LATITUDE"],
+        longitude=row["LONGITUDE"],
+        business_area_category_id=row["BUSINESS_AREA_CATEGORY_ID"],
+        biz_detail_category_rep_name=row["BIZ_DETAIL_CATEGORY_REP_NAME"],
+        detail_category_top1_ordered_menu=row[
+            "DETAIL_CATEGORY_TOP1_ORDERED_MENU"
+        ],
+        detail_category_top2_ordered_menu=row[
+            "DETAIL_CATEGORY_TOP2_ORDERED_MENU"
+        ],
+        detail_category_top3_ordered_menu=row[
+            "DETAIL_CATEGORY_TOP3_ORDERED_MENU"
+        ],
+        detail_category_top4_ordered_menu=row[
+            "DETAIL_CATEGORY_TOP4_ORDERED_MENU"
+        ],
+        detail_category_top5_ordered_menu=row[
+            "DETAIL_CATEGORY_TOP5_ORDERED_MENU"
+        ],
+        loc_info_j_score_average=row[
+            "LOC_INFO_J_SCORE_AVERAGE"
+        ],
+        population_total=row["POPULATION_TOTAL"],
+        population_male_percent=row["POPULATION_MALE_PERCENT"],
+        population_female_percent=row[
+            "POPULATION_FEMALE_PERCENT"
+        ],
+        population_age_10_under=row["POPULATION_AGE_10_UNDER"],
+        population_age_10s=row["POPULATION_AGE_10S"],
+        population_age_20s=row["POPULATION_AGE_20S"],
+        population_age_30s=row["POPULATION_AGE_30S"],
+        population_age_40s=row["POPULATION_AGE_40S"],
+        population_age_50s=row["POPULATION_AGE_50S"],
+        population_age_60_over=row["POPULATION_AGE_60_OVER"],
+        loc_info_resident_k=row["LOC_INFO_RESIDENT_K"],
+        loc_info_work_pop_k=row["LOC_INFO_WORK_POP_K"],
+        loc_info_move_pop_k=row["LOC_INFO_MOVE_POP_K"],
+        loc_info_shop_k=row["LOC_INFO_SHOP_K"],
+        loc_info_income_won=row["LOC_INFO_INCOME_WON"],
+        loc_info_average_sales_k=row[
+            "LOC_INFO_AVERAGE_SALES_K"
+        ],
+        loc_info_average_spend_k=row[
+            "LOC_INFO_AVERAGE_SPEND_K"
+        ],
+        loc_info_house_k=row["LOC_INFO_HOUSE_K"],
+        loc_info_resident_j_score=row[
+            "LOC_INFO_RESIDENT_J_SCORE"
+        ],
+        loc_info_work_pop_j_score=row[
+            "LOC_INFO_WORK_POP_J_SCORE"
+        ],
+        loc_info_move_pop_j_score=row[
+            "LOC_INFO_MOVE_POP_J_SCORE"
+        ],
+        loc_info_shop_j_score=row["LOC_INFO_SHOP_J_SCORE"],
+        loc_info_income_j_score=row["LOC_INFO_INCOME_J_SCORE"],
+        loc_info_mz_population_j_score=row[
+            "LOC_INFO_MZ_POPULATION_J_SCORE"
+        ],
+        loc_info_average_spend_j_score=row[
+            "LOC_INFO_AVERAGE_SPEND_J_SCORE"
+        ],
+        loc_info_average_sales_j_score=row[
+            "LOC_INFO_AVERAGE_SALES_J_SCORE"
+        ],
+        loc_info_house_j_score=row["LOC_INFO_HOUSE_J_SCORE"],
+        loc_info_resident=row["LOC_INFO_RESIDENT"],
+        loc_info_work_pop=row["LOC_INFO_WORK_POP"],
+        loc_info_resident_percent=row[
+            "LOC_INFO_RESIDENT_PERCENT"
+        ],
+        loc_info_work_pop_percent=row[
+            "LOC_INFO_WORK_POP_PERCENT"
+        ],
+        loc_info_move_pop=row["LOC_INFO_MOVE_POP"],
+        loc_info_city_move_pop=row["LOC_INFO_CITY_MOVE_POP"],
+        commercial_district_j_score_average=row[
+            "COMMERCIAL_DISTRICT_J_SCORE_AVERAGE"
+        ],
+        commercial_district_food_business_count=row[
+            "COMMERCIAL_DISTRICT_FOOD_BUSINESS_COUNT"
+        ],
+        commercial_district_healthcare_business_count=row[
+            "COMMERCIAL_DISTRICT_HEALTHCARE_BUSINESS_COUNT"
+        ],
+        commercial_district_education_business_count=row[
+            "COMMERCIAL_DISTRICT_EDUCATION_BUSINESS_COUNT"
+        ],
+        commercial_district_entertainment_business_count=row[
+            "COMMERCIAL_DISTRICT_ENTERTAINMENT_BUSINESS_COUNT"
+        ],
+        commercial_district_lifestyle_business_count=row[
+            "COMMERCIAL_DISTRICT_LIFESTYLE_BUSINESS_COUNT"
+        ],
+        commercial_district_retail_business_count=row[
+            "COMMERCIAL_DISTRICT_RETAIL_BUSINESS_COUNT"
+        ],
+        commercial_district_national_market_size=row[
+            "COMMERCIAL_DISTRICT_NATIONAL_MARKET_SIZE"
+        ],
+        commercial_district_sub_district_market_size=row[
+            "COMMERCIAL_DISTRICT_SUB_DISTRICT_MARKET_SIZE"
+        ],
+        commercial_district_national_density_average=row[
+            "COMMERCIAL_DISTRICT_NATIONAL_DENSITY_AVERAGE"
+        ],
+        commercial_district_sub_district_density_average=row[
+            "COMMERCIAL_DISTRICT_SUB_DISTRICT_DENSITY_AVERAGE"
+        ],
+        commercial_district_national_average_sales=row[
+            "COMMERCIAL_DISTRICT_NATIONAL_AVERAGE_SALES"
+        ],
+        commercial_district_sub_district_average_sales=row[
+            "COMMERCIAL_DISTRICT_SUB_DISTRICT_AVERAGE_SALES"
+        ],
+        commercial_district_national_average_payment=row[
+            "COMMERCIAL_DISTRICT_NATIONAL_AVERAGE_PAYMENT"
+        ],
+        commercial_district_sub_district_average_payment=row[
+            "COMMERCIAL_DISTRICT_SUB_DISTRICT_AVERAGE_PAYMENT"
+        ],
+        commercial_district_national_usage_count=row[
+            "COMMERCIAL_DISTRICT_NATIONAL_USAGE_COUNT"
+        ],
+        commercial_district_sub_district_usage_count=row[
+            "COMMERCIAL_DISTRICT_SUB_DISTRICT_USAGE_COUNT"
+        ],
+        commercial_district_market_size_j_score=row[
+            "COMMERCIAL_DISTRICT_MARKET_SIZE_J_SCORE"
+        ],
+        commercial_district_average_sales_j_score=row[
+            "COMMERCIAL_DISTRICT_AVERAGE_SALES_J_SCORE"
+        ],
+        commercial_district_usage_count_j_score=row[
+            "COMMERCIAL_DISTRICT_USAGE_COUNT_J_SCORE"
+        ],
+        commercial_district_sub_district_density_j_score=row[
+            "COMMERCIAL_DISTRICT_SUB_DISTRICT_DENSITY_J_SCORE"
+        ],
+        commercial_district_average_payment_j_score=row[
+            "COMMERCIAL_DISTRICT_AVERAGE_PAYMENT_J_SCORE"
+        ],
+        commercial_district_average_sales_percent_mon=row[
+            "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_MON"
+        ],
+        commercial_district_average_sales_percent_tue=row[
+            "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_TUE"
+        ],
+        commercial_district_average_sales_percent_wed=row[
+            "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_WED"
+        ],
+        commercial_district_average_sales_percent_thu=row[
+            "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_THU"
+        ],
+        commercial_district_average_sales_percent_fri=row[
+            "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_FRI"
+        ],
+        commercial_district_average_sales_percent_sat=row[
+            "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_SAT"
+        ],
+        commercial_district_average_sales_percent_sun=row[
+            "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_SUN"
+        ],
+        commercial_district_average_sales_percent_06_09=row[
+            "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_06_09"
+        ],
+        commercial_district_average_sales_percent_09_12=row[
+            "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_09_12"
+        ],
+        commercial_district_average_sales_percent_12_15=row[
+            "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_12_15"
+        ],
+        commercial_district_average_sales_percent_15_18=row[
+            "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_15_18"
+        ],
+        commercial_district_average_sales_percent_18_21=row[
+            "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_18_21"
+        ],
+        commercial_district_average_sales_percent_21_24=row[
+            "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_21_24"
+        ],
+        commercial_district_avg_client_per_m_20s=row[
+            "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_20S"
+        ],
+        commercial_district_avg_client_per_m_30s=row[
+            "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_30S"
+        ],
+        commercial_district_avg_client_per_m_40s=row[
+            "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_40S"
+        ],
+        commercial_district_avg_client_per_m_50s=row[
+            "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_50S"
+        ],
+        commercial_district_avg_client_per_m_60_over=row[
+            "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_60_OVER"
+        ],
+        commercial_district_avg_client_per_f_20s=row[
+            "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_20S"
+        ],
+        commercial_district_avg_client_per_f_30s=row[
+            "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_30S"
+        ],
+        commercial_district_avg_client_per_f_40s=row[
+            "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_40S"
+        ],
+        commercial_district_avg_client_per_f_50s=row[
+            "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_50S"
+        ],
+        commercial_district_avg_client_per_f_60_over=row[
+            "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_60_OVER"
+        ],
+        commercial_district_detail_category_average_sales_top1_info=row[
+            "COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP1_INFO"
+        ],
+        commercial_district_detail_category_average_sales_top2_info=row[
+            "COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP2_INFO"
+        ],
+        commercial_district_detail_category_average_sales_top3_info=row[
+            "COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP3_INFO"
+        ],
+        commercial_district_detail_category_average_sales_top4_info=row[
+            "COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP4_INFO"
+        ],
+        commercial_district_detail_category_average_sales_top5_info=row[
+            "COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP5_INFO"
+        ],
+        rising_business_national_rising_sales_top1_info=row[
+            "RISING_BUSINESS_NATIONAL_RISING_SALES_TOP1_INFO"
+        ],
+        rising_business_national_rising_sales_top2_info=row[
+            "RISING_BUSINESS_NATIONAL_RISING_SALES_TOP2_INFO"
+        ],
+        rising_business_national_rising_sales_top3_info=row[
+            "RISING_BUSINESS_NATIONAL_RISING_SALES_TOP3_INFO"
+        ],
+        rising_business_national_rising_sales_top4_info=row[
+            "RISING_BUSINESS_NATIONAL_RISING_SALES_TOP4_INFO"
+        ],
+        rising_business_national_rising_sales_top5_info=row[
+            "RISING_BUSINESS_NATIONAL_RISING_SALES_TOP5_INFO"
+        ],
+        rising_business_sub_district_rising_sales_top1_info=row[
+            "RISING_BUSINESS_SUB_DISTRICT_RISING_SALES_TOP1_INFO"
+        ],
+        rising_business_sub_district_rising_sales_top2_info=row[
+            "RISING_BUSINESS_SUB_DISTRICT_RISING_SALES_TOP2_INFO"
+        ],
+        rising_business_sub_district_rising_sales_top3_info=row[
+            "RISING_BUSINESS_SUB_DISTRICT_RISING_SALES_TOP3_INFO"
+        ],
+        loc_info_data_ref_date=row["LOC_INFO_DATA_REF_DATE"],
+        nice_biz_map_data_ref_date=row[
+            "NICE_BIZ_MAP_DATA_REF_DATE"
+        ],
+        population_data_ref_date=row[
+            "POPULATION_DATA_REF_DATE"
+        ],
+        created_at=row["CREATED_AT"],
+        updated_at=row["UPDATED_AT"],
+    )
+
+
+# 서버 측 커서(SSDictCursor)로 batch_size 개씩 스트리밍 (전체 행을 메모리에 올리지 않음)
+def iter_report_table(batch_size: int = 5000) -> Iterator[List[Report]]:
     logger = logging.getLogger(__name__)
 
     try:
         with get_service_report_db_connection() as connection:
-            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+            with stream_net_write_timeout(connection), connection.cursor(
+                pymysql.cursors.SSDictCursor
+            ) as cursor:
                 select_query = """
                     SELECT 
                         *
@@ -53,293 +362,21 @@ def select_report_table(batch_size: int = 5000) -> List[Report]:
                 logger.info(f"Executing query: {select_query}")
                 cursor.execute(select_query)
 
-                results = []
                 while True:
                     rows = cursor.fetchmany(batch_size)
                     if not rows:
                         break
-                    for row in rows:
-                        results.append(
-                            Report(
-                                store_business_number=row["STORE_BUSINESS_NUMBER"],
-                                city_name=row["CITY_NAME"],
-                                district_name=row["DISTRICT_NAME"],
-                                sub_district_name=row["SUB_DISTRICT_NAME"],
-                                detail_category_name=row["DETAIL_CATEGORY_NAME"],
-                                store_name=row["STORE_NAME"],
-                                road_name=row["ROAD_NAME"],
-                                building_name=row["BUILDING_NAME"],
-                                floor_info=row["FLOOR_INFO"],
-                                latitude=row["LATITUDE"],
-                                longitude=row["LONGITUDE"],
-                                business_area_category_id=row["BUSINESS_AREA_CATEGORY_ID"],
-                                biz_detail_category_rep_name=row["BIZ_DETAIL_CATEGORY_REP_NAME"],
-                                detail_category_top1_ordered_menu=row[
-                                    "DETAIL_CATEGORY_TOP1_ORDERED_MENU"
-                                ],
-                                detail_category_top2_ordered_menu=row[
-                                    "DETAIL_CATEGORY_TOP2_ORDERED_MENU"
-                                ],
-                                detail_category_top3_ordered_menu=row[
-                                    "DETAIL_CATEGORY_TOP3_ORDERED_MENU"
-                                ],
-                                detail_category_top4_ordered_menu=row[
-                                    "DETAIL_CATEGORY_TOP4_ORDERED_MENU"
-                                ],
-                                detail_category_top5_ordered_menu=row[
-                                    "DETAIL_CATEGORY_TOP5_ORDERED_MENU"
-                                ],
-                                loc_info_j_score_average=row[
-                                    "LOC_INFO_J_SCORE_AVERAGE"
-                                ],
-                                population_total=row["POPULATION_TOTAL"],
-                                population_male_percent=row["POPULATION_MALE_PERCENT"],
-                                population_female_percent=row[
-                                    "POPULATION_FEMALE_PERCENT"
-                                ],
-                                population_age_10_under=row["POPULATION_AGE_10_UNDER"],
-                                population_age_10s=row["POPULATION_AGE_10S"],
-                                population_age_20s=row["POPULATION_AGE_20S"],
-                                population_age_30s=row["POPULATION_AGE_30S"],
-                                population_age_40s=row["POPULATION_AGE_40S"],
-                                population_age_50s=row["POPULATION_AGE_50S"],
-                                population_age_60_over=row["POPULATION_AGE_60_OVER"],
-                                loc_info_resident_k=row["LOC_INFO_RESIDENT_K"],
-                                loc_info_work_pop_k=row["LOC_INFO_WORK_POP_K"],
-                                loc_info_move_pop_k=row["LOC_INFO_MOVE_POP_K"],
-                                loc_info_shop_k=row["LOC_INFO_SHOP_K"],
-                                loc_info_income_won=row["LOC_INFO_INCOME_WON"],
-                                loc_info_average_sales_k=row[
-                                    "LOC_INFO_AVERAGE_SALES_K"
-                                ],
-                                loc_info_average_spend_k=row[
-                                    "LOC_INFO_AVERAGE_SPEND_K"
-                                ],
-                                loc_info_house_k=row["LOC_INFO_HOUSE_K"],
-                                loc_info_resident_j_score=row[
-                                    "LOC_INFO_RESIDENT_J_SCORE"
-                                ],
-                                loc_info_work_pop_j_score=row[
-                                    "LOC_INFO_WORK_POP_J_SCORE"
-                                ],
-                                loc_info_move_pop_j_score=row[
-                                    "LOC_INFO_MOVE_POP_J_SCORE"
-                                ],
-                                loc_info_shop_j_score=row["LOC_INFO_SHOP_J_SCORE"],
-                                loc_info_income_j_score=row["LOC_INFO_INCOME_J_SCORE"],
-                                loc_info_mz_population_j_score=row[
-                                    "LOC_INFO_MZ_POPULATION_J_SCORE"
-                                ],
-                                loc_info_average_spend_j_score=row[
-                                    "LOC_INFO_AVERAGE_SPEND_J_SCORE"
-                                ],
-                                loc_info_average_sales_j_score=row[
-                                    "LOC_INFO_AVERAGE_SALES_J_SCORE"
-                                ],
-                                loc_info_house_j_score=row["LOC_INFO_HOUSE_J_SCORE"],
-                                loc_info_resident=row["LOC_INFO_RESIDENT"],
-                                loc_info_work_pop=row["LOC_INFO_WORK_POP"],
-                                loc_info_resident_percent=row[
-                                    "LOC_INFO_RESIDENT_PERCENT"
-                                ],
-                                loc_info_work_pop_percent=row[
-                                    "LOC_INFO_WORK_POP_PERCENT"
-                                ],
-                                loc_info_move_pop=row["LOC_INFO_MOVE_POP"],
-                                loc_info_city_move_pop=row["LOC_INFO_CITY_MOVE_POP"],
-                                commercial_district_j_score_average=row[
-                                    "COMMERCIAL_DISTRICT_J_SCORE_AVERAGE"
-                                ],
-                                commercial_district_food_business_count=row[
-                                    "COMMERCIAL_DISTRICT_FOOD_BUSINESS_COUNT"
-                                ],
-                                commercial_district_healthcare_business_count=row[
-                                    "COMMERCIAL_DISTRICT_HEALTHCARE_BUSINESS_COUNT"
-                                ],
-                                commercial_district_education_business_count=row[
-                                    "COMMERCIAL_DISTRICT_EDUCATION_BUSINESS_COUNT"
-                                ],
-                                commercial_district_entertainment_business_count=row[
-                                    "COMMERCIAL_DISTRICT_ENTERTAINMENT_BUSINESS_COUNT"
-                                ],
-                                commercial_district_lifestyle_business_count=row[
-                                    "COMMERCIAL_DISTRICT_LIFESTYLE_BUSINESS_COUNT"
-                                ],
-                                commercial_district_retail_business_count=row[
-                                    "COMMERCIAL_DISTRICT_RETAIL_BUSINESS_COUNT"
-                                ],
-                                commercial_district_national_market_size=row[
-                                    "COMMERCIAL_DISTRICT_NATIONAL_MARKET_SIZE"
-                                ],
-                                commercial_district_sub_district_market_size=row[
-                                    "COMMERCIAL_DISTRICT_SUB_DISTRICT_MARKET_SIZE"
-                                ],
-                                commercial_district_national_density_average=row[
-                                    "COMMERCIAL_DISTRICT_NATIONAL_DENSITY_AVERAGE"
-                                ],
-                                commercial_district_sub_district_density_average=row[
-                                    "COMMERCIAL_DISTRICT_SUB_DISTRICT_DENSITY_AVERAGE"
-                                ],
-                                commercial_district_national_average_sales=row[
-                                    "COMMERCIAL_DISTRICT_NATIONAL_AVERAGE_SALES"
-                                ],
-                                commercial_district_sub_district_average_sales=row[
-                                    "COMMERCIAL_DISTRICT_SUB_DISTRICT_AVERAGE_SALES"
-                                ],
-                                commercial_district_national_average_payment=row[
-                                    "COMMERCIAL_DISTRICT_NATIONAL_AVERAGE_PAYMENT"
-                                ],
-                                commercial_district_sub_district_average_payment=row[
-                                    "COMMERCIAL_DISTRICT_SUB_DISTRICT_AVERAGE_PAYMENT"
-                                ],
-                                commercial_district_national_usage_count=row[
-                                    "COMMERCIAL_DISTRICT_NATIONAL_USAGE_COUNT"
-                                ],
-                                commercial_district_sub_district_usage_count=row[
-                                    "COMMERCIAL_DISTRICT_SUB_DISTRICT_USAGE_COUNT"
-                                ],
-                                commercial_district_market_size_j_score=row[
-                                    "COMMERCIAL_DISTRICT_MARKET_SIZE_J_SCORE"
-                                ],
-                                commercial_district_average_sales_j_score=row[
-                                    "COMMERCIAL_DISTRICT_AVERAGE_SALES_J_SCORE"
-                                ],
-                                commercial_district_usage_count_j_score=row[
-                                    "COMMERCIAL_DISTRICT_USAGE_COUNT_J_SCORE"
-                                ],
-                                commercial_district_sub_district_density_j_score=row[
-                                    "COMMERCIAL_DISTRICT_SUB_DISTRICT_DENSITY_J_SCORE"
-                                ],
-                                commercial_district_average_payment_j_score=row[
-                                    "COMMERCIAL_DISTRICT_AVERAGE_PAYMENT_J_SCORE"
-                                ],
-                                commercial_district_average_sales_percent_mon=row[
-                                    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_MON"
-                                ],
-                                commercial_district_average_sales_percent_tue=row[
-                                    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_TUE"
-                                ],
-                                commercial_district_average_sales_percent_wed=row[
-                                    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_WED"
-                                ],
-                                commercial_district_average_sales_percent_thu=row[
-                                    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_THU"
-                                ],
-                                commercial_district_average_sales_percent_fri=row[
-                                    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_FRI"
-                                ],
-                                commercial_district_average_sales_percent_sat=row[
-                                    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_SAT"
-                                ],
-                                commercial_district_average_sales_percent_sun=row[
-                                    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_SUN"
-                                ],
-                                commercial_district_average_sales_percent_06_09=row[
-                                    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_06_09"
-                                ],
-                                commercial_district_average_sales_percent_09_12=row[
-                                    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_09_12"
-                                ],
-                                commercial_district_average_sales_percent_12_15=row[
-                                    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_12_15"
-                                ],
-                                commercial_district_average_sales_percent_15_18=row[
-                                    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_15_18"
-                                ],
-                                commercial_district_average_sales_percent_18_21=row[
-                                    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_18_21"
-                                ],
-                                commercial_district_average_sales_percent_21_24=row[
-                                    "COMMERCIAL_DISTRICT_AVERAGE_SALES_PERCENT_21_24"
-                                ],
-                                commercial_district_avg_client_per_m_20s=row[
-                                    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_20S"
-                                ],
-                                commercial_district_avg_client_per_m_30s=row[
-                                    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_30S"
-                                ],
-                                commercial_district_avg_client_per_m_40s=row[
-                                    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_40S"
-                                ],
-                                commercial_district_avg_client_per_m_50s=row[
-                                    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_50S"
-                                ],
-                                commercial_district_avg_client_per_m_60_over=row[
-                                    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_M_60_OVER"
-                                ],
-                                commercial_district_avg_client_per_f_20s=row[
-                                    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_20S"
-                                ],
-                                commercial_district_avg_client_per_f_30s=row[
-                                    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_30S"
-                                ],
-                                commercial_district_avg_client_per_f_40s=row[
-                                    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_40S"
-                                ],
-                                commercial_district_avg_client_per_f_50s=row[
-                                    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_50S"
-                                ],
-                                commercial_district_avg_client_per_f_60_over=row[
-                                    "COMMERCIAL_DISTRICT_AVG_CLIENT_PER_F_60_OVER"
-                                ],
-                                commercial_district_detail_category_average_sales_top1_info=row[
-                                    "COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP1_INFO"
-                                ],
-                                commercial_district_detail_category_average_sales_top2_info=row[
-                                    "COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP2_INFO"
-                                ],
-                                commercial_district_detail_category_average_sales_top3_info=row[
-                                    "COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP3_INFO"
-                                ],
-                                commercial_district_detail_category_average_sales_top4_info=row[
-                                    "COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP4_INFO"
-                                ],
-                                commercial_district_detail_category_average_sales_top5_info=row[
-                                    "COMMERCIAL_DISTRICT_DETAIL_CATEGORY_AVERAGE_SALES_TOP5_INFO"
-                                ],
-                                rising_business_national_rising_sales_top1_info=row[
-                                    "RISING_BUSINESS_NATIONAL_RISING_SALES_TOP1_INFO"
-                                ],
-                                rising_business_national_rising_sales_top2_info=row[
-                                    "RISING_BUSINESS_NATIONAL_RISING_SALES_TOP2_INFO"
-                                ],
-                                rising_business_national_rising_sales_top3_info=row[
-                                    "RISING_BUSINESS_NATIONAL_RISING_SALES_TOP3_INFO"
-                                ],
-                                rising_business_national_rising_sales_top4_info=row[
-                                    "RISING_BUSINESS_NATIONAL_RISING_SALES_TOP4_INFO"
-                                ],
-                                rising_business_national_rising_sales_top5_info=row[
-                                    "RISING_BUSINESS_NATIONAL_RISING_SALES_TOP5_INFO"
-                                ],
-                                rising_business_sub_district_rising_sales_top1_info=row[
-                                    "RISING_BUSINESS_SUB_DISTRICT_RISING_SALES_TOP1_INFO"
-                                ],
-                                rising_business_sub_district_rising_sales_top2_info=row[
-                                    "RISING_BUSINESS_SUB_DISTRICT_RISING_SALES_TOP2_INFO"
-                                ],
-                                rising_business_sub_district_rising_sales_top3_info=row[
-                                    "RISING_BUSINESS_SUB_DISTRICT_RISING_SALES_TOP3_INFO"
-                                ],
-                                loc_info_data_ref_date=row["LOC_INFO_DATA_REF_DATE"],
-                                nice_biz_map_data_ref_date=row[
-                                    "NICE_BIZ_MAP_DATA_REF_DATE"
-                                ],
-                                population_data_ref_date=row[
-                                    "POPULATION_DATA_REF_DATE"
-                                ],
-                                created_at=row["CREATED_AT"],
-                                updated_at=row["UPDATED_AT"],
-                            )
-                        )
-
-                return results
+                    yield [report_from_row(row) for row in rows]
 
     except Exception as e:
         logger.error(f"Error Report data: {e}")
         raise
 
 
+def select_report_table(batch_size: int = 5000) -> List[Report]:
+    return [report for batch in iter_report_table(batch_size) for report in batch]
+
+
 def insert_new_report_table(
     batch: List[LocalStoreCDCommercialDistrict],
 ) -> None:
@@ -630,12 +667,39 @@ def insert_new_report_table(
 
 
 ##################### 기본 매장 정보 넣기 ##############################
-def select_local_store_info(batch_size: int = 5000) -> List[LocalStoreBasicInfo]:
+def local_store_basic_info_from_row(row: dict) -> LocalStoreBasicInfo:
+    return LocalStoreBasicInfo(
+        store_business_number=row["STORE_BUSINESS_NUMBER"],
+        city_name=row["CITY_NAME"],
+        district_name=row["DISTRICT_NAME"],
+        sub_district_name=row["SUB_DISTRICT_NAME"],
+        sub_district_id=row["SUB_DISTRICT_ID"],
+        detail_category_name=row["SMALL_CATEGORY_NAME"],
+        store_name=row["STORE_NAME"],
+        road_name=row["ROAD_NAME_ADDRESS"],
+        building_name=row["BUILDING_NAME"],
+        floor_info=row["FLOOR_INFO"],
+        latitude=row["LATITUDE"],
+        longitude=row["LONGITUDE"],
+        business_area_category_id=row["BUSINESS_AREA_CATEGORY_ID"],
+        biz_detail_category_rep_name=row["BIZ_DETAIL_CATEGORY_NAME"],
+        biz_main_categort_id=row["BIZ_MAIN_CATEGORY_ID"],
+        biz_sub_categort_id=row["BIZ_SUB_CATEGORY_ID"],
+    )
+
+
+# 서버 측 커서(SSDictCursor)로 batch_size 개씩 스트리밍 (전체 매장을 메모리에 올리지 않음)
+def iter_local_store_info(
+    batch_size: int = 5000, snapshot: Optional[ReportSnapshot] = None
+) -> Iterator[List[LocalStoreBasicInfo]]:
     logger = logging.getLogger(__name__)
+    snapshot = snapshot or get_report_snapshot()
 
     try:
         with get_db_connection() as connection:
-            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+            with stream_net_write_timeout(connection), connection.cursor(
+                pymysql.cursors.SSDictCursor
+            ) as cursor:
                 select_query = """
                     SELECT 
                         ls.STORE_BUSINESS_NUMBER,
@@ -664,49 +728,39 @@ def select_local_store_info(batch_size: int = 5000) -> List[LocalStoreBasicInfo]
                         LEFT JOIN BIZ_DETAIL_CATEGORY BDC ON BDC.BIZ_DETAIL_CATEGORY_ID = DCM.REP_ID
                         LEFT JOIN BIZ_SUB_CATEGORY BSC ON BSC.BIZ_SUB_CATEGORY_ID = BDC.BIZ_SUB_CATEGORY_ID
                         LEFT JOIN BIZ_MAIN_CATEGORY BMC ON BMC.BIZ_MAIN_CATEGORY_ID = BSC.BIZ_MAIN_CATEGORY_ID
-                        WHERE ls.LOCAL_YEAR = (SELECT MAX(LOCAL_YEAR) FROM LOCAL_STORE)
-                        AND ls.LOCAL_QUARTER = (SELECT MAX(LOCAL_QUARTER) FROM LOCAL_STORE)
+                        WHERE ls.LOCAL_YEAR = %s
+                        AND ls.LOCAL_QUARTER = %s
                         AND ls.SUB_DISTRICT_ID IS NOT NULL
                         AND ls.IS_EXIST = 1
                     ;
                 """
 
                 logger.info(f"Executing query: {select_query}")
-                cursor.execute(select_query)
+                cursor.execute(
+                    select_query, (snapshot.local_year, snapshot.local_quarter)
+                )
 
-                results = []
                 while True:
                     rows = cursor.fetchmany(batch_size)
                     if not rows:
                         break
-                    for row in rows:
-                        results.append(
-                            LocalStoreBasicInfo(
-                                store_business_number=row["STORE_BUSINESS_NUMBER"],
-                                city_name=row["CITY_NAME"],
-                                district_name=row["DISTRICT_NAME"],
-                                sub_district_name=row["SUB_DISTRICT_NAME"],
-                                detail_category_name=row["SMALL_CATEGORY_NAME"],
-                                store_name=row["STORE_NAME"],
-                                road_name=row["ROAD_NAME_ADDRESS"],
-                                building_name=row["BUILDING_NAME"],
-                                floor_info=row["FLOOR_INFO"],
-                                latitude=row["LATITUDE"],
-                                longitude=row["LONGITUDE"],
-                                business_area_category_id=row["BUSINESS_AREA_CATEGORY_ID"],
-                                biz_detail_category_rep_name=row["BIZ_DETAIL_CATEGORY_NAME"],
-                                biz_main_categort_id=row["BIZ_MAIN_CATEGORY_ID"],
-                                biz_sub_categort_id=row["BIZ_SUB_CATEGORY_ID"],
-                            )
-                        )
-
-                return results
+                    yield [local_store_basic_info_from_row(row) for row in rows]
 
     except Exception as e:
         logger.error(f"Error LocalStoreBasicInfo data: {e}")
         raise
 
 
+def select_local_store_info(
+    batch_size: int = 5000, snapshot: Optional[ReportSnapshot] = None
+) -> List[LocalStoreBasicInfo]:
+    return [
+        store_info
+        for batch in iter_local_store_info(batch_size, snapshot)
+        for store_info in batch
+    ]
+
+
 ##################### 매장마다 소분류별 뜨는 메뉴 TOP5 넣기 ##############################
 
 
@@ -751,9 +805,11 @@ def select_local_store_sub_district_rep_id() -> List[LocalStoreMappingRepId]:
 
 def select_local_store_top5_menus(
     batch: List[LocalStoreMappingRepId],
+    snapshot: Optional[ReportSnapshot] = None,
 ) -> List[LocalStoreTop5Menu]:
     logger = logging.getLogger(__name__)
     results = []
+    snapshot = snapshot or get_report_snapshot()
 
     try:
         with get_db_connection() as connection:
@@ -773,15 +829,15 @@ def select_local_store_top5_menus(
                         TOP_MENU_5,
                         Y_M
                     FROM COMMERCIAL_DISTRICT
-                    WHERE BIZ_DETAIL_CATEGORY_ID IN (%s)
-                    AND Y_M = (SELECT MAX(Y_M) FROM COMMERCIAL_DISTRICT)
+                    WHERE BIZ_DETAIL_CATEGORY_ID IN ({})
+                    AND Y_M = %s
                     ;
                 """
                 # IN 절 파라미터 생성
                 in_params = ",".join(["%s"] * len(rep_ids))
-                query = select_query_top5 % in_params
+                query = select_query_top5.format(in_params)
 
-                cursor.execute(query, rep_ids)
+                cursor.execute(query, rep_ids + [snapshot.commercial_district_y_m])
                 rows = cursor.fetchall()
 
                 # rep_id를 키로 하는 딕셔너리 생성
@@ -824,8 +880,10 @@ def select_local_store_top5_menus(
 ### 매장별 읍/면/동 아이디 조회
 def select_local_store_sub_district_id(
     batch_size: int = 5000,
+    snapshot: Optional[ReportSnapshot] = None,
 ) -> List[LocalStoreSubdistrictId]:
     logger = logging.getLogger(__name__)
+    snapshot = snapshot or get_report_snapshot()
 
     try:
         with get_db_connection() as connection:
@@ -835,12 +893,14 @@ def select_local_store_sub_district_id(
                         STORE_BUSINESS_NUMBER,
                         SUB_DISTRICT_ID
                     FROM LOCAL_STORE
-                    WHERE LOCAL_YEAR = (SELECT MAX(LOCAL_YEAR) FROM LOCAL_STORE)
-                    AND LOCAL_QUARTER = (SELECT MAX(LOCAL_QUARTER) FROM LOCAL_STORE)
+                    WHERE LOCAL_YEAR = %s
+                    AND LOCAL_QUARTER = %s
                     ;
                 """
 
-                cursor.execute(select_query)
+                cursor.execute(
+                    select_query, (snapshot.local_year, snapshot.local_quarter)
+                )
 
                 results = []
                 while True:
@@ -863,6 +923,46 @@ def select_local_store_sub_district_id(
         raise
 
 
+##################### 읍/면/동 단위 선계산 ##############################
+# 매장(수십만 개)은 읍/면/동(약 3,500개)을 공유하므로
+# 1단계: 읍/면/동별 결과를 한 번만 계산 (중복 제거한 id 로 조회)
+# 2단계: 매장에는 읍/면/동 id 로 결과를 매핑(broadcast)만 함
+SUB_DISTRICT_IN_CHUNK_SIZE = 1000
+
+
+def unique_sub_district_ids(stores: List[LocalStoreSubdistrictId]) -> List[int]:
+    return sorted({store.sub_district_id for store in stores})
+
+
+# 증분 갱신: 바뀐 읍/면/동의 매장만 남김 (sub_district_ids 가 None 이면 전체)
+def filter_stores_by_sub_district_ids(stores: List, sub_district_ids: Optional[Set[int]]) -> List:
+    if sub_district_ids is None:
+        return stores
+    return [store for store in stores if store.sub_district_id in sub_district_ids]
+
+
+# IN 절 쿼리를 읍/면/동 id 청크 단위로 실행 (select_query 의 {} 자리에 IN 파라미터)
+def select_rows_by_sub_district_ids(
+    cursor, select_query: str, sub_district_ids: List[int], params: Tuple = ()
+) -> List[dict]:
+    rows = []
+    for start in range(0, len(sub_district_ids), SUB_DISTRICT_IN_CHUNK_SIZE):
+        chunk = list(sub_district_ids[start : start + SUB_DISTRICT_IN_CHUNK_SIZE])
+        query = select_query.format(",".join(["%s"] * len(chunk)))
+        cursor.execute(query, chunk + list(params))
+        rows.extend(cursor.fetchall())
+    return rows
+
+
+# 읍/면/동별 값(dict)을 매장별 모델로 매핑, 읍/면/동 결과가 없는 매장은 제외
+def broadcast_sub_district_data(stores: List[LocalStoreSubdistrictId], sub_district_data: Dict[int, dict], model):
+    return [
+        model(store_business_number=store.store_business_number, **sub_district_data[store.sub_district_id])
+        for store in stores
+        if store.sub_district_id in sub_district_data
+    ]
+
+
 def get_population_data_for_multiple_ids(sub_district_ids: List[int]):
     logger = logging.getLogger(__name__)
 
@@ -870,10 +970,7 @@ def get_population_data_for_multiple_ids(sub_district_ids: List[int]):
         with get_db_connection() as connection:
             with connection.cursor(pymysql.cursors.DictCursor) as cursor:
                 # 여러 SUB_DISTRICT_ID에 대해 인구 데이터를 조회하는 쿼리
-                format_strings = ",".join(
-                    ["%s"] * len(sub_district_ids)
-                )  # %s를 sub_district_ids 개수만큼 생성
-                select_query = f"""
+                select_query = """
                     SELECT
                         pa.SUB_DISTRICT_ID,
                         pa.GENDER_ID,
@@ -891,26 +988,25 @@ def get_population_data_for_multiple_ids(sub_district_ids: List[int]):
                     JOIN (
                         SELECT SUB_DISTRICT_ID, MAX(REF_DATE) AS max_ref_date
                         FROM POPULATION_AGE
-                        WHERE SUB_DISTRICT_ID IN ({format_strings})
+                        WHERE SUB_DISTRICT_ID IN ({})
                         GROUP BY SUB_DISTRICT_ID
                     ) AS recent
                     ON pa.SUB_DISTRICT_ID = recent.SUB_DISTRICT_ID AND pa.REF_DATE = recent.max_ref_date
                     ORDER BY pa.SUB_DISTRICT_ID;
                 """
-                cursor.execute(select_query, sub_district_ids)
-                return cursor.fetchall()
+                # 매장 수만큼 중복된 id 가 IN 절에 들어가지 않도록 중복 제거
+                return select_rows_by_sub_district_ids(
+                    cursor, select_query, sorted(set(sub_district_ids))
+                )
 
     except Exception as e:
-        logger.error(f"population data for sub_district_ids {sub_district_ids}: {e}")
+        logger.error(f"population data for {len(sub_district_ids)} sub_district_ids: {e}")
         raise
 
 
-def select_local_store_population_data(batch: List[LocalStoreSubdistrictId]):
+# 읍/면/동별 인구 (LocalStorePopulationData 필드)
+def select_sub_district_population_data(sub_district_ids: List[int]) -> Dict[int, dict]:
     logger = logging.getLogger(__name__)
-    local_store_population_data = []
-
-    # 배치로 처리하기 위해 서브리스트를 만들어서 조회
-    sub_district_ids = [local_store.sub_district_id for local_store in batch]
 
     # 여러 개의 SUB_DISTRICT_ID에 대해 한번에 인구 데이터를 조회
     population_data_rows = get_population_data_for_multiple_ids(sub_district_ids)
@@ -943,78 +1039,65 @@ def select_local_store_population_data(batch: List[LocalStoreSubdistrictId]):
                 population_data_dict[key]["population_male"] = row[
                     "TOTAL_POPULATION_BY_GENDER"
                 ]
-                population_data_dict[key]["age_under_10"] += row["AGE_UNDER_10s"]
-                population_data_dict[key]["age_10s"] += row["AGE_10s"]
-                population_data_dict[key]["age_20s"] += row["AGE_20s"]
-                population_data_dict[key]["age_30s"] += row["AGE_30s"]
-                population_data_dict[key]["age_40s"] += row["AGE_40s"]
-                population_data_dict[key]["age_50s"] += row["AGE_50s"]
-                population_data_dict[key]["age_60_over"] += row["AGE_PLUS_60s"]
             elif row["GENDER_ID"] == 2:  # 여자
                 population_data_dict[key]["population_female"] = row[
                     "TOTAL_POPULATION_BY_GENDER"
                 ]
-                population_data_dict[key]["age_under_10"] += row["AGE_UNDER_10s"]
-                population_data_dict[key]["age_10s"] += row["AGE_10s"]
-                population_data_dict[key]["age_20s"] += row["AGE_20s"]
-                population_data_dict[key]["age_30s"] += row["AGE_30s"]
-                population_data_dict[key]["age_40s"] += row["AGE_40s"]
-                population_data_dict[key]["age_50s"] += row["AGE_50s"]
-                population_data_dict[key]["age_60_over"] += row["AGE_PLUS_60s"]
-
-        # 각 local store에 대해 인구 데이터 생성
-        for local_store in batch:
-            sub_district_id = local_store.sub_district_id
-            if sub_district_id in population_data_dict:
-                total_population = population_data_dict[sub_district_id][
-                    "total_population"
-                ]
-                population_male = population_data_dict[sub_district_id][
-                    "population_male"
-                ]
-                population_female = population_data_dict[sub_district_id][
-                    "population_female"
-                ]
-                age_under_10 = population_data_dict[sub_district_id]["age_under_10"]
-                age_10s = population_data_dict[sub_district_id]["age_10s"]
-                age_20s = population_data_dict[sub_district_id]["age_20s"]
-                age_30s = population_data_dict[sub_district_id]["age_30s"]
-                age_40s = population_data_dict[sub_district_id]["age_40s"]
-                age_50s = population_data_dict[sub_district_id]["age_50s"]
-                age_60_over = population_data_dict[sub_district_id]["age_60_over"]
-                ref_date = population_data_dict[sub_district_id]["ref_date"]
-
-                # 성비 계산
-                population_male_percent = (
-                    (population_male / total_population * 100)
-                    if total_population > 0
-                    else 0
-                )
-                population_female_percent = (
-                    (population_female / total_population * 100)
-                    if total_population > 0
-                    else 0
-                )
+            else:
+                continue
+            population_data_dict[key]["age_under_10"] += row["AGE_UNDER_10s"]
+            population_data_dict[key]["age_10s"] += row["AGE_10s"]
+            population_data_dict[key]["age_20s"] += row["AGE_20s"]
+            population_data_dict[key]["age_30s"] += row["AGE_30s"]
+            population_data_dict[key]["age_40s"] += row["AGE_40s"]
+            population_data_dict[key]["age_50s"] += row["AGE_50s"]
+            population_data_dict[key]["age_60_over"] += row["AGE_PLUS_60s"]
+
+        results = {}
+        for sub_district_id, population in population_data_dict.items():
+            total_population = population["total_population"]
+
+            # 성비 계산
+            population_male_percent = (
+                (population["population_male"] / total_population * 100)
+                if total_population > 0
+                else 0
+            )
+            population_female_percent = (
+                (population["population_female"] / total_population * 100)
+                if total_population > 0
+                else 0
+            )
+
+            results[sub_district_id] = {
+                "population_total": total_population,
+                "population_male_percent": population_male_percent,
+                "population_female_percent": population_female_percent,
+                "population_age_10_under": population["age_under_10"],
+                "population_age_10s": population["age_10s"],
+                "population_age_20s": population["age_20s"],
+                "population_age_30s": population["age_30s"],
+                "population_age_40s": population["age_40s"],
+                "population_age_50s": population["age_50s"],
+                "population_age_60_over": population["age_60_over"],
+                "population_date_ref_date": population["ref_date"],
+            }
 
-                # LocalStorePopulationData 인스턴스 생성 및 추가
-                local_store_population_data.append(
-                    LocalStorePopulationData(
-                        store_business_number=local_store.store_business_number,
-                        population_total=total_population,
-                        population_male_percent=population_male_percent,
-                        population_female_percent=population_female_percent,
-                        population_age_10_under=age_under_10,
-                        population_age_10s=age_10s,
-                        population_age_20s=age_20s,
-                        population_age_30s=age_30s,
-                        population_age_40s=age_40s,
-                        population_age_50s=age_50s,
-                        population_age_60_over=age_60_over,
-                        population_date_ref_date=ref_date,
-                    )
-                )
+        return results
+    except Exception as e:
+        logger.error(f"읍/면/동 인구 데이터 생성 중 오류 발생: {e}")
+        raise
 
-        return local_store_population_data
+
+def select_local_store_population_data(batch: List[LocalStoreSubdistrictId]):
+    logger = logging.getLogger(__name__)
+
+    try:
+        population_data = select_sub_district_population_data(
+            unique_sub_district_ids(batch)
+        )
+        # LocalStorePopulationData 인스턴스 생성
+        return broadcast_sub_district_data(batch, population_data, LocalStorePopulationData)
     except Exception as e:
         logger.error(f"LocalStoreSubdistrictId 생성 중 오류 발생: {e}")
         raise
@@ -1023,9 +1106,11 @@ def select_local_store_population_data(batch: List[LocalStoreSubdistrictId]):
 ##################### 입지분석 J_SCORE 가중치 평균 ##############################
 def select_local_store_loc_info_j_score_average_data(
     batch: List[LocalStoreSubdistrictId],
+    snapshot: Optional[ReportSnapshot] = None,
 ) -> List[LocalStoreLIJSWeightedAverage]:
     logger = logging.getLogger(__name__)
     results = []
+    snapshot = snapshot or get_report_snapshot()
 
     try:
         with get_db_connection() as connection:
@@ -1044,13 +1129,15 @@ def select_local_store_loc_info_j_score_average_data(
                 WHERE TARGET_ITEM = 'j_score_avg'
                 AND STAT_LEVEL = '전국'
                 AND SUB_DISTRICT_ID IN ({})
-                AND REF_DATE = (SELECT MAX(REF_DATE) FROM LOC_INFO_STATISTICS)
+                AND REF_DATE = %s
                 ;
             """
             in_params = ",".join(["%s"] * len(sub_district_ids))
             query = select_query.format(in_params)
 
-            cursor.execute(query, sub_district_ids)
+            cursor.execute(
+                query, sub_district_ids + [snapshot.loc_info_statistics_ref_date]
+            )
 
             rows = cursor.fetchall()
 
@@ -1076,19 +1163,18 @@ def select_local_store_loc_info_j_score_average_data(
 
 
 ##################### 입지분석 데이터 ##############################
-def select_local_store_loc_info_data(
-    batch: List[LocalStoreSubdistrictId],
-) -> List[LocalStoreLocInfoData]:
+# 읍/면/동별 입지분석 데이터 (LocalStoreLocInfoData 필드)
+def select_sub_district_loc_info_data(
+    sub_district_ids: List[int],
+    snapshot: Optional[ReportSnapshot] = None,
+) -> Dict[int, dict]:
     logger = logging.getLogger(__name__)
-    results = []
+    snapshot = snapshot or get_report_snapshot()
 
     try:
         with get_db_connection() as connection:
             cursor = connection.cursor(pymysql.cursors.DictCursor)
 
-            # sub_district_id 리스트 생성
-            sub_district_ids = [store_info.sub_district_id for store_info in batch]
-
             # IN 절을 사용하여 한 번에 조회
             select_query = """
                 SELECT
@@ -1103,61 +1189,61 @@ def select_local_store_loc_info_data(
                     HOUSE,
                     Y_M
                 FROM LOC_INFO
-                WHERE SUB_DISTRICT_ID IN (%s)
-                AND Y_M = (SELECT MAX(Y_M) FROM LOC_INFO)
+                WHERE SUB_DISTRICT_ID IN ({})
+                AND Y_M = %s
             ;
             """
-            # IN 절 파라미터 생성
-            in_params = ",".join(["%s"] * len(sub_district_ids))
-            query = select_query % (in_params)
-
-            cursor.execute(query, sub_district_ids)  # sub_district_ids를 한 번만 사용
-
-            rows = cursor.fetchall()
+            rows = select_rows_by_sub_district_ids(
+                cursor, select_query, sub_district_ids, (snapshot.loc_info_y_m,)
+            )
 
             # sub_district_id를 키로 하는 딕셔너리 생성
-            loc_info_dict = {
-                row["SUB_DISTRICT_ID"]: row for row in rows
-            }  # 딕셔너리에 SUB_DISTRICT_ID 포함
+            return {
+                loc_info_data["SUB_DISTRICT_ID"]: {
+                    "loc_info_resident_k": round(
+                        (loc_info_data["RESIDENT"] or 0) / 1000, 1
+                    ),
+                    "loc_info_work_pop_k": round(
+                        (loc_info_data["WORK_POP"] or 0) / 1000, 1
+                    ),
+                    "loc_info_move_pop_k": round(
+                        (loc_info_data["MOVE_POP"] or 0) / 1000, 1
+                    ),
+                    "loc_info_shop_k": round((loc_info_data["SHOP"] or 0) / 1000, 1),
+                    "loc_info_income_won": round(
+                        (loc_info_data["INCOME"] or 0) / 10000
+                    ),
+                    "loc_info_average_sales_k": round(
+                        (loc_info_data["SALES"] or 0) / 1000, 1
+                    ),
+                    "loc_info_average_spend_k": round(
+                        (loc_info_data["SPEND"] or 0) / 1000, 1
+                    ),
+                    "loc_info_average_house_k": round(
+                        (loc_info_data["HOUSE"] or 0) / 1000, 1
+                    ),
+                    "loc_info_data_ref_date": loc_info_data["Y_M"],
+                }
+                for loc_info_data in rows
+            }
 
-            # batch의 순서를 유지하면서 결과 생성
-            for store_info in batch:
-                if store_info.sub_district_id in loc_info_dict:
+    except Exception as e:
+        logger.error(f"읍/면/동 입지분석 데이터 가져오는 중 오류 발생: {e}")
+        raise
 
-                    loc_info_data = loc_info_dict[store_info.sub_district_id]
 
-                    results.append(
-                        LocalStoreLocInfoData(
-                            store_business_number=store_info.store_business_number,
-                            loc_info_resident_k=round(
-                                (loc_info_data["RESIDENT"] or 0) / 1000, 1
-                            ),
-                            loc_info_work_pop_k=round(
-                                (loc_info_data["WORK_POP"] or 0) / 1000, 1
-                            ),
-                            loc_info_move_pop_k=round(
-                                (loc_info_data["MOVE_POP"] or 0) / 1000, 1
-                            ),
-                            loc_info_shop_k=round(
-                                (loc_info_data["SHOP"] or 0) / 1000, 1
-                            ),
-                            loc_info_income_won=round(
-                                (loc_info_data["INCOME"] or 0) / 10000
-                            ),
-                            loc_info_average_sales_k=round(
-                                (loc_info_data["SALES"] or 0) / 1000, 1
-                            ),
-                            loc_info_average_spend_k=round(
-                                (loc_info_data["SPEND"] or 0) / 1000, 1
-                            ),
-                            loc_info_average_house_k=round(
-                                (loc_info_data["HOUSE"] or 0) / 1000, 1
-                            ),
-                            loc_info_data_ref_date=loc_info_data["Y_M"],
-                        )
-                    )
+def select_local_store_loc_info_data(
+    batch: List[LocalStoreSubdistrictId],
+    snapshot: Optional[ReportSnapshot] = None,
+) -> List[LocalStoreLocInfoData]:
+    logger = logging.getLogger(__name__)
 
-            return results
+    try:
+        loc_info_data = select_sub_district_loc_info_data(
+            unique_sub_district_ids(batch), snapshot
+        )
+        # batch의 순서를 유지하면서 결과 생성
+        return broadcast_sub_district_data(batch, loc_info_data, LocalStoreLocInfoData)
 
     except Exception as e:
         logger.error(f"LocalStoreLocInfoData 가져오는 중 오류 발생: {e}")
@@ -1165,20 +1251,19 @@ def select_local_store_loc_info_data(
 
 
 ##################### 입지분석 J_SCORE 데이터 ##############################
-def select_local_store_loc_info_j_score_data(
-    batch: List[LocalStoreSubdistrictId],
-) -> List[LocalStoreLocInfoJscoreData]:
+# 읍/면/동별 입지분석 J_SCORE (LocalStoreLocInfoJscoreData 필드, 값이 없으면 0.0)
+def select_sub_district_loc_info_j_score_data(
+    sub_district_ids: List[int],
+    snapshot: Optional[ReportSnapshot] = None,
+) -> Dict[int, dict]:
     logger = logging.getLogger(__name__)
-    results = []
+    snapshot = snapshot or get_report_snapshot()
 
     try:
         with get_db_connection() as connection:
             cursor = connection.cursor(pymysql.cursors.DictCursor)
             cursor2 = connection.cursor(pymysql.cursors.DictCursor)
 
-            # sub_district_id 리스트 생성
-            sub_district_ids = [store_info.sub_district_id for store_info in batch]
-
             # loc_info 통계 조회
             loc_select_query = """
                 SELECT
@@ -1186,16 +1271,17 @@ def select_local_store_loc_info_j_score_data(
                     TARGET_ITEM,
                     COALESCE(J_SCORE_NON_OUTLIERS, 0.0) as J_SCORE
                 FROM LOC_INFO_STATISTICS
-                WHERE SUB_DISTRICT_ID IN (%s)
+                WHERE SUB_DISTRICT_ID IN ({})
                 AND STAT_LEVEL = '전국'
-                AND REF_DATE = (SELECT MAX(REF_DATE) FROM LOC_INFO_STATISTICS)
+                AND REF_DATE = %s
             ;
             """
-            in_params = ",".join(["%s"] * len(sub_district_ids))
-            loc_query = loc_select_query % (in_params)
-
-            cursor.execute(loc_query, sub_district_ids)
-            loc_rows = cursor.fetchall()
+            loc_rows = select_rows_by_sub_district_ids(
+                cursor,
+                loc_select_query,
+                sub_district_ids,
+                (snapshot.loc_info_statistics_ref_date,),
+            )
 
             # loc_info 점수 딕셔너리 생성
             loc_info_j_score_dict = {
@@ -1209,63 +1295,73 @@ def select_local_store_loc_info_j_score_data(
                     SUB_DISTRICT_ID,
                     COALESCE(J_SCORE_NON_OUTLIERS, 0.0) as J_SCORE
                 FROM POPULATION_INFO_MZ_STATISTICS
-                WHERE SUB_DISTRICT_ID IN (%s)
+                WHERE SUB_DISTRICT_ID IN ({})
                 AND STAT_LEVEL = '전국'
-                AND REF_DATE = (SELECT MAX(REF_DATE) FROM POPULATION_INFO_MZ_STATISTICS)
+                AND REF_DATE = %s
             ;
             """
-            pop_query = pop_select_query % (in_params)
-            cursor2.execute(pop_query, sub_district_ids)
-            pop_rows = cursor2.fetchall()
+            pop_rows = select_rows_by_sub_district_ids(
+                cursor2,
+                pop_select_query,
+                sub_district_ids,
+                (snapshot.population_info_mz_statistics_ref_date,),
+            )
 
             # pop_info 점수 딕셔너리 생성
             pop_info_j_score_dict = {
                 row["SUB_DISTRICT_ID"]: float(row["J_SCORE"]) for row in pop_rows
             }
 
-            # 결과 생성
-            for store_info in batch:
-                sub_district_id = store_info.sub_district_id
-                results.append(
-                    LocalStoreLocInfoJscoreData(
-                        store_business_number=store_info.store_business_number,
-                        loc_info_resident_j_score=float(
-                            loc_info_j_score_dict.get(
-                                (sub_district_id, "resident"), 0.0
-                            )
-                        ),
-                        loc_info_work_pop_j_score=float(
-                            loc_info_j_score_dict.get(
-                                (sub_district_id, "work_pop"), 0.0
-                            )
-                        ),
-                        loc_info_move_pop_j_score=float(
-                            loc_info_j_score_dict.get(
-                                (sub_district_id, "move_pop"), 0.0
-                            )
-                        ),
-                        loc_info_shop_j_score=float(
-                            loc_info_j_score_dict.get((sub_district_id, "shop"), 0.0)
-                        ),
-                        loc_info_income_j_score=float(
-                            loc_info_j_score_dict.get((sub_district_id, "income"), 0.0)
-                        ),
-                        loc_info_average_spend_j_score=float(
-                            loc_info_j_score_dict.get((sub_district_id, "spend"), 0.0)
-                        ),
-                        loc_info_average_sales_j_score=float(
-                            loc_info_j_score_dict.get((sub_district_id, "sales"), 0.0)
-                        ),
-                        loc_info_house_j_score=float(
-                            loc_info_j_score_dict.get((sub_district_id, "house"), 0.0)
-                        ),
-                        population_mz_population_j_score=float(
-                            pop_info_j_score_dict.get(sub_district_id, 0.0)
-                        ),
-                    )
-                )
+            # 결과 생성 (조회 결과가 없는 읍/면/동도 0.0 으로 포함)
+            return {
+                sub_district_id: {
+                    "loc_info_resident_j_score": loc_info_j_score_dict.get(
+                        (sub_district_id, "resident"), 0.0
+                    ),
+                    "loc_info_work_pop_j_score": loc_info_j_score_dict.get(
+                        (sub_district_id, "work_pop"), 0.0
+                    ),
+                    "loc_info_move_pop_j_score": loc_info_j_score_dict.get(
+                        (sub_district_id, "move_pop"), 0.0
+                    ),
+                    "loc_info_shop_j_score": loc_info_j_score_dict.get(
+                        (sub_district_id, "shop"), 0.0
+                    ),
+                    "loc_info_income_j_score": loc_info_j_score_dict.get(
+                        (sub_district_id, "income"), 0.0
+                    ),
+                    "loc_info_average_spend_j_score": loc_info_j_score_dict.get(
+                        (sub_district_id, "spend"), 0.0
+                    ),
+                    "loc_info_average_sales_j_score": loc_info_j_score_dict.get(
+                        (sub_district_id, "sales"), 0.0
+                    ),
+                    "loc_info_house_j_score": loc_info_j_score_dict.get(
+                        (sub_district_id, "house"), 0.0
+                    ),
+                    "population_mz_population_j_score": pop_info_j_score_dict.get(
+                        sub_district_id, 0.0
+                    ),
+                }
+                for sub_district_id in sub_district_ids
+            }
 
-            return results
+    except Exception as e:
+        logger.error(f"Error processing sub_district j_score: {str(e)}")
+        raise
+
+
+def select_local_store_loc_info_j_score_data(
+    batch: List[LocalStoreSubdistrictId],
+    snapshot: Optional[ReportSnapshot] = None,
+) -> List[LocalStoreLocInfoJscoreData]:
+    logger = logging.getLogger(__name__)
+
+    try:
+        j_score_data = select_sub_district_loc_info_j_score_data(
+            unique_sub_district_ids(batch), snapshot
+        )
+        return broadcast_sub_district_data(batch, j_score_data, LocalStoreLocInfoJscoreData)
 
     except Exception as e:
         logger.error(f"Error processing batch: {str(e)}")
@@ -1273,19 +1369,19 @@ def select_local_store_loc_info_j_score_data(
 
 
 ##################### 입지분석 주거인구 직장인구 ##############################
-def select_local_store_loc_info_resident_work_pop_data(
-    batch: List[LocalStoreSubdistrictId],
-) -> List[LocalStoreLocInfoData]:
+# 읍/면/동별 주거인구/직장인구 수, 비율 (LocalStoreResidentWorkPopData 필드)
+def select_sub_district_loc_info_resident_work_pop_data(
+    sub_district_ids: List[int],
+    snapshot: Optional[ReportSnapshot] = None,
+) -> Dict[int, dict]:
     logger = logging.getLogger(__name__)
-    results = []
+    results = {}
+    snapshot = snapshot or get_report_snapshot()
 
     try:
         with get_db_connection() as connection:
             cursor = connection.cursor(pymysql.cursors.DictCursor)
 
-            # sub_district_id 리스트 생성
-            sub_district_ids = [store_info.sub_district_id for store_info in batch]
-
             # IN 절을 사용하여 한 번에 조회
             select_query = """
                 SELECT
@@ -1294,53 +1390,54 @@ def select_local_store_loc_info_resident_work_pop_data(
                     WORK_POP
                 FROM
                     LOC_INFO
-                WHERE SUB_DISTRICT_ID IN (%s)
-                AND Y_M = (SELECT MAX(Y_M) FROM LOC_INFO)
+                WHERE SUB_DISTRICT_ID IN ({})
+                AND Y_M = %s
                 ;
             """
-            # IN 절 파라미터 생성
-            in_params = ",".join(["%s"] * len(sub_district_ids))
-            query = select_query % (in_params)
-
-            cursor.execute(query, sub_district_ids)  # sub_district_ids를 한 번만 사용
-
-            rows = cursor.fetchall()
-
-            # sub_district_id를 키로 하는 딕셔너리 생성
-            loc_info_dict = {
-                row["SUB_DISTRICT_ID"]: row for row in rows
-            }  # 딕셔너리에 SUB_DISTRICT_ID 포함
-
-            # batch의 순서를 유지하면서 결과 생성
-            for store_info in batch:
-                if store_info.sub_district_id in loc_info_dict:
+            rows = select_rows_by_sub_district_ids(
+                cursor, select_query, sub_district_ids, (snapshot.loc_info_y_m,)
+            )
+
+            for loc_info_data in rows:
+                resident = loc_info_data["RESIDENT"] or 0
+                work_pop = loc_info_data["WORK_POP"] or 0
+
+                # 두 값을 더하여 전체 인구 계산
+                total_pop = resident + work_pop
+
+                # 퍼센트 계산 (전체 인구가 0일 경우 0으로 처리)
+                results[loc_info_data["SUB_DISTRICT_ID"]] = {
+                    "loc_info_resident": resident,
+                    "loc_info_work_pop": work_pop,
+                    "loc_info_resident_percent": (
+                        (resident / total_pop * 100) if total_pop > 0 else 0
+                    ),
+                    "loc_info_work_pop_percent": (
+                        (work_pop / total_pop * 100) if total_pop > 0 else 0
+                    ),
+                }
 
-                    loc_info_data = loc_info_dict[store_info.sub_district_id]
-                    resident = loc_info_data["RESIDENT"] or 0
-                    work_pop = loc_info_data["WORK_POP"] or 0
+            return results
 
-                    # 두 값을 더하여 전체 인구 계산
-                    total_pop = resident + work_pop
+    except Exception as e:
+        logger.error(f"읍/면/동 주거인구/직장인구 가져오는 중 오류 발생: {e}")
+        raise
 
-                    # 퍼센트 계산 (전체 인구가 0일 경우 0으로 처리)
-                    loc_info_resident_percent = (
-                        (resident / total_pop * 100) if total_pop > 0 else 0
-                    )
-                    loc_info_work_pop_percent = (
-                        (work_pop / total_pop * 100) if total_pop > 0 else 0
-                    )
 
-                    results.append(
-                        LocalStoreResidentWorkPopData(
-                            store_business_number=store_info.store_business_number,
-                            loc_info_resident=resident,
-                            loc_info_work_pop=work_pop,
-                            loc_info_resident_percent=loc_info_resident_percent,
-                            loc_info_work_pop_percent=loc_info_work_pop_percent,
-                        )
-                    )
+def select_local_store_loc_info_resident_work_pop_data(
+    batch: List[LocalStoreSubdistrictId],
+    snapshot: Optional[ReportSnapshot] = None,
+) -> List[LocalStoreLocInfoData]:
+    logger = logging.getLogger(__name__)
 
-            return results
+    try:
+        resident_work_pop_data = select_sub_district_loc_info_resident_work_pop_data(
+            unique_sub_district_ids(batch), snapshot
+        )
+        # batch의 순서를 유지하면서 결과 생성
+        return broadcast_sub_district_data(
+            batch, resident_work_pop_data, LocalStoreResidentWorkPopData
+        )
 
     except Exception as e:
         logger.error(f"LocalStoreResidentWorkPopData 가져오는 중 오류 발생: {e}")
@@ -1348,20 +1445,19 @@ def select_local_store_loc_info_resident_work_pop_data(
 
 
 ##################### 입지분석 유동인구, 시/도 평균 유동인구 ##############################
-def select_local_store_loc_info_move_pop_data(
-    batch: List[LocalStoreSubdistrictId],
-) -> List[LocalStoreMovePopData]:
+# 읍/면/동별 유동인구, 시/도 평균 유동인구 (LocalStoreMovePopData 필드, 값이 없으면 0)
+def select_sub_district_loc_info_move_pop_data(
+    sub_district_ids: List[int],
+    snapshot: Optional[ReportSnapshot] = None,
+) -> Dict[int, dict]:
     logger = logging.getLogger(__name__)
-    results = []
+    snapshot = snapshot or get_report_snapshot()
 
     try:
         with get_db_connection() as connection:
             cursor = connection.cursor(pymysql.cursors.DictCursor)
             cursor2 = connection.cursor(pymysql.cursors.DictCursor)
 
-            # sub_district_id 리스트 생성
-            sub_district_ids = [store_info.sub_district_id for store_info in batch]
-
             # loc_info 통계 조회
             loc_select_query = """
                 SELECT
@@ -1370,15 +1466,13 @@ def select_local_store_loc_info_move_pop_data(
                 FROM
                     LOC_INFO
                 WHERE
-                    SUB_DISTRICT_ID IN (%s)
-                AND Y_M = (SELECT MAX(Y_M) FROM LOC_INFO)
+                    SUB_DISTRICT_ID IN ({})
+                AND Y_M = %s
                 ;
             """
-            in_params = ",".join(["%s"] * len(sub_district_ids))
-            loc_query = loc_select_query % (in_params)
-
-            cursor.execute(loc_query, sub_district_ids)
-            loc_rows = cursor.fetchall()
+            loc_rows = select_rows_by_sub_district_ids(
+                cursor, loc_select_query, sub_district_ids, (snapshot.loc_info_y_m,)
+            )
 
             # sub_district_id를 키로 하여 MOVE_POP 값을 저장하는 딕셔너리 생성
             loc_info_move_pop_dict = {
@@ -1391,37 +1485,51 @@ def select_local_store_loc_info_move_pop_data(
                     AVG_VAL AS CITY_MOVE_POP
                 FROM
                     LOC_INFO_STATISTICS
-                WHERE SUB_DISTRICT_ID IN (%s)
+                WHERE SUB_DISTRICT_ID IN ({})
                 AND TARGET_ITEM = 'move_pop'
                 AND STAT_LEVEL = '시/도'
-                AND REF_DATE = (SELECT MAX(REF_DATE) FROM LOC_INFO_STATISTICS)
+                AND REF_DATE = %s
                 ;
             """
-            pop_query = pop_select_query % (in_params)
-            cursor2.execute(pop_query, sub_district_ids)
-            pop_rows = cursor2.fetchall()
+            pop_rows = select_rows_by_sub_district_ids(
+                cursor2,
+                pop_select_query,
+                sub_district_ids,
+                (snapshot.loc_info_statistics_ref_date,),
+            )
 
             # sub_district_id를 키로 하여 CITY_MOVE_POP 값을 저장하는 딕셔너리 생성
             pop_info_city_move_pop_dict = {
                 row["SUB_DISTRICT_ID"]: row["CITY_MOVE_POP"] or 0.0 for row in pop_rows
             }
 
-            # 결과 생성
-            for store_info in batch:
-                sub_district_id = store_info.sub_district_id
-                results.append(
-                    LocalStoreMovePopData(
-                        store_business_number=store_info.store_business_number,
-                        loc_info_move_pop=loc_info_move_pop_dict.get(
-                            sub_district_id, 0
-                        ),
-                        loc_info_city_move_pop=round(
-                            pop_info_city_move_pop_dict.get(sub_district_id, 0.0)
-                        ),
-                    )
-                )
+            # 결과 생성 (조회 결과가 없는 읍/면/동도 0 으로 포함)
+            return {
+                sub_district_id: {
+                    "loc_info_move_pop": loc_info_move_pop_dict.get(sub_district_id, 0),
+                    "loc_info_city_move_pop": round(
+                        pop_info_city_move_pop_dict.get(sub_district_id, 0.0)
+                    ),
+                }
+                for sub_district_id in sub_district_ids
+            }
 
-            return results
+    except Exception as e:
+        logger.error(f"읍/면/동 유동인구 가져오는 중 오류 발생: {e}")
+        raise
+
+
+def select_local_store_loc_info_move_pop_data(
+    batch: List[LocalStoreSubdistrictId],
+    snapshot: Optional[ReportSnapshot] = None,
+) -> List[LocalStoreMovePopData]:
+    logger = logging.getLogger(__name__)
+
+    try:
+        move_pop_data = select_sub_district_loc_info_move_pop_data(
+            unique_sub_district_ids(batch), snapshot
+        )
+        return broadcast_sub_district_data(batch, move_pop_data, LocalStoreMovePopData)
 
     except Exception as e:
         logger.error(f"LocalStoreMovePopData 가져오는 중 오류 발생: {e}")
@@ -1433,9 +1541,12 @@ def select_local_store_loc_info_move_pop_data(
 
 def select_commercial_district_j_score_weighted_average_data(
     mappings: List[LocalStoreMappingSubDistrictDetailCategoryId],
+    snapshot: Optional[ReportSnapshot] = None,
 ) -> List[LocalStoreCDJSWeightedAverage]:
 
     logger = logging.getLogger(__name__)
+    snapshot = snapshot or get_report_snapshot()
+    ref_date = snapshot.commercial_district_weighted_average_ref_date
 
     store_mappings: Dict[str, Dict] = defaultdict(
         lambda: {"sub_district_id": None, "detail_categories": set()}
@@ -1449,16 +1560,9 @@ def select_commercial_district_j_score_weighted_average_data(
     try:
         with get_db_connection() as connection:
             with connection.cursor(pymysql.cursors.DictCursor) as cursor:
-                store_j_scores: Dict[str, Dict[str, List[float]]] = defaultdict(
-                    lambda: {
-                        "j_score": [],
-                    }
-                )
 
-                for store_number, store_data in store_mappings.items():
-                    detail_categories_str = ", ".join(
-                        map(str, store_data["detail_categories"])
-                    )
+                def fetch_j_scores(sub_district_id, detail_categories) -> List[float]:
+                    detail_categories_str = ", ".join(map(str, detail_categories))
 
                     query = """
                     SELECT
@@ -1468,30 +1572,41 @@ def select_commercial_district_j_score_weighted_average_data(
                         COMMERCIAL_DISTRICT_WEIGHTED_AVERAGE
                     WHERE SUB_DISTRICT_ID = %s
                     AND BIZ_DETAIL_CATEGORY_ID IN ({})
-                    AND REF_DATE = (SELECT MAX(REF_DATE) FROM COMMERCIAL_DISTRICT_WEIGHTED_AVERAGE)
+                    AND REF_DATE = %s
                     ;
                     """.format(
                         detail_categories_str
                     )
 
-                    cursor.execute(query, (store_data["sub_district_id"],))
+                    cursor.execute(query, (sub_district_id, ref_date))
                     scores = cursor.fetchall()
 
-                    store_scores = store_j_scores[store_number]
-                    for score in scores:
-                        if score["BIZ_DETAIL_CATEGORY_ID"] is not None:
-                            if score["J_SCORE_AVG"] is not None:
-                                store_scores["j_score"].append(
-                                    float(score["J_SCORE_AVG"])
-                                )
+                    return [
+                        float(score["J_SCORE_AVG"])
+                        for score in scores
+                        if score["BIZ_DETAIL_CATEGORY_ID"] is not None
+                        and score["J_SCORE_AVG"] is not None
+                    ]
 
                 results = []
-                for store_number, scores in store_j_scores.items():
+                for store_number, store_data in store_mappings.items():
+                    key = make_store_key(
+                        store_data["sub_district_id"],
+                        store_data["detail_categories"],
+                        ref_date,
+                    )
+                    j_scores = j_score_weighted_average_cache.get_or_compute(
+                        key,
+                        lambda: fetch_j_scores(
+                            store_data["sub_district_id"],
+                            store_data["detail_categories"],
+                        ),
+                    )
                     try:
                         result = LocalStoreCDJSWeightedAverage(
                             store_business_number=store_number,
                             commercial_district_j_score_average=(
-                                mean(scores["j_score"]) if scores["j_score"] else 0.0
+                                mean(j_scores) if j_scores else 0.0
                             ),
                         )
                         results.append(result)
@@ -1511,9 +1626,11 @@ def select_commercial_district_j_score_weighted_average_data(
 ##################### 상권분석 읍/면/동 대분류 갯수 ##############################
 def select_commercial_district_main_detail_category_count_data(
     batch: List[LocalStoreSubdistrictId],
+    snapshot: Optional[ReportSnapshot] = None,
 ) -> List[LocalStoreMainCategoryCount]:
     logger = logging.getLogger(__name__)
     results = []
+    snapshot = snapshot or get_report_snapshot()
     try:
         with get_db_connection() as connection:
             cursor = connection.cursor(pymysql.cursors.DictCursor)
@@ -1527,15 +1644,17 @@ def select_commercial_district_main_detail_category_count_data(
                     COUNT(BIZ_MAIN_CATEGORY_ID) as category_count
                 FROM
                     COMMERCIAL_DISTRICT
-                WHERE SUB_DISTRICT_ID IN (%s)
-                AND Y_M = (SELECT MAX(Y_M) FROM COMMERCIAL_DISTRICT)
+                WHERE SUB_DISTRICT_ID IN ({})
+                AND Y_M = %s
                 GROUP BY SUB_DISTRICT_ID, BIZ_MAIN_CATEGORY_ID
                 ;
             """
             # IN 절 파라미터 생성
             in_params = ",".join(["%s"] * len(sub_district_ids))
-            query = select_query % (in_params)
-            cursor.execute(query, sub_district_ids)
+            query = select_query.format(in_params)
+            cursor.execute(
+                query, sub_district_ids + [snapshot.commercial_district_y_m]
+            )
             rows = cursor.fetchall()
 
             # sub_district_id별로 카테고리 카운트를 정리하는 딕셔너리
@@ -1630,9 +1749,11 @@ def select_local_store_mp_detail_cateogry_id() -> (
 
 def select_commercial_district_j_score_average_data(
     mappings: List[LocalStoreMappingSubDistrictDetailCategoryId],
+    snapshot: Optional[ReportSnapshot] = None,
 ) -> List[LocalStoreCommercialDistrictJscoreAverage]:
 
     logger = logging.getLogger(__name__)
+    snapshot = snapshot or get_report_snapshot()
 
     store_mappings: Dict[str, Dict] = defaultdict(
         lambda: {"sub_district_id": None, "detail_categories": set()}
@@ -1691,17 +1812,21 @@ def select_commercial_district_j_score_average_data(
                         AND CDAPS.BIZ_DETAIL_CATEGORY_ID = CDMSS.BIZ_DETAIL_CATEGORY_ID
                     WHERE
                         SD.SUB_DISTRICT_ID = %s
-                    AND CDMSS.REF_DATE = (SELECT MAX(REF_DATE) FROM COMMERCIAL_DISTRICT_MARKET_SIZE_STATISTICS)
-                    AND CDUCS.REF_DATE = (SELECT MAX(REF_DATE) FROM COMMERCIAL_DISTRICT_USEAGE_COUNT_STATISTICS)
-                    AND CDASS.REF_DATE = (SELECT MAX(REF_DATE) FROM COMMERCIAL_DISTRICT_AVERAGE_SALES_STATISTICS)
-                    AND CDSDDS.REF_DATE = (SELECT MAX(REF_DATE) FROM COMMERCIAL_DISTRICT_SUB_DISTRICT_DENSITY_STATISTICS)
-                    AND CDAPS.REF_DATE = (SELECT MAX(REF_DATE) FROM COMMERCIAL_DISTRICT_AVERAGE_PAYMENT_STATISTICS)
+                    AND CDMSS.REF_DATE = %s
+                    AND CDUCS.REF_DATE = %s
+                    AND CDASS.REF_DATE = %s
+                    AND CDSDDS.REF_DATE = %s
+                    AND CDAPS.REF_DATE = %s
                     ;
                     """.format(
                         detail_categories_str
                     )
 
-                    cursor.execute(query, (store_data["sub_district_id"],))
+                    cursor.execute(
+                        query,
+                        (store_data["sub_district_id"],)
+                        + commercial_district_statistics_ref_dates(snapshot),
+                    )
                     scores = cursor.fetchall()
 
                     store_scores = store_j_scores[store_number]
@@ -1774,12 +1899,157 @@ def select_commercial_district_j_score_average_data(
         raise
 
 
+# 상권분석 J_SCORE 통계 테이블 (metric 이름 -> 테이블)
+COMMERCIAL_DISTRICT_J_SCORE_TABLES: Dict[str, str] = {
+    "market_size": "COMMERCIAL_DISTRICT_MARKET_SIZE_STATISTICS",
+    "usage_count": "COMMERCIAL_DISTRICT_USEAGE_COUNT_STATISTICS",
+    "average_sales": "COMMERCIAL_DISTRICT_AVERAGE_SALES_STATISTICS",
+    "sub_district_density": "COMMERCIAL_DISTRICT_SUB_DISTRICT_DENSITY_STATISTICS",
+    "average_payment": "COMMERCIAL_DISTRICT_AVERAGE_PAYMENT_STATISTICS",
+}
+
+
+# COMMERCIAL_DISTRICT_J_SCORE_TABLES 순서와 같은 통계 테이블 기준일
+def commercial_district_statistics_ref_dates(snapshot: ReportSnapshot) -> Tuple:
+    return (
+        snapshot.market_size_statistics_ref_date,
+        snapshot.usage_count_statistics_ref_date,
+        snapshot.average_sales_statistics_ref_date,
+        snapshot.sub_district_density_statistics_ref_date,
+        snapshot.average_payment_statistics_ref_date,
+    )
+
+
+# 다섯 개의 J_SCORE 통계 테이블을 최신 REF_DATE 기준으로 한 번씩만 조회
+# (SUB_DISTRICT_ID, BIZ_DETAIL_CATEGORY_ID) -> {metric: J_SCORE}
+# 기존 5중 LEFT JOIN + REF_DATE 조건과 같이 다섯 테이블 모두에 있는 키만 남긴다
+def select_commercial_district_j_score_statistics(
+    snapshot: Optional[ReportSnapshot] = None,
+) -> Dict[Tuple[int, int], Dict[str, Optional[float]]]:
+    logger = logging.getLogger(__name__)
+    snapshot = snapshot or get_report_snapshot()
+    ref_dates = dict(
+        zip(
+            COMMERCIAL_DISTRICT_J_SCORE_TABLES,
+            commercial_district_statistics_ref_dates(snapshot),
+        )
+    )
+
+    try:
+        with get_db_connection() as connection:
+            with connection.cursor() as cursor:
+                metric_scores: Dict[str, Dict[Tuple[int, int], Optional[float]]] = {}
+
+                for metric, table in COMMERCIAL_DISTRICT_J_SCORE_TABLES.items():
+                    select_query = f"""
+                        SELECT
+                            SUB_DISTRICT_ID,
+                            BIZ_DETAIL_CATEGORY_ID,
+                            J_SCORE
+                        FROM {table}
+                        WHERE REF_DATE = %s
+                        AND BIZ_DETAIL_CATEGORY_ID IS NOT NULL
+                        ;
+                    """
+                    cursor.execute(select_query, (ref_dates[metric],))
+                    metric_scores[metric] = {
+                        (sub_district_id, detail_category_id): (
+                            float(j_score) if j_score is not None else None
+                        )
+                        for sub_district_id, detail_category_id, j_score in cursor.fetchall()
+                    }
+                    logger.info(f"{table}: {len(metric_scores[metric])} rows loaded")
+
+                # 다섯 테이블 모두에 존재하는 (읍/면/동, 소분류)만 사용
+                metrics = list(COMMERCIAL_DISTRICT_J_SCORE_TABLES)
+                common_keys = set(metric_scores[metrics[0]])
+                for metric in metrics[1:]:
+                    common_keys &= metric_scores[metric].keys()
+
+                return {
+                    key: {metric: metric_scores[metric][key] for metric in metrics}
+                    for key in common_keys
+                }
+
+    except Exception as e:
+        logger.error(f"Error loading commercial district J score statistics: {e}")
+        raise
+
+
+# select_commercial_district_j_score_average_data 의 메모리 버전
+# (읍/면/동, 소분류 집합) 단위로 평균을 한 번만 계산하고 같은 키의 매장에 재사용
+def calculate_commercial_district_j_score_average_data(
+    mappings: List[LocalStoreMappingSubDistrictDetailCategoryId],
+    j_score_statistics: Dict[Tuple[int, int], Dict[str, Optional[float]]],
+) -> List[LocalStoreCommercialDistrictJscoreAverage]:
+    logger = logging.getLogger(__name__)
+
+    store_mappings: Dict[str, Dict] = defaultdict(
+        lambda: {"sub_district_id": None, "detail_categories": set()}
+    )
+
+    for mapping in mappings:
+        store_data = store_mappings[mapping.store_business_number]
+        store_data["sub_district_id"] = mapping.sub_district_id
+        store_data["detail_categories"].add(mapping.detail_category_id)
+
+    metrics = list(COMMERCIAL_DISTRICT_J_SCORE_TABLES)
+    averages_by_key: Dict[Tuple[int, frozenset], Dict[str, float]] = {}
+
+    results = []
+    for store_number, store_data in store_mappings.items():
+        key = (store_data["sub_district_id"], frozenset(store_data["detail_categories"]))
+
+        averages = averages_by_key.get(key)
+        if averages is None:
+            scores: Dict[str, List[float]] = {metric: [] for metric in metrics}
+            for detail_category_id in key[1]:
+                row = j_score_statistics.get((key[0], detail_category_id))
+                if row is None:
+                    continue
+                for metric in metrics:
+                    if row[metric] is not None:
+                        scores[metric].append(row[metric])
+
+            averages = {
+                metric: mean(values) if values else 0.0
+                for metric, values in scores.items()
+            }
+            averages_by_key[key] = averages
+
+        try:
+            results.append(
+                LocalStoreCommercialDistrictJscoreAverage(
+                    store_business_number=store_number,
+                    commercial_district_market_size_j_socre=averages["market_size"],
+                    commercial_district_average_sales_j_socre=averages["average_sales"],
+                    commercial_district_usage_count_j_socre=averages["usage_count"],
+                    commercial_district_sub_district_density_j_socre=averages[
+                        "sub_district_density"
+                    ],
+                    commercial_district_sub_average_payment_j_socre=averages[
+                        "average_payment"
+                    ],
+                )
+            )
+        except Exception as e:
+            logger.error(f"Error calculating averages for store {store_number}: {e}")
+            continue
+
+    logger.info(
+        f"J score averages: {len(results)} stores, {len(averages_by_key)} distinct keys"
+    )
+    return results
+
+
 ######################## 상권분석 동별 소분류별 요일,시간대 매출 비중 ######################################
 def select_local_store_weekday_time_client_average_sales_data(
     batch: List[LocalStoreMappingRepId],
+    snapshot: Optional[ReportSnapshot] = None,
 ) -> List[LocalStoreCDWeekdayTiemAveragePercent]:
     logger = logging.getLogger(__name__)
     results = []
+    snapshot = snapshot or get_report_snapshot()
 
     try:
         with get_db_connection() as connection:
@@ -1824,7 +2094,7 @@ def select_local_store_weekday_time_client_average_sales_data(
                         AVG_CLIENT_PER_F_60
                     FROM COMMERCIAL_DISTRICT
                     WHERE (SUB_DISTRICT_ID, BIZ_DETAIL_CATEGORY_ID) IN ({placeholders})
-                    AND Y_M = (SELECT MAX(Y_M) FROM COMMERCIAL_DISTRICT)
+                    AND Y_M = %s
                     ;
                 """
 
@@ -1832,6 +2102,7 @@ def select_local_store_weekday_time_client_average_sales_data(
                 flat_query_params = [
                     item for sublist in query_params for item in sublist
                 ]  # flatten list
+                flat_query_params.append(snapshot.commercial_district_y_m)
                 cursor.execute(select_query, flat_query_params)
                 rows = cursor.fetchall()
 
@@ -1934,10 +2205,13 @@ def select_local_store_weekday_time_client_average_sales_data(
 
 def select_commercial_district_district_average_sales_data_batch(
     mappings: List[LocalStoreMappingSubDistrictDetailCategoryId],
+    snapshot: Optional[ReportSnapshot] = None,
 ) -> List[LocalStoreCDDistrictAverageSalesTop5]:
 
     logger = logging.getLogger(__name__)
     results = []
+    snapshot = snapshot or get_report_snapshot()
+    y_m = snapshot.commercial_district_y_m
 
     store_mappings: Dict[str, Dict] = defaultdict(
         lambda: {"sub_district_id": None, "detail_categories": set()}
@@ -1952,10 +2226,8 @@ def select_commercial_district_district_average_sales_data_batch(
         with get_db_connection() as connection:
             with connection.cursor(pymysql.cursors.DictCursor) as cursor:
 
-                for store_number, store_data in store_mappings.items():
-                    detail_categories_str = ", ".join(
-                        map(str, store_data["detail_categories"])
-                    )
+                def fetch_top_sales(sub_district_id, detail_categories) -> List[str]:
+                    detail_categories_str = ", ".join(map(str, detail_categories))
 
                     query = """
                             WITH AggregatedSales AS (
@@ -1968,7 +2240,7 @@ def select_commercial_district_district_average_sales_data_batch(
                                 WHERE
                                     CD.DISTRICT_ID IN (SELECT DISTRICT_ID FROM SUB_DISTRICT WHERE SUB_DISTRICT_ID = %s)
                                     AND CD.BIZ_DETAIL_CATEGORY_ID IN ({})
-                                    AND CD.Y_M = (SELECT MAX(Y_M ) FROM COMMERCIAL_DISTRICT)
+                                    AND CD.Y_M = %s
                                 GROUP BY
                                     SD.SUB_DISTRICT_NAME
                             ),
@@ -1996,14 +2268,28 @@ def select_commercial_district_district_average_sales_data_batch(
                         detail_categories_str
                     )
 
-                    cursor.execute(query, (store_data["sub_district_id"],))
+                    cursor.execute(query, (sub_district_id, y_m))
                     scores = cursor.fetchall()
 
                     # Prepare result formatted as "SUB_DISTRICT_NAME,TOTAL_SALES"
-                    top_sales = [
+                    return [
                         f"{row['SUB_DISTRICT_NAME']},{row['TOTAL_SALES']}"
                         for row in scores
                     ]
+
+                for store_number, store_data in store_mappings.items():
+                    key = make_store_key(
+                        store_data["sub_district_id"],
+                        store_data["detail_categories"],
+                        y_m,
+                    )
+                    top_sales = district_average_sales_cache.get_or_compute(
+                        key,
+                        lambda: fetch_top_sales(
+                            store_data["sub_district_id"],
+                            store_data["detail_categories"],
+                        ),
+                    )
                     result = LocalStoreCDDistrictAverageSalesTop5(
                         store_business_number=store_number,
                         commercial_districdt_detail_category_average_sales_top1_info=(
@@ -2032,17 +2318,23 @@ def select_commercial_district_district_average_sales_data_batch(
 
 
 ######################## 뜨는 업종 전국 TOP5, 읍/면/동 TOP3 (시/군/구,읍/면/동,소분류명,증가율) ######################################
-def select_commercial_district_top5_top3_data_batch(
-    batch: List[LocalStoreSubdistrictId],
-) -> List[LocalStoreRisingBusinessNTop5SDTop3]:
+RISING_BUSINESS_EMPTY_INFO = ",,,"
+
+
+def format_rising_business_info(row: dict) -> str:
+    return f"{row['DISTRICT_NAME']},{row['SUB_DISTRICT_NAME']},{row['BIZ_DETAIL_CATEGORY_NAME']},{row['GROWTH_RATE']}"
+
+
+# 전국 TOP5 (모든 매장에 같은 값), 읍/면/동별 TOP3 를 기준월 기준으로 한 번에 조회
+def select_rising_business_top5_top3_tables(
+    y_m,
+) -> Tuple[List[str], Dict[int, List[str]]]:
     logger = logging.getLogger(__name__)
-    results = []
 
     try:
         with get_db_connection() as connection:
             cursor = connection.cursor(pymysql.cursors.DictCursor)
 
-            # TOP5 Query - ORDER BY 제거
             select_top5_query = """
                 WITH RankedBusiness AS (
                     SELECT 
@@ -2056,7 +2348,7 @@ def select_commercial_district_top5_top3_data_batch(
                     JOIN SUB_DISTRICT SD ON SD.SUB_DISTRICT_ID = RB.SUB_DISTRICT_ID
                     JOIN BIZ_DETAIL_CATEGORY BDC ON BDC.BIZ_DETAIL_CATEGORY_ID = RB.BIZ_DETAIL_CATEGORY_ID
                     WHERE GROWTH_RATE < 1000
-                    AND Y_M = (SELECT MAX(Y_M) FROM RISING_BUSINESS)
+                    AND Y_M = %s
                 )
                 SELECT
                     DISTRICT_NAME,
@@ -2065,13 +2357,11 @@ def select_commercial_district_top5_top3_data_batch(
                     GROWTH_RATE    
                 FROM RankedBusiness
                 WHERE NATIONAL_TOP5 <= 5
+                ORDER BY NATIONAL_TOP5
             """
 
-            # sub_district_id 리스트 생성
-            sub_district_ids = [store_info.sub_district_id for store_info in batch]
-
-            # TOP3 Query - ORDER BY 제거
-            select_top3_query = f"""
+            # 읍/면/동 IN 목록 없이 전체 읍/면/동의 TOP3 를 한 번에
+            select_top3_query = """
                 WITH RankedBusiness AS (
                     SELECT 
                         D.DISTRICT_NAME,
@@ -2085,9 +2375,7 @@ def select_commercial_district_top5_top3_data_batch(
                     JOIN SUB_DISTRICT SD ON SD.SUB_DISTRICT_ID = RB.SUB_DISTRICT_ID
                     JOIN BIZ_DETAIL_CATEGORY BDC ON BDC.BIZ_DETAIL_CATEGORY_ID = RB.BIZ_DETAIL_CATEGORY_ID
                     WHERE GROWTH_RATE < 1000
-                    AND RB.SUB_DISTRICT_ID IN ({', '.join(['%s'] * len(sub_district_ids))})
-                    -- AND Y_M = (SELECT MAX(Y_M) FROM RISING_BUSINESS)
-                    AND Y_M = '2024-08-01'
+                    AND Y_M = %s
                 )
                 SELECT
                     DISTRICT_NAME,
@@ -2097,86 +2385,77 @@ def select_commercial_district_top5_top3_data_batch(
                     SUB_DISTRICT_ID
                 FROM RankedBusiness
                 WHERE NATIONAL_TOP3 <= 3
+                ORDER BY SUB_DISTRICT_ID, NATIONAL_TOP3
             """
 
-            # Execute TOP5 query
-            cursor.execute(select_top5_query)
-            top5_rows = cursor.fetchall()
+            cursor.execute(select_top5_query, (y_m,))
+            top5_info = [format_rising_business_info(row) for row in cursor.fetchall()]
 
-            # Execute TOP3 query
-            cursor.execute(select_top3_query, sub_district_ids)
-            top3_rows = cursor.fetchall()
+            cursor.execute(select_top3_query, (y_m,))
+            top3_info: Dict[int, List[str]] = defaultdict(list)
+            for row in cursor.fetchall():
+                top3_info[row["SUB_DISTRICT_ID"]].append(format_rising_business_info(row))
 
-            # Process results for each store
-            for store_info in batch:
-                # Format TOP5 data
-                top5_info = []
-                for row in top5_rows:
-                    info = f"{row['DISTRICT_NAME']},{row['SUB_DISTRICT_NAME']},{row['BIZ_DETAIL_CATEGORY_NAME']},{row['GROWTH_RATE']}"
-                    top5_info.append(info)
-
-                # Fill remaining TOP5 slots with empty strings if necessary
-                while len(top5_info) < 5:
-                    top5_info.append(",,,")
-
-                # Filter and format TOP3 data for current sub_district
-                current_store_top3 = []
-                for row in top3_rows:
-                    if row["SUB_DISTRICT_ID"] == store_info.sub_district_id:
-                        info = f"{row['DISTRICT_NAME']},{row['SUB_DISTRICT_NAME']},{row['BIZ_DETAIL_CATEGORY_NAME']},{row['GROWTH_RATE']}"
-                        current_store_top3.append(info)
-
-                # Fill remaining TOP3 slots with empty strings if necessary
-                while len(current_store_top3) < 3:
-                    current_store_top3.append(",,,")
-
-                # Create result object
-                result = LocalStoreRisingBusinessNTop5SDTop3(
-                    store_business_number=store_info.store_business_number,
-                    rising_business_national_rising_sales_top1_info=(
-                        top5_info[0] if len(top5_info) > 0 else ",,,"
-                    ),
-                    rising_business_national_rising_sales_top2_info=(
-                        top5_info[1] if len(top5_info) > 1 else ",,,"
-                    ),
-                    rising_business_national_rising_sales_top3_info=(
-                        top5_info[2] if len(top5_info) > 2 else ",,,"
-                    ),
-                    rising_business_national_rising_sales_top4_info=(
-                        top5_info[3] if len(top5_info) > 3 else ",,,"
-                    ),
-                    rising_business_national_rising_sales_top5_info=(
-                        top5_info[4] if len(top5_info) > 4 else ",,,"
-                    ),
-                    rising_business_sub_district_rising_sales_top1_info=(
-                        current_store_top3[0] if len(current_store_top3) > 0 else ",,,"
-                    ),
-                    rising_business_sub_district_rising_sales_top2_info=(
-                        current_store_top3[1] if len(current_store_top3) > 1 else ",,,"
-                    ),
-                    rising_business_sub_district_rising_sales_top3_info=(
-                        current_store_top3[2] if len(current_store_top3) > 2 else ",,,"
-                    ),
-                )
-                # print(result)
-                results.append(result)
-
-            return results
+            logger.info(
+                f"Rising business {y_m}: national top5 {len(top5_info)}, "
+                f"sub_district top3 {len(top3_info)} sub_districts"
+            )
+            return top5_info, dict(top3_info)
 
     except Exception as e:
-        logger.error(f"LocalStoreLocInfoData 가져오는 중 오류 발생: {e}")
+        logger.error(f"Rising business top5/top3 가져오는 중 오류 발생: {e}")
         raise
 
 
+# 빈 자리는 ",,," 로 채워서 n 개로
+def pad_rising_business_info(info: List[str], size: int) -> List[str]:
+    return (info + [RISING_BUSINESS_EMPTY_INFO] * size)[:size]
+
+
+# 미리 계산한 TOP5/TOP3 를 매장별로 매핑 (쿼리 없음)
+def build_rising_business_top5_top3(
+    stores: List[LocalStoreSubdistrictId],
+    top5_info: List[str],
+    top3_info: Dict[int, List[str]],
+) -> List[LocalStoreRisingBusinessNTop5SDTop3]:
+    top5 = pad_rising_business_info(top5_info, 5)
+    empty_top3 = pad_rising_business_info([], 3)
+    top3_by_sub_district = {
+        sub_district_id: pad_rising_business_info(info, 3)
+        for sub_district_id, info in top3_info.items()
+    }
+
+    results = []
+    for store_info in stores:
+        top3 = top3_by_sub_district.get(store_info.sub_district_id, empty_top3)
+        results.append(
+            LocalStoreRisingBusinessNTop5SDTop3(
+                store_business_number=store_info.store_business_number,
+                rising_business_national_rising_sales_top1_info=top5[0],
+                rising_business_national_rising_sales_top2_info=top5[1],
+                rising_business_national_rising_sales_top3_info=top5[2],
+                rising_business_national_rising_sales_top4_info=top5[3],
+                rising_business_national_rising_sales_top5_info=top5[4],
+                rising_business_sub_district_rising_sales_top1_info=top3[0],
+                rising_business_sub_district_rising_sales_top2_info=top3[1],
+                rising_business_sub_district_rising_sales_top3_info=top3[2],
+            )
+        )
+    return results
+
+
 ######################################################################
 
 
 # 상권분석 읍/면/동 소분류 상권분석
 def select_commercial_district_commercial_district_average_data(
     mappings: List[LocalStoreMappingSubDistrictDetailCategoryId],
+    snapshot: Optional[ReportSnapshot] = None,
 ) -> List[LocalStoreCDCommercialDistrict]:
 
     logger = logging.getLogger(__name__)
+    snapshot = snapshot or get_report_snapshot()
+    statistics_ref_dates = commercial_district_statistics_ref_dates(snapshot)
 
     store_mappings: Dict[str, Dict] = defaultdict(
         lambda: {"sub_district_id": None, "detail_categories": set()}
@@ -2192,10 +2471,8 @@ def select_commercial_district_commercial_district_average_data(
     try:
         with get_db_connection() as connection:
             with connection.cursor(pymysql.cursors.DictCursor) as cursor:
-                for store_business_number, data in store_mappings.items():
-                    sub_district_id = data["sub_district_id"]
-                    detail_categories = tuple(data["detail_categories"])
 
+                def fetch_commercial_district(sub_district_id, detail_categories):
                     # 첫 번째 쿼리: 서브디스트릭트 데이터 조회 (SUB_DISTRICT_...)
                     cursor.execute(
                         """
@@ -2210,9 +2487,13 @@ def select_commercial_district_commercial_district_average_data(
                             COMMERCIAL_DISTRICT
                         WHERE SUB_DISTRICT_ID = %s
                         AND BIZ_DETAIL_CATEGORY_ID IN %s
-                        AND Y_M = (SELECT MAX(Y_M) FROM COMMERCIAL_DISTRICT)
+                        AND Y_M = %s
                         """,
-                        (sub_district_id, detail_categories),
+                        (
+                            sub_district_id,
+                            detail_categories,
+                            snapshot.commercial_district_y_m,
+                        ),
                     )
                     sub_district_data = cursor.fetchone()
 
@@ -2245,16 +2526,34 @@ def select_commercial_district_commercial_district_average_data(
                             AND CDAPS.BIZ_DETAIL_CATEGORY_ID = CDMSS.BIZ_DETAIL_CATEGORY_ID
                         WHERE
                             SD.SUB_DISTRICT_ID = %s
-                        AND CDMSS.REF_DATE = (SELECT MAX(REF_DATE) FROM COMMERCIAL_DISTRICT_MARKET_SIZE_STATISTICS)
-                        AND CDUCS.REF_DATE = (SELECT MAX(REF_DATE) FROM COMMERCIAL_DISTRICT_USEAGE_COUNT_STATISTICS)
-                        AND CDASS.REF_DATE = (SELECT MAX(REF_DATE) FROM COMMERCIAL_DISTRICT_AVERAGE_SALES_STATISTICS)
-                        AND CDSDDS.REF_DATE = (SELECT MAX(REF_DATE) FROM COMMERCIAL_DISTRICT_SUB_DISTRICT_DENSITY_STATISTICS)
-                        AND CDAPS.REF_DATE = (SELECT MAX(REF_DATE) FROM COMMERCIAL_DISTRICT_AVERAGE_PAYMENT_STATISTICS)
+                        AND CDMSS.REF_DATE = %s
+                        AND CDUCS.REF_DATE = %s
+                        AND CDASS.REF_DATE = %s
+                        AND CDSDDS.REF_DATE = %s
+                        AND CDAPS.REF_DATE = %s
                         """,
-                        (detail_categories, sub_district_id),
+                        (detail_categories, sub_district_id) + statistics_ref_dates,
                     )
                     national_data = cursor.fetchone()
 
+                    return sub_district_data, national_data
+
+                for store_business_number, data in store_mappings.items():
+                    key = make_store_key(
+                        data["sub_district_id"],
+                        data["detail_categories"],
+                        (snapshot.commercial_district_y_m,) + statistics_ref_dates,
+                    )
+                    sub_district_data, national_data = (
+                        commercial_district_average_cache.get_or_compute(
+                            key,
+                            lambda: fetch_commercial_district(
+                                data["sub_district_id"],
+                                tuple(data["detail_categories"]),
+                            ),
+                        )
+                    )
+
                     # LocalStoreCDCommercialDistrict 인스턴스 생성
                     result = LocalStoreCDCommercialDistrict(
                         store_business_number=store_business_number,
@@ -0,0 +1,102 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+import logging
+from threading import Lock
+from typing import Any, Callable, Dict, FrozenSet, Hashable, Optional, Tuple
+
+
+# 리포트 CRUD 결과 캐시
+# 같은 (읍/면/동, 소분류 집합, 기준일)을 가진 매장이 수천 개씩 있으므로
+# 키당 한 번만 조회하고 나머지 매장에는 결과를 재사용한다
+class ReportResultCache:
+    def __init__(self, name: str, maxsize: int = 100000):
+        self.name = name
+        self.maxsize = maxsize
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[Hashable, Any]" = OrderedDict()
+        self._pending: Dict[Hashable, Future] = {}
+        self._lock = Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        with self._lock:
+            if key in self._data:
+                self._data.move_to_end(key)
+                self.hits += 1
+                return self._data[key]
+            # 같은 키를 다른 스레드가 계산 중이면 그 결과를 기다림 (키당 한 번만 조회)
+            pending = self._pending.get(key)
+            if pending is None:
+                self.misses += 1
+                future: Future = Future()
+                self._pending[key] = future
+            else:
+                self.hits += 1
+
+        if pending is not None:
+            return pending.result()
+
+        # 쿼리는 락 밖에서 실행 (다른 키를 조회하는 스레드가 막히지 않도록)
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                if self._pending.get(key) is future:
+                    del self._pending[key]
+            future.set_exception(e)
+            raise
+
+        with self._lock:
+            # 계산 중에 clear() 됐으면 이전 실행의 결과이므로 캐시에 넣지 않음
+            if self._pending.get(key) is future:
+                del self._pending[key]
+                self._data[key] = value
+                self._data.move_to_end(key)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+        future.set_result(value)
+        return value
+
+    # 계산 중인 키도 함께 비워 다음 실행이 이전 실행의 결과를 기다리지 않도록
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+            self._pending.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                "name": self.name,
+                "size": len(self._data),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": (self.hits / total) if total else 0.0,
+            }
+
+    def log_stats(self) -> None:
+        stats = self.stats()
+        logging.getLogger(__name__).info(
+            f"[{stats['name']}] size={stats['size']} hits={stats['hits']} "
+            f"misses={stats['misses']} hit_rate={stats['hit_rate']:.2%}"
+        )
+
+
+def make_store_key(
+    sub_district_id: int, detail_categories, ref_date: Optional[Any] = None
+) -> Tuple[int, FrozenSet[int], Optional[Any]]:
+    return (sub_district_id, frozenset(detail_categories), ref_date)
+
+
+# 단계별 공유 캐시 (배치 스레드 간 공유)
+j_score_weighted_average_cache = ReportResultCache("cd_j_score_weighted_average")
+district_average_sales_cache = ReportResultCache("cd_district_average_sales")
+commercial_district_average_cache = ReportResultCache("cd_commercial_district_average")
+
+
+def clear_report_caches() -> None:
+    j_score_weighted_average_cache.clear()
+    district_average_sales_cache.clear()
+    commercial_district_average_cache.clear()
@@ -0,0 +1,155 @@
+import logging
+from threading import Lock
+from typing import Dict, Optional, Tuple
+import pymysql
+
+from app.db.connect import get_db_connection
+from app.schemas.report import ReportSnapshot
+
+
+# ReportSnapshot 필드 -> (테이블, 컬럼)
+REPORT_SNAPSHOT_SOURCES: Dict[str, Tuple[str, str]] = {
+    "local_year": ("LOCAL_STORE", "LOCAL_YEAR"),
+    "local_quarter": ("LOCAL_STORE", "LOCAL_QUARTER"),
+    "commercial_district_y_m": ("COMMERCIAL_DISTRICT", "Y_M"),
+    "loc_info_y_m": ("LOC_INFO", "Y_M"),
+    "rising_business_y_m": ("RISING_BUSINESS", "Y_M"),
+    "population_age_ref_date": ("POPULATION_AGE", "REF_DATE"),
+    "loc_info_statistics_ref_date": ("LOC_INFO_STATISTICS", "REF_DATE"),
+    "population_info_mz_statistics_ref_date": (
+        "POPULATION_INFO_MZ_STATISTICS",
+        "REF_DATE",
+    ),
+    "commercial_district_weighted_average_ref_date": (
+        "COMMERCIAL_DISTRICT_WEIGHTED_AVERAGE",
+        "REF_DATE",
+    ),
+    "market_size_statistics_ref_date": (
+        "COMMERCIAL_DISTRICT_MARKET_SIZE_STATISTICS",
+        "REF_DATE",
+    ),
+    "usage_count_statistics_ref_date": (
+        "COMMERCIAL_DISTRICT_USEAGE_COUNT_STATISTICS",
+        "REF_DATE",
+    ),
+    "average_sales_statistics_ref_date": (
+        "COMMERCIAL_DISTRICT_AVERAGE_SALES_STATISTICS",
+        "REF_DATE",
+    ),
+    "sub_district_density_statistics_ref_date": (
+        "COMMERCIAL_DISTRICT_SUB_DISTRICT_DENSITY_STATISTICS",
+        "REF_DATE",
+    ),
+    "average_payment_statistics_ref_date": (
+        "COMMERCIAL_DISTRICT_AVERAGE_PAYMENT_STATISTICS",
+        "REF_DATE",
+    ),
+}
+
+
+# 소스 테이블별 최신 기준일을 한 번에 조회
+def select_report_snapshot() -> ReportSnapshot:
+    logger = logging.getLogger(__name__)
+
+    try:
+        with get_db_connection() as connection:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                select_query = "SELECT {}".format(
+                    ",\n".join(
+                        f"(SELECT MAX({column}) FROM {table}) AS {field}"
+                        for field, (table, column) in REPORT_SNAPSHOT_SOURCES.items()
+                    )
+                )
+                cursor.execute(select_query)
+                row = cursor.fetchone()
+
+                snapshot = ReportSnapshot(**row)
+                logger.info(f"Report snapshot: {snapshot}")
+                return snapshot
+
+    except Exception as e:
+        logger.error(f"Error selecting report snapshot: {e}")
+        raise
+
+
+_report_snapshot: Optional[ReportSnapshot] = None
+_report_snapshot_lock = Lock()
+
+
+# 리포트 실행 시작 시 기준일 고정 (이후 모든 CRUD 가 같은 스냅샷 사용)
+def pin_report_snapshot(snapshot: Optional[ReportSnapshot] = None) -> ReportSnapshot:
+    global _report_snapshot
+    with _report_snapshot_lock:
+        _report_snapshot = snapshot or select_report_snapshot()
+        return _report_snapshot
+
+
+# 고정된 스냅샷 반환 (없으면 최초 1회 조회 후 고정)
+def get_report_snapshot() -> ReportSnapshot:
+    global _report_snapshot
+    with _report_snapshot_lock:
+        if _report_snapshot is None:
+            _report_snapshot = select_report_snapshot()
+        return _report_snapshot
+
+
+# 읍/면/동별 LOCAL_STORE 지문 (매장 수 + 매장 행 CRC 의 XOR)
+# 매장이 추가/삭제되거나 리포트에 쓰는 컬럼이 바뀐 읍/면/동만 지문이 달라진다
+def select_local_store_sub_district_digests(
+    snapshot: Optional[ReportSnapshot] = None,
+) -> Dict[int, str]:
+    logger = logging.getLogger(__name__)
+    snapshot = snapshot or get_report_snapshot()
+
+    try:
+        with get_db_connection() as connection:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                select_query = """
+                    SELECT
+                        SUB_DISTRICT_ID,
+                        COUNT(*) AS STORE_COUNT,
+                        BIT_XOR(CRC32(CONCAT_WS('|',
+                            STORE_BUSINESS_NUMBER, IS_EXIST, SMALL_CATEGORY_NAME, STORE_NAME,
+                            ROAD_NAME_ADDRESS, BUILDING_NAME, FLOOR_INFO, LATITUDE, LONGITUDE
+                        ))) AS STORE_CRC
+                    FROM LOCAL_STORE
+                    WHERE LOCAL_YEAR = %s
+                    AND LOCAL_QUARTER = %s
+                    AND SUB_DISTRICT_ID IS NOT NULL
+                    GROUP BY SUB_DISTRICT_ID
+                    ;
+                """
+                cursor.execute(select_query, (snapshot.local_year, snapshot.local_quarter))
+                return {
+                    row["SUB_DISTRICT_ID"]: f"{row['STORE_COUNT']}:{row['STORE_CRC']}"
+                    for row in cursor.fetchall()
+                }
+
+    except Exception as e:
+        logger.error(f"Error selecting LOCAL_STORE digests: {e}")
+        raise
+
+
+# 읍/면/동별 최신 POPULATION_AGE 기준일 (리포트는 읍/면/동마다 최신 REF_DATE 를 씀)
+def select_population_age_sub_district_ref_dates() -> Dict[int, str]:
+    logger = logging.getLogger(__name__)
+
+    try:
+        with get_db_connection() as connection:
+            with connection.cursor(pymysql.cursors.DictCursor) as cursor:
+                cursor.execute(
+                    """
+                    SELECT SUB_DISTRICT_ID, MAX(REF_DATE) AS REF_DATE
+                    FROM POPULATION_AGE
+                    GROUP BY SUB_DISTRICT_ID
+                    ;
+                    """
+                )
+                return {
+                    row["SUB_DISTRICT_ID"]: str(row["REF_DATE"])
+                    for row in cursor.fetchall()
+                }
+
+    except Exception as e:
+        logger.error(f"Error selecting POPULATION_AGE ref dates: {e}")
+        raise
@@ -1,12 +1,14 @@
 import logging
+import os
 from pymysql import MySQLError
-from typing import List, Optional
+from typing import Any, List, Optional, Tuple
 
 import pymysql
 from app.schemas.rising_business import (
     RisingBusinessInsert,
     RisingBusinessOutput,
 )
+from app.crud.batch_writer import BufferedBatchWriter
 from app.db.connect import (
     get_db_connection,
     close_connection,
@@ -16,7 +18,34 @@ from app.db.connect import (
 )
 
 
-def insert_rising_business(data_list: List[RisingBusinessInsert]):
+# 같은 (SUB_DISTRICT_ID, Y_M) 의 기존 행을 지우고 다시 넣어 재실행해도 중복되지 않음
+# (테이블에 유니크 키가 없어도 멱등)
+RISING_BUSINESS_INSERT_QUERY = """
+    INSERT INTO RISING_BUSINESS (city_id, district_id, sub_district_id, biz_main_category_id, biz_sub_category_id, biz_detail_category_id, growth_rate, sub_district_rank, y_m)
+    VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s);
+"""
+
+RISING_BUSINESS_BATCH_SIZE = int(os.getenv("RISING_BUSINESS_BATCH_SIZE", "1000"))
+
+# 버퍼는 읍/면/동 묶음 단위 (읍/면/동당 최대 5건)
+RISING_BUSINESS_GROUP_BATCH_SIZE = max(RISING_BUSINESS_BATCH_SIZE // 5, 1)
+
+
+def delete_rising_business_keys(cursor, keys: List[Tuple[int, Any]], batch_size: int):
+    for start in range(0, len(keys), batch_size):
+        batch = keys[start:start + batch_size]
+        placeholders = ", ".join(["(%s, %s)"] * len(batch))
+        cursor.execute(
+            f"DELETE FROM RISING_BUSINESS WHERE (SUB_DISTRICT_ID, Y_M) IN ({placeholders})",
+            [value for key in batch for value in key],
+        )
+
+
+# data_list 에는 (sub_district_id, y_m) 마다 해당 읍/면/동의 행이 모두 들어 있어야 함
+# 기존 행 삭제와 인서트를 한 트랜잭션으로 처리
+def insert_rising_business(
+    data_list: List[RisingBusinessInsert], batch_size: int = RISING_BUSINESS_BATCH_SIZE
+):
     connection = get_db_connection()
     cursor = None
     logger = logging.getLogger(__name__)
@@ -25,13 +54,8 @@ def insert_rising_business(data_list: List[RisingBusinessInsert]):
         if connection.open:
             cursor = connection.cursor()
 
-            insert_query = """
-            INSERT INTO RISING_BUSINESS (city_id, district_id, sub_district_id, biz_main_category_id, biz_sub_category_id, biz_detail_category_id, growth_rate, sub_district_rank, y_m)
-            VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s);
-            """
-
-            for data in data_list:
-                values = (
+            rows = [
+                (
                     data.city_id,
                     data.district_id,
                     data.sub_district_id,
@@ -42,10 +66,23 @@ def insert_rising_business(data_list: List[RisingBusinessInsert]):
                     data.sub_district_rank if data.sub_district_rank is not None else 0,
                     data.y_m,
                 )
-                logger.info(f"Executing query: {insert_query % values}")
-                cursor.execute(insert_query, values)
+                for data in data_list
+            ]
+
+            keys = sorted({(row[2], row[8]) for row in rows}, key=str)
+            delete_rising_business_keys(cursor, keys, batch_size)
+
+            # executemany 가 다중 행 INSERT 로 묶어서 batch_size 건마다 한 번만 전송
+            for start in range(0, len(rows), batch_size):
+                batch = rows[start:start + batch_size]
+                # 쿼리 문자열은 만들지 않고 배치마다 첫 행만 (debug 일 때만 포맷됨)
+                logger.debug("Inserting %d RISING_BUSINESS rows, first: %s", len(batch), batch[0])
+                cursor.executemany(RISING_BUSINESS_INSERT_QUERY, batch)
 
             commit(connection)
+            logger.info(
+                "Replaced RISING_BUSINESS rows for %d sub districts (%d rows)", len(keys), len(rows)
+            )
 
     except MySQLError as e:
         print(f"MySQL Error: {e}")
@@ -58,3 +95,17 @@ def insert_rising_business(data_list: List[RisingBusinessInsert]):
             close_cursor(cursor)
         if connection:
             close_connection(connection)
+
+
+def insert_rising_business_groups(groups: List[List[RisingBusinessInsert]]):
+    insert_rising_business([data for group in groups for data in group])
+
+
+# 크롤러 공용 버퍼 (읍/면/동마다 인서트하지 않고 모아서 배치로 인서트)
+# 한 읍/면/동의 행이 서로 다른 flush 로 나뉘면 나중 flush 가 앞의 행을 지우므로 읍/면/동 묶음 단위로 add
+rising_business_writer = BufferedBatchWriter(
+    "rising_business",
+    insert_rising_business_groups,
+    max_size=RISING_BUSINESS_GROUP_BATCH_SIZE,
+    flush_interval=30.0,
+)
@@ -1,129 +1,241 @@
+from collections import defaultdict
 import pymysql
 import os
+import time
+from threading import Lock
+from typing import Dict, List
+from dbutils.pooled_db import PooledDB
 from dotenv import load_dotenv
 from pymysql import OperationalError, InternalError, ProgrammingError, Error
 
 load_dotenv()
 
-# Source DB
-def get_db_connection():
+
+# DB 별 커넥션 풀 최대 크기 (환경변수로 조정)
+POOL_MAX_CONNECTIONS = {
+    "source": int(os.getenv("DB_POOL_SIZE", 20)),
+    "re": int(os.getenv("DB_RE_POOL_SIZE", 10)),
+    "report": int(os.getenv("REPORT_DB_POOL_SIZE", 20)),
+    "service_report": int(os.getenv("SERVICE_REPORT_DB_POOL_SIZE", 20)),
+}
+# 커넥션 하나를 몇 번 빌려준 뒤 새로 맺을지 (0: 무제한)
+POOL_MAX_USAGE = int(os.getenv("DB_POOL_MAX_USAGE", 0))
+
+_pools: Dict[str, PooledDB] = {}
+_pools_lock = Lock()
+_pool_metrics: Dict[str, Dict[str, float]] = defaultdict(
+    lambda: {"borrowed": 0, "wait_total": 0.0, "wait_max": 0.0, "errors": 0}
+)
+_pool_metrics_lock = Lock()
+# fork 된 자식이 물려받은 풀
+# 부모와 같은 소켓을 가리키므로 자식에서 쓰면 안 되고, 닫거나 GC 되어도 부모 커넥션에 COM_QUIT 이 가므로 참조만 유지
+_inherited_pools: List[PooledDB] = []
+
+
+# multiprocessing 워커 등 fork 된 자식 프로세스는 빈 풀에서 새로 연결
+def _reset_pools_after_fork() -> None:
+    global _pools, _pools_lock, _pool_metrics_lock
+    _inherited_pools.extend(_pools.values())
+    _pools = {}
+    # 부모의 다른 스레드가 잡고 있던 락은 자식에서 풀리지 않으므로 새로 만듦
+    _pools_lock = Lock()
+    _pool_metrics_lock = Lock()
+
+
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_reset_pools_after_fork)
+
+
+def _get_pool(name: str, max_connections: int, **connect_kwargs) -> PooledDB:
+    with _pools_lock:
+        pool = _pools.get(name)
+        if pool is None:
+            pool = PooledDB(
+                creator=pymysql,
+                mincached=0,
+                maxcached=max_connections,
+                maxconnections=max_connections,
+                blocking=True,  # 풀이 가득 차면 반납될 때까지 대기
+                maxusage=POOL_MAX_USAGE or None,
+                ping=1,  # 풀에서 꺼낼 때마다 헬스 체크, 끊긴 커넥션은 재연결
+                reset=True,  # 반납 시 롤백
+                failures=(OperationalError, InternalError),
+                autocommit=False,
+                **connect_kwargs,
+            )
+            _pools[name] = pool
+        return pool
+
+
+def _record_metric(name: str, key: str, value: float = 1) -> None:
+    with _pool_metrics_lock:
+        metrics = _pool_metrics[name]
+        if key == "wait":
+            metrics["borrowed"] += 1
+            metrics["wait_total"] += value
+            metrics["wait_max"] = max(metrics["wait_max"], value)
+        else:
+            metrics[key] += value
+
+
+# 풀에서 빌린 커넥션
+# close() / with 블록 종료 시 실제로 끊지 않고 풀에 반납한다
+class PooledConnection:
+    def __init__(self, pool_name: str, connection):
+        self._pool_name = pool_name
+        self._connection = connection
+        self._closed = False
+
+    @property
+    def open(self) -> bool:
+        return not self._closed
+
+    def close(self) -> None:
+        if not self._closed:
+            self._closed = True
+            self._connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        if exc_type is not None and issubclass(exc_type, Error):
+            _record_metric(self._pool_name, "errors")
+        self.close()
+
+    def __getattr__(self, name):
+        return getattr(self._connection, name)
+
+
+def _borrow_connection(name: str, max_connections: int, **connect_kwargs):
     connection = None
     try:
-        connection = pymysql.connect(
-            host=os.getenv("DB_HOST"),
-            user=os.getenv("DB_USER"),
-            password=os.getenv("DB_PASSWORD"),
-            database=os.getenv("DB_DATABASE"),
-            autocommit=False,
-        )
-        # print("TEST Database connection established successfully.")
+        pool = _get_pool(name, max_connections, **connect_kwargs)
+        start = time.perf_counter()
+        raw_connection = pool.connection()
+        _record_metric(name, "wait", time.perf_counter() - start)
+        connection = PooledConnection(name, raw_connection)
     except OperationalError as e:
+        _record_metric(name, "errors")
         print(f"OperationalError: {e}")
     except InternalError as e:
+        _record_metric(name, "errors")
         print(f"InternalError: {e}")
     except ProgrammingError as e:
+        _record_metric(name, "errors")
         print(f"ProgrammingError: {e}")
     except Error as e:
+        _record_metric(name, "errors")
         print(f"Error: {e}")
     except Exception as e:
+        _record_metric(name, "errors")
         print(f"Unexpected error: {e}")
     return connection
 
+
+# 풀별 대여 횟수, 대기 시간, 오류 횟수
+def get_pool_metrics() -> Dict[str, Dict[str, float]]:
+    with _pool_metrics_lock:
+        return {
+            name: {
+                **metrics,
+                "wait_avg": (
+                    metrics["wait_total"] / metrics["borrowed"]
+                    if metrics["borrowed"]
+                    else 0.0
+                ),
+            }
+            for name, metrics in _pool_metrics.items()
+        }
+
+
+def log_pool_metrics() -> None:
+    for name, metrics in get_pool_metrics().items():
+        print(
+            f"[DB pool {name}] borrowed={metrics['borrowed']} "
+            f"wait_avg={metrics['wait_avg']:.4f}s wait_max={metrics['wait_max']:.4f}s "
+            f"errors={metrics['errors']}"
+        )
+
+
+# 풀 전체 종료 (프로세스 종료 시)
+def close_all_pools() -> None:
+    with _pools_lock:
+        for pool in _pools.values():
+            pool.close()
+        _pools.clear()
+
+
+# Source DB
+def get_db_connection():
+    return _borrow_connection(
+        "source",
+        POOL_MAX_CONNECTIONS["source"],
+        host=os.getenv("DB_HOST"),
+        user=os.getenv("DB_USER"),
+        password=os.getenv("DB_PASSWORD"),
+        database=os.getenv("DB_DATABASE"),
+    )
+
+
 # 리포트 DB 연결
 def get_re_db_connection():
-    connection = None
-    try:
-        connection = pymysql.connect(
-            host=os.getenv("DB_RE_HOST"),
-            user=os.getenv("DB_RE_USER"),
-            password=os.getenv("DB_RE_PASSWORD"),
-            database=os.getenv("DB_RE_DATABASE"),
-            autocommit=False,
-        )
-        # print("TEST Database connection established successfully.")
-    except OperationalError as e:
-        print(f"OperationalError: {e}")
-    except InternalError as e:
-        print(f"InternalError: {e}")
-    except ProgrammingError as e:
-        print(f"ProgrammingError: {e}")
-    except Error as e:
-        print(f"Error: {e}")
-    except Exception as e:
-        print(f"Unexpected error: {e}")
-    return connection
+    return _borrow_connection(
+        "re",
+        POOL_MAX_CONNECTIONS["re"],
+        host=os.getenv("DB_RE_HOST"),
+        user=os.getenv("DB_RE_USER"),
+        password=os.getenv("DB_RE_PASSWORD"),
+        database=os.getenv("DB_RE_DATABASE"),
+    )
+
 
 def get_report_db_connection(is_dev=False):
-    connection = None
-    try:
-        # 개발 모드 또는 배포 모드에 따라 다른 환경 변수 사용
-        if is_dev:
-            host = os.getenv("REPORT_DB_HOST_DEV")
-            user = os.getenv("REPORT_DB_USER_DEV")
-            password = os.getenv("REPORT_DB_PASSWORD_DEV")
-            database = os.getenv("REPORT_DB_DATABASE_DEV")
-        else:
-            host = os.getenv("REPORT_DB_HOST_DEP")
-            user = os.getenv("REPORT_DB_USER_DEP")
-            password = os.getenv("REPORT_DB_PASSWORD_DEP")
-            database = os.getenv("REPORT_DB_DATABASE_DEP")
-
-        connection = pymysql.connect(
-            host=host,
-            user=user,
-            password=password,
-            database=database,
-            autocommit=False,
-        )
-        # print("ReportDB Database connection established successfully.")
-    except OperationalError as e:
-        print(f"OperationalError: {e}")
-    except InternalError as e:
-        print(f"InternalError: {e}")
-    except ProgrammingError as e:
-        print(f"ProgrammingError: {e}")
-    except Error as e:
-        print(f"Error: {e}")
-    except Exception as e:
-        print(f"Unexpected error: {e}")
-    return connection
+    # 개발 모드 또는 배포 모드에 따라 다른 환경 변수 사용
+    if is_dev:
+        host = os.getenv("REPORT_DB_HOST_DEV")
+        user = os.getenv("REPORT_DB_USER_DEV")
+        password = os.getenv("REPORT_DB_PASSWORD_DEV")
+        database = os.getenv("REPORT_DB_DATABASE_DEV")
+    else:
+        host = os.getenv("REPORT_DB_HOST_DEP")
+        user = os.getenv("REPORT_DB_USER_DEP")
+        password = os.getenv("REPORT_DB_PASSWORD_DEP")
+        database = os.getenv("REPORT_DB_DATABASE_DEP")
+
+    return _borrow_connection(
+        "report_dev" if is_dev else "report",
+        POOL_MAX_CONNECTIONS["report"],
+        host=host,
+        user=user,
+        password=password,
+        database=database,
+    )
 
 
 def get_service_report_db_connection(is_dev=True):
-    connection = None
-    try:
-        # 개발 모드 또는 배포 모드에 따라 다른 환경 변수 사용
-        if is_dev:
-            host = os.getenv("SERVICE_REPORT_DB_HOST_DEV")
-            user = os.getenv("SERVICE_REPORT_DB_USER_DEV")
-            password = os.getenv("SERVICE_REPORT_DB_PASSWORD_DEV")
-            database = os.getenv("SERVICE_REPORT_DB_DATABASE_DEV")
-        else:
-            # host = os.getenv("REPORT_DB_HOST_DEP")
-            # user = os.getenv("REPORT_DB_USER_DEP")
-            # password = os.getenv("REPORT_DB_PASSWORD_DEP")
-            # database = os.getenv("REPORT_DB_DATABASE_DEP")
-            pass
-
-        connection = pymysql.connect(
-            host=host,
-            user=user,
-            password=password,
-            database=database,
-            autocommit=False,
-        )
-        # print("Service Report Database connection established successfully.")
-    except OperationalError as e:
-        print(f"OperationalError: {e}")
-    except InternalError as e:
-        print(f"InternalError: {e}")
-    except ProgrammingError as e:
-        print(f"ProgrammingError: {e}")
-    except Error as e:
-        print(f"Error: {e}")
-    except Exception as e:
-        print(f"Unexpected error: {e}")
-    return connection
+    # 개발 모드 또는 배포 모드에 따라 다른 환경 변수 사용
+    if is_dev:
+        host = os.getenv("SERVICE_REPORT_DB_HOST_DEV")
+        user = os.getenv("SERVICE_REPORT_DB_USER_DEV")
+        password = os.getenv("SERVICE_REPORT_DB_PASSWORD_DEV")
+        database = os.getenv("SERVICE_REPORT_DB_DATABASE_DEV")
+    else:
+        # host = os.getenv("REPORT_DB_HOST_DEP")
+        # user = os.getenv("REPORT_DB_USER_DEP")
+        # password = os.getenv("REPORT_DB_PASSWORD_DEP")
+        # database = os.getenv("REPORT_DB_DATABASE_DEP")
+        print("Service Report DB 배포 설정이 없습니다.")
+        return None
+
+    return _borrow_connection(
+        "service_report",
+        POOL_MAX_CONNECTIONS["service_report"],
+        host=host,
+        user=user,
+        password=password,
+        database=database,
+    )
 
 
 # DB 연결 종료
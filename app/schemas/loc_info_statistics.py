@@ -145,7 +145,35 @@ class MzPopJScorePerNonOutLiers(BaseModel):
     district_id: int
     sub_district_id: int
     j_score_per_non_outliers :Optional[float]
-    
+
+    class Config:
+        from_attributes = True
+
+
+######### 전체 지역 일괄 조회
+
+
+class LocInfoJScoreComponents(BaseModel):
+    city_id: int
+    district_id: int
+    sub_district_id: int
+    target_item:str
+    j_score_rank:Optional[float]
+    j_score_per:Optional[float]
+    j_score_per_non_outliers:Optional[float]
+
+    class Config:
+        from_attributes = True
+
+
+class MzPopJScoreComponents(BaseModel):
+    city_id: int
+    district_id: int
+    sub_district_id: int
+    j_score_rank:Optional[float]
+    j_score_per:Optional[float]
+    j_score_per_non_outliers:Optional[float]
+
     class Config:
         from_attributes = True
 
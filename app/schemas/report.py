@@ -160,6 +160,7 @@ class LocalStoreBasicInfo(BaseModel):
     city_name: str
     district_name: str
     sub_district_name: str
+    sub_district_id: Optional[int] = None
     detail_category_name: Optional[str] = None  # VARCHAR(100)
     store_name: Optional[str] = None
     road_name: Optional[str] = None  # VARCHAR(255)
@@ -502,6 +503,26 @@ class LocalStoreCDCommercialDistrict(BaseModel):
             self.commercial_district_sub_district_usage_count = 0.0
 
 
+# 리포트 실행 단위로 고정하는 소스 테이블 최신 기준일
+class ReportSnapshot(BaseModel):
+    local_year: Optional[int] = None  # MAX(LOCAL_STORE.LOCAL_YEAR)
+    local_quarter: Optional[int] = None  # MAX(LOCAL_STORE.LOCAL_QUARTER)
+    commercial_district_y_m: Optional[date] = None  # MAX(COMMERCIAL_DISTRICT.Y_M)
+    loc_info_y_m: Optional[date] = None  # MAX(LOC_INFO.Y_M)
+    rising_business_y_m: Optional[date] = None  # MAX(RISING_BUSINESS.Y_M)
+    population_age_ref_date: Optional[date] = None  # MAX(POPULATION_AGE.REF_DATE)
+    loc_info_statistics_ref_date: Optional[date] = None
+    population_info_mz_statistics_ref_date: Optional[date] = None
+    commercial_district_weighted_average_ref_date: Optional[date] = None
+    market_size_statistics_ref_date: Optional[date] = None
+    usage_count_statistics_ref_date: Optional[date] = None
+    average_sales_statistics_ref_date: Optional[date] = None
+    sub_district_density_statistics_ref_date: Optional[date] = None
+    average_payment_statistics_ref_date: Optional[date] = None
+
+    class Config:
+        from_attributes = True
+
 ####################
 # store_business_number='MA010120220807561997'
 # commercial_district_national_density_average=2.678424835205078
@@ -1,16 +1,11 @@
 from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Pool, cpu_count
-import random
 import re
 import time
 import os
 from typing import Dict, List
 import psutil
-from webdriver_manager.chrome import ChromeDriverManager
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.common.exceptions import (
@@ -19,13 +14,11 @@ from selenium.common.exceptions import (
 from selenium.webdriver.common.alert import Alert
 from tqdm import tqdm
 
-from app.crud.biz_detail_category import get_or_create_biz_detail_category_id
-from app.crud.biz_main_category import get_or_create_biz_main_category_id
-from app.crud.biz_sub_category import get_or_create_biz_sub_category_id
-from app.crud.city import get_or_create_city_id
-from app.crud.commercial_district import insert_commercial_district
-from app.crud.district import get_or_create_district_id
-from app.crud.sub_district import get_or_create_sub_district_id
+from app.crud.commercial_district import commercial_district_writer
+from app.crud.crawl_job_queue import CrawlJobQueue
+from app.crud.dimension_cache import dimension_cache, preload_dimension_cache
+from app.service.crawler_wait import adaptive_wait
+from app.service.webdriver_pool import WebDriverPool, resolve_chromedriver_path
 from app.schemas.commercial_district import CommercialDistrictInsert
 
 from selenium.common.exceptions import (
@@ -56,36 +49,43 @@ BIZ_MAP_URL = "https://m.nicebizmap.co.kr/analysis/analysisFree"
 # BIZ_MAP_URL = "https://m.nicebizmap.co.kr/"
 
 
-# Global WebDriver instance
+# Global WebDriver instance (프로세스당 하나, 풀에서 빌려 씀)
 global_driver = None
+driver_pool = WebDriverPool(size=1)
 
 
 def setup_global_driver():
     global global_driver
     if global_driver is None:
-        options = Options()
-        options.add_argument("--start-fullscreen")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-
-        # WebDriver Manager를 이용해 ChromeDriver 자동 관리
-        service = Service(ChromeDriverManager().install())
-        global_driver = webdriver.Chrome(service=service, options=options)
+        global_driver = driver_pool.acquire()
+    else:
+        # K 페이지 이상 사용했거나 메모리가 커진 브라우저는 새로 띄움
+        global_driver = driver_pool.recycle_if_needed(global_driver)
 
     return global_driver
 
 
+# 드라이버를 종료하지 않고 풀에 반납 (다음 작업에서 재사용)
+def release_global_driver():
+    global global_driver
+    if global_driver is not None:
+        driver_pool.release(global_driver)
+        global_driver = None
+
+
 def click_element(driver, wait, by, value):
     try:
-        element = wait.until(EC.element_to_be_clickable((by, value)))
+        waiter = adaptive_wait(driver)
+        element = waiter.until(wait, EC.element_to_be_clickable((by, value)))
         text = element.text
         element.click()
-        time.sleep(1 + random.random())
+        waiter.settle()
         return text
     except ElementClickInterceptedException:
         try:
             driver.execute_script("arguments[0].click();", element)
-            text = element.text
+            # 일반 클릭과 같이 화면 갱신을 기다린 뒤 반환 (텍스트는 클릭 전에 읽어둔 값)
+            waiter.settle()
             return text
         except Exception as e:
             # print(f"JavaScript click failed for element: {value}. Error: {str(e)}")
@@ -101,9 +101,10 @@ def click_element(driver, wait, by, value):
 
 def read_element(wait, by, value):
     try:
-        element = wait.until(EC.presence_of_element_located((by, value)))
+        element = adaptive_wait(wait._driver).until(
+            wait, EC.presence_of_element_located((by, value))
+        )
         text = element.text.strip()
-        time.sleep(1 + random.random())
         return text
     except (
         TimeoutException,
@@ -152,11 +153,9 @@ def get_district_count(city_idx):
         # for city_idx in tqdm(range(city_count), desc="시/도 Progress"):
         # print(f"idx: {city_idx}")
 
-        global_driver.get(BIZ_MAP_URL)
+        adaptive_wait(global_driver).load_page(BIZ_MAP_URL)
         wait = WebDriverWait(global_driver, 30)
 
-        time.sleep(1 + random.random())
-
         # 분석 지역
         click_element(
             global_driver,
@@ -165,8 +164,6 @@ def get_district_count(city_idx):
             '//*[@id="pc_sheet01"]/div/div[2]/div[2]/ul/li[1]/a',
         )
 
-        time.sleep(1 + random.random())
-
         city_text = click_element(
             global_driver,
             wait,
@@ -190,9 +187,7 @@ def get_district_count(city_idx):
         # print(f"Exception occurred: {e}.")
         return None
     finally:
-        if global_driver:
-            global_driver.quit()  # 메인 함수에서만 드라이버 종료
-            global_driver = None
+        release_global_driver()  # 메인 함수에서만 드라이버 반납
 
 
 # def get_sub_district_count(start_idx: int, end_idx: int):
@@ -208,12 +203,10 @@ def get_sub_district_count(
         # ):
 
         try:
-            global_driver.get(BIZ_MAP_URL)
+            adaptive_wait(global_driver).load_page(BIZ_MAP_URL)
             wait = WebDriverWait(global_driver, 30)
             global_driver.implicitly_wait(10)
 
-            time.sleep(1 + random.random())
-
             # 분석 지역
             click_element(
                 global_driver,
@@ -222,8 +215,6 @@ def get_sub_district_count(
                 '//*[@id="pc_sheet01"]/div/div[2]/div[2]/ul/li[1]/a',
             )
 
-            time.sleep(1 + random.random())
-
             city_text = click_element(
                 global_driver,
                 wait,
@@ -231,8 +222,6 @@ def get_sub_district_count(
                 f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{city_idx + 1}]/a',
             )
 
-            time.sleep(1 + random.random())
-
             district_text = click_element(
                 global_driver,
                 wait,
@@ -266,9 +255,7 @@ def get_sub_district_count(
     # finally: # 시/도 기준으로 할 때 활성화
     #     pass
     finally:
-        if global_driver:
-            global_driver.quit()  # 메인 함수에서만 드라이버 종료
-            global_driver = None
+        release_global_driver()  # 메인 함수에서만 드라이버 반납
 
 
 def get_main_category(city_idx, district_idx, sub_district_count):
@@ -277,7 +264,7 @@ def get_main_category(city_idx, district_idx, sub_district_count):
     try:
         for sub_district_idx in tqdm(range(sub_district_count)):
             try:
-                global_driver.get(BIZ_MAP_URL)
+                adaptive_wait(global_driver).load_page(BIZ_MAP_URL)
                 wait = WebDriverWait(global_driver, 30)
                 global_driver.implicitly_wait(10)
 
@@ -289,8 +276,6 @@ def get_main_category(city_idx, district_idx, sub_district_count):
                     '//*[@id="pc_sheet01"]/div/div[2]/div[2]/ul/li[1]/a',
                 )
 
-                time.sleep(1 + random.random())
-
                 city_text = click_element(
                     global_driver,
                     wait,
@@ -298,8 +283,6 @@ def get_main_category(city_idx, district_idx, sub_district_count):
                     f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{city_idx + 1}]/a',
                 )
 
-                time.sleep(1 + random.random())
-
                 district_text = click_element(
                     global_driver,
                     wait,
@@ -307,8 +290,6 @@ def get_main_category(city_idx, district_idx, sub_district_count):
                     f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{district_idx + 1}]/a',
                 )
 
-                time.sleep(1 + random.random())
-
                 sub_district_text = click_element(
                     global_driver,
                     wait,
@@ -316,8 +297,6 @@ def get_main_category(city_idx, district_idx, sub_district_count):
                     f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{sub_district_idx + 1}]/a',
                 )
 
-                time.sleep(1 + random.random())
-
                 main_category_ul_1 = wait.until(
                     EC.presence_of_element_located(
                         (
@@ -352,7 +331,7 @@ def get_main_category(city_idx, district_idx, sub_district_count):
 
         for sub_district_idx in tqdm(range(sub_district_count)):
             try:
-                global_driver.get(BIZ_MAP_URL)
+                adaptive_wait(global_driver).load_page(BIZ_MAP_URL)
                 wait = WebDriverWait(global_driver, 30)
                 global_driver.implicitly_wait(10)
 
@@ -364,8 +343,6 @@ def get_main_category(city_idx, district_idx, sub_district_count):
                     '//*[@id="pc_sheet01"]/div/div[2]/div[2]/ul/li[1]/a',
                 )
 
-                time.sleep(1 + random.random())
-
                 city_text = click_element(
                     global_driver,
                     wait,
@@ -373,8 +350,6 @@ def get_main_category(city_idx, district_idx, sub_district_count):
                     f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{city_idx + 1}]/a',
                 )
 
-                time.sleep(1 + random.random())
-
                 district_text = click_element(
                     global_driver,
                     wait,
@@ -382,8 +357,6 @@ def get_main_category(city_idx, district_idx, sub_district_count):
                     f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{district_idx + 1}]/a',
                 )
 
-                time.sleep(1 + random.random())
-
                 sub_district_text = click_element(
                     global_driver,
                     wait,
@@ -439,7 +412,7 @@ def get_sub_category(
     try:
         for main_category_idx in range(main_category_count):
             try:
-                global_driver.get(BIZ_MAP_URL)
+                adaptive_wait(global_driver).load_page(BIZ_MAP_URL)
                 wait = WebDriverWait(global_driver, 30)
                 global_driver.implicitly_wait(10)
 
@@ -451,8 +424,6 @@ def get_sub_category(
                     '//*[@id="pc_sheet01"]/div/div[2]/div[2]/ul/li[1]/a',
                 )
 
-                time.sleep(1 + random.random())
-
                 city_text = click_element(
                     global_driver,
                     wait,
@@ -460,8 +431,6 @@ def get_sub_category(
                     f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{city_idx + 1}]/a',
                 )
 
-                time.sleep(1 + random.random())
-
                 district_text = click_element(
                     global_driver,
                     wait,
@@ -469,8 +438,6 @@ def get_sub_category(
                     f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{district_idx + 1}]/a',
                 )
 
-                time.sleep(1 + random.random())
-
                 sub_district_text = click_element(
                     global_driver,
                     wait,
@@ -478,8 +445,6 @@ def get_sub_category(
                     f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{sub_district_idx + 1}]/a',
                 )
 
-                time.sleep(1 + random.random())
-
                 main_category_text = click_element(
                     global_driver,
                     wait,
@@ -538,7 +503,7 @@ def get_detail_category(
         for sub_category_idx in range(0, sub_category_count * 2, 2):
 
             try:
-                global_driver.get(BIZ_MAP_URL)
+                adaptive_wait(global_driver).load_page(BIZ_MAP_URL)
                 wait = WebDriverWait(global_driver, 30)
                 global_driver.implicitly_wait(10)
 
@@ -550,8 +515,6 @@ def get_detail_category(
                     '//*[@id="pc_sheet01"]/div/div[2]/div[2]/ul/li[1]/a',
                 )
 
-                time.sleep(1 + random.random())
-
                 city_text = click_element(
                     global_driver,
                     wait,
@@ -559,8 +522,6 @@ def get_detail_category(
                     f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{city_idx + 1}]/a',
                 )
 
-                time.sleep(1 + random.random())
-
                 district_text = click_element(
                     global_driver,
                     wait,
@@ -568,8 +529,6 @@ def get_detail_category(
                     f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{district_idx + 1}]/a',
                 )
 
-                time.sleep(1 + random.random())
-
                 sub_district_text = click_element(
                     global_driver,
                     wait,
@@ -577,8 +536,6 @@ def get_detail_category(
                     f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{sub_district_idx + 1}]/a',
                 )
 
-                time.sleep(1 + random.random())
-
                 main_category_text = click_element(
                     global_driver,
                     wait,
@@ -586,8 +543,6 @@ def get_detail_category(
                     f'//*[@id="basicReport"]/div[5]/div[3]/div[2]/div/ul[{m_c_ul}]/li[{main_category_idx + 1}]',
                 )
 
-                time.sleep(1 + random.random())
-
                 sub_category_text = click_element(
                     global_driver,
                     wait,
@@ -646,741 +601,1001 @@ def search_commercial_district(
         for detail_category_idx in range(detail_category_count):
 
             try:
-                start_time = time.time()
+                crawl_detail_category(
+                    city_idx,
+                    district_idx,
+                    sub_district_idx,
+                    main_category_idx,
+                    sub_category_idx,
+                    detail_category_idx,
+                    m_c_ul,
+                )
+            except UnexpectedAlertPresentException:
+                handle_unexpected_alert(global_driver)
+            except Exception as e:
                 # print(
-                #     f"Execution started at: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))}"
+                #     f"Error processing {city_idx}, {district_idx}, {sub_district_idx}, {main_category_idx}, {sub_category_idx} : index {detail_category_idx}. {str(e)}"
                 # )
+                continue
+    except Exception as e:
+        # print(
+        #     f"Exception occurred search_commercial_district(), detail_category_idx: {detail_category_idx} {e}."
+        # )
+        return None
+    finally:
+        pass
 
-                global_driver.get(BIZ_MAP_URL)
-                wait = WebDriverWait(global_driver, 30)
-                global_driver.implicitly_wait(10)
-
-                # 분석 지역
-                click_element(
-                    global_driver,
-                    wait,
-                    By.XPATH,
-                    '//*[@id="pc_sheet01"]/div/div[2]/div[2]/ul/li[1]',
-                )
-
-                time.sleep(1 + random.random())
-
-                city_text = click_element(
-                    global_driver,
-                    wait,
-                    By.XPATH,
-                    f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{city_idx + 1}]',
-                )
 
-                time.sleep(1 + random.random())
+# 소분류 하나 조회 후 버퍼에 추가
+# 데이터가 있으면 True, 리포트/소분류가 없으면 False, 조회 실패는 예외
+def crawl_detail_category(
+    city_idx,
+    district_idx,
+    sub_district_idx,
+    main_category_idx,
+    sub_category_idx,
+    detail_category_idx,
+    m_c_ul,
+) -> bool:
+    setup_global_driver()
+    start_time = time.time()
+    # print(
+    #     f"Execution started at: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(start_time))}"
+    # )
+
+    adaptive_wait(global_driver).load_page(BIZ_MAP_URL)
+    wait = WebDriverWait(global_driver, 30)
+    global_driver.implicitly_wait(10)
+
+    # 분석 지역
+    click_element(
+        global_driver,
+        wait,
+        By.XPATH,
+        '//*[@id="pc_sheet01"]/div/div[2]/div[2]/ul/li[1]',
+    )
+
+    city_text = click_element(
+        global_driver,
+        wait,
+        By.XPATH,
+        f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{city_idx + 1}]',
+    )
+
+    district_text = click_element(
+        global_driver,
+        wait,
+        By.XPATH,
+        f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{district_idx + 1}]',
+    )
+
+    sub_district_text = click_element(
+        global_driver,
+        wait,
+        By.XPATH,
+        f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{sub_district_idx + 1}]',
+    )
+
+    main_category_text = click_element(
+        global_driver,
+        wait,
+        By.XPATH,
+        f'//*[@id="basicReport"]/div[5]/div[3]/div[2]/div/ul[{m_c_ul}]/li[{main_category_idx + 1}]',
+    )
+
+    sub_category_text = click_element(
+        global_driver,
+        wait,
+        By.XPATH,
+        f'//*[@id="basicReport"]/div[5]/div[3]/div[2]/div/ul[{m_c_ul + 1}]/ul/li[{sub_category_idx + 1}]',
+    )
+
+    detail_category_text = click_element(
+        global_driver,
+        wait,
+        By.XPATH,
+        f'//*[@id="basicReport"]/div[5]/div[3]/div[2]/div/ul[{m_c_ul + 1}]/ul/li[{sub_category_idx + 2}]/ul/li[{detail_category_idx + 1}]',
+    )
+
+    # id 를 못 가져오면 예외로 올려서 재시도 대상이 되도록 함
+    city_id = dimension_cache.city_id(city_text)
+    if city_id is None:
+        raise RuntimeError(f"Failed to get or create city ID: {city_text}")
+    # print(f"시/도: {city_text}, {city_id}")
+
+    district_id = dimension_cache.district_id(city_id, district_text)
+    if district_id is None:
+        raise RuntimeError(f"Failed to get or create district ID: {district_text}")
+    # print(f"시/군/구: {district_text}, {district_id}")
+
+    sub_district_id = dimension_cache.sub_district_id(
+        city_id, district_id, sub_district_text
+    )
+    if sub_district_id is None:
+        raise RuntimeError(f"Failed to get or create sub_district ID: {sub_district_text}")
+    # print(f"읍/면/동: {sub_district_text}, {sub_district_id}")
+
+    ###########################
+
+    main_category_id = dimension_cache.biz_main_category_id(main_category_text)
+    if main_category_id is None:
+        raise RuntimeError(f"Failed to get or create main category ID: {main_category_text}")
+
+    sub_category_id = dimension_cache.biz_sub_category_id(
+        main_category_id, sub_category_text
+    )
+    if sub_category_id is None:
+        raise RuntimeError(f"Failed to get or create sub-category ID: {sub_category_text}")
+
+    if detail_category_text:
+        detail_category_text = detail_category_text.replace(
+            "(확장 분석)", ""
+        ).strip()
+
+    detail_category_id = dimension_cache.biz_detail_category_id(
+        sub_category_id, detail_category_text
+    )
+    # if detail_category_id is None:
+    #     print("Failed to get or create detail category ID")
+
+    if detail_category_text:
+        # print(detail_category_text)
+
+        # '//*[@id="report1"]' 요소가 나타날 때까지 기다리기
+        try:
+            # 상권분석 보기
+            click_element(
+                global_driver, wait, By.XPATH, '//*[@id="pcBasicReport"]'
+            )
 
-                district_text = click_element(
-                    global_driver,
-                    wait,
-                    By.XPATH,
-                    f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{district_idx + 1}]',
+            wait.until(
+                EC.presence_of_element_located(
+                    (By.XPATH, '//*[@id="report1"]/div/div[3]/div/div')
                 )
+            )
+        except TimeoutException:
+            # print(f"Element not found: //*[@id='report1'] 없거나 안뜸")
+            return False
 
-                time.sleep(1 + random.random())
-
-                sub_district_text = click_element(
-                    global_driver,
-                    wait,
-                    By.XPATH,
-                    f'//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul/li[{sub_district_idx + 1}]',
-                )
+        wait = WebDriverWait(global_driver, 3)
 
-                time.sleep(1 + random.random())
+        # 분석 텍스트 보기 없애기
+        click_element(
+            global_driver,
+            wait,
+            By.XPATH,
+            '//*[@id="report1"]/div/div[4]/div[1]/div/div/div/div[1]/div[2]/label',
+        )
 
-                main_category_text = click_element(
-                    global_driver,
-                    wait,
-                    By.XPATH,
-                    f'//*[@id="basicReport"]/div[5]/div[3]/div[2]/div/ul[{m_c_ul}]/li[{main_category_idx + 1}]',
-                )
+        # 표 전제보기
+        click_element(
+            global_driver,
+            wait,
+            By.XPATH,
+            '//*[@id="report1"]/div/div[4]/div[1]/div/div/div/div[1]/div[1]/label',
+        )
 
-                time.sleep(1 + random.random())
+        # 밀집도 클릭
+        click_element(
+            global_driver,
+            wait,
+            By.XPATH,
+            '//*[@id="report1"]/div/div[3]/div/ul/li[2]',
+        )
 
-                sub_category_text = click_element(
-                    global_driver,
-                    wait,
-                    By.XPATH,
-                    f'//*[@id="basicReport"]/div[5]/div[3]/div[2]/div/ul[{m_c_ul + 1}]/ul/li[{sub_category_idx + 1}]',
-                )
+        # 전국 해당 업종수 밀집도 데이터
+        national_density = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s2"]/div[2]/div[2]/div/div[2]/table/tbody/tr[3]/td[2]',
+        )
 
-                time.sleep(1 + random.random())
+        # 해당 시/도, 해당 업종수 밀집도 데이터
+        city_density = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s2"]/div[2]/div[2]/div/div[2]/table/tbody/tr[3]/td[3]',
+        )
 
-                detail_category_text = click_element(
-                    global_driver,
-                    wait,
-                    By.XPATH,
-                    f'//*[@id="basicReport"]/div[5]/div[3]/div[2]/div/ul[{m_c_ul + 1}]/ul/li[{sub_category_idx + 2}]/ul/li[{detail_category_idx + 1}]',
-                )
+        # 해당 시/군/구, 해당 업종수 밀집도 데이터
+        district_density = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s2"]/div[2]/div[2]/div/div[2]/table/tbody/tr[3]/td[4]',
+        )
 
-                time.sleep(1 + random.random())
+        # 해당 읍/면/동, 해당 업종수 밀집도 데이터
+        sub_district_density = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s2"]/div[2]/div[2]/div/div[2]/table/tbody/tr[3]/td[5]',
+        )
 
-                try:
-                    city_id = get_or_create_city_id(city_text)
-                    if city_id is None:
-                        # print("Failed to get or create main city ID")
-                        continue
-                    # print(f"시/도: {city_text}, {city_id}")
+        # 시장규모 클릭
+        click_element(
+            global_driver,
+            wait,
+            By.XPATH,
+            '//*[@id="report1"]/div/div[3]/div/ul/li[3]',
+        )
 
-                    district_id = get_or_create_district_id(city_id, district_text)
-                    if district_id is None:
-                        # print("Failed to get or create district ID")
-                        continue
-                    # print(f"시/군/구: {district_text}, {district_id}")
+        # 해당지역 업종 총 시장규모(원) 제일 최신
+        market_size = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s3"]/div[2]/div[2]/div[2]/table/tbody/tr/td[7]',
+        )
 
-                    sub_district_id = get_or_create_sub_district_id(
-                        city_id, district_id, sub_district_text
-                    )
-                    if sub_district_id is None:
-                        # print("Failed to get or create sub_district ID")
-                        continue
-                    # print(f"읍/면/동: {sub_district_text}, {sub_district_id}")
+        # 결제단가 클릭
+        click_element(
+            global_driver,
+            wait,
+            By.XPATH,
+            '//*[@id="report1"]/div/div[3]/div/ul/li[6]',
+        )
 
-                except Exception as e:
-                    # print(f"시 구 동 조회 오류 : {e}")
-                    continue
+        # 해당지역 업종 결제단가(원)
+        average_payment = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s6"]/div[2]/div[2]/div[2]/table/tbody/tr[2]/td[7]',
+        )
 
-                ###########################
+        # 해당지역 업종 이용건수(건)
+        usage_count = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s6"]/div[2]/div[2]/div[2]/table/tbody/tr[1]/td[7]',
+        )
 
-                try:
-                    main_category_id = get_or_create_biz_main_category_id(
-                        main_category_text
-                    )
-                    if main_category_id is None:
-                        # print("Failed to get or create main category ID")
-                        continue
+        # 비용/수익통계 대분류:1 음식일때만
+        if main_category_id == 1:
+            # 비용/수익통계 클릭
+            click_element(
+                global_driver,
+                wait,
+                By.XPATH,
+                '//*[@id="report1"]/div/div[3]/div/ul/li[7]',
+            )
 
-                    sub_category_id = get_or_create_biz_sub_category_id(
-                        main_category_id, sub_category_text
-                    )
-                    if sub_category_id is None:
-                        # print("Failed to get or create sub-category ID")
-                        continue
+            # 해당지역 업종 점포당 매출규모(원)
+            average_sales = read_element(
+                wait,
+                By.XPATH,
+                '//*[@id="receipt1"]/div/div[2]/ul/li[1]/p[2]/b',
+            )
 
-                    if detail_category_text:
-                        detail_category_text = detail_category_text.replace(
-                            "(확장 분석)", ""
-                        ).strip()
+            # 해당지역 영업비용(원)
+            operating_cost = read_element(
+                wait,
+                By.XPATH,
+                '//*[@id="receipt1"]/div/div[2]/ul/li[2]/p[2]/b',
+            )
 
-                    detail_category_id = get_or_create_biz_detail_category_id(
-                        sub_category_id, detail_category_text
-                    )
-                    # if detail_category_id is None:
-                    #     print("Failed to get or create detail category ID")
+            # 식재료비(원)
+            food_cost = read_element(
+                wait,
+                By.XPATH,
+                '//*[@id="receipt1"]/div/div[2]/ul/li[3]/ul/li[1]/p[2]',
+            )
 
-                except Exception as e:
-                    # print(f"카테고리 조회 오류 : {e}")
-                    continue
+            # 고용인 인건비(원)
+            employee_cost = read_element(
+                wait,
+                By.XPATH,
+                '//*[@id="receipt1"]/div/div[2]/ul/li[3]/ul/li[2]/p[2]',
+            )
 
-                if detail_category_text:
-                    # print(detail_category_text)
+            # 임차료(원)
+            rental_cost = read_element(
+                wait,
+                By.XPATH,
+                '//*[@id="receipt1"]/div/div[2]/ul/li[3]/ul/li[3]/p[2]',
+            )
 
-                    time.sleep(1 + random.random())
+            # 세금(원)
+            tax_cost = read_element(
+                wait,
+                By.XPATH,
+                '//*[@id="receipt1"]/div/div[2]/ul/li[3]/ul/li[4]/p[2]',
+            )
 
-                    # '//*[@id="report1"]' 요소가 나타날 때까지 기다리기
-                    try:
-                        # 상권분석 보기
-                        click_element(
-                            global_driver, wait, By.XPATH, '//*[@id="pcBasicReport"]'
-                        )
+            # 가족 종사자 인건비(원)
+            family_employee_cost = read_element(
+                wait,
+                By.XPATH,
+                '//*[@id="receipt1"]/div/div[2]/ul/li[3]/ul/li[5]/p[2]',
+            )
 
-                        wait.until(
-                            EC.presence_of_element_located(
-                                (By.XPATH, '//*[@id="report1"]/div/div[3]/div/div')
-                            )
-                        )
-                    except TimeoutException:
-                        # print(f"Element not found: //*[@id='report1'] 없거나 안뜸")
-                        continue
+            # 대표자 인건비(원)
+            ceo_cost = read_element(
+                wait,
+                By.XPATH,
+                '//*[@id="receipt1"]/div/div[2]/ul/li[3]/ul/li[6]/p[2]',
+            )
 
-                    wait = WebDriverWait(global_driver, 3)
+            # 기타 인건비(원)
+            etc_cost = read_element(
+                wait,
+                By.XPATH,
+                '//*[@id="receipt1"]/div/div[2]/ul/li[3]/ul/li[7]/p[2]',
+            )
 
-                    # 분석 텍스트 보기 없애기
-                    click_element(
-                        global_driver,
-                        wait,
-                        By.XPATH,
-                        '//*[@id="report1"]/div/div[4]/div[1]/div/div/div/div[1]/div[2]/label',
-                    )
+            # 해당지역 평균 영업이익(원)
+            average_profit = read_element(
+                wait,
+                By.XPATH,
+                '//*[@id="receipt1"]/div/div[2]/ul/li[4]/p[2]/b',
+            )
+        else:
+            average_sales = 0
+            operating_cost = 0
+            food_cost = 0
+            employee_cost = 0
+            rental_cost = 0
+            tax_cost = 0
+            family_employee_cost = 0
+            ceo_cost = 0
+            etc_cost = 0
+            average_profit = 0
+
+        # 매출 비중 클릭
+        click_element(
+            global_driver,
+            wait,
+            By.XPATH,
+            '//*[@id="report1"]/div/div[3]/div/ul/li[8]',
+        )
 
-                    time.sleep(1 + random.random())
+        # 해당지역 업종 매출 요일별 (월요일 %)
+        avg_profit_per_mon = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s8"]/div[2]/div[2]/div[2]/table[1]/tbody/tr/td[2]',
+        )
 
-                    # 표 전제보기
-                    click_element(
-                        global_driver,
-                        wait,
-                        By.XPATH,
-                        '//*[@id="report1"]/div/div[4]/div[1]/div/div/div/div[1]/div[1]/label',
-                    )
+        # 해당지역 업종 매출 요일별 (화요일 %)
+        avg_profit_per_tue = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s8"]/div[2]/div[2]/div[2]/table[1]/tbody/tr/td[3]',
+        )
 
-                    time.sleep(1 + random.random())
+        # 해당지역 업종 매출 요일별 (수요일 %)
+        avg_profit_per_wed = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s8"]/div[2]/div[2]/div[2]/table[1]/tbody/tr/td[4]',
+        )
 
-                    # 밀집도 클릭
-                    click_element(
-                        global_driver,
-                        wait,
-                        By.XPATH,
-                        '//*[@id="report1"]/div/div[3]/div/ul/li[2]',
-                    )
+        # 해당지역 업종 매출 요일별 (목요일 %)
+        avg_profit_per_thu = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s8"]/div[2]/div[2]/div[2]/table[1]/tbody/tr/td[5]',
+        )
 
-                    time.sleep(1 + random.random())
+        # 해당지역 업종 매출 요일별 (금요일 %)
+        avg_profit_per_fri = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s8"]/div[2]/div[2]/div[2]/table[1]/tbody/tr/td[6]',
+        )
 
-                    # 전국 해당 업종수 밀집도 데이터
-                    national_density = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s2"]/div[2]/div[2]/div/div[2]/table/tbody/tr[3]/td[2]',
-                    )
+        # 해당지역 업종 매출 요일별 (토요일 %)
+        avg_profit_per_sat = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s8"]/div[2]/div[2]/div[2]/table[1]/tbody/tr/td[7]',
+        )
 
-                    time.sleep(1 + random.random())
+        # 해당지역 업종 매출 요일별 (일요일 %)
+        avg_profit_per_sun = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s8"]/div[2]/div[2]/div[2]/table[1]/tbody/tr/td[8]',
+        )
 
-                    # 해당 시/도, 해당 업종수 밀집도 데이터
-                    city_density = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s2"]/div[2]/div[2]/div/div[2]/table/tbody/tr[3]/td[3]',
-                    )
+        # 해당지역 업종 매출 시간별 (06 ~ 09  %)
+        avg_profit_per_06_09 = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s8"]/div[2]/div[2]/div[2]/table[2]/tbody/tr[2]/td[2]',
+        )
 
-                    # 해당 시/군/구, 해당 업종수 밀집도 데이터
-                    district_density = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s2"]/div[2]/div[2]/div/div[2]/table/tbody/tr[3]/td[4]',
-                    )
+        # 해당지역 업종 매출 시간별 (09 ~ 12  %)
+        avg_profit_per_09_12 = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s8"]/div[2]/div[2]/div[2]/table[2]/tbody/tr[2]/td[3]',
+        )
 
-                    # 해당 읍/면/동, 해당 업종수 밀집도 데이터
-                    sub_district_density = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s2"]/div[2]/div[2]/div/div[2]/table/tbody/tr[3]/td[5]',
-                    )
+        # 해당지역 업종 매출 시간별 (12 ~ 15  %)
+        avg_profit_per_12_15 = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s8"]/div[2]/div[2]/div[2]/table[2]/tbody/tr[2]/td[4]',
+        )
 
-                    # 시장규모 클릭
-                    click_element(
-                        global_driver,
-                        wait,
-                        By.XPATH,
-                        '//*[@id="report1"]/div/div[3]/div/ul/li[3]',
-                    )
+        # 해당지역 업종 매출 시간별 (15 ~ 18  %)
+        avg_profit_per_15_18 = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s8"]/div[2]/div[2]/div[2]/table[2]/tbody/tr[2]/td[5]',
+        )
 
-                    time.sleep(1 + random.random())
+        # 해당지역 업종 매출 시간별 (18 ~ 21  %)
+        avg_profit_per_18_21 = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s8"]/div[2]/div[2]/div[2]/table[2]/tbody/tr[2]/td[6]',
+        )
 
-                    # 해당지역 업종 총 시장규모(원) 제일 최신
-                    market_size = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s3"]/div[2]/div[2]/div[2]/table/tbody/tr/td[7]',
-                    )
+        # 해당지역 업종 매출 시간별 (21 ~ 24  %)
+        avg_profit_per_21_24 = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s8"]/div[2]/div[2]/div[2]/table[2]/tbody/tr[2]/td[7]',
+        )
 
-                    # 결제단가 클릭
-                    click_element(
-                        global_driver,
-                        wait,
-                        By.XPATH,
-                        '//*[@id="report1"]/div/div[3]/div/ul/li[6]',
-                    )
+        # 해당지역 업종 매출 시간별 (24 ~ 06  %)
+        avg_profit_per_24_06 = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s8"]/div[2]/div[2]/div[2]/table[2]/tbody/tr[2]/td[8]',
+        )
 
-                    time.sleep(1 + random.random())
+        # 고객 비중 클릭
+        click_element(
+            global_driver,
+            wait,
+            By.XPATH,
+            '//*[@id="report1"]/div/div[3]/div/ul/li[9]',
+        )
 
-                    # 해당지역 업종 결제단가(원)
-                    average_payment = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s6"]/div[2]/div[2]/div[2]/table/tbody/tr[2]/td[7]',
-                    )
+        # 남 20대
+        avg_client_per_m_20 = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[1]/td[2]',
+        )
 
-                    # 해당지역 업종 이용건수(건)
-                    usage_count = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s6"]/div[2]/div[2]/div[2]/table/tbody/tr[1]/td[7]',
-                    )
+        # 남 30대
+        avg_client_per_m_30 = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[1]/td[3]',
+        )
 
-                    # 비용/수익통계 대분류:1 음식일때만
-                    if main_category_id == 1:
-                        # 비용/수익통계 클릭
-                        click_element(
-                            global_driver,
-                            wait,
-                            By.XPATH,
-                            '//*[@id="report1"]/div/div[3]/div/ul/li[7]',
-                        )
+        # 남 40대
+        avg_client_per_m_40 = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[1]/td[4]',
+        )
 
-                        time.sleep(1 + random.random())
+        # 남 50대
+        avg_client_per_m_50 = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[1]/td[5]',
+        )
 
-                        # 해당지역 업종 점포당 매출규모(원)
-                        average_sales = read_element(
-                            wait,
-                            By.XPATH,
-                            '//*[@id="receipt1"]/div/div[2]/ul/li[1]/p[2]/b',
-                        )
+        # 남 60대 이상
+        avg_client_per_m_60 = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[1]/td[6]',
+        )
 
-                        # 해당지역 영업비용(원)
-                        operating_cost = read_element(
-                            wait,
-                            By.XPATH,
-                            '//*[@id="receipt1"]/div/div[2]/ul/li[2]/p[2]/b',
-                        )
+        # 여 20대
+        avg_client_per_f_20 = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[2]/td[2]',
+        )
 
-                        # 식재료비(원)
-                        food_cost = read_element(
-                            wait,
-                            By.XPATH,
-                            '//*[@id="receipt1"]/div/div[2]/ul/li[3]/ul/li[1]/p[2]',
-                        )
+        # 여 30대
+        avg_client_per_f_30 = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[2]/td[3]',
+        )
 
-                        # 고용인 인건비(원)
-                        employee_cost = read_element(
-                            wait,
-                            By.XPATH,
-                            '//*[@id="receipt1"]/div/div[2]/ul/li[3]/ul/li[2]/p[2]',
-                        )
+        # 여 40대
+        avg_client_per_f_40 = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[2]/td[4]',
+        )
 
-                        # 임차료(원)
-                        rental_cost = read_element(
-                            wait,
-                            By.XPATH,
-                            '//*[@id="receipt1"]/div/div[2]/ul/li[3]/ul/li[3]/p[2]',
-                        )
+        # 여 50대
+        avg_client_per_f_50 = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[2]/td[5]',
+        )
 
-                        # 세금(원)
-                        tax_cost = read_element(
-                            wait,
-                            By.XPATH,
-                            '//*[@id="receipt1"]/div/div[2]/ul/li[3]/ul/li[4]/p[2]',
-                        )
+        # 여 60대 이상
+        avg_client_per_f_60 = read_element(
+            wait,
+            By.XPATH,
+            '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[2]/td[6]',
+        )
 
-                        # 가족 종사자 인건비(원)
-                        family_employee_cost = read_element(
-                            wait,
-                            By.XPATH,
-                            '//*[@id="receipt1"]/div/div[2]/ul/li[3]/ul/li[5]/p[2]',
-                        )
+        top5_menu_elements = []
 
-                        # 대표자 인건비(원)
-                        ceo_cost = read_element(
-                            wait,
-                            By.XPATH,
-                            '//*[@id="receipt1"]/div/div[2]/ul/li[3]/ul/li[6]/p[2]',
-                        )
+        # 뜨는 메뉴 대분류: 음식일때만
+        if main_category_id == 1:
+            try:
+                # 주요 메뉴/뜨는 메뉴 클릭
+                click_element(
+                    global_driver,
+                    wait,
+                    By.XPATH,
+                    '//*[@id="report1"]/div/div[3]/div/ul/li[11]',
+                )
 
-                        # 기타 인건비(원)
-                        etc_cost = read_element(
-                            wait,
-                            By.XPATH,
-                            '//*[@id="receipt1"]/div/div[2]/ul/li[3]/ul/li[7]/p[2]',
-                        )
+                # 뜨는 메뉴 클릭
+                click_element(
+                    global_driver,
+                    wait,
+                    By.XPATH,
+                    '//*[@id="s11"]/div[2]/div[2]/div/div[1]/ul/li[2]/button',
+                )
 
-                        # 해당지역 평균 영업이익(원)
-                        average_profit = read_element(
-                            wait,
+                wait.until(
+                    EC.presence_of_element_located(
+                        (
                             By.XPATH,
-                            '//*[@id="receipt1"]/div/div[2]/ul/li[4]/p[2]/b',
+                            '//*[@id="s11"]/div[2]/div[2]',
                         )
-                    else:
-                        average_sales = 0
-                        operating_cost = 0
-                        food_cost = 0
-                        employee_cost = 0
-                        rental_cost = 0
-                        tax_cost = 0
-                        family_employee_cost = 0
-                        ceo_cost = 0
-                        etc_cost = 0
-                        average_profit = 0
-
-                    # 매출 비중 클릭
-                    click_element(
-                        global_driver,
-                        wait,
-                        By.XPATH,
-                        '//*[@id="report1"]/div/div[3]/div/ul/li[8]',
                     )
+                )
 
-                    time.sleep(1 + random.random())
-
-                    # 해당지역 업종 매출 요일별 (월요일 %)
-                    avg_profit_per_mon = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s8"]/div[2]/div[2]/div[2]/table[1]/tbody/tr/td[2]',
-                    )
+                for i in range(5):
+                    try:
+                        element = wait.until(
+                            EC.presence_of_element_located(
+                                (
+                                    By.XPATH,
+                                    f'//*[@id="popular_graph"]/div/div[2]/div[2]/table/tbody/tr[{i + 1}]/td[3]',
+                                )
+                            )
+                        )
+                        top5_menu_elements.append(element.text)
+                    except:
+                        top5_menu_elements.append(None)
+            except:
+                top5_menu_elements = [None] * 5
+        else:
+            top5_menu_elements = [None] * 5
+
+        top_menu_1 = top5_menu_elements[0]
+        top_menu_2 = top5_menu_elements[1]
+        top_menu_3 = top5_menu_elements[2]
+        top_menu_4 = top5_menu_elements[3]
+        top_menu_5 = top5_menu_elements[4]
+
+        data: CommercialDistrictInsert = {
+            "city_id": city_id,
+            "district_id": district_id,
+            "sub_district_id": sub_district_id,
+            ###
+            "biz_main_category_id": main_category_id,
+            "biz_sub_category_id": sub_category_id,
+            "biz_detail_category_id": detail_category_id,
+            ###
+            "national_density": convert_to_int_float(national_density)
+            or 0.0,
+            "city_density": convert_to_int_float(city_density) or 0.0,
+            "district_density": convert_to_int_float(district_density)
+            or 0.0,
+            "sub_district_density": convert_to_int_float(
+                sub_district_density
+            )
+            or 0.0,
+            ###
+            "market_size": convert_to_int_float(market_size) * 10000 or 0, # 원데이터로 저장
+            ###
+            "average_payment": convert_to_int_float(average_payment) or 0,
+            "usage_count": convert_to_int_float(usage_count) or 0,
+            ###
+            "average_sales": convert_to_int_float(average_sales) * 10000 or 0, # 원데이터로 저장
+            "operating_cost": convert_to_int_float(operating_cost) or 0,
+            "food_cost": convert_to_int_float(food_cost) or 0,
+            "employee_cost": convert_to_int_float(employee_cost) or 0,
+            "rental_cost": convert_to_int_float(rental_cost) or 0,
+            "tax_cost": convert_to_int_float(tax_cost) or 0,
+            "family_employee_cost": convert_to_int_float(
+                family_employee_cost
+            )
+            or 0,
+            "ceo_cost": convert_to_int_float(ceo_cost) or 0,
+            "etc_cost": convert_to_int_float(etc_cost) or 0,
+            "average_profit": convert_to_int_float(average_profit) or 0,
+            ###
+            "avg_profit_per_mon": convert_to_int_float(avg_profit_per_mon)
+            or 0.0,
+            "avg_profit_per_tue": convert_to_int_float(avg_profit_per_tue)
+            or 0.0,
+            "avg_profit_per_wed": convert_to_int_float(avg_profit_per_wed)
+            or 0.0,
+            "avg_profit_per_thu": convert_to_int_float(avg_profit_per_thu)
+            or 0.0,
+            "avg_profit_per_fri": convert_to_int_float(avg_profit_per_fri)
+            or 0.0,
+            "avg_profit_per_sat": convert_to_int_float(avg_profit_per_sat)
+            or 0.0,
+            "avg_profit_per_sun": convert_to_int_float(avg_profit_per_sun)
+            or 0.0,
+            ###
+            "avg_profit_per_06_09": convert_to_int_float(
+                avg_profit_per_06_09
+            )
+            or 0.0,
+            "avg_profit_per_09_12": convert_to_int_float(
+                avg_profit_per_09_12
+            )
+            or 0.0,
+            "avg_profit_per_12_15": convert_to_int_float(
+                avg_profit_per_12_15
+            )
+            or 0.0,
+            "avg_profit_per_15_18": convert_to_int_float(
+                avg_profit_per_15_18
+            )
+            or 0.0,
+            "avg_profit_per_18_21": convert_to_int_float(
+                avg_profit_per_18_21
+            )
+            or 0.0,
+            "avg_profit_per_21_24": convert_to_int_float(
+                avg_profit_per_21_24
+            )
+            or 0.0,
+            "avg_profit_per_24_06": convert_to_int_float(
+                avg_profit_per_24_06
+            )
+            or 0.0,
+            ###
+            "avg_client_per_m_20": convert_to_int_float(avg_client_per_m_20)
+            or 0.0,
+            "avg_client_per_m_30": convert_to_int_float(avg_client_per_m_30)
+            or 0.0,
+            "avg_client_per_m_40": convert_to_int_float(avg_client_per_m_40)
+            or 0.0,
+            "avg_client_per_m_50": convert_to_int_float(avg_client_per_m_50)
+            or 0.0,
+            "avg_client_per_m_60": convert_to_int_float(avg_client_per_m_60)
+            or 0.0,
+            "avg_client_per_f_20": convert_to_int_float(avg_client_per_f_20)
+            or 0.0,
+            "avg_client_per_f_30": convert_to_int_float(avg_client_per_f_30)
+            or 0.0,
+            "avg_client_per_f_40": convert_to_int_float(avg_client_per_f_40)
+            or 0.0,
+            "avg_client_per_f_50": convert_to_int_float(avg_client_per_f_50)
+            or 0.0,
+            "avg_client_per_f_60": convert_to_int_float(avg_client_per_f_60)
+            or 0.0,
+            ###
+            "top_menu_1": top_menu_1,
+            "top_menu_2": top_menu_2,
+            "top_menu_3": top_menu_3,
+            "top_menu_4": top_menu_4,
+            "top_menu_5": top_menu_5,
+            "y_m": "2024-11-30",
+        }
+
+        # print(data)
+
+        # 버퍼에만 넣고 인서트는 백그라운드에서 모아서 처리
+        commercial_district_writer.add(data)
 
-                    # 해당지역 업종 매출 요일별 (화요일 %)
-                    avg_profit_per_tue = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s8"]/div[2]/div[2]/div[2]/table[1]/tbody/tr/td[3]',
-                    )
+        end_time = time.time()
 
-                    # 해당지역 업종 매출 요일별 (수요일 %)
-                    avg_profit_per_wed = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s8"]/div[2]/div[2]/div[2]/table[1]/tbody/tr/td[4]',
-                    )
+        print(
+            f"Execution finished at: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(end_time))}"
+        )
 
-                    # 해당지역 업종 매출 요일별 (목요일 %)
-                    avg_profit_per_thu = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s8"]/div[2]/div[2]/div[2]/table[1]/tbody/tr/td[5]',
-                    )
+        print(f"Total execution time: {end_time - start_time} seconds")
+        return True
 
-                    # 해당지역 업종 매출 요일별 (금요일 %)
-                    avg_profit_per_fri = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s8"]/div[2]/div[2]/div[2]/table[1]/tbody/tr/td[6]',
-                    )
+    else:
+        print(
+            f"NO DATA : {city_text}, {district_text}, {sub_district_text}, {main_category_text}, {sub_category_text} : index {detail_category_idx}."
+        )
+        return False
 
-                    # 해당지역 업종 매출 요일별 (토요일 %)
-                    avg_profit_per_sat = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s8"]/div[2]/div[2]/div[2]/table[1]/tbody/tr/td[7]',
-                    )
 
-                    # 해당지역 업종 매출 요일별 (일요일 %)
-                    avg_profit_per_sun = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s8"]/div[2]/div[2]/div[2]/table[1]/tbody/tr/td[8]',
-                    )
+########## 작업 큐 기반 크롤링 (재개 가능) ##########
 
-                    # 해당지역 업종 매출 시간별 (06 ~ 09  %)
-                    avg_profit_per_06_09 = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s8"]/div[2]/div[2]/div[2]/table[2]/tbody/tr[2]/td[2]',
-                    )
+# 작업 단위: 시/도 -> 시/군/구 -> 읍/면/동 -> 대분류 -> 중분류 -> 소분류
+# 상위 단위는 하위 목록 갯수만 세서 하위 작업을 큐에 추가하고, 소분류 단위에서 실제 데이터를 수집한다.
+NICEBIZMAP_QUEUE_NAME = "nicebizmap_commercial_district"
+NICEBIZMAP_QUEUE_PATH = os.getenv(
+    "NICEBIZMAP_QUEUE_PATH",
+    os.path.join(os.path.dirname(__file__), "../data/crawl_queue/nicebizmap.sqlite3"),
+)
+NICEBIZMAP_QUEUE_WORKERS = int(os.getenv("NICEBIZMAP_QUEUE_WORKERS", "4"))
+# 가져갈 작업이 없을 때 다시 확인하기까지 대기 (다른 워커의 running 작업이 하위 작업을 추가할 수 있음)
+NICEBIZMAP_QUEUE_POLL_MIN_SECONDS = float(os.getenv("NICEBIZMAP_QUEUE_POLL_MIN_SECONDS", "1"))
+NICEBIZMAP_QUEUE_POLL_MAX_SECONDS = float(os.getenv("NICEBIZMAP_QUEUE_POLL_MAX_SECONDS", "30"))
+NICEBIZMAP_CITY_COUNT = 17  # 전국 17 시/도
 
-                    # 해당지역 업종 매출 시간별 (09 ~ 12  %)
-                    avg_profit_per_09_12 = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s8"]/div[2]/div[2]/div[2]/table[2]/tbody/tr[2]/td[3]',
-                    )
+REGION_LIST_XPATH = '//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul'
+MAIN_CATEGORY_LIST_XPATH = '//*[@id="basicReport"]/div[5]/div[3]/div[2]/div/ul[{m_c_ul}]'
+MAIN_CATEGORY_ULS = (1, 3)
 
-                    # 해당지역 업종 매출 시간별 (12 ~ 15  %)
-                    avg_profit_per_12_15 = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s8"]/div[2]/div[2]/div[2]/table[2]/tbody/tr[2]/td[4]',
-                    )
 
-                    # 해당지역 업종 매출 시간별 (15 ~ 18  %)
-                    avg_profit_per_15_18 = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s8"]/div[2]/div[2]/div[2]/table[2]/tbody/tr[2]/td[5]',
-                    )
+def get_crawl_job_queue() -> CrawlJobQueue:
+    return CrawlJobQueue(NICEBIZMAP_QUEUE_PATH, NICEBIZMAP_QUEUE_NAME)
 
-                    # 해당지역 업종 매출 시간별 (18 ~ 21  %)
-                    avg_profit_per_18_21 = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s8"]/div[2]/div[2]/div[2]/table[2]/tbody/tr[2]/td[6]',
-                    )
 
-                    # 해당지역 업종 매출 시간별 (21 ~ 24  %)
-                    avg_profit_per_21_24 = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s8"]/div[2]/div[2]/div[2]/table[2]/tbody/tr[2]/td[7]',
-                    )
+# 분석 페이지를 열고 주어진 단계까지 순서대로 클릭 (클릭 실패 시 예외)
+def open_biz_map_path(
+    city_idx,
+    district_idx=None,
+    sub_district_idx=None,
+    m_c_ul=None,
+    main_category_idx=None,
+    sub_category_idx=None,
+):
+    setup_global_driver()
+    adaptive_wait(global_driver).load_page(BIZ_MAP_URL)
+    wait = WebDriverWait(global_driver, 30)
+    global_driver.implicitly_wait(10)
+
+    # 분석 지역
+    xpaths = ['//*[@id="pc_sheet01"]/div/div[2]/div[2]/ul/li[1]/a']
+    for idx in (city_idx, district_idx, sub_district_idx):
+        if idx is None:
+            break
+        xpaths.append(f"{REGION_LIST_XPATH}/li[{idx + 1}]/a")
+    else:
+        if main_category_idx is not None:
+            xpaths.append(
+                f"{MAIN_CATEGORY_LIST_XPATH.format(m_c_ul=m_c_ul)}/li[{main_category_idx + 1}]"
+            )
+        if main_category_idx is not None and sub_category_idx is not None:
+            xpaths.append(
+                f'//*[@id="basicReport"]/div[5]/div[3]/div[2]/div/ul[{m_c_ul + 1}]/ul/li[{sub_category_idx + 1}]'
+            )
 
-                    # 해당지역 업종 매출 시간별 (24 ~ 06  %)
-                    avg_profit_per_24_06 = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s8"]/div[2]/div[2]/div[2]/table[2]/tbody/tr[2]/td[8]',
-                    )
+    for xpath in xpaths:
+        if not click_element(global_driver, wait, By.XPATH, xpath):
+            raise RuntimeError(f"Failed to click {xpath}")
+    return wait
 
-                    # 고객 비중 클릭
-                    click_element(
-                        global_driver,
-                        wait,
-                        By.XPATH,
-                        '//*[@id="report1"]/div/div[3]/div/ul/li[9]',
-                    )
 
-                    time.sleep(1 + random.random())
+def count_list_items(wait, by, value, item_by, item_value) -> int:
+    container = wait.until(EC.presence_of_element_located((by, value)))
+    return len(container.find_elements(item_by, item_value))
 
-                    # 남 20대
-                    avg_client_per_m_20 = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[1]/td[2]',
-                    )
 
-                    # 남 30대
-                    avg_client_per_m_30 = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[1]/td[3]',
-                    )
+def crawl_city_job(city_idx):
+    wait = open_biz_map_path(city_idx)
+    district_count = count_list_items(wait, By.XPATH, REGION_LIST_XPATH, By.TAG_NAME, "li")
+    return [
+        ("district", {"city_idx": city_idx, "district_idx": district_idx})
+        for district_idx in range(district_count)
+    ]
 
-                    # 남 40대
-                    avg_client_per_m_40 = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[1]/td[4]',
-                    )
 
-                    # 남 50대
-                    avg_client_per_m_50 = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[1]/td[5]',
-                    )
+def crawl_district_job(city_idx, district_idx):
+    wait = open_biz_map_path(city_idx, district_idx)
+    sub_district_count = count_list_items(wait, By.XPATH, REGION_LIST_XPATH, By.TAG_NAME, "li")
+    return [
+        (
+            "sub_district",
+            {"city_idx": city_idx, "district_idx": district_idx, "sub_district_idx": sub_district_idx},
+        )
+        for sub_district_idx in range(sub_district_count)
+    ]
 
-                    # 남 60대 이상
-                    avg_client_per_m_60 = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[1]/td[6]',
-                    )
 
-                    # 여 20대
-                    avg_client_per_f_20 = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[2]/td[2]',
-                    )
+def crawl_sub_district_job(city_idx, district_idx, sub_district_idx):
+    wait = open_biz_map_path(city_idx, district_idx, sub_district_idx)
+    children = []
+    # 대분류 목록이 ul[1], ul[3] 두 줄로 나뉘어 있어 한 페이지에서 같이 셈
+    for m_c_ul in MAIN_CATEGORY_ULS:
+        main_category_count = count_list_items(
+            wait, By.XPATH, MAIN_CATEGORY_LIST_XPATH.format(m_c_ul=m_c_ul), By.TAG_NAME, "li"
+        )
+        children.extend(
+            (
+                "main_category",
+                {
+                    "city_idx": city_idx,
+                    "district_idx": district_idx,
+                    "sub_district_idx": sub_district_idx,
+                    "m_c_ul": m_c_ul,
+                    "main_category_idx": main_category_idx,
+                },
+            )
+            for main_category_idx in range(main_category_count)
+        )
+    return children
+
+
+def crawl_main_category_job(city_idx, district_idx, sub_district_idx, m_c_ul, main_category_idx):
+    wait = open_biz_map_path(city_idx, district_idx, sub_district_idx, m_c_ul, main_category_idx)
+    sub_category_count = count_list_items(
+        wait,
+        By.CSS_SELECTOR,
+        "#basicReport ul.cate2 > ul",
+        By.CSS_SELECTOR,
+        "#basicReport  ul.cate2 > ul > li > button",
+    )
+    # 중분류 li 사이에 소분류 ul 이 끼어 있어 인덱스는 2 씩 증가
+    return [
+        (
+            "sub_category",
+            {
+                "city_idx": city_idx,
+                "district_idx": district_idx,
+                "sub_district_idx": sub_district_idx,
+                "m_c_ul": m_c_ul,
+                "main_category_idx": main_category_idx,
+                "sub_category_idx": sub_category_idx,
+            },
+        )
+        for sub_category_idx in range(0, sub_category_count * 2, 2)
+    ]
 
-                    # 여 30대
-                    avg_client_per_f_30 = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[2]/td[3]',
-                    )
 
-                    # 여 40대
-                    avg_client_per_f_40 = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[2]/td[4]',
-                    )
+def crawl_sub_category_job(
+    city_idx, district_idx, sub_district_idx, m_c_ul, main_category_idx, sub_category_idx
+):
+    wait = open_biz_map_path(
+        city_idx, district_idx, sub_district_idx, m_c_ul, main_category_idx, sub_category_idx
+    )
+    detail_category_count = count_list_items(
+        wait,
+        By.CSS_SELECTOR,
+        "#basicReport ul.cate3",
+        By.XPATH,
+        f'//*[@id="basicReport"]/div[5]/div[3]/div[2]/div/ul[{m_c_ul + 1}]/ul/li[{sub_category_idx + 2}]/ul/li',
+    )
+    return [
+        (
+            "detail_category",
+            {
+                "city_idx": city_idx,
+                "district_idx": district_idx,
+                "sub_district_idx": sub_district_idx,
+                "m_c_ul": m_c_ul,
+                "main_category_idx": main_category_idx,
+                "sub_category_idx": sub_category_idx,
+                "detail_category_idx": detail_category_idx,
+            },
+        )
+        for detail_category_idx in range(detail_category_count)
+    ]
 
-                    # 여 50대
-                    avg_client_per_f_50 = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[2]/td[5]',
-                    )
 
-                    # 여 60대 이상
-                    avg_client_per_f_60 = read_element(
-                        wait,
-                        By.XPATH,
-                        '//*[@id="s9"]/div[2]/div[2]/div[2]/table[1]/tbody/tr[2]/td[6]',
-                    )
+def crawl_detail_category_job(
+    city_idx,
+    district_idx,
+    sub_district_idx,
+    m_c_ul,
+    main_category_idx,
+    sub_category_idx,
+    detail_category_idx,
+):
+    crawl_detail_category(
+        city_idx,
+        district_idx,
+        sub_district_idx,
+        main_category_idx,
+        sub_category_idx,
+        detail_category_idx,
+        m_c_ul,
+    )
+    return []
+
+
+CRAWL_JOB_HANDLERS = {
+    "city": crawl_city_job,
+    "district": crawl_district_job,
+    "sub_district": crawl_sub_district_job,
+    "main_category": crawl_main_category_job,
+    "sub_category": crawl_sub_category_job,
+    "detail_category": crawl_detail_category_job,
+}
+
+
+# 시작할 시/도 작업 추가 (이미 있는 작업은 무시되므로 재실행해도 안전)
+def seed_crawl_jobs(city_indices=None) -> int:
+    city_indices = range(NICEBIZMAP_CITY_COUNT) if city_indices is None else city_indices
+    queue = get_crawl_job_queue()
+    try:
+        return queue.enqueue_many(("city", {"city_idx": city_idx}) for city_idx in city_indices)
+    finally:
+        queue.close()
+
+
+def run_crawl_worker(worker_idx):
+    worker = f"{os.getpid()}-{worker_idx}"
+    queue = get_crawl_job_queue()
+    # 소분류 작업은 버퍼가 DB 에 들어간 뒤에 완료 처리 (중간에 죽으면 lease 만료 후 재시도)
+    # 버퍼 기준(건수, 시간)과 같게 맞춰 lease 가 만료되기 전에 완료 처리됨
+    buffered_jobs = []
+    last_checkpoint = time.monotonic()
+
+    def checkpoint():
+        nonlocal last_checkpoint
+        commercial_district_writer.flush()
+        # 백그라운드 flush 실패도 포함 (인서트하지 못한 행이 있으면 완료 처리하지 않음)
+        failed = commercial_district_writer.take_failed_count()
+        if buffered_jobs:
+            if failed:
+                # 실패한 행이 어느 작업 것인지 알 수 없으므로 이번 구간 작업을 모두 다시 시도
+                # (인서트는 같은 키의 기존 행을 지우고 넣으므로 이미 들어간 행이 중복되지 않음)
+                for buffered_job in buffered_jobs:
+                    queue.fail(buffered_job, f"{failed} commercial_district rows failed to insert")
+            else:
+                queue.complete([buffered_job.job_id for buffered_job in buffered_jobs])
+            buffered_jobs.clear()
+        last_checkpoint = time.monotonic()
 
-                    top5_menu_elements = []
-
-                    # 뜨는 메뉴 대분류: 음식일때만
-                    if main_category_id == 1:
-                        try:
-                            # 주요 메뉴/뜨는 메뉴 클릭
-                            click_element(
-                                global_driver,
-                                wait,
-                                By.XPATH,
-                                '//*[@id="report1"]/div/div[3]/div/ul/li[11]',
-                            )
+    try:
+        poll_seconds = NICEBIZMAP_QUEUE_POLL_MIN_SECONDS
+        while True:
+            job = queue.claim(worker)
+            if job is None:
+                # 내가 들고 있는 작업부터 완료 처리하고, 남은 작업(pending/running)이 없을 때만 종료
+                checkpoint()
+                if not queue.has_unfinished():
+                    break
+                time.sleep(poll_seconds)
+                poll_seconds = min(poll_seconds * 2, NICEBIZMAP_QUEUE_POLL_MAX_SECONDS)
+                continue
+            poll_seconds = NICEBIZMAP_QUEUE_POLL_MIN_SECONDS
 
-                            time.sleep(1 + random.random())
+            try:
+                children = CRAWL_JOB_HANDLERS[job.job_kind](**job.job_key)
+            except UnexpectedAlertPresentException as e:
+                handle_unexpected_alert(global_driver)
+                queue.fail(job, repr(e))
+                continue
+            except Exception as e:
+                queue.fail(job, repr(e))
+                continue
 
-                            # 뜨는 메뉴 클릭
-                            click_element(
-                                global_driver,
-                                wait,
-                                By.XPATH,
-                                '//*[@id="s11"]/div[2]/div[2]/div/div[1]/ul/li[2]/button',
-                            )
+            if job.job_kind == "detail_category":
+                buffered_jobs.append(job)
+                if (
+                    len(buffered_jobs) >= commercial_district_writer.max_size
+                    or time.monotonic() - last_checkpoint >= commercial_district_writer.flush_interval
+                ):
+                    checkpoint()
+            else:
+                queue.complete([job.job_id], children)
+    finally:
+        checkpoint()
+        release_global_driver()
+        driver_pool.close()
+        queue.close()
 
-                            time.sleep(1 + random.random())
 
-                            wait.until(
-                                EC.presence_of_element_located(
-                                    (
-                                        By.XPATH,
-                                        '//*[@id="s11"]/div[2]/div[2]',
-                                    )
-                                )
-                            )
+@time_execution
+def execute_queue_crawl(workers: int = NICEBIZMAP_QUEUE_WORKERS, city_indices=None):
+    seed_crawl_jobs(city_indices)
 
-                            for i in range(5):
-                                try:
-                                    element = wait.until(
-                                        EC.presence_of_element_located(
-                                            (
-                                                By.XPATH,
-                                                f'//*[@id="popular_graph"]/div/div[2]/div[2]/table/tbody/tr[{i + 1}]/td[3]',
-                                            )
-                                        )
-                                    )
-                                    top5_menu_elements.append(element.text)
-                                except:
-                                    top5_menu_elements.append(None)
-                        except:
-                            top5_menu_elements = [None] * 5
-                    else:
-                        top5_menu_elements = [None] * 5
-
-                    top_menu_1 = top5_menu_elements[0]
-                    top_menu_2 = top5_menu_elements[1]
-                    top_menu_3 = top5_menu_elements[2]
-                    top_menu_4 = top5_menu_elements[3]
-                    top_menu_5 = top5_menu_elements[4]
-
-                    data: CommercialDistrictInsert = {
-                        "city_id": city_id,
-                        "district_id": district_id,
-                        "sub_district_id": sub_district_id,
-                        ###
-                        "biz_main_category_id": main_category_id,
-                        "biz_sub_category_id": sub_category_id,
-                        "biz_detail_category_id": detail_category_id,
-                        ###
-                        "national_density": convert_to_int_float(national_density)
-                        or 0.0,
-                        "city_density": convert_to_int_float(city_density) or 0.0,
-                        "district_density": convert_to_int_float(district_density)
-                        or 0.0,
-                        "sub_district_density": convert_to_int_float(
-                            sub_district_density
-                        )
-                        or 0.0,
-                        ###
-                        "market_size": convert_to_int_float(market_size) * 10000 or 0, # 원데이터로 저장
-                        ###
-                        "average_payment": convert_to_int_float(average_payment) or 0,
-                        "usage_count": convert_to_int_float(usage_count) or 0,
-                        ###
-                        "average_sales": convert_to_int_float(average_sales) * 10000 or 0, # 원데이터로 저장
-                        "operating_cost": convert_to_int_float(operating_cost) or 0,
-                        "food_cost": convert_to_int_float(food_cost) or 0,
-                        "employee_cost": convert_to_int_float(employee_cost) or 0,
-                        "rental_cost": convert_to_int_float(rental_cost) or 0,
-                        "tax_cost": convert_to_int_float(tax_cost) or 0,
-                        "family_employee_cost": convert_to_int_float(
-                            family_employee_cost
-                        )
-                        or 0,
-                        "ceo_cost": convert_to_int_float(ceo_cost) or 0,
-                        "etc_cost": convert_to_int_float(etc_cost) or 0,
-                        "average_profit": convert_to_int_float(average_profit) or 0,
-                        ###
-                        "avg_profit_per_mon": convert_to_int_float(avg_profit_per_mon)
-                        or 0.0,
-                        "avg_profit_per_tue": convert_to_int_float(avg_profit_per_tue)
-                        or 0.0,
-                        "avg_profit_per_wed": convert_to_int_float(avg_profit_per_wed)
-                        or 0.0,
-                        "avg_profit_per_thu": convert_to_int_float(avg_profit_per_thu)
-                        or 0.0,
-                        "avg_profit_per_fri": convert_to_int_float(avg_profit_per_fri)
-                        or 0.0,
-                        "avg_profit_per_sat": convert_to_int_float(avg_profit_per_sat)
-                        or 0.0,
-                        "avg_profit_per_sun": convert_to_int_float(avg_profit_per_sun)
-                        or 0.0,
-                        ###
-                        "avg_profit_per_06_09": convert_to_int_float(
-                            avg_profit_per_06_09
-                        )
-                        or 0.0,
-                        "avg_profit_per_09_12": convert_to_int_float(
-                            avg_profit_per_09_12
-                        )
-                        or 0.0,
-                        "avg_profit_per_12_15": convert_to_int_float(
-                            avg_profit_per_12_15
-                        )
-                        or 0.0,
-                        "avg_profit_per_15_18": convert_to_int_float(
-                            avg_profit_per_15_18
-                        )
-                        or 0.0,
-                        "avg_profit_per_18_21": convert_to_int_float(
-                            avg_profit_per_18_21
-                        )
-                        or 0.0,
-                        "avg_profit_per_21_24": convert_to_int_float(
-                            avg_profit_per_21_24
-                        )
-                        or 0.0,
-                        "avg_profit_per_24_06": convert_to_int_float(
-                            avg_profit_per_24_06
-                        )
-                        or 0.0,
-                        ###
-                        "avg_client_per_m_20": convert_to_int_float(avg_client_per_m_20)
-                        or 0.0,
-                        "avg_client_per_m_30": convert_to_int_float(avg_client_per_m_30)
-                        or 0.0,
-                        "avg_client_per_m_40": convert_to_int_float(avg_client_per_m_40)
-                        or 0.0,
-                        "avg_client_per_m_50": convert_to_int_float(avg_client_per_m_50)
-                        or 0.0,
-                        "avg_client_per_m_60": convert_to_int_float(avg_client_per_m_60)
-                        or 0.0,
-                        "avg_client_per_f_20": convert_to_int_float(avg_client_per_f_20)
-                        or 0.0,
-                        "avg_client_per_f_30": convert_to_int_float(avg_client_per_f_30)
-                        or 0.0,
-                        "avg_client_per_f_40": convert_to_int_float(avg_client_per_f_40)
-                        or 0.0,
-                        "avg_client_per_f_50": convert_to_int_float(avg_client_per_f_50)
-                        or 0.0,
-                        "avg_client_per_f_60": convert_to_int_float(avg_client_per_f_60)
-                        or 0.0,
-                        ###
-                        "top_menu_1": top_menu_1,
-                        "top_menu_2": top_menu_2,
-                        "top_menu_3": top_menu_3,
-                        "top_menu_4": top_menu_4,
-                        "top_menu_5": top_menu_5,
-                        "y_m": "2024-11-30",
-                    }
-
-                    # print(data)
-
-                    insert_commercial_district(data)
-
-                    end_time = time.time()
-
-                    print(
-                        f"Execution finished at: {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(end_time))}"
-                    )
+    # 시/구/동, 업종 id 캐시, ChromeDriver 경로 미리 로드 (fork 된 워커 프로세스가 그대로 물려받음)
+    preload_dimension_cache()
+    resolve_chromedriver_path()
 
-                    print(f"Total execution time: {end_time - start_time} seconds")
+    with Pool(processes=workers) as pool:
+        pool.map(run_crawl_worker, range(workers))
 
-                else:
-                    print(
-                        f"NO DATA : {city_text}, {district_text}, {sub_district_text}, {main_category_text}, {sub_category_text} : index {detail_category_idx}."
-                    )
-                    # continue
-            except UnexpectedAlertPresentException:
-                handle_unexpected_alert(wait._driver)
-            except Exception as e:
-                # print(
-                #     f"Error processing {city_text}, {district_text}, {sub_district_text}, {main_category_text}, {sub_category_text} : index {detail_category_idx}. {str(e)}"
-                # )
-                continue
-    except Exception as e:
-        # print(
-        #     f"Exception occurred search_commercial_district(), detail_category_idx: {detail_category_idx} {e}."
-        # )
-        return None
+    queue = get_crawl_job_queue()
+    try:
+        print(f"crawl job status: {queue.status_counts()}")
     finally:
-        pass
+        queue.close()
 
 
 # def calculate_optimal_workers():
@@ -1412,14 +1627,21 @@ def search_commercial_district(
 
 
 def execute_task_in_thread(value, max_workers):
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = [
-            # executor.submit(get_sub_district_count, 시/도 Index, value),
-            # executor.submit(get_sub_district_count, 0, value),
-            # executor.submit(get_district_count, value),
-        ]
-        for future in futures:
-            future.result()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = [
+                # executor.submit(get_sub_district_count, 시/도 Index, value),
+                # executor.submit(get_sub_district_count, 0, value),
+                # executor.submit(get_district_count, value),
+            ]
+            for future in futures:
+                future.result()
+    finally:
+        # Pool 종료 시 워커 프로세스가 강제 종료되므로 작업이 끝날 때(예외 포함) 남은 데이터 인서트
+        commercial_district_writer.flush()
+        # 같은 이유로 풀에 남은 브라우저도 여기서 종료
+        release_global_driver()
+        driver_pool.close()
 
 
 @time_execution
@@ -1460,12 +1682,19 @@ def execute_parallel_tasks():
     max_workers = len(values) + 2
     print(f"최종 max_workers: {max_workers}")
 
+    # 시/구/동, 업종 id 캐시, ChromeDriver 경로 미리 로드 (fork 된 워커 프로세스가 그대로 물려받음)
+    preload_dimension_cache()
+    resolve_chromedriver_path()
+
     with Pool(processes=max_workers) as pool:
         pool.starmap(execute_task_in_thread, [(value, max_workers) for value in values])
 
 
 if __name__ == "__main__":
-    execute_parallel_tasks()
+    # 작업 큐 기반 전국 크롤링 (중단 후 다시 실행하면 남은 작업부터 이어서 진행)
+    execute_queue_crawl()
+    # 시/도, 시/군/구 직접 지정 실행
+    # execute_parallel_tasks()
     print(f"상권분석 END")
 
     # 컴퓨터 종료 명령어 (운영체제에 따라 다름)
@@ -1,14 +1,10 @@
 import itertools
 from concurrent.futures import ThreadPoolExecutor, as_completed
-import os
 import time
 from typing import List, Dict
-from dotenv import load_dotenv
 import numpy as np
 from tqdm import tqdm
-import pymysql
 from pymysql.cursors import DictCursor
-from contextlib import contextmanager
 
 # 기존 import 문은 그대로 유지합니다
 from app.crud.commercial_district import (
@@ -27,39 +23,20 @@ from app.crud.commercial_district import (
     select_commercial_district_j_score_weight_average_data as crud_select_commercial_district_j_score_weight_average_data,
     insert_or_update_commercial_district_j_score_weight_average_data_batch as crud_insert_or_update_commercial_district_j_score_weight_average_data_batch,
 )
+from app.db.connect import get_db_connection
+from app.service.j_score import j_score_per, j_score_rank
 from app.schemas.commercial_district import (
     CommercialDistrictStatistics,
     CommercialDistrictSubDistrictDetailCategoryId,
     CommercialDistrictWeightedAvgStatistics,
 )
 
-load_dotenv()
-
-# 데이터베이스 연결 설정
-DB_CONFIG = {
-    "host": os.getenv("DB_HOST"),
-    "user": os.getenv("DB_USER"),
-    "password": os.getenv("DB_PASSWORD"),
-    "db": os.getenv("DB_DATABASE"),
-    "charset": "utf8mb4",
-    "cursorclass": DictCursor,
-}
-
-
-@contextmanager
-def get_db_connection():
-    connection = pymysql.connect(**DB_CONFIG)
-    try:
-        yield connection
-    finally:
-        connection.close()
-
 
 def batch_select_category_ids(
     biz_detail_category_ids: List[int],
 ) -> Dict[int, Dict[str, int]]:
     with get_db_connection() as connection:
-        with connection.cursor() as cursor:
+        with connection.cursor(DictCursor) as cursor:
             query = """
             SELECT 
                 bdc.BIZ_DETAIL_CATEGORY_ID,
@@ -92,40 +69,34 @@ def calculate_j_score(data):
         key=lambda x: x.biz_detail_category_id,  # biz_detail_category_id로만 그룹화
     ):
         group_data = list(group)  # 그룹화된 데이터를 리스트로 변환합니다.
-        counts = [
-            item.column_name for item in group_data
-        ]  # 각 그룹의 column_name를 추출합니다.
-        ranked_counts = sorted(
-            counts, reverse=True
-        )  # column_name를 내림차순으로 정렬합니다.
-        totals = len(counts)  # 그룹의 총 항목 수를 계산합니다.
-
-        # 각 항목에 대해 J-Score를 계산합니다.
-        for item in group_data:
-            column_name = item.column_name  # 컬럼값 가져옵니다.
-            if column_name > 0:
-                rank = ranked_counts.index(column_name) + 1  # 순위를 찾습니다.
-
-                j_score_rank = 10 * ((totals + 1 - rank) / totals)  # J-Score 계산
-
-                max_value = max([i.column_name for i in group_data])
-                j_score_per = 10 * (item.column_name / max_value)  # J-Score_Per 계산
-
-                j_score = (j_score_rank + j_score_per) / 2
-            else:
-                j_score_rank = 0  # 컬럼값 0일 경우 J-Score는 0
-                j_score_per = 0
-
+        counts = np.array(
+            [item.column_name for item in group_data], dtype=float
+        )  # 각 그룹의 column_name를 추출합니다.
+
+        # 그룹 전체에 대해 J-Score를 한 번에 계산합니다. (rank 는 내림차순 동점 최고 순위)
+        j_score_ranks = j_score_rank(counts)  # J-Score 계산
+        j_score_pers = j_score_per(counts, counts.max())  # J-Score_Per 계산
+        j_scores = (j_score_ranks + j_score_pers) / 2
+
+        # 컬럼값 0일 경우 J-Score는 0
+        has_value = counts > 0
+        j_score_ranks = np.where(has_value, j_score_ranks, 0)
+        j_score_pers = np.where(has_value, j_score_pers, 0)
+        j_scores = np.where(has_value, j_scores, 0)
+
+        for item, rank_score, per_score, score in zip(
+            group_data, j_score_ranks.tolist(), j_score_pers.tolist(), j_scores.tolist()
+        ):
             j_score_data.append(
                 (
                     item.city_id,  # 도시 ID
                     item.district_id,  # 구 ID
                     item.sub_district_id,  # 동 ID
                     biz_detail_category_id,  # 소분류 ID
-                    column_name,  # 시장 규모
-                    j_score_rank,  # J-Score Rank
-                    j_score_per,  # J-Score Percent
-                    j_score,  # J-Score 평균
+                    item.column_name,  # 시장 규모
+                    rank_score,  # J-Score Rank
+                    per_score,  # J-Score Percent
+                    score,  # J-Score 평균
                 )
             )
 
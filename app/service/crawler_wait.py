@@ -0,0 +1,231 @@
+import logging
+import os
+import random
+import threading
+import time
+import weakref
+from collections import defaultdict
+from typing import Callable, Dict, Optional, Set
+from urllib.parse import urlsplit
+
+from selenium.common.exceptions import (
+    StaleElementReferenceException,
+    TimeoutException,
+    WebDriverException,
+)
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+
+# 크롤러 공통 대기 모듈
+# 고정 sleep 대신 실제 준비 신호(요소 존재/클릭 가능, 텍스트 변경, 네트워크 유휴)를 기다리고,
+# 서버 응답 시간(지수 이동 평균)에 비례한 예의(politeness) 대기만 추가로 둔다.
+# 페이지 단위로 대기 시간을 집계해 로그로 남긴다.
+
+# 예의 대기 = clamp(측정 지연 * FACTOR, MIN, MAX) * (1 + random * JITTER)
+CRAWLER_POLITENESS_FACTOR = float(os.getenv("CRAWLER_POLITENESS_FACTOR", "0.5"))
+CRAWLER_POLITENESS_MIN_DELAY = float(os.getenv("CRAWLER_POLITENESS_MIN_DELAY", "0.2"))
+CRAWLER_POLITENESS_MAX_DELAY = float(os.getenv("CRAWLER_POLITENESS_MAX_DELAY", "3.0"))
+CRAWLER_POLITENESS_JITTER = float(os.getenv("CRAWLER_POLITENESS_JITTER", "0.5"))
+
+# 네트워크 유휴 판단: 진행 중인 요청이 없고 리소스 수가 IDLE_TIME 동안 변하지 않으면 유휴
+CRAWLER_NETWORK_IDLE_TIME = float(os.getenv("CRAWLER_NETWORK_IDLE_TIME", "0.5"))
+CRAWLER_NETWORK_IDLE_TIMEOUT = float(os.getenv("CRAWLER_NETWORK_IDLE_TIMEOUT", "30"))
+CRAWLER_WAIT_POLL_FREQUENCY = float(os.getenv("CRAWLER_WAIT_POLL_FREQUENCY", "0.1"))
+
+# 지연 시간 지수 이동 평균 가중치
+CRAWLER_LATENCY_SMOOTHING = 0.3
+
+NETWORK_ACTIVITY_SCRIPT = """
+return [
+    document.readyState,
+    window.jQuery ? window.jQuery.active : 0,
+    window.performance ? window.performance.getEntriesByType('resource').length : 0
+];
+"""
+
+
+# URL 의 origin (scheme://host[:port]), http(s) 가 아니면 None
+def url_origin(url: Optional[str]) -> Optional[str]:
+    parts = urlsplit(url or "")
+    if parts.scheme not in ("http", "https") or not parts.netloc:
+        return None
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+# 페이지 단위 대기 시간 집계
+class PageWaitStats:
+    def __init__(self, label: str):
+        self.label = label
+        self.started_at = time.monotonic()
+        self.seconds: Dict[str, float] = defaultdict(float)
+        self.counts: Dict[str, int] = defaultdict(int)
+
+    def record(self, kind: str, seconds: float) -> None:
+        self.seconds[kind] += seconds
+        self.counts[kind] += 1
+
+    def report(self) -> None:
+        elapsed = time.monotonic() - self.started_at
+        waited = sum(self.seconds.values())
+        details = ", ".join(
+            f"{kind}={seconds:.2f}s/{self.counts[kind]}"
+            for kind, seconds in sorted(self.seconds.items())
+        )
+        logging.getLogger(__name__).info(
+            f"[{self.label}] elapsed {elapsed:.2f}s, waiting {waited:.2f}s "
+            f"({waited / elapsed * 100 if elapsed else 0:.0f}%) {details}"
+        )
+
+
+# 네트워크 유휴 조건 (WebDriverWait.until 에 넘기는 callable)
+class network_idle:
+    def __init__(self, idle_time: float = CRAWLER_NETWORK_IDLE_TIME):
+        self.idle_time = idle_time
+        self.last_count = None
+        self.stable_since = None
+
+    def __call__(self, driver) -> bool:
+        ready_state, active_requests, resource_count = driver.execute_script(
+            NETWORK_ACTIVITY_SCRIPT
+        )
+        now = time.monotonic()
+        if ready_state != "complete" or active_requests:
+            self.last_count, self.stable_since = None, None
+            return False
+        if resource_count != self.last_count:
+            self.last_count, self.stable_since = resource_count, now
+            return False
+        return now - self.stable_since >= self.idle_time
+
+
+# 요소의 텍스트가 이전 값과 달라질 때까지 (달라진 텍스트 반환)
+# 목록이 제자리에서 갱신되는 화면에서 이전 내용을 읽지 않도록 사용 (예: 상승 업종 top5)
+class text_changed:
+    def __init__(self, locator, old_text: Optional[str]):
+        self.locator = locator
+        self.old_text = old_text
+
+    def __call__(self, driver):
+        try:
+            text = EC.presence_of_element_located(self.locator)(driver).text
+        except StaleElementReferenceException:
+            # 읽는 도중 요소가 다시 그려짐, 다음 폴링에서 확인
+            return False
+        if text != self.old_text:
+            return text
+        return False
+
+
+# 드라이버별 대기 상태 (지연 시간 평균, 현재 페이지 집계)
+class AdaptiveWait:
+    def __init__(self, driver):
+        self._driver = weakref.ref(driver)
+        self.latency: Optional[float] = None
+        self.page: Optional[PageWaitStats] = None
+        self.pages_loaded = 0
+        # load_page 로 방문한 origin (세션 초기화 시 스토리지 삭제 대상)
+        self.origins: Set[str] = set()
+
+    @property
+    def driver(self):
+        return self._driver()
+
+    def _record(self, kind: str, seconds: float) -> None:
+        if self.page is not None:
+            self.page.record(kind, seconds)
+
+    def _observe_latency(self, seconds: float) -> None:
+        if self.latency is None:
+            self.latency = seconds
+        else:
+            self.latency += CRAWLER_LATENCY_SMOOTHING * (seconds - self.latency)
+
+    # wait(WebDriverWait) 의 timeout 을 그대로 쓰면서 걸린 시간을 kind 로 기록
+    def until(self, wait: WebDriverWait, condition: Callable, kind: str = "element"):
+        start = time.monotonic()
+        try:
+            return wait.until(condition)
+        finally:
+            self._record(kind, time.monotonic() - start)
+
+    def wait_for(self, condition: Callable, timeout: float, kind: str = "element"):
+        wait = WebDriverWait(self.driver, timeout, poll_frequency=CRAWLER_WAIT_POLL_FREQUENCY)
+        return self.until(wait, condition, kind)
+
+    def wait_for_text_change(self, by, value, old_text: Optional[str], timeout: float = 10):
+        return self.wait_for(text_changed((by, value), old_text), timeout, "text_change")
+
+    # 네트워크 유휴까지 대기한 시간(초) 반환, 시간 초과는 경고만 남기고 진행
+    def wait_for_network_idle(self, timeout: float = CRAWLER_NETWORK_IDLE_TIMEOUT) -> float:
+        start = time.monotonic()
+        try:
+            self.wait_for(network_idle(), timeout, "network_idle")
+        except TimeoutException:
+            logging.getLogger(__name__).warning(
+                f"Network not idle after {timeout:.0f}s, continuing"
+            )
+        except WebDriverException as e:
+            logging.getLogger(__name__).warning(f"Network idle check failed: {e}")
+        # 유휴 판정에 필요한 관찰 시간은 서버 지연에서 제외
+        return max(time.monotonic() - start - CRAWLER_NETWORK_IDLE_TIME, 0.0)
+
+    def politeness_delay(self) -> float:
+        latency = self.latency if self.latency is not None else CRAWLER_POLITENESS_MIN_DELAY
+        delay = min(
+            max(latency * CRAWLER_POLITENESS_FACTOR, CRAWLER_POLITENESS_MIN_DELAY),
+            CRAWLER_POLITENESS_MAX_DELAY,
+        )
+        return delay * (1 + random.random() * CRAWLER_POLITENESS_JITTER)
+
+    def polite_pause(self) -> None:
+        delay = self.politeness_delay()
+        time.sleep(delay)
+        self._record("politeness", delay)
+
+    # 클릭/입력 등 동작 후: 네트워크 유휴까지 기다리고 측정 지연에 맞춰 예의 대기
+    def settle(self, timeout: float = CRAWLER_NETWORK_IDLE_TIMEOUT) -> None:
+        self._observe_latency(self.wait_for_network_idle(timeout))
+        self.polite_pause()
+
+    def start_page(self, label: str) -> None:
+        self.finish_page()
+        self.page = PageWaitStats(label)
+
+    def finish_page(self) -> None:
+        if self.page is not None:
+            self.page.report()
+            self.page = None
+
+    def load_page(self, url: str, label: Optional[str] = None) -> None:
+        self.start_page(label or url)
+        self.pages_loaded += 1
+        origin = url_origin(url)
+        if origin is not None:
+            self.origins.add(origin)
+        start = time.monotonic()
+        self.driver.get(url)
+        self._record("page_load", time.monotonic() - start)
+        self.settle()
+
+
+_adaptive_waits: "weakref.WeakKeyDictionary" = weakref.WeakKeyDictionary()
+_adaptive_waits_lock = threading.Lock()
+
+
+# 드라이버별 AdaptiveWait (드라이버가 정리되면 함께 정리됨)
+def adaptive_wait(driver) -> AdaptiveWait:
+    with _adaptive_waits_lock:
+        waiter = _adaptive_waits.get(driver)
+        if waiter is None:
+            waiter = AdaptiveWait(driver)
+            _adaptive_waits[driver] = waiter
+        return waiter
+
+
+# 드라이버 종료 전 마지막 페이지 집계 출력
+def finish_adaptive_wait(driver) -> None:
+    with _adaptive_waits_lock:
+        waiter = _adaptive_waits.pop(driver, None)
+    if waiter is not None:
+        waiter.finish_page()
@@ -1,11 +1,16 @@
+import hashlib
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Tuple
+
 import pandas as pd
 import os
 from dotenv import load_dotenv
 from app.db.connect import *
-from app.crud.crime import insert_crime_data
+from app.crud.crime import insert_crime_data_batch
 
 
-# csv 파일 인서트 
+# csv 파일 인서트
 
 CITY_MAPPING = {
     "강원": 1,
@@ -27,70 +32,153 @@ CITY_MAPPING = {
     "충북": 17,
 }
 
+CRIME_QUARTERS = ['2023.1/4', '2023.2/4', '2023.3/4', '2023.4/4',
+                  '2024.1/4', '2024.2/4']
+CRIME_COLUMNS = ['MajorCategory', 'MinorCategory', 'IncidentCount', 'ArrestCount', 'ArrestRatio', 'ArrestPersonnel', 'LegalEntity']
+CRIME_NUMERIC_COLUMNS = ['IncidentCount', 'ArrestCount', 'ArrestRatio', 'ArrestPersonnel', 'LegalEntity']
+# 경기남부/경기북부 합산 시 더하는 컬럼 (ArrestRatio 는 합산 후 재계산)
+CRIME_SUM_COLUMNS = ['IncidentCount', 'ArrestCount', 'ArrestPersonnel', 'LegalEntity']
+
+# 엑셀 파싱 결과 캐시 (파일 내용 해시별 pickle, 파일이 바뀌지 않았으면 엑셀을 다시 읽지 않음)
+CRIME_CACHE_DIR = os.getenv("CRIME_CACHE_DIR", os.path.join("app", "data", "crime_cache"))
+CRIME_PARSE_WORKERS = int(os.getenv("CRIME_PARSE_WORKERS", os.cpu_count() or 1))
+# 파싱 방식(분기, 컬럼)이 바뀌면 올려서 이전 캐시를 무시
+CRIME_CACHE_VERSION = 1
+
+
+def file_sha1(file_path: str) -> str:
+    sha1 = hashlib.sha1()
+    with open(file_path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            sha1.update(chunk)
+    return sha1.hexdigest()
+
+
+def crime_city_name(file: str) -> str:
+    # 파일 이름에서 도시명 추출
+    city_name_part = file.split('_')[4]  # "서울청", "경기남부청" 부분 추출
+    return city_name_part.replace('청', '')  # "서울", "경기남부", "경기북부" 등으로 변환
+
+
+# 엑셀 파일 하나를 분기별 데이터프레임으로 (프로세스 풀에서 실행)
+def parse_crime_workbook(file_path: str) -> Dict[str, pd.DataFrame]:
+    # 엑셀 파일을 DataFrame으로 로드 (첫 행을 무시)
+    df = pd.read_excel(file_path)
+    df = df.iloc[1:]  # 첫 번째 행 제거
+
+    quarter_dfs = {}
+    for quarter in CRIME_QUARTERS:
+        cols = ['죄종별(1)', '죄종별(2)', quarter, f'{quarter}.1', f'{quarter}.2', f'{quarter}.3', f'{quarter}.4']
+        if all(col in df.columns for col in cols):  # 분기에 해당하는 컬럼이 모두 존재할 경우
+            quarter_df = df[cols].copy()
+            quarter_df.columns = CRIME_COLUMNS
+
+            # 숫자형 컬럼들을 명시적으로 변환
+            for col in CRIME_NUMERIC_COLUMNS:
+                quarter_df[col] = pd.to_numeric(quarter_df[col], errors='coerce')
+
+            quarter_dfs[quarter] = quarter_df
+    return quarter_dfs
+
+
+def crime_cache_path(file_hash: str, cache_dir: str = CRIME_CACHE_DIR) -> str:
+    return os.path.join(cache_dir, f"{file_hash}_v{CRIME_CACHE_VERSION}.pkl")
+
+
+def load_cached_crime_workbook(file_hash: str, cache_dir: str = CRIME_CACHE_DIR) -> Optional[Dict[str, pd.DataFrame]]:
+    path = crime_cache_path(file_hash, cache_dir)
+    if not os.path.exists(path):
+        return None
+    try:
+        return pd.read_pickle(path)
+    except Exception as e:
+        logging.getLogger(__name__).warning(f"Ignoring broken crime cache {path}: {e}")
+        return None
+
+
+def save_cached_crime_workbook(file_hash: str, quarter_dfs: Dict[str, pd.DataFrame], cache_dir: str = CRIME_CACHE_DIR) -> None:
+    os.makedirs(cache_dir, exist_ok=True)
+    path = crime_cache_path(file_hash, cache_dir)
+    # 다른 실행이 읽는 중에 덮어쓰지 않도록 임시 파일에 쓰고 교체
+    tmp_path = f"{path}.{os.getpid()}.tmp"
+    pd.to_pickle(quarter_dfs, tmp_path)
+    os.replace(tmp_path, path)
+
+
+# 캐시에 없는 파일만 프로세스 풀에서 파싱, {파일명: {분기: df}}
+def load_crime_workbooks(excel_file_path: str, files: List[str], cache_dir: str = CRIME_CACHE_DIR) -> Dict[str, Dict[str, pd.DataFrame]]:
+    logger = logging.getLogger(__name__)
+    workbooks = {}
+    missing: List[Tuple[str, str]] = []
+
+    for file in files:
+        file_hash = file_sha1(os.path.join(excel_file_path, file))
+        cached = load_cached_crime_workbook(file_hash, cache_dir)
+        if cached is None:
+            missing.append((file, file_hash))
+        else:
+            workbooks[file] = cached
+
+    logger.info(f"Crime workbooks: {len(workbooks)} cached, {len(missing)} to parse")
+    if missing:
+        with ProcessPoolExecutor(max_workers=min(CRIME_PARSE_WORKERS, len(missing))) as executor:
+            parsed = executor.map(
+                parse_crime_workbook,
+                [os.path.join(excel_file_path, file) for file, _ in missing],
+            )
+            for (file, file_hash), quarter_dfs in zip(missing, parsed):
+                save_cached_crime_workbook(file_hash, quarter_dfs, cache_dir)
+                workbooks[file] = quarter_dfs
+
+    return workbooks
+
 
 def process_crime_data():
     # .env 파일에서 환경 변수 로드
     load_dotenv()
 
-    # MySQL 연결 설정
-    connection = get_db_connection()
-
     # ROOT_PATH 가져오기
     root_path = os.getenv('ROOT_PATH')
 
     # 엑셀 파일 경로 설정
     excel_file_path = os.path.join(root_path, 'app', 'data', 'crimeData')
+    cache_dir = os.path.join(root_path, CRIME_CACHE_DIR)
+
+    # 폴더 내 모든 .xlsx 파일 찾기 (순서를 고정해 경기남부/경기북부 합산 순서가 매번 같도록)
+    files = sorted(f for f in os.listdir(excel_file_path) if f.endswith(".xlsx"))
 
-    # 폴더 내 모든 .xlsx 파일 찾기
-    files = [f for f in os.listdir(excel_file_path) if f.endswith(".xlsx")]
+    workbooks = load_crime_workbooks(excel_file_path, files, cache_dir)
 
     combined_df = {}
+    # (city_id, quarter, df) 를 모아서 한 번에 인서트
+    crime_frames = []
+
+    for file in files:
+        city_name = crime_city_name(file)
+        city_id = CITY_MAPPING.get(city_name, 0)
+
+        for quarter, quarter_df in workbooks[file].items():
+            # 경기남부와 경기북부를 합치기
+            if city_name in ['경기남부', '경기북부']:
+                if quarter not in combined_df:
+                    combined_df[quarter] = quarter_df.copy()
+                else:
+                    # 숫자형 컬럼만 합산 (ArrestRatio 제외)
+                    combined_df[quarter][CRIME_SUM_COLUMNS] += quarter_df[CRIME_SUM_COLUMNS]
+
+                    # 발생건수와 검거건수 합산 후, ArrestRatio 재계산
+                    combined_df[quarter]['ArrestRatio'] = (combined_df[quarter]['ArrestCount'] / combined_df[quarter]['IncidentCount']) * 100
+            else:
+                crime_frames.append((city_id, quarter, quarter_df))
+
+    # 합산된 경기 데이터
+    for quarter, df in combined_df.items():
+        crime_frames.append((CITY_MAPPING['경기'], quarter, df))
 
+    # MySQL 연결 설정
+    connection = get_db_connection()
     try:
-        for file in files:
-            file_path = os.path.join(excel_file_path, file)
-            
-            # 파일 이름에서 도시명 추출
-            city_name_part = file.split('_')[4]  # "서울청", "경기남부청" 부분 추출
-            city_name = city_name_part.replace('청', '')  # "서울", "경기남부", "경기북부" 등으로 변환
-
-            city_id = CITY_MAPPING.get(city_name, 0)
-
-            # 엑셀 파일을 DataFrame으로 로드 (첫 행을 무시)
-            df = pd.read_excel(file_path)
-            df = df.iloc[1:]  # 첫 번째 행 제거
-
-            # 분기별 데이터프레임 생성
-            quarters = ['2023.1/4', '2023.2/4', '2023.3/4', '2023.4/4', 
-                        '2024.1/4', '2024.2/4']
-            
-            for quarter in quarters:
-                cols = ['죄종별(1)', '죄종별(2)', quarter, f'{quarter}.1', f'{quarter}.2', f'{quarter}.3', f'{quarter}.4']
-                if all(col in df.columns for col in cols):  # 분기에 해당하는 컬럼이 모두 존재할 경우
-                    quarter_df = df[cols].copy()
-                    quarter_df.columns = ['MajorCategory', 'MinorCategory', 'IncidentCount', 'ArrestCount', 'ArrestRatio', 'ArrestPersonnel', 'LegalEntity']
-
-                    # 숫자형 컬럼들을 명시적으로 변환
-                    for col in ['IncidentCount', 'ArrestCount', 'ArrestRatio', 'ArrestPersonnel', 'LegalEntity']:
-                        quarter_df[col] = pd.to_numeric(quarter_df[col], errors='coerce')
-
-                    # 경기남부와 경기북부를 합치기
-                    if city_name in ['경기남부', '경기북부']:
-                        if quarter not in combined_df:
-                            combined_df[quarter] = quarter_df
-                        else:
-                            # 숫자형 컬럼만 합산 (ArrestRatio 제외)
-                            combined_df[quarter][['IncidentCount', 'ArrestCount', 'ArrestPersonnel', 'LegalEntity']] += quarter_df[['IncidentCount', 'ArrestCount', 'ArrestPersonnel', 'LegalEntity']]
-                            
-                            # 발생건수와 검거건수 합산 후, ArrestRatio 재계산
-                            combined_df[quarter]['ArrestRatio'] = (combined_df[quarter]['ArrestCount'] / combined_df[quarter]['IncidentCount']) * 100
-                    else:
-                        insert_crime_data(connection, quarter_df, city_id, quarter)
-
-        # 합산된 경기 데이터 삽입
-        for quarter, df in combined_df.items():
-            insert_crime_data(connection, df, CITY_MAPPING['경기'], quarter)
-
+        insert_crime_data_batch(connection, crime_frames)
     finally:
         close_connection(connection)
 
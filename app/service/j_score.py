@@ -0,0 +1,64 @@
+from typing import Optional
+import numpy as np
+
+
+# J-Score 공통 계산 모듈
+# 기존 sorted_values.index(value) + 1 (내림차순 첫 등장 위치 = 동점은 가장 높은 순위) 방식과
+# 같은 결과를 정렬 + 이진 탐색으로 배열 단위 O(n log n) 에 계산한다
+
+
+# 내림차순 기준 순위 (동점은 같은 최고 순위, 1부터 시작)
+def rank_descending(values, population=None) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    population = values if population is None else np.asarray(population, dtype=float)
+
+    # population 중 value 보다 큰 값의 개수 + 1 = 내림차순 리스트에서 첫 등장 위치 + 1
+    population_ascending = np.sort(population)
+    greater_counts = len(population_ascending) - np.searchsorted(population_ascending, values, side="right")
+    return greater_counts + 1
+
+
+# 순위 기반 J-Score: 10 * ((n + 1 - rank) / n)
+def j_score_rank(values, population=None) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    population = values if population is None else np.asarray(population, dtype=float)
+    totals = len(population)
+    if totals == 0:
+        return np.zeros(len(values))
+
+    rank = rank_descending(values, population)
+    return 10 * ((totals + 1 - rank) / totals)
+
+
+# 최대값 대비 비율 J-Score: (value / max_value) * 10, max_value 가 0 이하면 0
+def j_score_per(values, max_value: Optional[float] = None) -> np.ndarray:
+    values = np.asarray(values, dtype=float)
+    if max_value is None:
+        max_value = values.max() if len(values) else 0
+    if max_value > 0:
+        return (values / max_value) * 10
+    return np.zeros(len(values))
+
+
+# 내림차순 정렬값에서 이상치가 아닌 위치 마스크
+# 인접한 값과의 차이가 stddev 보다 크면 앞쪽 값을 이상치로 보고 최대 limit 개까지 제거
+# (limit 개를 채운 직후의 값 하나는 기존 로직과 동일하게 제외됨)
+def non_outlier_mask(values_sorted_desc, stddev: float, limit: int = 3) -> np.ndarray:
+    values_sorted_desc = np.asarray(values_sorted_desc, dtype=float)
+    mask = np.ones(len(values_sorted_desc), dtype=bool)
+    if len(values_sorted_desc) < 2:
+        return mask
+
+    gaps = values_sorted_desc[:-1] - values_sorted_desc[1:]
+    outlier_positions = np.flatnonzero(gaps > stddev)[:limit]
+    mask[outlier_positions] = False
+
+    if len(outlier_positions) == limit and limit > 0:
+        mask[outlier_positions[-1] + 1] = False
+    return mask
+
+
+# 이상치 제거 후 값 (내림차순)
+def trim_outliers(values, stddev: float, limit: int = 3) -> np.ndarray:
+    values_sorted_desc = np.sort(np.asarray(values, dtype=float))[::-1]
+    return values_sorted_desc[non_outlier_mask(values_sorted_desc, stddev, limit)]
@@ -1,21 +1,20 @@
 import pymysql
 from openpyxl import load_workbook
-from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver import ActionChains
 from selenium.webdriver.common.by import By
 from datetime import datetime
-import os, time
+import os
 from tqdm import tqdm
 import sys
 from app.crud.loc_info import *
+from app.service.crawler_wait import adaptive_wait
+from app.service.webdriver_pool import WebDriverPool
 from datetime import datetime
 
 
@@ -23,6 +22,14 @@ from datetime import datetime
 sys.path.append(os.path.join(os.path.dirname(__file__), "../../"))
 from app.db.connect import get_db_connection, close_connection
 
+# 스레드 10개가 나눠 쓰는 드라이버 풀
+loc_info_driver_pool = WebDriverPool(
+    size=10,
+    arguments=("--no-sandbox", "--disable-dev-shm-usage", "--disable-gpu", "--window-size=1920,1080"),
+    # 매 지역마다 안내 팝업부터 다시 닫으므로 세션은 초기화해서 반납
+    reset_on_release=True,
+)
+
 
 def crawl_keyword(region_data, connection):
 
@@ -30,19 +37,13 @@ def crawl_keyword(region_data, connection):
     reference_id = 3
     year_month = datetime(2024, 12, 1).date()
 
-    # 글로벌 드라이버 사용
-    options = Options()
-    options.add_argument("--start-fullscreen")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--disable-gpu") 
-
-    # WebDriver Manager를 이용해 ChromeDriver 자동 관리
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
+    # 풀에서 미리 띄워둔 드라이버 사용
+    driver = loc_info_driver_pool.acquire()
+    discard_driver = False
+    waiter = adaptive_wait(driver)
 
     try:
-        driver.get("https://sg.sbiz.or.kr/godo/index.sg")
+        waiter.load_page("https://sg.sbiz.or.kr/godo/index.sg", region_data['keyword'])
 
         # 첫 번째 팝업창 제거
         WebDriverWait(driver, 30).until(
@@ -118,16 +119,14 @@ def crawl_keyword(region_data, connection):
             full_keyword = full_keyword.replace(",", ".")
 
         last_keyword = full_keyword.split()[-1]
-        time.sleep(20)
+        waiter.settle(timeout=120)
         WebDriverWait(driver, 120).until(
             EC.presence_of_element_located((By.ID, "adrsDiv"))
         )
 
         # 'adrsDiv' 아래의 span 태그 중에서 텍스트가 region_data['keyword'] 또는 last_keyword와 일치하는 요소를 찾음
         adrs_div = driver.find_element(By.ID, "adrsDiv")
-        time.sleep(0.5)
         span_elements = adrs_div.find_elements(By.TAG_NAME, "span")
-        time.sleep(0.5)
         for span in span_elements:
             span_text = span.text.replace(" ", "")
             full_keyword_no_space = full_keyword.replace(" ", "")
@@ -137,7 +136,7 @@ def crawl_keyword(region_data, connection):
         else:
             print("No matching location found in adrsDiv")
         
-        time.sleep(20)
+        waiter.settle(timeout=60)
         
         # 초기 위치에서 div[@class='cell'] 검색 시도
         div_content = None
@@ -165,7 +164,7 @@ def crawl_keyword(region_data, connection):
                 zoom_out_button = driver.find_element(By.CSS_SELECTOR, "#container > div.custom_zoomcontrol > div:nth-child(3) > a:nth-child(2)")
                 driver.execute_script("arguments[0].scrollIntoView();", zoom_out_button)
                 driver.execute_script("arguments[0].click();", zoom_out_button)
-                time.sleep(20)  # 잠깐 대기
+                waiter.settle()  # 지도 데이터 로딩 대기
 
                 # 다시 검색 시도
                 WebDriverWait(driver, 30).until(
@@ -186,9 +185,9 @@ def crawl_keyword(region_data, connection):
                     zoom_in_button = driver.find_element(By.CSS_SELECTOR, "#container > div.custom_zoomcontrol > div:nth-child(3) > a:nth-child(1)")
                     driver.execute_script("arguments[0].scrollIntoView();", zoom_in_button)
                     driver.execute_script("arguments[0].click();", zoom_in_button)
-                    time.sleep(20)  # 잠깐 대기
+                    waiter.settle()  # 지도 데이터 로딩 대기
                     driver.execute_script("arguments[0].click();", zoom_in_button)
-                    time.sleep(20)  # 잠깐 대기
+                    waiter.settle()  # 지도 데이터 로딩 대기
 
                     # 다시 검색 시도
                     WebDriverWait(driver, 30).until(
@@ -213,9 +212,9 @@ def crawl_keyword(region_data, connection):
                     zoom_in_button = driver.find_element(By.CSS_SELECTOR, "#container > div.custom_zoomcontrol > div:nth-child(3) > a:nth-child(2)")
                     driver.execute_script("arguments[0].scrollIntoView();", zoom_in_button)
                     driver.execute_script("arguments[0].click();", zoom_in_button)
-                    time.sleep(1)  # 잠깐 대기
+                    waiter.settle()  # 지도 데이터 로딩 대기
                     driver.execute_script("arguments[0].click();", zoom_in_button)
-                    time.sleep(1)  # 잠깐 대기
+                    waiter.settle()  # 지도 데이터 로딩 대기
 
                     # 다시 검색 시도
                     WebDriverWait(driver, 60).until(
@@ -277,8 +276,13 @@ def crawl_keyword(region_data, connection):
             connection.rollback()
             raise e
 
+    except WebDriverException:
+        # 세션이 깨진 드라이버는 풀에 돌려놓지 않음
+        discard_driver = True
+        raise
+
     finally:
-        driver.quit()
+        loc_info_driver_pool.release(driver, discard=discard_driver)
 
 
 
@@ -333,11 +337,15 @@ def process_keywords_from_db():
     # keyword_list = fetch_test_keywords_from_db()
     missing_list = find_missing_list()
 
+    # 스레드 수만큼 브라우저를 미리 띄워둠
+    loc_info_driver_pool.prewarm()
 
     with ThreadPoolExecutor(max_workers=10) as executor:
         # process_file_directly를 실행하는 스레드를 5개 병렬로 처리
         executor.map(lambda region: process_file_directly([region]), missing_list)
 
+    loc_info_driver_pool.close()
+
 
 def find_missing_list():
     # 두 테이블에서 데이터를 가져오기
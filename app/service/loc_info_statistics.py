@@ -1,24 +1,17 @@
 from app.crud.sub_district import (
     select_all_region_id,
-    select_city_id_sub_district_id,
-    select_district_id_sub_district_id
 )
 from app.crud.loc_info_statistics import (
-    select_nation_loc_info_by_region,
-    select_city_loc_info_by_region,
-    select_district_loc_info_by_region,
+    select_loc_info_by_all_regions,
     insert_loc_info_statistics,
-    select_loc_info_j_score_rank,
-    select_mz_j_score_rank,
-    select_loc_info_j_score_per,
-    select_mz_j_score_per,
-    select_loc_info_j_score_per_non_outliers,
-    select_mz_j_score_per_non_outliers,
+    select_loc_info_j_score_components,
+    select_mz_j_score_components,
     insert_loc_info_statistics_avg_j_score
 )
 from app.db.connect import (
     get_db_connection,
 )
+from app.service.j_score import j_score_per, j_score_rank, non_outlier_mask
 from concurrent.futures import ThreadPoolExecutor, as_completed
 import numpy as np
 from collections import defaultdict
@@ -27,8 +20,6 @@ from collections import defaultdict
 ############################ 병렬 처리 ###########################################
 
 
-from concurrent.futures import ThreadPoolExecutor, as_completed
-
 def insert_by_date():
     date_list = ['2024-11-01']
     target_list = ['shop', 'move_pop', 'sales', 'work_pop', 'income', 'spend', 'house', 'resident', 'apart_price']
@@ -52,69 +43,48 @@ def fetch_loc_info_and_insert(ref_date, target_item):
     connection = get_db_connection()
 
     try:
+        # 전체 지역 값을 한 번에 조회 후 전국/시도/시군구 통계에 공용으로 사용
+        loc_info_by_region = select_loc_info_by_all_regions(connection, ref_date, target_item)
+
         # 전국 범위 처리
-        process_nationwide(connection, ref_date, target_item)
+        process_nationwide(connection, loc_info_by_region, ref_date, target_item)
         
         # 시/도 범위 처리
-        process_city(connection, ref_date, target_item)
+        process_city(connection, loc_info_by_region, ref_date, target_item)
         
         # 시/군/구 범위 처리
-        process_district(connection, ref_date, target_item)
+        process_district(connection, loc_info_by_region, ref_date, target_item)
     finally:
         connection.close()  # 작업이 끝난 후 연결을 닫음
 
-def process_nationwide(connection, ref_date, target_item):
-    region_id_list = select_all_region_id(connection)
 
-    nation_loc_info_by_region = []
-    for region in region_id_list:
-        nation_loc_info_by_region_list = select_nation_loc_info_by_region(
-            connection,
-            city_id=region.city_id,
-            district_id=region.district_id,
-            sub_district_id=region.sub_district_id,
-            ref_date=ref_date,
-            target_item=target_item
-        )
-        nation_loc_info_by_region.extend(nation_loc_info_by_region_list)
+def group_loc_info_by(loc_info_by_region, key):
+    # 한 번의 순회로 그룹별 항목 리스트 생성 (첫 등장 순서 유지)
+    grouped_loc_info = defaultdict(list)
+    for item in loc_info_by_region:
+        grouped_loc_info[getattr(item, key)].append(item)
+    return grouped_loc_info
 
+
+def process_loc_info_group(region_info, stat_level, target_item, ref_date):
     # null 값 제외 후 통계 계산
-    nation_loc_info_values = [item.target_item for item in nation_loc_info_by_region]
-    filtered_values = [value for value in nation_loc_info_values if value is not None]
+    filtered_values = [item.target_item for item in region_info if item.target_item is not None]
     statistics = calculate_statistics(filtered_values)
 
     # J-Score 및 통계값 추가된 데이터를 가져옴
-    updated_nation_info = process_j_score(nation_loc_info_by_region, filtered_values, '전국', target_item, statistics, ref_date)
+    return process_j_score(region_info, filtered_values, stat_level, target_item, statistics, ref_date)
+
+
+def process_nationwide(connection, loc_info_by_region, ref_date, target_item):
+    updated_nation_info = process_loc_info_group(loc_info_by_region, '전국', target_item, ref_date)
     # print("Nation Level:", updated_nation_info[:3])  # 데이터 일부만 출력하여 확인
     insert_loc_info_statistics(connection, updated_nation_info)  # 인서트 주석 처리
 
 
-def process_city(connection, ref_date, target_item):
-    city_id_sub_district_id_list = select_city_id_sub_district_id(connection)
-
-    city_loc_info_by_region = []
-    for region in city_id_sub_district_id_list:
-        city_loc_info_by_region_list = select_city_loc_info_by_region(
-            connection,
-            city_id=region.city_id,
-            sub_district_id=region.sub_district_id,
-            ref_date=ref_date,
-            target_item=target_item
-        )
-        city_loc_info_by_region.extend(city_loc_info_by_region_list)
-    # print(city_loc_info_by_region[:3])
-    # null 값 제외 후 통계 계산
-    city_grouped_loc_info = defaultdict(list)
-    for item in city_loc_info_by_region:
-        city_grouped_loc_info[item.city_id].append(item.target_item)
+def process_city(connection, loc_info_by_region, ref_date, target_item):
     updated_city_info = []
-    for city_id, loc_info_values in city_grouped_loc_info.items():
-        filtered_values = [value for value in loc_info_values if value is not None]
-        statistics = calculate_statistics(filtered_values)
-    
-        # 원본 데이터의 각 항목을 전달하여 통계 및 J-Score 계산
-        region_info_for_city = [i for i in city_loc_info_by_region if i.city_id == city_id]
-        updated_city_info.extend(process_j_score(region_info_for_city, filtered_values, '시/도', target_item, statistics, ref_date))
+    for city_id, region_info_for_city in group_loc_info_by(loc_info_by_region, 'city_id').items():
+        updated_city_info.extend(process_loc_info_group(region_info_for_city, '시/도', target_item, ref_date))
 
     for item in updated_city_info:
         item['district_id'] = None
@@ -123,33 +93,10 @@ def process_city(connection, ref_date, target_item):
     insert_loc_info_statistics(connection, updated_city_info)  # 인서트 주석 처리
 
 
-def process_district(connection, ref_date, target_item):
-    district_id_sub_district_id_list = select_district_id_sub_district_id(connection)
-
-    district_loc_info_by_region = []
-    for region in district_id_sub_district_id_list:
-        district_loc_info_by_region_list = select_district_loc_info_by_region(
-            connection,
-            district_id=region.district_id,
-            sub_district_id=region.sub_district_id,
-            ref_date=ref_date,
-            target_item=target_item
-        )
-        district_loc_info_by_region.extend(district_loc_info_by_region_list)
-    # print(district_loc_info_by_region[:3])
-    # null 값 제외 후 통계 계산
-    district_grouped_loc_info = defaultdict(list)
-    for item in district_loc_info_by_region:
-        district_grouped_loc_info[item.district_id].append(item.target_item)
-    # print(district_grouped_loc_info)
+def process_district(connection, loc_info_by_region, ref_date, target_item):
     updated_district_info = []
-    for district_id, loc_info_values in district_grouped_loc_info.items():
-        filtered_values = [value for value in loc_info_values if value is not None]
-        statistics = calculate_statistics(filtered_values)
-        # print(filtered_values[:3])
-        # 원본 데이터의 각 항목을 전달하여 통계 및 J-Score 계산
-        region_info_for_district = [i for i in district_loc_info_by_region if i.district_id == district_id]
-        updated_district_info.extend(process_j_score(region_info_for_district, filtered_values, '시/군/구', target_item, statistics, ref_date))
+    for district_id, region_info_for_district in group_loc_info_by(loc_info_by_region, 'district_id').items():
+        updated_district_info.extend(process_loc_info_group(region_info_for_district, '시/군/구', target_item, ref_date))
     
     for item in updated_district_info:
         item['city_id'] = None
@@ -166,34 +113,46 @@ def process_j_score(region_info, filtered_values, stat_level, target_item, stati
     outlier_removal_limit = 3
     # print('프로세스 J-score 전')
     # 내림차순 정렬 후 이상치 제거
-    loc_info_values_sorted = sorted(filtered_values, reverse=True)
+    loc_info_values_sorted = np.sort(np.asarray(filtered_values, dtype=float))[::-1]
     stddev = statistics["stddev"]
-    non_outliers = []
-
-    # 이상치 제거 수행
-    removed_outliers = 0
-    for i in range(1, len(loc_info_values_sorted)):
-        if removed_outliers >= outlier_removal_limit:
-            non_outliers.extend(loc_info_values_sorted[i:])
-            break
-        if loc_info_values_sorted[i - 1] - loc_info_values_sorted[i] > stddev:
-            removed_outliers += 1
-            continue
-        non_outliers.append(loc_info_values_sorted[i - 1])
-    if removed_outliers < outlier_removal_limit:
-        non_outliers.append(loc_info_values_sorted[-1])
+    non_outliers = loc_info_values_sorted[
+        non_outlier_mask(loc_info_values_sorted, stddev, outlier_removal_limit)
+    ]
 
     # 이상치가 제거된 데이터로 새로운 최대값 설정
-    max_value_non_outliers = max(non_outliers) if non_outliers else 0
+    max_value_non_outliers = non_outliers.max() if len(non_outliers) else 0
+
+    # 값이 있는 항목만 배열로 모아 J-Score 일괄 계산
+    values = np.asarray([item.target_item for item in region_info if item.target_item is not None], dtype=float)
+
+    # 기존 J-Score 계산 (rank는 이상치 제거 전 기준으로 계산)
+    original_scores = calculate_j_scores(values, loc_info_values_sorted, loc_info_values_sorted[0], stat_level, target_item)
+    # 이상치 제거 후 J-Score per만 재계산
+    non_outlier_scores = calculate_j_scores(values, loc_info_values_sorted, max_value_non_outliers, stat_level, target_item, is_non_outlier=True)
+    is_non_outlier = np.isin(values, non_outliers)
+
+    # 기존 값이 이상치 제거 후 per 값보다 큰 경우 출력
+    exceeded = is_non_outlier & (original_scores['j_score_per'] > non_outlier_scores['j_score_per_non_outliers'])
+    for position in np.flatnonzero(exceeded):
+        print(f"Per exceeded for {target_item}: Original Per {original_scores['j_score_per'][position]} > Non-outlier Per {non_outlier_scores['j_score_per_non_outliers'][position]}")
+
+    j_score_rank_values = original_scores['j_score_rank'].tolist()
+    j_score_per_values = original_scores['j_score_per'].tolist()
+    j_score_values = original_scores['j_score'].tolist()
+    # 이상치일 경우 10으로 설정
+    j_score_per_non_outliers_values = np.where(is_non_outlier, non_outlier_scores['j_score_per_non_outliers'], 10).tolist()
+    j_score_non_outliers_values = np.where(
+        is_non_outlier, (original_scores['j_score_rank'] + non_outlier_scores['j_score_per_non_outliers']) / 2, 10
+    ).tolist()
 
     updated_region_info = []
+    position = 0
 
     for item in region_info:
-        target_value = item.target_item
         item_dict = item.__dict__.copy()
 
         # target_value가 None인 경우 모든 J-Score 값을 None으로 설정하고 다음 항목으로
-        if target_value is None:
+        if item.target_item is None:
             item_dict.update({
                 "j_score_rank": None,
                 "j_score_per": None,
@@ -202,27 +161,14 @@ def process_j_score(region_info, filtered_values, stat_level, target_item, stati
                 "j_score_non_outliers": None
             })
         else:
-            # 기존 J-Score 계산 (rank는 이상치 제거 전 기준으로 계산)
-            original_scores = calculate_j_scores(target_value, loc_info_values_sorted, max(filtered_values), stat_level, target_item)
-            item_dict.update(original_scores)
-
-            # 이상치 제거 후 J-Score per만 재계산
-            if target_value in non_outliers:
-                non_outlier_scores = calculate_j_scores(target_value, loc_info_values_sorted, max_value_non_outliers, stat_level, target_item, is_non_outlier=True)
-                
-                # non_outlier_scores에서 rank 제거하고 per 관련 필드만 추가
-                item_dict['j_score_per_non_outliers'] = non_outlier_scores['j_score_per_non_outliers']
-                item_dict['j_score_non_outliers'] = (original_scores['j_score_rank'] + non_outlier_scores['j_score_per_non_outliers']) / 2
-                
-                # 기존 값이 이상치 제거 후 per 값보다 큰 경우 출력
-                if (original_scores['j_score_per'] is not None and item_dict['j_score_per_non_outliers'] is not None and
-                    original_scores['j_score_per'] > item_dict['j_score_per_non_outliers']):
-                    print(f"Per exceeded for {target_item}: Original Per {original_scores['j_score_per']} > Non-outlier Per {item_dict['j_score_per_non_outliers']}")
-
-            else:
-                # 이상치일 경우 10으로 설정
-                item_dict['j_score_per_non_outliers'] = 10
-                item_dict['j_score_non_outliers'] = 10
+            item_dict.update({
+                "j_score_rank": j_score_rank_values[position],
+                "j_score_per": j_score_per_values[position],
+                "j_score": j_score_values[position],
+                "j_score_per_non_outliers": j_score_per_non_outliers_values[position],
+                "j_score_non_outliers": j_score_non_outliers_values[position]
+            })
+            position += 1
 
         # 통계 및 추가 필드 삽입
         item_dict.update({
@@ -241,156 +187,113 @@ def process_j_score(region_info, filtered_values, stat_level, target_item, stati
     return updated_region_info
 
 
-def calculate_j_scores(value, sorted_values, max_value, stat_level, target_item, is_non_outlier=False):
-    # print('J-score 계산 전')
-    if value is None:
-        return {
-            f'j_score_rank': None if not is_non_outlier else None,
-            f'j_score_per{"_non_outliers" if is_non_outlier else ""}': None,
-            f'j_score{"_non_outliers" if is_non_outlier else ""}': None,
-        }
-
+def calculate_j_scores(values, sorted_values, max_value, stat_level, target_item, is_non_outlier=False):
     # 순위 계산 (rank는 항상 이상치 제거 전 기준으로 계산)
-    rank = sorted_values.index(value) + 1  # Rank calculation with the original sorted_values list
-    j_score_rank = ((len(sorted_values) + 1 - rank) / len(sorted_values)) * 10 if value in sorted_values else None
-    # print('J-score 계산 후')
+    j_score_rank_values = j_score_rank(values, sorted_values)
+
     # j_score_per는 max_value가 변경될 때만 재계산 (is_non_outlier=True일 때만)
     if is_non_outlier:
         # 이상치 제거 후 per 계산
-        j_score_per_non_outliers = (value / max_value) * 10 if max_value > 0 else 0
-        j_score_non_outliers = (j_score_rank + j_score_per_non_outliers) / 2 if j_score_rank is not None else None
+        j_score_per_non_outliers = j_score_per(values, max_value)
         return {
-            'j_score_rank': j_score_rank,  # 원래의 rank 그대로 유지
+            'j_score_rank': j_score_rank_values,  # 원래의 rank 그대로 유지
             'j_score_per_non_outliers': j_score_per_non_outliers,
-            'j_score_non_outliers': j_score_non_outliers
+            'j_score_non_outliers': (j_score_rank_values + j_score_per_non_outliers) / 2
         }
     else:
         # 원래 per 계산
-        j_score_per = (value / max_value) * 10 if max_value > 0 else 0
-        j_score = (j_score_rank + j_score_per) / 2 if j_score_rank is not None else None
+        j_score_per_values = j_score_per(values, max_value)
         return {
-            'j_score_rank': j_score_rank,
-            'j_score_per': j_score_per,
-            'j_score': j_score
+            'j_score_rank': j_score_rank_values,
+            'j_score_per': j_score_per_values,
+            'j_score': (j_score_rank_values + j_score_per_values) / 2
         }
 
 
 
 
+#################### 가중치 일괄 처리 #################
+# 지역 x 타겟 아이템 단위로 조회하던 j_score 구성값을 기준일 단위로 한 번에 조회한 뒤
+# 지역 인덱스 기준 NumPy 배열로 가중 평균을 계산
+MZ_J_SCORE_WEIGHT = 1.5
+J_SCORE_COMPONENTS = ('j_score_per', 'j_score_rank', 'j_score_per_non_outliers')
 
-#################### 가중치 병렬 처리 #################
-def fetch_and_weight_j_score(connection, region, target_item, weight, ref_date, is_mz=False):
-    """J-Score 데이터를 조회하고 가중치를 적용하는 함수"""
-    if not is_mz:
-        # loc_info에서 j_score 데이터 가져오기
-        j_score_rank_list = select_loc_info_j_score_rank(
-            connection, region.city_id, region.district_id, region.sub_district_id, target_item, ref_date
-        )
-        j_score_per_list = select_loc_info_j_score_per(
-            connection, region.city_id, region.district_id, region.sub_district_id, target_item, ref_date
-        )
-        # 이상치 제거 후 per만 가져오기 (rank는 제외)
-        j_score_per_non_outliers_list = select_loc_info_j_score_per_non_outliers(
-            connection, region.city_id, region.district_id, region.sub_district_id, target_item, ref_date
-        )
-        # target_item이 apart_price일 경우 null 값을 0으로 대체
-        if target_item == 'apart_price':
-            for score in j_score_rank_list:
-                if score.j_score_rank is None:
-                    score.j_score_rank = 0
-            for score in j_score_per_list:
-                if score.j_score_per is None:
-                    score.j_score_per = 0
-            for score in j_score_per_non_outliers_list:
-                if score.j_score_per_non_outliers is None:
-                    score.j_score_per_non_outliers = 0
 
-    else:
-        # mz에서 j_score 데이터 가져오기
-        j_score_rank_list = select_mz_j_score_rank(connection, region.city_id, region.district_id, region.sub_district_id, ref_date)
-        j_score_per_list = select_mz_j_score_per(connection, region.city_id, region.district_id, region.sub_district_id, ref_date)
-        # 이상치 제거 후 per만 가져오기 (rank는 제외)
-        j_score_per_non_outliers_list = select_mz_j_score_per_non_outliers(connection, region.city_id, region.district_id, region.sub_district_id, ref_date)
+def load_weighted_j_score_arrays(connection, target_items, weights, ref_date, region_index):
+    """기준일의 loc_info, mz j_score 구성값을 일괄 조회해 (지역 인덱스 배열, 구성값별 가중치 적용 배열) 반환"""
+    item_weights = dict(zip(target_items, weights))
+    loc_info_rows = select_loc_info_j_score_components(connection, target_items, ref_date)
+    mz_rows = select_mz_j_score_components(connection, ref_date)
+
+    region_positions = []
+    row_weights = []
+    component_values = {component: [] for component in J_SCORE_COMPONENTS}
+
+    for row in loc_info_rows + mz_rows:
+        position = region_index.get((row.city_id, row.district_id, row.sub_district_id))
+        if position is None:
+            continue
 
+        target_item = getattr(row, 'target_item', None)
+        region_positions.append(position)
+        row_weights.append(item_weights[target_item] if target_item is not None else MZ_J_SCORE_WEIGHT)
+
+        for component in J_SCORE_COMPONENTS:
+            value = getattr(row, component)
+            # target_item이 apart_price일 경우 null 값을 0으로 대체
+            if value is None and target_item == 'apart_price':
+                value = 0
+            component_values[component].append(np.nan if value is None else value)
+
+    region_positions = np.asarray(region_positions, dtype=np.intp)
+    row_weights = np.asarray(row_weights, dtype=float)
+    weighted_components = {
+        component: np.asarray(values, dtype=float) * row_weights
+        for component, values in component_values.items()
+    }
+    return region_positions, weighted_components
 
-    # Null 확인 후 가중치 적용
-    weighted_j_score_per = [(j.j_score_per * weight) if j.j_score_per is not None else None for j in j_score_per_list]
-    weighted_j_score_rank = [(j.j_score_rank * weight) if j.j_score_rank is not None else None for j in j_score_rank_list]
 
-    # 이상치 제거 후 j_score_per에만 가중치 적용
-    weighted_j_score_per_non_outliers = [(j.j_score_per_non_outliers * weight) if j.j_score_per_non_outliers is not None else None for j in j_score_per_non_outliers_list]
+def average_weighted_j_scores(region_positions, weighted_values, region_count):
+    """지역별 평균 - 모든 항목에 유효한 값이 있어야 평균 계산, 하나라도 None(NaN)이거나 값이 없으면 NaN"""
+    is_null = np.isnan(weighted_values)
+    counts = np.bincount(region_positions, minlength=region_count)
+    null_counts = np.bincount(region_positions, weights=is_null.astype(float), minlength=region_count)
+    sums = np.bincount(region_positions, weights=np.where(is_null, 0.0, weighted_values), minlength=region_count)
 
-    return weighted_j_score_per, weighted_j_score_rank, weighted_j_score_per_non_outliers
+    averages = np.full(region_count, np.nan)
+    valid = (counts > 0) & (null_counts == 0)
+    averages[valid] = sums[valid] / counts[valid]
+    return averages
 
 
 def calculate_weighted_j_scores(connection, target_items, ref_date):
     weights = [1, 2.5, 1.5, 1.5, 1.5, 1.5, 1, 1, 1]  # 각 타겟 아이템별 가중치
     region_id_list = select_all_region_id(connection)
-    
-    # 기존 및 이상치 제거 후의 j_score 데이터를 저장하는 구조
-    region_scores = {
-        (region.city_id, region.district_id, region.sub_district_id): {
-            'j_score_per': [], 'j_score_rank': [], 
-            'j_score_per_non_outliers': []
-        } for region in region_id_list
-    }
-
-    # loc_info j_score 데이터 병렬 처리
-    with ThreadPoolExecutor(max_workers=8) as executor:
-        future_to_target_item = {
-            executor.submit(fetch_and_weight_j_score, connection, region, target_item, weights[i], ref_date): (region, target_item)
-            for i, target_item in enumerate(target_items)
-            for region in region_id_list
-        }
 
-        for future in as_completed(future_to_target_item):
-            region, target_item = future_to_target_item[future]
-            (weighted_j_score_per, weighted_j_score_rank, weighted_j_score_per_non_outliers) = future.result()
-            
-            region_key = (region.city_id, region.district_id, region.sub_district_id)
-            
-            # 기존 j_score와 이상치 제거 후 j_score 추가
-            region_scores[region_key]['j_score_per'].extend(weighted_j_score_per)
-            region_scores[region_key]['j_score_rank'].extend(weighted_j_score_rank)
-            region_scores[region_key]['j_score_per_non_outliers'].extend(weighted_j_score_per_non_outliers)
-
-    # mz j_score 데이터 병렬 처리 없이 가중치 적용
+    # 지역 키 -> 배열 인덱스
+    region_index = {}
     for region in region_id_list:
-        (weighted_mz_j_score_per, weighted_mz_j_score_rank, weighted_mz_j_score_per_non_outliers) = fetch_and_weight_j_score(
-            connection, region, target_item=None, weight=1.5, ref_date=ref_date, is_mz=True
-        )
-        
-        region_key = (region.city_id, region.district_id, region.sub_district_id)
-        
-        region_scores[region_key]['j_score_per'].extend(weighted_mz_j_score_per)
-        region_scores[region_key]['j_score_rank'].extend(weighted_mz_j_score_rank)
-        region_scores[region_key]['j_score_per_non_outliers'].extend(weighted_mz_j_score_per_non_outliers)
-
-    # 동별 평균 계산
-    final_j_score_per = {}
-    final_j_score_rank = {}
-    final_j_score_per_non_outliers = {}
-
-    for region_key, scores in region_scores.items():
-        # 기존 j_score 평균 계산 - 모든 항목에 유효한 값이 있어야 평균 계산, 하나라도 None이면 None으로 설정
-        if all(score is not None for score in scores['j_score_per']) and scores['j_score_per']:
-            valid_j_score_per = [score for score in scores['j_score_per']]
-            final_j_score_per[region_key] = sum(valid_j_score_per) / len(valid_j_score_per)
-        else:
-            final_j_score_per[region_key] = None
-
-        if all(score is not None for score in scores['j_score_rank']) and scores['j_score_rank']:
-            valid_j_score_rank = [score for score in scores['j_score_rank']]
-            final_j_score_rank[region_key] = sum(valid_j_score_rank) / len(valid_j_score_rank)
-        else:
-            final_j_score_rank[region_key] = None
+        region_index.setdefault((region.city_id, region.district_id, region.sub_district_id), len(region_index))
+    region_keys = list(region_index)
+
+    # loc_info, mz j_score 구성값 일괄 조회 후 가중치 적용
+    region_positions, weighted_components = load_weighted_j_score_arrays(
+        connection, target_items, weights, ref_date, region_index
+    )
+
+    # 동별 평균 계산 (NaN -> None)
+    final_scores = {}
+    for component, weighted_values in weighted_components.items():
+        averages = average_weighted_j_scores(region_positions, weighted_values, len(region_keys))
+        final_scores[component] = {
+            region_key: (None if np.isnan(average) else float(average))
+            for region_key, average in zip(region_keys, averages)
+        }
 
-        # 이상치 제거된 j_score_per 평균 계산
-        if all(score is not None for score in scores['j_score_per_non_outliers']) and scores['j_score_per_non_outliers']:
-            valid_j_score_per_non_outliers = [score for score in scores['j_score_per_non_outliers']]
-            final_j_score_per_non_outliers[region_key] = sum(valid_j_score_per_non_outliers) / len(valid_j_score_per_non_outliers)
-        else:
-            final_j_score_per_non_outliers[region_key] = None
+    final_j_score_per = final_scores['j_score_per']
+    final_j_score_rank = final_scores['j_score_rank']
+    final_j_score_per_non_outliers = final_scores['j_score_per_non_outliers']
 
     # j_score_per 조정
     max_j_score_per = max([score for score in final_j_score_per.values() if score is not None], default=1)
@@ -407,21 +310,11 @@ def calculate_weighted_j_scores(connection, target_items, ref_date):
 
 
     # j_score_rank 조정 (이상치 제거 전의 rank만 사용)
-    all_rank_values = [score for score in final_j_score_rank.values() if score is not None]
-    all_rank_values_sorted = sorted(all_rank_values, reverse=True)
+    ranked_region_keys = [region_key for region_key, score in final_j_score_rank.items() if score is not None]
+    all_rank_values = np.asarray([final_j_score_rank[region_key] for region_key in ranked_region_keys], dtype=float)
 
-    adjusted_j_score_rank = {}
-
-    for region_key, score in final_j_score_rank.items():
-        if score is None:
-            adjusted_j_score_rank[region_key] = None
-        else:
-            rank = all_rank_values_sorted.index(score) + 1
-            totals = len(all_rank_values_sorted)
-            adjusted_j_score_rank[region_key] = 10 * ((totals + 1 - rank) / totals)
-            # 10을 초과하는 값이 있는지 확인 및 출력
-            if adjusted_j_score_rank[region_key] > 10:
-                print(f"Exceeded 10: Region = {region_key}, Score = {score}, Rank = {rank}, Adjusted j_score_rank = {adjusted_j_score_rank[region_key]}")
+    adjusted_j_score_rank = {region_key: None for region_key in final_j_score_rank}
+    adjusted_j_score_rank.update(zip(ranked_region_keys, j_score_rank(all_rank_values).tolist()))
 
     # 데이터 준비 및 인서트
     insert_data = prepare_insert_data(adjusted_j_score_per, adjusted_j_score_rank, adjusted_j_score_per_non_outliers, ref_date)
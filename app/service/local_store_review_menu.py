@@ -6,22 +6,21 @@ from app.crud.local_store_review_menu import (
 
 import pymysql
 from openpyxl import load_workbook
-from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.support.ui import WebDriverWait
-from selenium.webdriver.chrome.options import Options
-from webdriver_manager.chrome import ChromeDriverManager
 from concurrent.futures import ThreadPoolExecutor
 from selenium.webdriver import ActionChains
 from selenium.webdriver.common.by import By
 from datetime import datetime
-import os, time
+import os
 from tqdm import tqdm
 import sys
 from app.crud.loc_info import *
+from app.service.crawler_wait import adaptive_wait
+from app.service.webdriver_pool import WebDriverPool
 from datetime import datetime
 from PIL import Image
 from io import BytesIO
@@ -31,6 +30,23 @@ import pymysql
 from tqdm import tqdm
 
 
+# 스레드 10개가 나눠 쓰는 드라이버 풀 (헤드리스)
+review_driver_pool = WebDriverPool(
+    size=10,
+    arguments=(
+        "--disable-gpu",
+        "--use-gl=swiftshader",
+        "--disable-webgl",
+        "--disable-software-rasterizer",
+        "--no-sandbox",
+        "--disable-dev-shm-usage",
+        "--window-size=1920x1080",
+        "--start-maximized",
+    ),
+    headless=True,
+    reset_on_release=True,
+)
+
 
 def get_kakao_review():
     start_time = datetime.now()
@@ -40,6 +56,9 @@ def get_kakao_review():
     connection = get_db_connection()  # 연결 한 번만 생성
 
     try:
+        # 스레드 수만큼 브라우저를 미리 띄워둠
+        review_driver_pool.prewarm()
+
         # 병렬 처리
         with ThreadPoolExecutor(max_workers=10) as executor:
             futures = []
@@ -63,6 +82,7 @@ def get_kakao_review():
 
     finally:
         close_connection(connection)  # 모든 작업이 끝난 후 연결 닫기
+        review_driver_pool.close()
 
     end_time = datetime.now()
     print(f"End Time: {end_time}")
@@ -73,24 +93,13 @@ def get_kakao_review():
 
 def crawl_keyword(city_name, district_name, sub_district_name, store_name, store_business_number, connection):
 
-    # 글로벌 드라이버 사용
-    options = Options()
-    options.add_argument("--headless")  # 헤드리스 모드 활성화
-    options.add_argument("--disable-gpu")
-    options.add_argument("--use-gl=swiftshader")
-    options.add_argument("--disable-webgl")
-    options.add_argument("--disable-software-rasterizer")
-    options.add_argument("--no-sandbox")
-    options.add_argument("--disable-dev-shm-usage")
-    options.add_argument("--window-size=1920x1080")  # 해상도 설정
-    options.add_argument("--start-maximized")
-
-    # WebDriver Manager를 이용해 ChromeDriver 자동 관리
-    service = Service(ChromeDriverManager().install())
-    driver = webdriver.Chrome(service=service, options=options)
+    # 풀에서 미리 띄워둔 드라이버 사용
+    driver = review_driver_pool.acquire()
+    discard_driver = False
+    waiter = adaptive_wait(driver)
 
     try:
-        driver.get("https://map.kakao.com/?nil_profile=title&nil_src=local")
+        waiter.load_page("https://map.kakao.com/?nil_profile=title&nil_src=local", store_business_number)
 
         # id가 search.keyword.query인 input 요소를 찾음
         search_input = driver.find_element(By.ID, "search.keyword.query")
@@ -103,11 +112,13 @@ def crawl_keyword(city_name, district_name, sub_district_name, store_name, store
         # Enter 키를 눌러 검색 실행
         search_input.send_keys(Keys.RETURN)
 
-        # 잠시 대기 (검색 결과 로딩을 기다리기 위해)
-        time.sleep(3)
+        # 검색 결과 로딩 대기
+        waiter.settle()
 
         # id가 info.search.place.list인 ul 태그의 첫 번째 li 태그를 찾음
-        search_results = driver.find_element(By.ID, "info.search.place.list")
+        search_results = waiter.wait_for(
+            EC.presence_of_element_located((By.ID, "info.search.place.list")), 10
+        )
         first_li = search_results.find_element(By.TAG_NAME, "li")
         
         # li 태그 내의 div 클래스가 info_item인 요소 찾기
@@ -117,9 +128,7 @@ def crawl_keyword(city_name, district_name, sub_district_name, store_name, store
         contact_area = info_item.find_element(By.CLASS_NAME, "contact.clickArea")
         contact_link = contact_area.find_element(By.TAG_NAME, "a")
         moreview_url = contact_link.get_attribute("href")
-        driver.get(moreview_url)
-
-        time.sleep(3)
+        waiter.load_page(moreview_url, store_business_number)
 
         # span 태그 아래의 모든 a 태그 찾기
         links = driver.find_elements(By.CSS_SELECTOR, "#mArticle > div.cont_essential > div:nth-child(1) > div.place_details > div > div.location_evaluation > a:nth-child(3)")
@@ -200,8 +209,13 @@ def crawl_keyword(city_name, district_name, sub_district_name, store_name, store
         # print(data)
         crud_update_store_review(connection, data)
 
+    except WebDriverException:
+        # 세션이 깨진 드라이버는 풀에 돌려놓지 않음
+        discard_driver = True
+        raise
+
     finally:
-        driver.quit()
+        review_driver_pool.release(driver, discard=discard_driver)
 
 
 
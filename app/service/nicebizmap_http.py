@@ -0,0 +1,454 @@
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from urllib.parse import parse_qsl, urlparse
+
+import requests
+
+from app.crud.commercial_district import commercial_district_writer
+from app.crud.dimension_cache import dimension_cache, preload_dimension_cache
+from app.crud.rising_business import rising_business_writer
+from app.schemas.commercial_district import CommercialDistrictInsert
+from app.schemas.rising_business import RisingBusinessInsert
+
+
+# nicebizmap HTTP 수집 모드
+# 메뉴를 클릭해 DOM 에서 숫자를 읽는 대신 화면이 호출하는 XHR(JSON) 요청을 직접 재현한다.
+# 사이트 엔드포인트/파라미터/응답 필드는 코드에 박지 않고 설정 파일(JSON)로 정의한다.
+# (record_browser_xhr 로 브라우저 크롤링 중 오간 XHR 을 기록해 설정/오프라인 픽스처로 사용)
+#
+# 설정 예시 (전체 예시: app/data/nicebizmap/endpoints.example.json)
+# {
+#   "base_url": "https://m.nicebizmap.co.kr",
+#   "headers": {"X-Requested-With": "XMLHttpRequest"},
+#   "regions": [  # 시/도 -> 시/군/구 -> 읍/면/동 목록 요청 (상위 코드는 {city_code} 등으로 치환)
+#     {"method": "POST", "path": "/...", "data": {...}, "items": "data.list", "code": "cd", "name": "nm"}, ...
+#   ],
+#   "categories": [ ...대분류 -> 중분류 -> 소분류 목록 요청, 형식 동일... ],
+#   "commercial_district": [
+#     {"method": "POST", "path": "/...", "data": {"admiCd": "{sub_district_code}", "upjongCd": "{detail_category_code}"},
+#      "fields": {"national_density": "data.density.0.value", "market_size": {"path": "data.sales", "scale": 10000}}}
+#   ],
+#   "rising_business": {"method": "POST", "path": "/...", "data": {...}, "items": "data.top5",
+#                       "fields": {"sub_district_rank": "rank", "detail_category_name": "upjongNm", "growth_rate": "rate"}}
+# }
+
+NICEBIZMAP_HTTP_CONFIG_PATH = os.getenv(
+    "NICEBIZMAP_HTTP_CONFIG_PATH",
+    os.path.join(os.path.dirname(__file__), "../data/nicebizmap/endpoints.json"),
+)
+NICEBIZMAP_HTTP_CONCURRENCY = int(os.getenv("NICEBIZMAP_HTTP_CONCURRENCY", "8"))
+NICEBIZMAP_HTTP_MIN_INTERVAL = float(os.getenv("NICEBIZMAP_HTTP_MIN_INTERVAL", "0.1"))
+NICEBIZMAP_HTTP_TIMEOUT = float(os.getenv("NICEBIZMAP_HTTP_TIMEOUT", "30"))
+NICEBIZMAP_HTTP_RETRIES = int(os.getenv("NICEBIZMAP_HTTP_RETRIES", "3"))
+
+REGION_LEVELS = ("city", "district", "sub_district")
+CATEGORY_LEVELS = ("main_category", "sub_category", "detail_category")
+
+# 스키마 기본값 (DOM 크롤러와 동일하게 숫자는 0, 메뉴는 None)
+COMMERCIAL_DISTRICT_TEXT_FIELDS = {f"top_menu_{i}" for i in range(1, 6)}
+
+
+def load_http_config(path: str = NICEBIZMAP_HTTP_CONFIG_PATH) -> Dict[str, Any]:
+    if not os.path.exists(path):
+        raise FileNotFoundError(
+            f"nicebizmap HTTP config not found: {path} "
+            f"(copy app/data/nicebizmap/endpoints.example.json and fill in the recorded XHR endpoints, "
+            f"or set NICEBIZMAP_HTTP_CONFIG_PATH)"
+        )
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+# "{sub_district_code}" 같은 자리표시자를 context 값으로 치환 (dict/list 재귀)
+def render_template(value, context: Dict[str, Any]):
+    if isinstance(value, str):
+        return value.format(**context)
+    if isinstance(value, dict):
+        return {key: render_template(item, context) for key, item in value.items()}
+    if isinstance(value, list):
+        return [render_template(item, context) for item in value]
+    return value
+
+
+def render_request(spec: Dict[str, Any], context: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "method": spec.get("method", "GET").upper(),
+        "path": render_template(spec["path"], context),
+        "params": render_template(spec.get("params"), context),
+        "data": render_template(spec.get("data"), context),
+        "json": render_template(spec.get("json"), context),
+    }
+
+
+# "data.list.0.value" 형태 경로로 값 꺼내기 (없으면 None)
+def extract_path(payload, path: Optional[str]):
+    if not path:
+        return payload
+    value = payload
+    for part in path.split("."):
+        if isinstance(value, list) and part.isdigit() and int(part) < len(value):
+            value = value[int(part)]
+        elif isinstance(value, dict) and part in value:
+            value = value[part]
+        else:
+            return None
+    return value
+
+
+def to_number(value):
+    if value is None or isinstance(value, (int, float)):
+        return value
+    value = re.sub(r"[^\d.\-]+", "", str(value))
+    if value in ("", "-", "."):
+        return None
+    return float(value) if "." in value else int(value)
+
+
+# 브라우저에서 기록한 요청(쿼리스트링, 폼/JSON 문자열 본문)과 설정으로 만든 요청이
+# 같은 키가 되도록 정규화
+def normalize_request(request: Dict[str, Any]) -> Dict[str, Any]:
+    path, _, query = request["path"].partition("?")
+    params = dict(parse_qsl(query))
+    params.update({key: str(value) for key, value in (request.get("params") or {}).items()})
+
+    data, json_body = request.get("data"), request.get("json")
+    if isinstance(data, str):
+        try:
+            json_body, data = json.loads(data), None
+        except ValueError:
+            data = dict(parse_qsl(data))
+    if isinstance(data, dict):
+        data = {key: str(value) for key, value in data.items()}
+
+    return {
+        "method": request["method"].upper(),
+        "path": path,
+        "params": params or None,
+        "data": data or None,
+        "json": json_body,
+    }
+
+
+def request_fixture_key(request: Dict[str, Any]) -> str:
+    canonical = json.dumps(normalize_request(request), sort_keys=True, ensure_ascii=False)
+    return hashlib.sha1(canonical.encode("utf-8")).hexdigest()
+
+
+########## 요청 백엔드 ##########
+
+
+# requests 기반 요청 (동시 요청 수, 최소 요청 간격, 재시도 제한)
+class HttpFetchBackend:
+    def __init__(
+        self,
+        base_url: str,
+        headers: Optional[Dict[str, str]] = None,
+        concurrency: int = NICEBIZMAP_HTTP_CONCURRENCY,
+        min_interval: float = NICEBIZMAP_HTTP_MIN_INTERVAL,
+        timeout: float = NICEBIZMAP_HTTP_TIMEOUT,
+        retries: int = NICEBIZMAP_HTTP_RETRIES,
+    ):
+        self.base_url = base_url.rstrip("/")
+        self.headers = dict(headers or {})
+        self.min_interval = min_interval
+        self.timeout = timeout
+        self.retries = retries
+        self._semaphore = threading.BoundedSemaphore(concurrency)
+        self._throttle_lock = threading.Lock()
+        self._next_request_at = 0.0
+        self._local = threading.local()
+
+    # 스레드마다 세션 하나 (커넥션 재사용)
+    def _session(self) -> requests.Session:
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update(self.headers)
+            self._local.session = session
+        return session
+
+    def _throttle(self) -> None:
+        with self._throttle_lock:
+            now = time.monotonic()
+            wait_seconds = self._next_request_at - now
+            self._next_request_at = max(now, self._next_request_at) + self.min_interval
+        if wait_seconds > 0:
+            time.sleep(wait_seconds)
+
+    def fetch(self, request: Dict[str, Any]):
+        with self._semaphore:
+            for attempt in range(1, self.retries + 1):
+                self._throttle()
+                try:
+                    response = self._session().request(
+                        request["method"],
+                        f"{self.base_url}{request['path']}",
+                        params=request.get("params"),
+                        data=request.get("data"),
+                        json=request.get("json"),
+                        timeout=self.timeout,
+                    )
+                    response.raise_for_status()
+                    return response.json()
+                except (requests.RequestException, ValueError) as e:
+                    if attempt == self.retries:
+                        raise
+                    logging.getLogger(__name__).warning(
+                        f"Retrying {request['method']} {request['path']} ({attempt}/{self.retries}): {e}"
+                    )
+                    time.sleep(2 ** (attempt - 1))
+
+
+# 기록해둔 요청/응답(JSON lines)만으로 응답 (오프라인 재현용)
+class ReplayFetchBackend:
+    def __init__(self, fixture_path: str):
+        self._responses: Dict[str, Any] = {}
+        with open(fixture_path, encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    record = json.loads(line)
+                    self._responses[request_fixture_key(record["request"])] = record["response"]
+
+    def fetch(self, request: Dict[str, Any]):
+        key = request_fixture_key(request)
+        if key not in self._responses:
+            raise LookupError(f"No recorded response for {request['method']} {request['path']}")
+        return self._responses[key]
+
+
+# 다른 백엔드 응답을 JSON lines 로 기록
+class RecordingFetchBackend:
+    def __init__(self, backend, fixture_path: str):
+        self.backend = backend
+        self.fixture_path = fixture_path
+        self._lock = threading.Lock()
+
+    def fetch(self, request: Dict[str, Any]):
+        response = self.backend.fetch(request)
+        with self._lock:
+            with open(self.fixture_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps({"request": request, "response": response}, ensure_ascii=False) + "\n")
+        return response
+
+
+# 브라우저 크롤링 중 오간 XHR/Fetch 요청과 응답을 픽스처 형식으로 기록
+# (WebDriverPool(capabilities={"goog:loggingPrefs": {"performance": "ALL"}}) 로 띄운 드라이버 필요)
+def record_browser_xhr(driver, fixture_path: str) -> int:
+    requests_by_id = {}
+    recorded = 0
+    for entry in driver.get_log("performance"):
+        message = json.loads(entry["message"])["message"]
+        params = message.get("params", {})
+        if message.get("method") == "Network.requestWillBeSent" and params.get("type") in ("XHR", "Fetch"):
+            requests_by_id[params["requestId"]] = params["request"]
+        elif message.get("method") == "Network.loadingFinished" and params.get("requestId") in requests_by_id:
+            request = requests_by_id.pop(params["requestId"])
+            try:
+                body = driver.execute_cdp_cmd("Network.getResponseBody", {"requestId": params["requestId"]})
+                response = json.loads(body["body"])
+            except Exception:
+                continue
+
+            url = urlparse(request["url"])
+            record = {
+                "request": {
+                    "method": request["method"],
+                    "path": url.path + (f"?{url.query}" if url.query else ""),
+                    "params": None,
+                    "data": request.get("postData"),
+                    "json": None,
+                },
+                "response": response,
+            }
+            with open(fixture_path, "a", encoding="utf-8") as f:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+            recorded += 1
+    return recorded
+
+
+########## 수집 ##########
+
+
+class NiceBizMapHttpCrawler:
+    def __init__(self, backend, config: Dict[str, Any]):
+        self.backend = backend
+        self.config = config
+
+    # 목록 요청 -> [(코드, 이름)]
+    def list_items(self, spec: Dict[str, Any], context: Dict[str, Any]) -> List[Tuple[Any, str]]:
+        payload = self.backend.fetch(render_request(spec, context))
+        items = extract_path(payload, spec.get("items")) or []
+        return [(extract_path(item, spec["code"]), extract_path(item, spec["name"])) for item in items]
+
+    # 단계별 목록을 따라 내려가며 {level_code, level_name} context 생성
+    def iter_hierarchy(self, specs: List[Dict[str, Any]], levels, context: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        if not specs:
+            yield context
+            return
+        for code, name in self.list_items(specs[0], context):
+            child = dict(context, **{f"{levels[0]}_code": code, f"{levels[0]}_name": name})
+            yield from self.iter_hierarchy(specs[1:], levels[1:], child)
+
+    def iter_sub_districts(self) -> Iterator[Dict[str, Any]]:
+        return self.iter_hierarchy(self.config["regions"], REGION_LEVELS, {})
+
+    def list_detail_categories(self) -> List[Dict[str, Any]]:
+        return list(self.iter_hierarchy(self.config["categories"], CATEGORY_LEVELS, {}))
+
+    # 이름 -> DB id (DOM 크롤러와 같은 캐시 사용)
+    def resolve_region_ids(self, context: Dict[str, Any]) -> Optional[Dict[str, int]]:
+        city_id = dimension_cache.city_id(context["city_name"])
+        district_id = city_id and dimension_cache.district_id(city_id, context["district_name"])
+        sub_district_id = district_id and dimension_cache.sub_district_id(
+            city_id, district_id, context["sub_district_name"]
+        )
+        if not sub_district_id:
+            return None
+        return {"city_id": city_id, "district_id": district_id, "sub_district_id": sub_district_id}
+
+    def resolve_category_ids(self, context: Dict[str, Any]) -> Optional[Dict[str, int]]:
+        main_category_id = dimension_cache.biz_main_category_id(context["main_category_name"])
+        sub_category_id = main_category_id and dimension_cache.biz_sub_category_id(
+            main_category_id, context["sub_category_name"]
+        )
+        detail_category_id = sub_category_id and dimension_cache.biz_detail_category_id(
+            sub_category_id, context["detail_category_name"].replace("(확장 분석)", "").strip()
+        )
+        if not detail_category_id:
+            return None
+        return {
+            "biz_main_category_id": main_category_id,
+            "biz_sub_category_id": sub_category_id,
+            "biz_detail_category_id": detail_category_id,
+        }
+
+    def fetch_commercial_district(self, context: Dict[str, Any], y_m: str) -> Dict[str, Any]:
+        region_ids = self.resolve_region_ids(context)
+        category_ids = self.resolve_category_ids(context)
+        if region_ids is None or category_ids is None:
+            raise RuntimeError(f"Failed to resolve ids: {context}")
+
+        values: Dict[str, Any] = {}
+        for endpoint in self.config["commercial_district"]:
+            payload = self.backend.fetch(render_request(endpoint, context))
+            for field, field_spec in endpoint["fields"].items():
+                if isinstance(field_spec, str):
+                    field_spec = {"path": field_spec}
+                value = extract_path(payload, field_spec["path"])
+                if field in COMMERCIAL_DISTRICT_TEXT_FIELDS:
+                    values[field] = value
+                    continue
+                value = to_number(value)
+                values[field] = value * field_spec.get("scale", 1) if value is not None else None
+
+        # 값이 없는 숫자 항목은 DOM 크롤러와 같이 0, 텍스트 항목은 스키마 기본값
+        data = {
+            field: 0
+            for field in CommercialDistrictInsert.__fields__
+            if field not in COMMERCIAL_DISTRICT_TEXT_FIELDS
+        }
+        data.update({field: value for field, value in values.items() if value is not None})
+        data.update(region_ids)
+        data.update(category_ids)
+        data["y_m"] = y_m
+        # 스키마 검증 후 DOM 크롤러와 같은 dict 형태로 버퍼에 넣음
+        return CommercialDistrictInsert(**data).dict()
+
+    def fetch_rising_businesses(self, context: Dict[str, Any]) -> List[RisingBusinessInsert]:
+        region_ids = self.resolve_region_ids(context)
+        if region_ids is None:
+            raise RuntimeError(f"Failed to resolve ids: {context}")
+
+        spec = self.config["rising_business"]
+        payload = self.backend.fetch(render_request(spec, context))
+        fields = spec["fields"]
+
+        data_list = []
+        for item in extract_path(payload, spec.get("items")) or []:
+            category_result = dimension_cache.biz_categories_by_detail_name(
+                extract_path(item, fields["detail_category_name"])
+            )
+            if category_result is None:
+                continue
+            data_list.append(
+                RisingBusinessInsert(
+                    **region_ids,
+                    biz_main_category_id=category_result[0],
+                    biz_sub_category_id=category_result[1],
+                    biz_detail_category_id=category_result[2],
+                    growth_rate=to_number(extract_path(item, fields["growth_rate"])) or 0.0,
+                    sub_district_rank=to_number(extract_path(item, fields["sub_district_rank"])) or 0,
+                )
+            )
+
+        # 상승 업종이 없으면 DOM 크롤러와 같이 기본 행 하나
+        if not data_list:
+            data_list.append(
+                RisingBusinessInsert(
+                    **region_ids,
+                    biz_main_category_id=2,
+                    biz_sub_category_id=2,
+                    biz_detail_category_id=3,
+                    growth_rate=0.0,
+                    sub_district_rank=0,
+                )
+            )
+        return data_list
+
+
+def build_crawler(backend=None, config: Optional[Dict[str, Any]] = None) -> NiceBizMapHttpCrawler:
+    config = config or load_http_config()
+    backend = backend or HttpFetchBackend(config["base_url"], config.get("headers"))
+    return NiceBizMapHttpCrawler(backend, config)
+
+
+def execute_http_commercial_district(y_m: str, crawler: Optional[NiceBizMapHttpCrawler] = None):
+    crawler = crawler or build_crawler()
+    preload_dimension_cache()
+    detail_categories = crawler.list_detail_categories()
+    logger = logging.getLogger(__name__)
+
+    def crawl(context):
+        try:
+            commercial_district_writer.add(crawler.fetch_commercial_district(context, y_m))
+        except Exception as e:
+            logger.error(f"Error fetching commercial district {context}: {e}")
+
+    # 동시 요청 수는 백엔드 세마포어가 제한
+    with ThreadPoolExecutor(max_workers=NICEBIZMAP_HTTP_CONCURRENCY) as executor:
+        for region in crawler.iter_sub_districts():
+            list(executor.map(crawl, (dict(region, **category) for category in detail_categories)))
+
+    commercial_district_writer.flush()
+
+
+def execute_http_rising_business(crawler: Optional[NiceBizMapHttpCrawler] = None):
+    crawler = crawler or build_crawler()
+    preload_dimension_cache()
+    logger = logging.getLogger(__name__)
+
+    def crawl(context):
+        try:
+            return crawler.fetch_rising_businesses(context)
+        except Exception as e:
+            logger.error(f"Error fetching rising business {context}: {e}")
+            return []
+
+    with ThreadPoolExecutor(max_workers=NICEBIZMAP_HTTP_CONCURRENCY) as executor:
+        for data_list in executor.map(crawl, crawler.iter_sub_districts()):
+            # 읍/면/동 단위로 묶어서 넣음 (기존 행 삭제 후 인서트)
+            if data_list:
+                rising_business_writer.add(data_list)
+
+    rising_business_writer.flush()
+
+
+if __name__ == "__main__":
+    execute_http_commercial_district("2024-11-30")
@@ -6,7 +6,6 @@ import pymysql
 from datetime import datetime, timedelta
 from app.crud.population import *
 from app.schemas.population import Population
-import re
 import pandas as pd
 
 # 미리 데이터를 로드하는 함수들
@@ -85,6 +84,95 @@ ROOT_PATH = os.getenv("ROOT_PATH")
 csv_directory = os.path.join(ROOT_PATH, "app", "data", "populationData")
 
 
+# 특정 패턴의 동명 매핑 작업
+SUB_DISTRICT_NAME_MAPPINGS = {
+    "숭의1.3동": "숭의1,3동",
+    "용현1.4동": "용현1,4동",
+    "도화2.3동": "도화2,3동",
+    "봉명2송정동": "봉명2.송정동",
+    "성화개신죽림동": "성화.개신.죽림동",
+    "용담명암산성동": "용담.명암.산성동",
+    "운천신봉동": "운천.신봉동",
+    "율량사천동": "율량.사천동",
+}
+
+GENDERS = [(1, "남자"), (2, "여자")]
+
+
+def build_population_data(df, cities, districts, sub_districts):
+    """CSV 데이터프레임을 행 단위 반복 없이 정리하고 성별 행으로 펼쳐 Population 리스트로 변환"""
+    # sub_district_name에 '출장소'라는 단어가 포함된 경우, 건너뛰기
+    df = df[~df["읍면동명"].astype(str).str.contains("출장소")].copy()
+
+    df["province_name"] = df["시도명"]
+    # sub_district_name에서 '제'를 제거 후 동명 매핑
+    df["sub_district_name"] = (
+        df["읍면동명"].astype(str).str.replace(r"제(\d)", r"\1", regex=True).replace(SUB_DISTRICT_NAME_MAPPINGS)
+    )
+    # district_name에 띄어쓰기가 있으면, 첫 번째 단어만 사용
+    df["district_name"] = df["시군구명"].astype(str).str.split().str[0]
+
+    # 미리 로드한 데이터와 merge 로 ID 매핑
+    city_ids = pd.DataFrame(
+        [(city_name, city.city_id) for city_name, city in cities.items()],
+        columns=["province_name", "city_id"],
+    )
+    district_ids = pd.DataFrame(
+        [(city_id, district_name, district.district_id) for (city_id, district_name), district in districts.items()],
+        columns=["city_id", "district_name", "district_id"],
+    )
+    sub_district_ids = pd.DataFrame(
+        [
+            (district_id, sub_district_name, sub_district.sub_district_id)
+            for (district_id, sub_district_name), sub_district in sub_districts.items()
+        ],
+        columns=["district_id", "sub_district_name", "sub_district_id"],
+    )
+    df = (
+        df.merge(city_ids, on="province_name", how="left")
+        .merge(district_ids, on=["city_id", "district_name"], how="left")
+        .merge(sub_district_ids, on=["district_id", "sub_district_name"], how="left")
+    )
+
+    # 매핑되지 않은 지역은 건너뛰기
+    unmatched = df[["city_id", "district_id", "sub_district_id"]].isna().any(axis=1)
+    for row in df.loc[unmatched, ["province_name", "district_name", "sub_district_name"]].itertuples(index=False):
+        print(f"지역 ID를 찾을 수 없습니다: {row.province_name} {row.district_name} {row.sub_district_name}")
+    df = df[~unmatched]
+
+    base = pd.DataFrame({
+        "city_id": df["city_id"].astype(int),
+        "district_id": df["district_id"].astype(int),
+        "sub_district_id": df["sub_district_id"].astype(int),
+        # 행정기관코드와 기준연월
+        "admin_code": df["행정기관코드"],
+        "reference_date": df["기준연월"],
+        "province_name": df["province_name"],
+        "district_name": df["district_name"],
+        "sub_district_name": df["sub_district_name"],
+        # 계(total_population)를 남자와 여자의 합으로 설정
+        "total_population": df["남자"] + df["여자"],
+    })
+
+    # 성별로 나이별 컬럼을 골라 age_0 ~ age_110_over 로 이름을 맞춘 뒤 세로로 이어 붙임
+    age_fields = [f"age_{age}" for age in range(110)] + ["age_110_over"]
+    gender_frames = []
+    for gender_id, gender in GENDERS:
+        age_columns = [f"{age}세{gender}" for age in range(110)] + [f"110세이상 {gender}"]
+        gender_frame = base.assign(
+            gender_id=gender_id,
+            male_population=df["남자"] if gender_id == 1 else 0,
+            female_population=df["여자"] if gender_id == 2 else 0,
+        )
+        age_frame = pd.DataFrame(df[age_columns].to_numpy(), columns=age_fields, index=df.index)
+        gender_frames.append(pd.concat([gender_frame, age_frame], axis=1))
+
+    # 행 순서는 기존과 동일하게 (행정동별 남자, 여자)
+    population_df = pd.concat(gender_frames).sort_index(kind="stable")
+
+    return [Population(**record) for record in population_df.to_dict("records")]
+
+
 def load_and_insert_population_data(file_name):
         connection = get_db_connection()
 
@@ -114,108 +202,13 @@ def load_and_insert_population_data(file_name):
             districts = load_all_districts(connection)
             sub_districts = load_all_sub_districts(connection)
 
-            for index, row in df.iterrows():
-                try:
-                    city_name = row["시도명"]
-                    district_name = row["시군구명"]
-                    sub_district_name = row["읍면동명"]
-
-                    # sub_district_name에 '출장소'라는 단어가 포함된 경우, 건너뛰기
-                    if "출장소" in sub_district_name:
-                        continue
-
-                    # sub_district_name에서 '제'를 제거
-                    if isinstance(sub_district_name, str):
-                        sub_district_name = re.sub(r"제(\d)", r"\1", sub_district_name)
-
-                    # 특정 패턴의 동명 매핑 작업
-                    mappings = {
-                        "숭의1.3동": "숭의1,3동",
-                        "용현1.4동": "용현1,4동",
-                        "도화2.3동": "도화2,3동",
-                        "봉명2송정동": "봉명2.송정동",
-                        "성화개신죽림동": "성화.개신.죽림동",
-                        "용담명암산성동": "용담.명암.산성동",
-                        "운천신봉동": "운천.신봉동",
-                        "율량사천동": "율량.사천동",
-                    }
-                    if sub_district_name in mappings:
-                        sub_district_name = mappings[sub_district_name]
-
-                    # district_name에 띄어쓰기가 있으면, 첫 번째 단어만 사용
-                    if " " in district_name:
-                        district_name = district_name.split()[0]
-
-                    # 2. 로드된 데이터에서 참조
-                    city = cities.get(city_name)
-                    district = districts.get((city.city_id, district_name))
-                    sub_district = sub_districts.get(
-                        (district.district_id, sub_district_name)
-                    )
-
-                    # 행정기관코드와 기준연월
-                    admin_code = row["행정기관코드"]
-                    reference_date = row["기준연월"]
-
-                    # 남자와 여자의 인구수를 각각 가져옴
-                    male_population = row["남자"]
-                    female_population = row["여자"]
-
-                    # 계(total_population)를 남자와 여자의 합으로 설정
-                    total_population = male_population + female_population
-
-                    # 성별 데이터와 gender_id를 처리
-                    gender_data = [
-                        {
-                            "gender_id": 1,
-                            "gender": "남자",
-                            "population": male_population,
-                        },
-                        {
-                            "gender_id": 2,
-                            "gender": "여자",
-                            "population": female_population,
-                        },
-                    ]
-
-                    for gender_info in gender_data:
-                        gender_id = gender_info["gender_id"]
-                        gender = gender_info["gender"]
-
-                        # 나이별 인구 데이터를 처리
-                        age_data = {}
-                        for age in range(0, 110):
-                            age_data[f"age_{age}"] = row[f"{age}세{gender}"]
-                        age_data["age_110_over"] = row[f"110세이상 {gender}"]
-
-                        # 여기서 population_data 생성 및 DB에 삽입
-                        population_data = Population(
-                            city_id=city.city_id,
-                            district_id=district.district_id,
-                            sub_district_id=sub_district.sub_district_id,
-                            gender_id=gender_id,
-                            admin_code=admin_code,
-                            reference_date=reference_date,
-                            province_name=city_name,
-                            district_name=district_name,
-                            sub_district_name=sub_district_name,
-                            total_population=total_population,
-                            male_population=male_population if gender_id == 1 else 0,
-                            female_population=(
-                                female_population if gender_id == 2 else 0
-                            ),
-                            **age_data,
-                        )
-
-                        insert_population_data(connection, population_data)
-
-                except Exception as e:
-                    print(f"Row data: {row}")
-                    print(e)
-                    continue
+            # 2. CSV 전체를 한 번에 변환 후 일괄 인서트
+            population_data_list = build_population_data(df, cities, districts, sub_districts)
+            insert_population_data_batch(connection, population_data_list)
 
             # 모든 데이터가 성공적으로 삽입된 후에 커밋
             commit(connection)
+            print(f"인구 데이터 {len(population_data_list)}건 인서트 완료")
 
         except Exception as e:
             print(f"Error during population data insertion: {e}")
@@ -1,13 +1,15 @@
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, as_completed, wait
 from contextlib import contextmanager
 import logging
+import os
+import sys
 from threading import local
 from tqdm import tqdm
 import time  # 내장 time 모듈을 가져옵니다.
-from typing import Any, Callable, List
+from typing import Any, Callable, Iterable, List, Optional, Set
 from app.crud.report import (
     insert_new_report_table as crud_insert_new_report_table,
-    select_local_store_info as crud_select_local_store_info,
+    iter_local_store_info as crud_iter_local_store_info,
     select_local_store_mp_detail_cateogry_id as crud_select_local_store_mp_detail_cateogry_id,
     select_local_store_top5_menus as crud_select_local_store_top5_menus,
     insert_or_update_top5_batch as crud_insert_or_update_top5_batch,
@@ -27,12 +29,15 @@ from app.crud.report import (
     select_commercial_district_main_detail_category_count_data as crud_select_commercial_district_main_detail_category_count_data,
     insert_or_update_commercial_district_main_category_count_data_batch as crud_insert_or_update_commercial_district_main_category_count_data_batch,
     select_commercial_district_j_score_average_data as crud_select_commercial_district_j_score_average_data,
+    select_commercial_district_j_score_statistics as crud_select_commercial_district_j_score_statistics,
+    calculate_commercial_district_j_score_average_data as crud_calculate_commercial_district_j_score_average_data,
     insert_or_update_commercial_district_j_score_average_data_batch as crud_insert_or_update_commercial_district_j_score_average_data_batch,
     select_local_store_weekday_time_client_average_sales_data as crud_select_local_store_weekday_time_client_average_sales_data,
     insert_or_update_commercial_district_weekday_time_client_average_sales_data_batch as crud_insert_or_update_commercial_district_weekday_time_client_average_sales_data_batch,
     select_commercial_district_district_average_sales_data_batch as crud_select_commercial_district_district_average_sales_data_batch,
     insert_or_update_commercial_district_district_average_sales_data_batch as crud_insert_or_update_commercial_district_district_average_sales_data_batch,
-    select_commercial_district_top5_top3_data_batch as crud_select_commercial_district_top5_top3_data_batch,
+    select_rising_business_top5_top3_tables as crud_select_rising_business_top5_top3_tables,
+    build_rising_business_top5_top3 as crud_build_rising_business_top5_top3,
     insert_or_update_commercial_district_top5_top3_data_batch as crud_insert_or_update_commercial_district_top5_top3_data_batch,
     select_local_store_loc_info_j_score_average_data as crud_select_local_store_loc_info_j_score_average_data,
     insert_or_update_loc_info_j_score_average_data_batch as crud_insert_or_update_loc_info_j_score_average_data_batch,
@@ -40,11 +45,23 @@ from app.crud.report import (
     insert_or_update_commercial_district_j_score_weighted_average_data_batch as crud_insert_or_update_commercial_district_j_score_weighted_average_data_batch,
     select_commercial_district_commercial_district_average_data as crud_select_commercial_district_commercial_district_average_data,
     insert_or_update_commercial_district_commercial_district_average_data_batch as crud_insert_or_update_commercial_district_commercial_district_average_data_batch,
-    select_report_table,
+    iter_report_table as crud_iter_report_table,
+    filter_stores_by_sub_district_ids as crud_filter_stores_by_sub_district_ids,
 )
-from app.db.connect import get_db_connection
+from app.crud.report_cache import (
+    commercial_district_average_cache,
+    district_average_sales_cache,
+    j_score_weighted_average_cache,
+)
+from app.crud.report_snapshot import (
+    get_report_snapshot,
+    pin_report_snapshot,
+    select_local_store_sub_district_digests,
+    select_population_age_sub_district_ref_dates,
+)
+from app.db.connect import get_db_connection, log_pool_metrics
+from app.service.report_stage_runner import ReportStage, ReportStageRunner
 from app.schemas.report import (
-    LocalStoreBasicInfo,
     LocalStoreCDCommercialDistrict,
     LocalStoreCDDistrictAverageSalesTop5,
     LocalStoreCommercialDistrictJscoreAverage,
@@ -59,7 +76,6 @@ from app.schemas.report import (
     LocalStoreRisingBusinessNTop5SDTop3,
     LocalStoreSubdistrictId,
     LocalStoreTop5Menu,
-    Report,
 )
 
 
@@ -78,63 +94,83 @@ def time_execution(func):
 
 
 #################################################################################
+# 읽기(서버 측 커서 제너레이터) -> 변환 -> upsert 스트리밍
+# 진행 중인 upsert 배치가 max_pending 개에 차면 하나가 끝날 때까지 읽기를 멈춤 (backpressure)
+# 메모리에는 최대 (max_pending + 1) 배치만 있고, 첫 배치를 읽자마자 쓰기 시작
+REPORT_STREAM_MAX_PENDING_BATCHES = int(os.getenv("REPORT_STREAM_MAX_PENDING_BATCHES", "24"))
+
+
+def _upsert_batch(upsert: Callable[[List], None], batch: List) -> int:
+    upsert(batch)
+    return len(batch)
+
+
+def stream_upsert_batches(
+    batches: Iterable[List],
+    upsert: Callable[[List], None],
+    desc: str,
+    transform: Optional[Callable[[List], List]] = None,
+    max_workers: int = 12,
+    max_pending: int = REPORT_STREAM_MAX_PENDING_BATCHES,
+) -> int:
+    total = 0
+    pending = set()
+    try:
+        with ThreadPoolExecutor(max_workers=max_workers) as executor, tqdm(
+            desc=desc, unit="rows"
+        ) as progress:
+            for batch in batches:
+                if transform is not None:
+                    batch = transform(batch)
+                if not batch:
+                    continue
+
+                if len(pending) >= max_pending:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        progress.update(future.result())
+                pending.add(executor.submit(_upsert_batch, upsert, batch))
+                total += len(batch)
+
+            for future in as_completed(pending):
+                progress.update(future.result())
+    finally:
+        # 중간에 실패해도 제너레이터를 닫아 커서와 연결을 풀에 반납
+        # (pymysql SSCursor.close() 는 남은 행을 끝까지 읽어 버린 뒤 닫으므로 즉시 해제되지는 않음)
+        close = getattr(batches, "close", None)
+        if close is not None:
+            close()
+
+    return total
 
 
-# report 컬럼추가 정보 옮기기
-def insert_new_report_table_thread(
-    old_report_list: List[Report],
-    batch_size: int = 5000,
-) -> None:
-    with ThreadPoolExecutor(max_workers=12) as executor:
-        futures = []
-        for i in range(0, len(old_report_list), batch_size):
-            batch = old_report_list[i : i + batch_size]
-            futures.append(executor.submit(crud_insert_new_report_table, batch))
-
-        for future in tqdm(
-            as_completed(futures),
-            total=len(futures),
-            desc="Inserting old_report_table batches",
-        ):
-            future.result()
+#################################################################################
 
 
+# report 컬럼추가 정보 옮기기
 @time_execution
 def migration_old_talbe_to_new_table_report():
-    old_report_list: List[Report] = select_report_table()
-
-    print(len(old_report_list))
-    print(old_report_list[0])
-    print(old_report_list[1])
-
-    insert_new_report_table_thread(old_report_list)
+    count = stream_upsert_batches(
+        crud_iter_report_table(),
+        crud_insert_new_report_table,
+        desc="Inserting old_report_table batches",
+    )
+    print(count)
 
 
 #################################################################################
 # 매장 기본 정보 insert 또는 update 함수
-def insert_or_update_local_store_info_thread(
-    store_info_list: List[LocalStoreBasicInfo], batch_size: int = 5000
-) -> None:
-    with ThreadPoolExecutor(max_workers=12) as executor:
-        futures = []
-        for i in range(0, len(store_info_list), batch_size):
-            batch = store_info_list[i : i + batch_size]
-            futures.append(
-                executor.submit(crud_insert_or_update_store_info_batch, batch)
-            )
-
-        for future in tqdm(
-            as_completed(futures),
-            total=len(futures),
-            desc="Inserting local_store batches",
-        ):
-            future.result()
-
-
+# 매장 전체를 리스트로 만들지 않고 읽는 대로 배치 upsert
 @time_execution
-def insert_or_update_local_store_info():
-    local_store_info_list = crud_select_local_store_info()
-    insert_or_update_local_store_info_thread(local_store_info_list)
+def insert_or_update_local_store_info(sub_district_ids: Optional[Set[int]] = None):
+    stream_upsert_batches(
+        crud_iter_local_store_info(),
+        crud_insert_or_update_store_info_batch,
+        desc="Inserting local_store batches",
+        transform=lambda batch: crud_filter_stores_by_sub_district_ids(
+            batch, sub_district_ids
+        ),
+    )
 
 
 #################################################################################
@@ -180,8 +216,10 @@ def select_local_store_top5_menus_thread(
 
 
 @time_execution
-def insert_or_update_local_store_top5_menu():
-    local_store_rep_id_list = crud_select_local_store_sub_district_rep_id()
+def insert_or_update_local_store_top5_menu(sub_district_ids: Optional[Set[int]] = None):
+    local_store_rep_id_list = crud_filter_stores_by_sub_district_ids(
+        crud_select_local_store_sub_district_rep_id(), sub_district_ids
+    )
     local_store_top5_menu_list = select_local_store_top5_menus_thread(
         local_store_rep_id_list
     )
@@ -246,9 +284,13 @@ def select_local_store_loc_info_j_score_average_thread(
 
 
 @time_execution
-def insert_or_update_local_store_loc_info_j_score_average_data():
+def insert_or_update_local_store_loc_info_j_score_average_data(
+    sub_district_ids: Optional[Set[int]] = None,
+):
     local_store_sub_district_id_list: List[LocalStoreSubdistrictId] = (
-        crud_select_local_store_sub_district_id()
+        crud_filter_stores_by_sub_district_ids(
+            crud_select_local_store_sub_district_id(), sub_district_ids
+        )
     )
     local_store_loc_info_j_score_avg_list = (
         select_local_store_loc_info_j_score_average_thread(
@@ -256,7 +298,6 @@ def insert_or_update_local_store_loc_info_j_score_average_data():
         )
     )
     print(len(local_store_loc_info_j_score_avg_list))
-    print(local_store_loc_info_j_score_avg_list[1])
     insert_or_update_local_store_loc_info_j_score_average_data_thread(
         local_store_loc_info_j_score_avg_list
     )
@@ -286,10 +327,15 @@ def insert_or_update_local_store_population_data_thread(
 
 
 @time_execution
-def insert_or_update_local_store_population_data():
+def insert_or_update_local_store_population_data(
+    sub_district_ids: Optional[Set[int]] = None,
+):
     local_store_sub_district_id_list: List[LocalStoreSubdistrictId] = (
-        crud_select_local_store_sub_district_id()
+        crud_filter_stores_by_sub_district_ids(
+            crud_select_local_store_sub_district_id(), sub_district_ids
+        )
     )
+    # 읍/면/동별로 한 번만 조회해서 매장에 매핑
     local_store_population_data_list = crud_select_local_store_population_data(
         local_store_sub_district_id_list
     )
@@ -319,42 +365,20 @@ def insert_or_update_local_store_loc_info_data_thread(
             future.result()
 
 
-def select_local_store_loc_info_thread(
-    local_store_sub_district_id_list: List[LocalStoreSubdistrictId],
-    batch_size: int = 5000,
-) -> List[LocalStoreLocInfoData]:
-    results = []
-    with ThreadPoolExecutor(max_workers=12) as executor:
-        futures = []
-        for i in range(0, len(local_store_sub_district_id_list), batch_size):
-            batch = local_store_sub_district_id_list[i : i + batch_size]
-            futures.append(
-                executor.submit(crud_select_local_store_loc_info_data, batch)
-            )
-
-        for future in tqdm(
-            as_completed(futures), total=len(futures), desc="SELECT LOC_INFO batches"
-        ):
-            try:
-                batch_result = future.result()
-                results.extend(batch_result)
-            except Exception as e:
-                print(f"배치 처리 중 오류 발생: {e}")
-                continue
-
-    return results
-
-
 @time_execution
-def insert_or_update_local_store_loc_info_data():
+def insert_or_update_local_store_loc_info_data(
+    sub_district_ids: Optional[Set[int]] = None,
+):
     local_store_sub_district_id_list: List[LocalStoreSubdistrictId] = (
-        crud_select_local_store_sub_district_id()
+        crud_filter_stores_by_sub_district_ids(
+            crud_select_local_store_sub_district_id(), sub_district_ids
+        )
     )
-    local_store_loc_info_list = select_local_store_loc_info_thread(
+    # 읍/면/동별로 한 번만 조회해서 매장에 매핑
+    local_store_loc_info_list = crud_select_local_store_loc_info_data(
         local_store_sub_district_id_list
     )
     print(len(local_store_loc_info_list))
-    print(local_store_loc_info_list[1])
     insert_or_update_local_store_loc_info_data_thread(local_store_loc_info_list)
 
 
@@ -384,44 +408,20 @@ def insert_or_update_local_store_loc_info_j_score_data_thread(
             future.result()
 
 
-def select_local_store_loc_info_j_score_thread(
-    local_store_sub_district_id_list: List[LocalStoreSubdistrictId],
-    batch_size: int = 5000,
-) -> List[LocalStoreLocInfoData]:
-    results = []
-    with ThreadPoolExecutor(max_workers=12) as executor:
-        futures = []
-        for i in range(0, len(local_store_sub_district_id_list), batch_size):
-            batch = local_store_sub_district_id_list[i : i + batch_size]
-            futures.append(
-                executor.submit(crud_select_local_store_loc_info_j_score_data, batch)
-            )
-
-        for future in tqdm(
-            as_completed(futures),
-            total=len(futures),
-            desc="SELECT LOC_INFO_j_score batches",
-        ):
-            try:
-                batch_result = future.result()
-                results.extend(batch_result)
-            except Exception as e:
-                print(f"배치 처리 중 오류 발생: {e}")
-                continue
-
-    return results
-
-
 @time_execution
-def insert_or_update_local_store_loc_info_j_score_data():
+def insert_or_update_local_store_loc_info_j_score_data(
+    sub_district_ids: Optional[Set[int]] = None,
+):
     local_store_sub_district_id_list: List[LocalStoreSubdistrictId] = (
-        crud_select_local_store_sub_district_id()
+        crud_filter_stores_by_sub_district_ids(
+            crud_select_local_store_sub_district_id(), sub_district_ids
+        )
     )
-    local_store_loc_info_j_score_list = select_local_store_loc_info_j_score_thread(
+    # 읍/면/동별로 한 번만 조회해서 매장에 매핑
+    local_store_loc_info_j_score_list = crud_select_local_store_loc_info_j_score_data(
         local_store_sub_district_id_list
     )
     # print(len(local_store_loc_info_j_score_list))
-    print(local_store_loc_info_j_score_list[1])
     insert_or_update_local_store_loc_info_j_score_data_thread(
         local_store_loc_info_j_score_list
     )
@@ -453,48 +453,22 @@ def insert_or_update_local_store_loc_info_resident_work_pop_data_thread(
             future.result()
 
 
-def select_local_store_loc_info_resident_work_pop_thread(
-    local_store_sub_district_id_list: List[LocalStoreSubdistrictId],
-    batch_size: int = 5000,
-) -> List[LocalStoreLocInfoData]:
-    results = []
-    with ThreadPoolExecutor(max_workers=12) as executor:
-        futures = []
-        for i in range(0, len(local_store_sub_district_id_list), batch_size):
-            batch = local_store_sub_district_id_list[i : i + batch_size]
-            futures.append(
-                executor.submit(
-                    crud_select_local_store_loc_info_resident_work_pop_data, batch
-                )
-            )
-
-        for future in tqdm(
-            as_completed(futures),
-            total=len(futures),
-            desc="SELECT LOC_INFO_resident_work_pop batches",
-        ):
-            try:
-                batch_result = future.result()
-                results.extend(batch_result)
-            except Exception as e:
-                print(f"배치 처리 중 오류 발생: {e}")
-                continue
-
-    return results
-
-
 @time_execution
-def insert_or_update_local_store_loc_info_resident_work_pop_data():
+def insert_or_update_local_store_loc_info_resident_work_pop_data(
+    sub_district_ids: Optional[Set[int]] = None,
+):
     local_store_sub_district_id_list: List[LocalStoreSubdistrictId] = (
-        crud_select_local_store_sub_district_id()
+        crud_filter_stores_by_sub_district_ids(
+            crud_select_local_store_sub_district_id(), sub_district_ids
+        )
     )
+    # 읍/면/동별로 한 번만 조회해서 매장에 매핑
     local_store_loc_info_resident_work_pop_list = (
-        select_local_store_loc_info_resident_work_pop_thread(
+        crud_select_local_store_loc_info_resident_work_pop_data(
             local_store_sub_district_id_list
         )
     )
     print(len(local_store_loc_info_resident_work_pop_list))
-    print(local_store_loc_info_resident_work_pop_list[1])
     insert_or_update_local_store_loc_info_resident_work_pop_data_thread(
         local_store_loc_info_resident_work_pop_list
     )
@@ -524,44 +498,20 @@ def insert_or_update_local_store_loc_info_move_pop_data_thread(
             future.result()
 
 
-def select_local_store_loc_info_move_pop_thread(
-    local_store_sub_district_id_list: List[LocalStoreSubdistrictId],
-    batch_size: int = 5000,
-) -> List[LocalStoreMovePopData]:
-    results = []
-    with ThreadPoolExecutor(max_workers=12) as executor:
-        futures = []
-        for i in range(0, len(local_store_sub_district_id_list), batch_size):
-            batch = local_store_sub_district_id_list[i : i + batch_size]
-            futures.append(
-                executor.submit(crud_select_local_store_loc_info_move_pop_data, batch)
-            )
-
-        for future in tqdm(
-            as_completed(futures),
-            total=len(futures),
-            desc="SELECT LOC_INFO_move_pop batches",
-        ):
-            try:
-                batch_result = future.result()
-                results.extend(batch_result)
-            except Exception as e:
-                print(f"배치 처리 중 오류 발생: {e}")
-                continue
-
-    return results
-
-
 @time_execution
-def insert_or_update_local_store_loc_info_move_pop_data():
+def insert_or_update_local_store_loc_info_move_pop_data(
+    sub_district_ids: Optional[Set[int]] = None,
+):
     local_store_sub_district_id_list: List[LocalStoreSubdistrictId] = (
-        crud_select_local_store_sub_district_id()
+        crud_filter_stores_by_sub_district_ids(
+            crud_select_local_store_sub_district_id(), sub_district_ids
+        )
     )
-    local_store_loc_info_move_pop_list = select_local_store_loc_info_move_pop_thread(
+    # 읍/면/동별로 한 번만 조회해서 매장에 매핑
+    local_store_loc_info_move_pop_list = crud_select_local_store_loc_info_move_pop_data(
         local_store_sub_district_id_list
     )
     print(len(local_store_loc_info_move_pop_list))
-    print(local_store_loc_info_move_pop_list[1])
     insert_or_update_local_store_loc_info_move_pop_data_thread(
         local_store_loc_info_move_pop_list
     )
@@ -628,24 +578,25 @@ def select_commercial_district_j_score_weighted_average_thread(
 
 
 @time_execution
-def insert_or_update_commercial_district_j_score_weighted_average_data():
+def insert_or_update_commercial_district_j_score_weighted_average_data(
+    sub_district_ids: Optional[Set[int]] = None,
+):
     local_store_sub_district_detail_category_id_list: List[
         LocalStoreMappingSubDistrictDetailCategoryId
-    ] = crud_select_local_store_mp_detail_cateogry_id()
+    ] = crud_filter_stores_by_sub_district_ids(
+        crud_select_local_store_mp_detail_cateogry_id(), sub_district_ids
+    )
 
     print(len(local_store_sub_district_detail_category_id_list))
-    print(local_store_sub_district_detail_category_id_list[1])
 
+    j_score_weighted_average_cache.clear()
     commercial_district_j_score_weighted_average_list = (
         select_commercial_district_j_score_weighted_average_thread(
             local_store_sub_district_detail_category_id_list
         )
     )
+    j_score_weighted_average_cache.log_stats()
     print(len(commercial_district_j_score_weighted_average_list))
-    print(commercial_district_j_score_weighted_average_list[0])
-    print(commercial_district_j_score_weighted_average_list[1])
-    print(commercial_district_j_score_weighted_average_list[2])
-    print(commercial_district_j_score_weighted_average_list[3])
     insert_or_update_commercial_district_j_score_weighted_average_data_thread(
         commercial_district_j_score_weighted_average_list
     )
@@ -710,9 +661,13 @@ def select_commercial_district_main_detail_category_count_thread(
 
 
 @time_execution
-def insert_or_update_commercial_district_main_detail_category_count_data():
+def insert_or_update_commercial_district_main_detail_category_count_data(
+    sub_district_ids: Optional[Set[int]] = None,
+):
     local_store_sub_district_id_list: List[LocalStoreSubdistrictId] = (
-        crud_select_local_store_sub_district_id()
+        crud_filter_stores_by_sub_district_ids(
+            crud_select_local_store_sub_district_id(), sub_district_ids
+        )
     )
     commercial_district_main_detail_category_count_list = (
         select_commercial_district_main_detail_category_count_thread(
@@ -789,17 +744,24 @@ def select_commercial_district_j_score_average_thread(
 
 
 @time_execution
-def insert_or_update_commercial_district_j_score_average_data():
+def insert_or_update_commercial_district_j_score_average_data(
+    sub_district_ids: Optional[Set[int]] = None,
+):
     local_store_sub_district_detail_category_id_list: List[
         LocalStoreMappingSubDistrictDetailCategoryId
-    ] = crud_select_local_store_mp_detail_cateogry_id()
+    ] = crud_filter_stores_by_sub_district_ids(
+        crud_select_local_store_mp_detail_cateogry_id(), sub_district_ids
+    )
 
     # print(len(local_store_sub_district_detail_category_id_list))
     # print(local_store_sub_district_detail_category_id_list[1])
 
+    # 매장별 5중 JOIN 쿼리 대신 통계 테이블을 한 번만 읽어서 메모리에서 평균 계산
+    # (기존 방식: select_commercial_district_j_score_average_thread)
+    j_score_statistics = crud_select_commercial_district_j_score_statistics()
     commercial_district_j_score_average_list = (
-        select_commercial_district_j_score_average_thread(
-            local_store_sub_district_detail_category_id_list
+        crud_calculate_commercial_district_j_score_average_data(
+            local_store_sub_district_detail_category_id_list, j_score_statistics
         )
     )
     # print(len(commercial_district_j_score_average_list))
@@ -866,8 +828,12 @@ def select_local_store_weekday_time_client_average_sales_thread(
 
 
 @time_execution
-def insert_or_update_commercial_district_weekday_time_client_average_sales():
-    local_store_sub_district_rep_id_list = crud_select_local_store_sub_district_rep_id()
+def insert_or_update_commercial_district_weekday_time_client_average_sales(
+    sub_district_ids: Optional[Set[int]] = None,
+):
+    local_store_sub_district_rep_id_list = crud_filter_stores_by_sub_district_ids(
+        crud_select_local_store_sub_district_rep_id(), sub_district_ids
+    )
     local_store_weekday_time_client_average_sales_list = (
         select_local_store_weekday_time_client_average_sales_thread(
             local_store_sub_district_rep_id_list
@@ -945,19 +911,25 @@ def select_commercial_district_district_average_sales_thread(
 
 
 @time_execution
-def insert_or_update_commercial_district_district_average_sales_data():
+def insert_or_update_commercial_district_district_average_sales_data(
+    sub_district_ids: Optional[Set[int]] = None,
+):
     local_store_sub_district_detail_category_id_list: List[
         LocalStoreMappingSubDistrictDetailCategoryId
-    ] = crud_select_local_store_mp_detail_cateogry_id()
+    ] = crud_filter_stores_by_sub_district_ids(
+        crud_select_local_store_mp_detail_cateogry_id(), sub_district_ids
+    )
 
     # print(len(local_store_sub_district_detail_category_id_list))
     # print(local_store_sub_district_detail_category_id_list[1])
 
+    district_average_sales_cache.clear()
     commercial_district_district_average_sales_list = (
         select_commercial_district_district_average_sales_thread(
             local_store_sub_district_detail_category_id_list
         )
     )
+    district_average_sales_cache.log_stats()
     print(len(commercial_district_district_average_sales_list))
 
     insert_or_update_commercial_district_district_average_sales_data_thread(
@@ -992,48 +964,26 @@ def insert_or_update_commercial_district_top5_top3_data_thread(
             future.result()
 
 
-def select_commercial_district_top5_top3_thread(
-    local_store_sub_district_id_list: List[LocalStoreSubdistrictId],
-    batch_size: int = 5000,
-) -> List[LocalStoreCDDistrictAverageSalesTop5]:
-    results = []
-    with ThreadPoolExecutor(max_workers=12) as executor:
-        futures = []
-        for i in range(0, len(local_store_sub_district_id_list), batch_size):
-            batch = local_store_sub_district_id_list[i : i + batch_size]
-            futures.append(
-                executor.submit(
-                    crud_select_commercial_district_top5_top3_data_batch,
-                    batch,
-                )
-            )
-
-        for future in tqdm(
-            as_completed(futures),
-            total=len(futures),
-            desc="SELECT cd top5 top3 batches",
-        ):
-            try:
-                batch_result = future.result()
-                results.extend(batch_result)
-            except Exception as e:
-                print(f"배치 처리 중 오류 발생: {e}")
-                continue
-
-    return results
-
-
 @time_execution
-def insert_or_update_commercial_district_top5_top3_data():
+def insert_or_update_commercial_district_top5_top3_data(
+    sub_district_ids: Optional[Set[int]] = None,
+):
     local_store_sub_district_id_list: List[LocalStoreSubdistrictId] = (
-        crud_select_local_store_sub_district_id()
+        crud_filter_stores_by_sub_district_ids(
+            crud_select_local_store_sub_district_id(), sub_district_ids
+        )
     )
 
     # print(len(local_store_sub_district_id_list))
     # print(local_store_sub_district_id_list[1])
 
-    commercial_district_top5_top3_list = select_commercial_district_top5_top3_thread(
-        local_store_sub_district_id_list
+    # 전국 TOP5, 읍/면/동별 TOP3 는 고정된 기준월로 한 번만 조회하고 매장에는 메모리에서 매핑
+    snapshot = get_report_snapshot()
+    top5_info, top3_info = crud_select_rising_business_top5_top3_tables(
+        snapshot.rising_business_y_m
+    )
+    commercial_district_top5_top3_list = crud_build_rising_business_top5_top3(
+        local_store_sub_district_id_list, top5_info, top3_info
     )
     # print(len(commercial_district_top5_top3_list))
     # print(local_store_sub_district_id_list[0])
@@ -1106,19 +1056,24 @@ def select_commercial_district_commercial_district_average_thread(
 
 
 @time_execution
-def insert_or_update_commercial_district_commercial_district_average_data():
+def insert_or_update_commercial_district_commercial_district_average_data(
+    sub_district_ids: Optional[Set[int]] = None,
+):
     local_store_sub_district_detail_category_id_list: List[
         LocalStoreMappingSubDistrictDetailCategoryId
-    ] = crud_select_local_store_mp_detail_cateogry_id()
+    ] = crud_filter_stores_by_sub_district_ids(
+        crud_select_local_store_mp_detail_cateogry_id(), sub_district_ids
+    )
 
+    commercial_district_average_cache.clear()
     commercial_district_commercial_district_average_list = (
         select_commercial_district_commercial_district_average_thread(
             local_store_sub_district_detail_category_id_list
         )
     )
+    commercial_district_average_cache.log_stats()
 
     print(len(commercial_district_commercial_district_average_list))
-    print(commercial_district_commercial_district_average_list[0])
     insert_or_update_commercial_district_commercial_district_average_data_thread(
         commercial_district_commercial_district_average_list
     )
@@ -1127,23 +1082,155 @@ def insert_or_update_commercial_district_commercial_district_average_data():
 #################################################################################
 
 # 37400 seconds -> 약 10시간
+# 리포트 갱신 단계 그래프 (입력: ReportSnapshot 필드 또는 다른 단계 출력)
+# 모든 단계가 LOCAL_STORE 매장 목록과 REPORT 기본 행을 쓰므로 report_store_info 에 의존
+# 매장 목록 변경은 partitions(읍/면/동별 지문)로 감지해서 바뀐 읍/면/동만 갱신
+# 기준월이 전 지역 공통인 소스(Y_M, 통계 REF_DATE)가 바뀌면 해당 단계는 전체 갱신
+# 주석의 시간은 단계별 단독 실행 기준
+REPORT_STAGES = [
+    ReportStage(
+        "local_store_info",  # 532.43 seconds
+        insert_or_update_local_store_info,
+        outputs=("report_store_info",),
+        partitions=("local_store",),
+    ),
+    ReportStage(
+        "local_store_loc_info_j_score_average",  # 40.96 seconds
+        insert_or_update_local_store_loc_info_j_score_average_data,
+        inputs=("report_store_info", "loc_info_statistics_ref_date"),
+        outputs=("report_loc_info_j_score_average",),
+        partitions=("local_store",),
+    ),
+    ReportStage(
+        "local_store_population",  # 49.84 seconds
+        insert_or_update_local_store_population_data,
+        inputs=("report_store_info",),
+        outputs=("report_population",),
+        partitions=("local_store", "population_age"),
+    ),
+    ReportStage(
+        "local_store_loc_info",  # 522.93 seconds
+        insert_or_update_local_store_loc_info_data,
+        inputs=("report_store_info", "loc_info_y_m"),
+        outputs=("report_loc_info",),
+        partitions=("local_store",),
+    ),
+    ReportStage(
+        "local_store_loc_info_j_score",  # 63.58 seconds
+        insert_or_update_local_store_loc_info_j_score_data,
+        inputs=(
+            "report_store_info",
+            "loc_info_statistics_ref_date",
+            "population_info_mz_statistics_ref_date",
+        ),
+        outputs=("report_loc_info_j_score",),
+        partitions=("local_store",),
+    ),
+    ReportStage(
+        "local_store_loc_info_resident_work_pop",  # 42.97 seconds
+        insert_or_update_local_store_loc_info_resident_work_pop_data,
+        inputs=("report_store_info", "loc_info_y_m"),
+        outputs=("report_loc_info_resident_work_pop",),
+        partitions=("local_store",),
+    ),
+    ReportStage(
+        "local_store_loc_info_move_pop",  # 43.68 seconds
+        insert_or_update_local_store_loc_info_move_pop_data,
+        inputs=("report_store_info", "loc_info_y_m", "loc_info_statistics_ref_date"),
+        outputs=("report_loc_info_move_pop",),
+        partitions=("local_store",),
+    ),
+    ReportStage(
+        "local_store_top5_menu",  # 139.11 seconds
+        insert_or_update_local_store_top5_menu,
+        inputs=("report_store_info", "commercial_district_y_m"),
+        outputs=("report_top5_menu",),
+        partitions=("local_store",),
+    ),
+    ReportStage(
+        "commercial_district_j_score_weighted_average",  # 4661.50 seconds
+        insert_or_update_commercial_district_j_score_weighted_average_data,
+        inputs=("report_store_info", "commercial_district_weighted_average_ref_date"),
+        outputs=("report_commercial_district_j_score_weighted_average",),
+        partitions=("local_store",),
+    ),
+    ReportStage(
+        "commercial_district_main_detail_category_count",  # 422.60 seconds
+        insert_or_update_commercial_district_main_detail_category_count_data,
+        inputs=("report_store_info", "commercial_district_y_m"),
+        outputs=("report_commercial_district_main_category_count",),
+        partitions=("local_store",),
+    ),
+    ReportStage(
+        "commercial_district_weekday_time_client_average_sales",  # 163.68 seconds
+        insert_or_update_commercial_district_weekday_time_client_average_sales,
+        inputs=("report_store_info", "commercial_district_y_m"),
+        outputs=("report_commercial_district_weekday_time_client_average_sales",),
+        partitions=("local_store",),
+    ),
+    ReportStage(
+        "commercial_district_top5_top3",  # 569.44 seconds
+        insert_or_update_commercial_district_top5_top3_data,
+        inputs=("report_store_info", "rising_business_y_m"),
+        outputs=("report_commercial_district_top5_top3",),
+        partitions=("local_store",),
+    ),
+    ReportStage(
+        "commercial_district_j_score_average",  # 23355.34 seconds
+        insert_or_update_commercial_district_j_score_average_data,
+        inputs=(
+            "report_store_info",
+            "market_size_statistics_ref_date",
+            "usage_count_statistics_ref_date",
+            "average_sales_statistics_ref_date",
+            "sub_district_density_statistics_ref_date",
+            "average_payment_statistics_ref_date",
+        ),
+        outputs=("report_commercial_district_j_score_average",),
+        partitions=("local_store",),
+    ),
+    ReportStage(
+        "commercial_district_district_average_sales",  # 3186.77 seconds
+        insert_or_update_commercial_district_district_average_sales_data,
+        inputs=("report_store_info", "commercial_district_y_m"),
+        outputs=("report_commercial_district_district_average_sales",),
+        partitions=("local_store",),
+    ),
+    ReportStage(
+        "commercial_district_commercial_district_average",  # 3630.66 seconds
+        insert_or_update_commercial_district_commercial_district_average_data,
+        inputs=("report_store_info", "commercial_district_y_m"),
+        outputs=("report_commercial_district_average",),
+        partitions=("local_store",),
+        db_slots=16,
+    ),
+]
+
+
+def run_report_stages(only=None, force=()):
+    # 실행 시작 시 소스 테이블 최신 기준일 고정 (모든 단계가 같은 스냅샷 사용)
+    snapshot = pin_report_snapshot()
+    partition_sources = {
+        "local_store": lambda: select_local_store_sub_district_digests(snapshot),
+        "population_age": select_population_age_sub_district_ref_dates,
+    }
+    statuses = ReportStageRunner(REPORT_STAGES, snapshot, partition_sources).run(
+        only=only, force=force
+    )
+    for name, status in statuses.items():
+        print(f"{name}: {status}")
+    return statuses
+
+
 if __name__ == "__main__":
-    # migration_old_talbe_to_new_table_report() # 583.14 seconds O
-
-    # insert_or_update_local_store_info()  #  532.43 seconds # O
-    # insert_or_update_local_store_loc_info_j_score_average_data()  # 40.96 seconds # O
-    # insert_or_update_local_store_population_data()  # 49.84 seconds  # O
-    # insert_or_update_local_store_loc_info_data()  # 522.93 seconds # O
-    # insert_or_update_local_store_loc_info_j_score_data()  #  63.58 seconds # O
-    # insert_or_update_local_store_loc_info_resident_work_pop_data()  # 42.97 seconds # O
-    # insert_or_update_local_store_loc_info_move_pop_data()  #   43.68 seconds # O
-
-    # insert_or_update_local_store_top5_menu()  # 139.11 seconds
-    # insert_or_update_commercial_district_j_score_weighted_average_data()  # 4661.50 seconds
-    # insert_or_update_commercial_district_main_detail_category_count_data()  # 422.60 seconds
-    # insert_or_update_commercial_district_weekday_time_client_average_sales()  #  163.68 seconds
-    # insert_or_update_commercial_district_top5_top3_data()  # 569.44 seconds
-    # insert_or_update_commercial_district_j_score_average_data()  #  23355.34 seconds
-    # insert_or_update_commercial_district_district_average_sales_data()  #  3186.77 seconds
-    # insert_or_update_commercial_district_commercial_district_average_data()  # 3630.66 seconds
+    # python -m app.service.report [단계 이름 ...] [--force]
+    # 단계 이름을 주면 그 단계만, --force 면 입력이 그대로여도 다시 실행
+    args = sys.argv[1:]
+    only = [arg for arg in args if arg != "--force"] or None
+    force = (only or [stage.name for stage in REPORT_STAGES]) if "--force" in args else ()
+
+    # migration_old_talbe_to_new_table_report() # 583.14 seconds O  (1회성 이관, 단계 그래프에서 제외)
+
+    run_report_stages(only=only, force=force)
+    log_pool_metrics()
     print("END!!!!!!!!!!!!!!!")
@@ -0,0 +1,298 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, Iterable, List, NamedTuple, Optional, Set, Tuple
+
+
+# 리포트 갱신 단계 실행기
+# 단계마다 입력(ReportSnapshot 필드 = 소스 테이블 기준일, 또는 다른 단계의 출력)과 출력을 선언하면
+# 의존 관계를 따라 실행하고, 서로 독립인 단계는 DB 동시 작업 예산 안에서 병렬로 돌린다.
+# 입력 지문(fingerprint)이 마지막 성공 실행과 같으면 건너뛰고, 단계별 소요 시간을 파일에 남긴다.
+# partitions 를 선언한 단계는 지문이 같을 때 읍/면/동별 지문(매장 목록 등)이 바뀐 곳만 증분 갱신한다.
+
+REPORT_STAGE_STATE_DIR = os.getenv("REPORT_STAGE_STATE_DIR", os.path.join("app", "data", "report_runs"))
+# 동시에 돌릴 단계들의 db_slots 합계 상한 (단계 내부 스레드 수 기준, DB 풀 크기에 맞춰 조정)
+REPORT_STAGE_DB_BUDGET = int(os.getenv("REPORT_STAGE_DB_BUDGET", "24"))
+
+REPORT_STAGE_DONE = "done"
+REPORT_STAGE_SKIPPED = "skipped"
+REPORT_STAGE_FAILED = "failed"
+REPORT_STAGE_BLOCKED = "blocked"
+
+
+class ReportStage(NamedTuple):
+    name: str
+    run: Callable[[], Any]
+    inputs: Tuple[str, ...] = ()  # ReportSnapshot 필드 또는 다른 단계의 출력 이름
+    outputs: Tuple[str, ...] = ()
+    db_slots: int = 12  # 단계가 동시에 쓰는 DB 커넥션 수 (내부 ThreadPoolExecutor max_workers)
+    partitions: Tuple[str, ...] = ()  # 읍/면/동별 지문 이름 (run(sub_district_ids=...) 로 범위 전달)
+
+
+# 가중치 세마포어 (단계마다 db_slots 만큼 예산을 잡음)
+class DbBudget:
+    def __init__(self, capacity: int):
+        self.capacity = max(capacity, 1)
+        self.used = 0
+        self._condition = threading.Condition()
+
+    # 예산보다 큰 단계는 혼자 돌 수 있도록 capacity 로 잘라서 잡음
+    def acquire(self, slots: int) -> int:
+        slots = min(max(slots, 1), self.capacity)
+        with self._condition:
+            self._condition.wait_for(lambda: self.used + slots <= self.capacity)
+            self.used += slots
+        return slots
+
+    def release(self, slots: int) -> None:
+        with self._condition:
+            self.used -= slots
+            self._condition.notify_all()
+
+
+class ReportStageRunner:
+    def __init__(
+        self,
+        stages: Iterable[ReportStage],
+        snapshot: Any,
+        partition_sources: Optional[Dict[str, Callable[[], Dict[int, str]]]] = None,
+        budget: int = REPORT_STAGE_DB_BUDGET,
+        state_dir: str = REPORT_STAGE_STATE_DIR,
+    ):
+        self.stages: Dict[str, ReportStage] = {}
+        for stage in stages:
+            if stage.name in self.stages:
+                raise ValueError(f"Duplicate report stage: {stage.name}")
+            self.stages[stage.name] = stage
+
+        self.snapshot = snapshot
+        self.partition_sources = partition_sources or {}
+        self.budget = DbBudget(budget)
+        self.state_path = os.path.join(state_dir, "report_stages.json")
+        self.timings_path = os.path.join(state_dir, "report_stage_timings.jsonl")
+        self._lock = threading.Lock()
+
+        self.producers = self._resolve_producers()
+        self.dependencies = {
+            name: sorted({self.producers[i] for i in stage.inputs if i in self.producers})
+            for name, stage in self.stages.items()
+        }
+        self.order = self._topological_order()
+
+    # 출력 이름 -> 단계 이름, 스냅샷 필드도 다른 단계 출력도 아닌 입력은 선언 오류
+    def _resolve_producers(self) -> Dict[str, str]:
+        producers: Dict[str, str] = {}
+        for stage in self.stages.values():
+            for output in stage.outputs:
+                if output in producers:
+                    raise ValueError(f"Output {output} declared by {producers[output]} and {stage.name}")
+                producers[output] = stage.name
+
+        for stage in self.stages.values():
+            for name in stage.inputs:
+                if name not in producers and not hasattr(self.snapshot, name):
+                    raise ValueError(f"Unknown input {name} for report stage {stage.name}")
+            for name in stage.partitions:
+                if name not in self.partition_sources:
+                    raise ValueError(f"Unknown partition {name} for report stage {stage.name}")
+        return producers
+
+    def _topological_order(self) -> List[str]:
+        order: List[str] = []
+        visiting = set()
+
+        def visit(name: str) -> None:
+            if name in order:
+                return
+            if name in visiting:
+                raise ValueError(f"Report stage cycle at {name}")
+            visiting.add(name)
+            for dependency in self.dependencies[name]:
+                visit(dependency)
+            visiting.discard(name)
+            order.append(name)
+
+        for name in self.stages:
+            visit(name)
+        return order
+
+    # 스냅샷 입력 값 + 선행 단계 지문 (선행 단계 입력이 바뀌면 후행 단계도 다시 실행)
+    def fingerprint(self, name: str, fingerprints: Dict[str, str]) -> str:
+        values = {}
+        for input_name in self.stages[name].inputs:
+            if input_name in self.producers:
+                values[input_name] = fingerprints[self.producers[input_name]]
+            else:
+                values[input_name] = str(getattr(self.snapshot, input_name))
+        encoded = json.dumps(values, sort_keys=True, ensure_ascii=False)
+        return hashlib.sha1(encoded.encode("utf-8")).hexdigest()
+
+    def load_state(self) -> Dict[str, Dict[str, Any]]:
+        if not os.path.exists(self.state_path):
+            return {}
+        try:
+            with open(self.state_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError) as e:
+            logging.getLogger(__name__).warning(f"Ignoring broken report stage state {self.state_path}: {e}")
+            return {}
+
+    def _save_state(self, state: Dict[str, Dict[str, Any]]) -> None:
+        os.makedirs(os.path.dirname(self.state_path) or ".", exist_ok=True)
+        tmp_path = f"{self.state_path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f, ensure_ascii=False, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.state_path)
+
+    def _record_timing(self, record: Dict[str, Any]) -> None:
+        os.makedirs(os.path.dirname(self.timings_path) or ".", exist_ok=True)
+        with open(self.timings_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+
+    # 읍/면/동별 지문 조회 (여러 단계가 같은 지문을 쓰므로 실행당 한 번)
+    def load_partitions(self, names: Iterable[str]) -> Dict[str, Dict[str, str]]:
+        partitions = {}
+        for name in sorted(set(names)):
+            start = time.monotonic()
+            partitions[name] = {
+                str(sub_district_id): digest
+                for sub_district_id, digest in self.partition_sources[name]().items()
+            }
+            logging.getLogger(__name__).info(
+                f"Partition {name}: {len(partitions[name])} sub-districts in {time.monotonic() - start:.2f} seconds"
+            )
+        return partitions
+
+    # 지난 성공 실행 이후 지문이 바뀐(추가/삭제 포함) 읍/면/동
+    @staticmethod
+    def changed_sub_district_ids(
+        previous: Dict[str, Dict[str, str]], current: Dict[str, Dict[str, str]]
+    ) -> Set[int]:
+        changed = set()
+        for name, digests in current.items():
+            old_digests = previous[name]
+            for key in digests.keys() | old_digests.keys():
+                if digests.get(key) != old_digests.get(key):
+                    changed.add(int(key))
+        return changed
+
+    # scope: None 이면 전체, 아니면 갱신할 읍/면/동 id
+    def _execute(self, name: str, scope: Optional[Set[int]]) -> float:
+        stage = self.stages[name]
+        slots = self.budget.acquire(stage.db_slots)
+        try:
+            logging.getLogger(__name__).info(
+                f"Report stage {name} started "
+                f"({'full' if scope is None else f'{len(scope)} sub-districts'}, db slots {slots}/{self.budget.capacity})"
+            )
+            start = time.monotonic()
+            if stage.partitions:
+                stage.run(sub_district_ids=scope)
+            else:
+                stage.run()
+            return time.monotonic() - start
+        finally:
+            self.budget.release(slots)
+
+    # None: 전체 갱신, 빈 집합: 건너뜀, 그 외: 지문이 바뀐 읍/면/동만 갱신
+    def plan_scope(
+        self,
+        name: str,
+        previous: Optional[Dict[str, Any]],
+        fingerprint: str,
+        partitions: Dict[str, Dict[str, str]],
+        force: bool,
+    ) -> Optional[Set[int]]:
+        if force or previous is None or previous.get("fingerprint") != fingerprint:
+            return None
+        stage_partitions = {p: partitions[p] for p in self.stages[name].partitions}
+        previous_partitions = previous.get("partitions", {})
+        if any(p not in previous_partitions for p in stage_partitions):
+            return None
+        return self.changed_sub_district_ids(previous_partitions, stage_partitions)
+
+    # only: 지정한 단계만 실행 (나머지는 지문 계산에만 사용), force: 지문이 같아도 실행
+    def run(self, only: Optional[Iterable[str]] = None, force: Iterable[str] = ()) -> Dict[str, str]:
+        logger = logging.getLogger(__name__)
+        only = set(self.stages if only is None else only)
+        force = set(force)
+        for name in only | force:
+            if name not in self.stages:
+                raise ValueError(f"Unknown report stage: {name}")
+
+        state = self.load_state()
+        partitions = self.load_partitions(
+            partition for name in only for partition in self.stages[name].partitions
+        )
+        run_id = time.strftime("%Y%m%dT%H%M%S")
+        fingerprints: Dict[str, str] = {}
+        for name in self.order:
+            fingerprints[name] = self.fingerprint(name, fingerprints)
+        statuses: Dict[str, str] = {}
+        pending = list(self.order)
+        running: Dict[Any, str] = {}
+        scopes: Dict[str, Optional[Set[int]]] = {}
+
+        def finish(name: str, status: str, seconds: Optional[float] = None, error: Optional[str] = None) -> None:
+            statuses[name] = status
+            record = {"run_id": run_id, "stage": name, "status": status, "fingerprint": fingerprints[name]}
+            if name in scopes:
+                scope = scopes[name]
+                record["sub_districts"] = "full" if scope is None else len(scope)
+            if seconds is not None:
+                record["seconds"] = round(seconds, 2)
+            if error is not None:
+                record["error"] = error
+            with self._lock:
+                self._record_timing(record)
+                if status == REPORT_STAGE_DONE:
+                    state[name] = {
+                        "fingerprint": fingerprints[name],
+                        "partitions": {p: partitions[p] for p in self.stages[name].partitions},
+                        "seconds": record["seconds"],
+                        "finished_at": time.strftime("%Y-%m-%d %H:%M:%S"),
+                    }
+                    self._save_state(state)
+
+        with ThreadPoolExecutor(max_workers=len(self.stages) or 1) as executor:
+            while pending or running:
+                for name in list(pending):
+                    dependency_statuses = [statuses.get(d) for d in self.dependencies[name]]
+                    if None in dependency_statuses:
+                        continue
+                    pending.remove(name)
+
+                    if REPORT_STAGE_FAILED in dependency_statuses or REPORT_STAGE_BLOCKED in dependency_statuses:
+                        logger.warning(f"Report stage {name} blocked by failed dependency")
+                        finish(name, REPORT_STAGE_BLOCKED)
+                    elif name not in only:
+                        statuses[name] = REPORT_STAGE_SKIPPED
+                    else:
+                        scope = self.plan_scope(name, state.get(name), fingerprints[name], partitions, name in force)
+                        if scope is not None and not scope:
+                            logger.info(f"Report stage {name} skipped (inputs unchanged)")
+                            statuses[name] = REPORT_STAGE_SKIPPED
+                            continue
+                        scopes[name] = scope
+                        running[executor.submit(self._execute, name, scope)] = name
+
+                if not running:
+                    continue
+
+                done, _ = wait(list(running), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        seconds = future.result()
+                    except Exception as e:
+                        logger.error(f"Report stage {name} failed: {e}")
+                        finish(name, REPORT_STAGE_FAILED, error=str(e))
+                    else:
+                        logger.info(f"Report stage {name} finished in {seconds:.2f} seconds")
+                        finish(name, REPORT_STAGE_DONE, seconds)
+
+        return statuses
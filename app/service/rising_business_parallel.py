@@ -1,25 +1,18 @@
 from concurrent.futures import ThreadPoolExecutor
 from multiprocessing import Pool
 import re
-from typing import List
+from typing import List, Optional
 import time
-from selenium import webdriver
 from selenium.webdriver.common.by import By
-from selenium.webdriver.chrome.service import Service
-from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.support.ui import WebDriverWait
 from selenium.webdriver.support import expected_conditions as EC
 import os
-from webdriver_manager.chrome import ChromeDriverManager
 from tqdm import tqdm
-from app.crud.biz_detail_category import (
-    get_biz_categories_id_by_biz_detail_category_name,
-)
-from app.crud.city import get_or_create_city_id
-from app.crud.district import get_or_create_district_id
-from app.crud.rising_business import insert_rising_business
-from app.crud.sub_district import get_or_create_sub_district_id
+from app.crud.dimension_cache import dimension_cache, preload_dimension_cache
+from app.crud.rising_business import rising_business_writer
 from app.schemas.rising_business import RisingBusiness, RisingBusinessInsert
+from app.service.crawler_wait import adaptive_wait
+from app.service.webdriver_pool import WebDriverPool, resolve_chromedriver_path
 
 from selenium.common.exceptions import (
     UnexpectedAlertPresentException,
@@ -30,6 +23,14 @@ from selenium.webdriver.common.alert import Alert
 
 NICE_BIZ_MAP_URL = "https://m.nicebizmap.co.kr/analysis/analysisFree"
 
+# 시/도, 시/군/구, 읍/면/동 목록이 같은 ul 에 차례로 표시됨
+RISING_REGION_LIST_XPATH = '//*[@id="rising"]/div[2]/div[2]/div[2]/div/div[2]/ul'
+
+# 상승 업종 top5 목록 (읍/면/동을 바꾸면 같은 ul 의 내용만 바뀜)
+RISING_TOP5_XPATH = '//*[@id="cardBoxTop5"]'
+# 이웃한 읍/면/동의 목록이 같을 수 있으므로 이 시간 안에 바뀌지 않으면 그대로 읽음
+RISING_TOP5_CHANGE_TIMEOUT = float(os.getenv("RISING_TOP5_CHANGE_TIMEOUT", "5"))
+
 
 # 시간 재는 함수
 def time_execution(func):
@@ -45,31 +46,37 @@ def time_execution(func):
     return wrapper
 
 
-# Global WebDriver instance
+# Global WebDriver instance (프로세스당 하나, 풀에서 빌려 씀)
 global_driver = None
+driver_pool = WebDriverPool(size=1)
 
 
 def setup_global_driver():
     global global_driver
     if global_driver is None:
-        options = Options()
-        options.add_argument("--start-fullscreen")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-
-        # WebDriver Manager를 이용해 ChromeDriver 자동 관리
-        service = Service(ChromeDriverManager().install())
-        global_driver = webdriver.Chrome(service=service, options=options)
+        global_driver = driver_pool.acquire()
+    else:
+        # K 페이지 이상 사용했거나 메모리가 커진 브라우저는 새로 띄움
+        global_driver = driver_pool.recycle_if_needed(global_driver)
 
     return global_driver
 
 
+# 드라이버를 종료하지 않고 풀에 반납 (다음 작업에서 재사용)
+def release_global_driver():
+    global global_driver
+    if global_driver is not None:
+        driver_pool.release(global_driver)
+        global_driver = None
+
+
 def click_element(wait, by, value):
     try:
-        element = wait.until(EC.element_to_be_clickable((by, value)))
+        waiter = adaptive_wait(wait._driver)
+        element = waiter.until(wait, EC.element_to_be_clickable((by, value)))
         text = element.text
         element.click()
-        time.sleep(2)
+        waiter.settle()
         return text
     except TimeoutException:
         # print(
@@ -80,9 +87,10 @@ def click_element(wait, by, value):
 
 def read_element(wait, by, value):
     try:
-        element = wait.until(EC.presence_of_element_located((by, value)))
+        element = adaptive_wait(wait._driver).until(
+            wait, EC.presence_of_element_located((by, value))
+        )
         text = element.text
-        time.sleep(0.3)
         return text
     except TimeoutException:
         # print(
@@ -109,16 +117,101 @@ def handle_unexpected_alert(driver):
         return False
 
 
+# 상승 업종 화면을 시/군/구까지 선택해 둔 상태로 유지하며 읍/면/동만 바꿔 선택
+# (읍/면/동마다 처음 페이지부터 다시 들어가지 않음)
+# 목록이 사라졌거나 갯수가 달라지는 등 화면 상태가 어긋나면 처음부터 다시 선택
+class RisingBusinessNavigator:
+    def __init__(self, driver, city_idx: int, district_idx: int):
+        self.driver = driver
+        self.city_idx = city_idx
+        self.district_idx = district_idx
+        self.wait = WebDriverWait(driver, 40)
+        self.city_text: Optional[str] = None
+        self.district_text: Optional[str] = None
+        self.sub_district_count: Optional[int] = None
+        self.reloads = 0
+
+    def _click_region(self, idx: int) -> Optional[str]:
+        return click_element(
+            self.wait, By.XPATH, f"{RISING_REGION_LIST_XPATH}/li[{idx + 1}]/a"
+        )
+
+    def _region_items(self):
+        return self.driver.find_elements(By.XPATH, f"{RISING_REGION_LIST_XPATH}/li")
+
+    # 처음 페이지부터 시/도, 시/군/구 선택 후 읍/면/동 갯수 반환
+    def reload(self) -> int:
+        self.reloads += 1
+        self.sub_district_count = None
+        adaptive_wait(self.driver).load_page(NICE_BIZ_MAP_URL)
+        click_element(self.wait, By.XPATH, "/html/body/div[5]/div[2]/ul/li[5]/a")
+        click_element(
+            self.wait, By.XPATH, '//*[@id="pc_sheet04"]/div/div[2]/div[2]/ul/li/a'
+        )
+        self.city_text = self._click_region(self.city_idx)
+        self.district_text = self._click_region(self.district_idx)
+        if not self.city_text or not self.district_text:
+            return 0
+
+        self.wait.until(
+            EC.presence_of_element_located((By.XPATH, RISING_REGION_LIST_XPATH))
+        )
+        self.sub_district_count = len(self._region_items())
+        return self.sub_district_count
+
+    # 읍/면/동 목록이 그대로 있는지 확인
+    def drifted(self, sub_district_idx: int) -> bool:
+        if self.sub_district_count is None:
+            return True
+        try:
+            items = self._region_items()
+        except UnexpectedAlertPresentException:
+            handle_unexpected_alert(self.driver)
+            return True
+        return len(items) != self.sub_district_count or sub_district_idx >= len(items)
+
+    # 현재 표시 중인 top5 목록 텍스트 (목록이 없으면 None)
+    def top5_text(self) -> Optional[str]:
+        try:
+            elements = self.driver.find_elements(By.XPATH, RISING_TOP5_XPATH)
+            return elements[0].text if elements else None
+        except UnexpectedAlertPresentException:
+            handle_unexpected_alert(self.driver)
+            return None
+
+    # 읍/면/동 선택 후 top5 목록이 새 내용으로 바뀔 때까지 대기
+    def wait_for_top5_update(self, old_text: Optional[str]) -> None:
+        try:
+            adaptive_wait(self.driver).wait_for_text_change(
+                By.XPATH, RISING_TOP5_XPATH, old_text, RISING_TOP5_CHANGE_TIMEOUT
+            )
+        except TimeoutException:
+            pass
+
+    # 읍/면/동 선택 (선택한 이름 반환), 실패하면 처음부터 다시 선택 후 한 번 더 시도
+    def select_sub_district(self, sub_district_idx: int) -> Optional[str]:
+        for _ in range(2):
+            if self.drifted(sub_district_idx):
+                self.reload()
+            try:
+                sub_district_text = self._click_region(sub_district_idx)
+            except UnexpectedAlertPresentException:
+                handle_unexpected_alert(self.driver)
+                sub_district_text = None
+            if sub_district_text:
+                return sub_district_text
+            self.sub_district_count = None
+        return None
+
+
 def get_city_count():
     global global_driver
     setup_global_driver()
     try:
-        global_driver.get(NICE_BIZ_MAP_URL)
+        adaptive_wait(global_driver).load_page(NICE_BIZ_MAP_URL)
         wait = WebDriverWait(global_driver, 40)
         global_driver.implicitly_wait(10)
 
-        time.sleep(2)
-
         # 분석 지역
         click_element(
             wait,
@@ -126,8 +219,6 @@ def get_city_count():
             "#pc_sheet04 > div > div.pc_bdy.ticket > div.middle > ul > li > a",
         )
 
-        time.sleep(2)
-
         city_ul = wait.until(
             EC.presence_of_element_located(
                 (By.XPATH, '//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul')
@@ -141,11 +232,7 @@ def get_city_count():
         # print(f"Exception occurred: {e}.")
         return None
     finally:
-        try:
-            if global_driver:
-                global_driver.quit()
-        except Exception as quit_error:
-            print(f"Error closing driver: {str(quit_error)}")
+        release_global_driver()
 
 
 # def get_district_count(city_count):
@@ -155,17 +242,13 @@ def get_district_count(start_idx: int, end_idx: int):
     try:
         for city_idx in tqdm(range(start_idx, end_idx), desc="시/도 Progress"):
             try:
-                global_driver.get(NICE_BIZ_MAP_URL)
+                adaptive_wait(global_driver).load_page(NICE_BIZ_MAP_URL)
                 wait = WebDriverWait(global_driver, 40)
                 click_element(wait, By.XPATH, "/html/body/div[5]/div[2]/ul/li[5]/a")
 
-                time.sleep(2)
-
                 click_element(
                     wait, By.XPATH, '//*[@id="pc_sheet04"]/div/div[2]/div[2]/ul/li/a'
                 )
-
-                time.sleep(2)
                 city_text = click_element(
                     wait,
                     By.XPATH,
@@ -191,11 +274,7 @@ def get_district_count(start_idx: int, end_idx: int):
                 # print(f"Error processing city index {city_idx}: {str(e)}")
                 continue
     finally:
-        try:
-            if global_driver:
-                global_driver.quit()
-        except Exception as quit_error:
-            print(f"Error closing driver: {str(quit_error)}")
+        release_global_driver()
 
 
 def get_sub_district_count(city_idx: int, district_count: int, city_text_ck: str):
@@ -204,60 +283,16 @@ def get_sub_district_count(city_idx: int, district_count: int, city_text_ck: str
     try:
         for district_idx in tqdm(range(district_count), f"{city_text_ck} : Progress"):
             try:
-                global_driver.get(NICE_BIZ_MAP_URL)
-                wait = WebDriverWait(global_driver, 40)
-                click_element(wait, By.XPATH, "/html/body/div[5]/div[2]/ul/li[5]/a")
-
-                time.sleep(2)
-
-                click_element(
-                    wait, By.XPATH, '//*[@id="pc_sheet04"]/div/div[2]/div[2]/ul/li/a'
-                )
-
-                time.sleep(2)
-
-                city_text = click_element(
-                    wait,
-                    By.XPATH,
-                    f'//*[@id="rising"]/div[2]/div[2]/div[2]/div/div[2]/ul/li[{city_idx + 1}]/a',
-                )
-
-                time.sleep(2)
-
-                district_ul = wait.until(
-                    EC.presence_of_element_located(
-                        (
-                            By.XPATH,
-                            '//*[@id="rising"]/div[2]/div[2]/div[2]/div/div[2]/ul',
-                        )
-                    )
-                )
-
-                district_ul_li = district_ul.find_elements(By.TAG_NAME, "li")
-                # print(f"구 갯수: {len(district_ul_li)}")
-
-                district_text = click_element(
-                    wait,
-                    By.XPATH,
-                    f'//*[@id="rising"]/div[2]/div[2]/div[2]/div/div[2]/ul/li[{district_idx + 1}]/a',
-                )
-
-                sub_district_ul = wait.until(
-                    EC.presence_of_element_located(
-                        (
-                            By.XPATH,
-                            '//*[@id="rising"]/div[2]/div[2]/div[2]/div/div[2]/ul',
-                        )
-                    )
-                )
-                sub_district_ul_li = sub_district_ul.find_elements(By.TAG_NAME, "li")
-                # print(f"동 갯수: {len(sub_district_ul_li)}")
+                # 시/군/구까지 한 번만 선택하고 읍/면/동은 같은 화면에서 차례로 선택
+                navigator = RisingBusinessNavigator(global_driver, city_idx, district_idx)
+                sub_district_count = navigator.reload()
+                # print(f"동 갯수: {sub_district_count}")
 
                 search_rising_businesses_top5(
-                    city_idx, district_idx, len(sub_district_ul_li)
+                    city_idx, district_idx, sub_district_count, navigator
                 )
             except UnexpectedAlertPresentException:
-                handle_unexpected_alert(wait._driver)
+                handle_unexpected_alert(global_driver)
             except Exception as e:
                 print(f"Error processing district index {district_idx}: {str(e)}")
                 continue
@@ -272,54 +307,37 @@ def get_sub_district_count(city_idx: int, district_count: int, city_text_ck: str
 
 
 def search_rising_businesses_top5(
-    city_idx: int, district_idx: int, sub_district_count: int
+    city_idx: int,
+    district_idx: int,
+    sub_district_count: int,
+    navigator: Optional[RisingBusinessNavigator] = None,
 ):
     global global_driver
     setup_global_driver()
     data_list: List[RisingBusiness] = []
+    if navigator is None or navigator.driver is not global_driver:
+        navigator = RisingBusinessNavigator(global_driver, city_idx, district_idx)
 
     try:
         for sub_district_idx in range(sub_district_count):
             # start_time = time.time()
-            global_driver.get(NICE_BIZ_MAP_URL)
-            wait = WebDriverWait(global_driver, 40)
-            time.sleep(2)
-
-            click_element(wait, By.XPATH, "/html/body/div[5]/div[2]/ul/li[5]/a")
-
-            time.sleep(2)
-
-            click_element(
-                wait, By.XPATH, '//*[@id="pc_sheet04"]/div/div[2]/div[2]/ul/li/a'
-            )
-            time.sleep(2)
-
-            city_text = click_element(
-                wait,
-                By.XPATH,
-                f'//*[@id="rising"]/div[2]/div[2]/div[2]/div/div[2]/ul/li[{city_idx + 1}]/a',
-            )
-            time.sleep(3)
-            district_text = click_element(
-                wait,
-                By.XPATH,
-                f'//*[@id="rising"]/div[2]/div[2]/div[2]/div/div[2]/ul/li[{district_idx + 1}]/a',
-            )
-            time.sleep(2)
-            sub_district_text = click_element(
-                wait,
-                By.XPATH,
-                f'//*[@id="rising"]/div[2]/div[2]/div[2]/div/div[2]/ul/li[{sub_district_idx + 1}]/a',
-            )
-            time.sleep(2)
+            wait = navigator.wait
+            old_top5_text = navigator.top5_text()
+            sub_district_text = navigator.select_sub_district(sub_district_idx)
+            if sub_district_text is None:
+                continue
+            # 목록이 제자리에서 갱신되므로 이전 읍/면/동 내용을 읽지 않도록 변경을 기다림
+            navigator.wait_for_top5_update(old_top5_text)
+            city_text = navigator.city_text
+            district_text = navigator.district_text
 
             try:
                 # 시/구/동 ID 조회 및 생성
-                city_id = get_or_create_city_id(city_text)
+                city_id = dimension_cache.city_id(city_text)
                 if city_id:
-                    district_id = get_or_create_district_id(city_id, district_text)
+                    district_id = dimension_cache.district_id(city_id, district_text)
                     if district_id:
-                        sub_district_id = get_or_create_sub_district_id(
+                        sub_district_id = dimension_cache.sub_district_id(
                             city_id, district_id, sub_district_text
                         )
 
@@ -329,7 +347,7 @@ def search_rising_businesses_top5(
             # 상승 중인 사업 정보 추출
             try:
                 rising_ul = wait.until(
-                    EC.presence_of_element_located((By.XPATH, '//*[@id="cardBoxTop5"]'))
+                    EC.presence_of_element_located((By.XPATH, RISING_TOP5_XPATH))
                 )
                 rising_ul_li = rising_ul.find_elements(
                     By.CSS_SELECTOR, "#cardBoxTop5 > li"
@@ -347,7 +365,7 @@ def search_rising_businesses_top5(
                         if len(li_text) >= 2:
                             try:
                                 category_result = (
-                                    get_biz_categories_id_by_biz_detail_category_name(
+                                    dimension_cache.biz_categories_by_detail_name(
                                         li_text[1]
                                     )
                                 )
@@ -410,7 +428,10 @@ def search_rising_businesses_top5(
             #     f"시/도: {city_text}, 시/군/구: {district_text}, 읍/면/동: {sub_district_text}"
             # )
 
-        insert_rising_business(data_list)
+        # 버퍼에만 넣고 인서트는 백그라운드에서 모아서 처리
+        # (시/군/구 전체 읍/면/동 묶음 하나로 넣어 기존 행 삭제 후 인서트)
+        if data_list:
+            rising_business_writer.add(data_list)
 
     except Exception as e:
         print(f"Failed to fetch data from {NICE_BIZ_MAP_URL}: {str(e)}")
@@ -420,15 +441,21 @@ def search_rising_businesses_top5(
 
 def execute_task_in_thread(start, end):
 
-    with ThreadPoolExecutor(max_workers=18) as executor:
+    try:
+        with ThreadPoolExecutor(max_workers=18) as executor:
 
-        futures = [
-            executor.submit(get_district_count, start, end),
-        ]
-        # 17번까지
+            futures = [
+                executor.submit(get_district_count, start, end),
+            ]
+            # 17번까지
 
-        for future in futures:
-            future.result()
+            for future in futures:
+                future.result()
+    finally:
+        # Pool 종료 시 워커 프로세스가 강제 종료되므로 남은 데이터 인서트, 풀에 남은 브라우저 종료를 여기서
+        rising_business_writer.flush()
+        release_global_driver()
+        driver_pool.close()
 
 
 @time_execution
@@ -447,6 +474,10 @@ def execute_parallel_tasks():
         (16, 17),
     ]
 
+    # 시/구/동, 업종 id 캐시, ChromeDriver 경로 미리 로드 (fork 된 워커 프로세스가 그대로 물려받음)
+    preload_dimension_cache()
+    resolve_chromedriver_path()
+
     # 멀티프로세싱 사용
     with Pool(processes=len(ranges)) as pool:
         pool.starmap(execute_task_in_thread, ranges)
@@ -31,6 +31,7 @@ from app.schemas.rising_business import (
     RisingBusinessInsert,
     RisingBusinessOutput,
 )
+from app.service.crawler_wait import adaptive_wait, finish_adaptive_wait
 
 from selenium.common.exceptions import (
     UnexpectedAlertPresentException,
@@ -60,10 +61,11 @@ def setup_driver():
 
 def click_element(wait, by, value):
     try:
-        element = wait.until(EC.element_to_be_clickable((by, value)))
+        waiter = adaptive_wait(wait._driver)
+        element = waiter.until(wait, EC.element_to_be_clickable((by, value)))
         text = element.text
         element.click()
-        time.sleep(0.7)
+        waiter.settle()
         return text
     except Exception as e:
         print(
@@ -74,9 +76,10 @@ def click_element(wait, by, value):
 
 def read_element(wait, by, value):
     try:
-        element = wait.until(EC.presence_of_element_located((by, value)))
+        element = adaptive_wait(wait._driver).until(
+            wait, EC.presence_of_element_located((by, value))
+        )
         text = element.text
-        time.sleep(0.5)
         return text
     except Exception as e:
         print(
@@ -116,12 +119,10 @@ def handle_unexpected_alert(driver):
 def get_city_count():
     driver = setup_driver()
     try:
-        driver.get(NICE_BIZ_MAP_URL)
+        adaptive_wait(driver).load_page(NICE_BIZ_MAP_URL)
         wait = WebDriverWait(driver, 40)
         driver.implicitly_wait(10)
 
-        time.sleep(2)
-
         # 분석 지역
         click_element(
             wait,
@@ -129,8 +130,6 @@ def get_city_count():
             "#pc_sheet04 > div > div.pc_bdy.ticket > div.middle > ul > li > a",
         )
 
-        time.sleep(2)
-
         city_ul = wait.until(
             EC.presence_of_element_located(
                 (By.XPATH, '//*[@id="basicReport"]/div[4]/div[2]/div[2]/div/div[2]/ul')
@@ -146,6 +145,7 @@ def get_city_count():
     finally:
         try:
             if driver:
+                finish_adaptive_wait(driver)
                 driver.quit()
         except Exception as quit_error:
             print(f"Error closing driver: {str(quit_error)}")
@@ -157,17 +157,13 @@ def get_district_count(city_count):
         for city_idx in tqdm(range(city_count), desc="시/도 Progress"):
             try:
                 print(f"idx: {city_idx}")
-                driver.get(NICE_BIZ_MAP_URL)
+                adaptive_wait(driver).load_page(NICE_BIZ_MAP_URL)
                 wait = WebDriverWait(driver, 60)
                 click_element(wait, By.XPATH, "/html/body/div[5]/div[2]/ul/li[5]/a")
 
-                time.sleep(1.5)
-
                 click_element(
                     wait, By.XPATH, '//*[@id="pc_sheet04"]/div/div[2]/div[2]/ul/li/a'
                 )
-
-                time.sleep(1.5)
                 city_text = click_element(
                     wait,
                     By.XPATH,
@@ -195,6 +191,7 @@ def get_district_count(city_count):
     finally:
         try:
             if driver:
+                finish_adaptive_wait(driver)
                 driver.quit()
         except Exception as quit_error:
             print(f"Error closing driver: {str(quit_error)}")
@@ -206,26 +203,20 @@ def get_sub_district_count(city_idx: int, district_count: int, city_text_ck: str
         for district_idx in tqdm(range(district_count), f"{city_text_ck} : Progress"):
             try:
                 print(f"idx: {district_idx}")
-                driver.get(NICE_BIZ_MAP_URL)
+                adaptive_wait(driver).load_page(NICE_BIZ_MAP_URL)
                 wait = WebDriverWait(driver, 60)
                 click_element(wait, By.XPATH, "/html/body/div[5]/div[2]/ul/li[5]/a")
 
-                time.sleep(1.5)
-
                 click_element(
                     wait, By.XPATH, '//*[@id="pc_sheet04"]/div/div[2]/div[2]/ul/li/a'
                 )
 
-                time.sleep(1.5)
-
                 city_text = click_element(
                     wait,
                     By.XPATH,
                     f'//*[@id="rising"]/div[2]/div[2]/div[2]/div/div[2]/ul/li[{city_idx + 1}]/a',
                 )
 
-                time.sleep(1.5)
-
                 district_ul = wait.until(
                     EC.presence_of_element_located(
                         (
@@ -269,6 +260,7 @@ def get_sub_district_count(city_idx: int, district_count: int, city_text_ck: str
     finally:
         try:
             if driver:
+                finish_adaptive_wait(driver)
                 driver.quit()
         except Exception as quit_error:
             print(f"Error closing driver: {str(quit_error)}")
@@ -283,37 +275,30 @@ def search_rising_businesses_top5(
     try:
         for sub_district_idx in range(sub_district_count):
             start_time = time.time()
-            driver.get(NICE_BIZ_MAP_URL)
+            adaptive_wait(driver).load_page(NICE_BIZ_MAP_URL)
             wait = WebDriverWait(driver, 60)
-            time.sleep(1.5)
 
             click_element(wait, By.XPATH, "/html/body/div[5]/div[2]/ul/li[5]/a")
 
-            time.sleep(1.5)
-
             click_element(
                 wait, By.XPATH, '//*[@id="pc_sheet04"]/div/div[2]/div[2]/ul/li/a'
             )
-            time.sleep(1.5)
 
             city_text = click_element(
                 wait,
                 By.XPATH,
                 f'//*[@id="rising"]/div[2]/div[2]/div[2]/div/div[2]/ul/li[{city_idx + 1}]/a',
             )
-            time.sleep(3)
             district_text = click_element(
                 wait,
                 By.XPATH,
                 f'//*[@id="rising"]/div[2]/div[2]/div[2]/div/div[2]/ul/li[{district_idx + 1}]/a',
             )
-            time.sleep(1.5)
             sub_district_text = click_element(
                 wait,
                 By.XPATH,
                 f'//*[@id="rising"]/div[2]/div[2]/div[2]/div/div[2]/ul/li[{sub_district_idx + 1}]/a',
             )
-            time.sleep(1.5)
 
             try:
                 # 시/구/동 ID 조회 및 생성
@@ -424,6 +409,7 @@ def search_rising_businesses_top5(
     except Exception as e:
         print(f"Failed to fetch data from {NICE_BIZ_MAP_URL}: {str(e)}")
     finally:
+        finish_adaptive_wait(driver)
         driver.quit()
 
 
@@ -0,0 +1,223 @@
+import atexit
+import logging
+import os
+import queue
+import threading
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Optional
+
+import psutil
+from selenium import webdriver
+from selenium.common.exceptions import WebDriverException
+from selenium.webdriver.chrome.options import Options
+from selenium.webdriver.chrome.service import Service
+from webdriver_manager.chrome import ChromeDriverManager
+
+from app.service.crawler_wait import adaptive_wait, finish_adaptive_wait, url_origin
+
+
+# 크롤러용 Chrome WebDriver 풀
+# 브라우저를 미리 띄워두고(prewarm) 작업마다 빌려주고 돌려받는다.
+# K 페이지 이상 사용했거나 브라우저 메모리가 커지면 종료 후 새로 띄운다(recycle).
+
+CRAWLER_HEADLESS = os.getenv("CRAWLER_HEADLESS", "1") == "1"
+CRAWLER_DRIVER_MAX_PAGES = int(os.getenv("CRAWLER_DRIVER_MAX_PAGES", "200"))
+CRAWLER_DRIVER_MAX_MEMORY_MB = float(os.getenv("CRAWLER_DRIVER_MAX_MEMORY_MB", "1500"))
+
+DEFAULT_CHROME_ARGUMENTS = (
+    "--no-sandbox",
+    "--disable-dev-shm-usage",
+    "--window-size=1920,1080",
+)
+
+
+# ChromeDriverManager().install() 는 버전 확인에 수 초가 걸리므로 프로세스당 한 번만
+# (fork 전에 호출해두면 워커 프로세스가 그대로 물려받음)
+@lru_cache(maxsize=1)
+def resolve_chromedriver_path() -> str:
+    return os.getenv("CHROMEDRIVER_PATH") or ChromeDriverManager().install()
+
+
+class WebDriverPool:
+    def __init__(
+        self,
+        size: int = 1,
+        arguments: Iterable[str] = DEFAULT_CHROME_ARGUMENTS,
+        headless: bool = CRAWLER_HEADLESS,
+        max_pages: int = CRAWLER_DRIVER_MAX_PAGES,
+        max_memory_mb: float = CRAWLER_DRIVER_MAX_MEMORY_MB,
+        reset_on_release: bool = False,
+        capabilities: Optional[Dict[str, Any]] = None,
+    ):
+        self.size = size
+        self.arguments = tuple(arguments)
+        self.headless = headless
+        self.max_pages = max_pages
+        self.max_memory_mb = max_memory_mb
+        self.reset_on_release = reset_on_release
+        self.capabilities = dict(capabilities or {})
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self) -> None:
+        # 최근에 쓴 브라우저부터 다시 쓰도록 LIFO
+        self._idle: "queue.LifoQueue" = queue.LifoQueue()
+        self._created = 0
+        self._pid = os.getpid()
+        atexit.register(self.close)
+
+    def _ensure_process(self) -> None:
+        # fork 된 자식 프로세스는 부모의 브라우저 세션을 공유하면 안 되므로 새 풀로 시작
+        if self._pid != os.getpid():
+            with self._lock:
+                if self._pid != os.getpid():
+                    self._reset()
+
+    def _create(self):
+        options = Options()
+        if self.headless:
+            options.add_argument("--headless=new")
+        for argument in self.arguments:
+            options.add_argument(argument)
+        for name, value in self.capabilities.items():
+            options.set_capability(name, value)
+
+        service = Service(resolve_chromedriver_path())
+        return webdriver.Chrome(service=service, options=options)
+
+    def _quit(self, driver) -> None:
+        finish_adaptive_wait(driver)
+        try:
+            driver.quit()
+        except Exception as e:
+            logging.getLogger(__name__).warning(f"Error closing driver: {e}")
+
+    # chromedriver 프로세스와 그 자식(브라우저) 프로세스들의 RSS 합계
+    def _memory_mb(self, driver) -> float:
+        try:
+            process = psutil.Process(driver.service.process.pid)
+            processes = [process] + process.children(recursive=True)
+            return sum(p.memory_info().rss for p in processes) / (1024 * 1024)
+        except (AttributeError, psutil.Error):
+            return 0.0
+
+    def needs_recycle(self, driver) -> bool:
+        if adaptive_wait(driver).pages_loaded >= self.max_pages:
+            return True
+        return self._memory_mb(driver) >= self.max_memory_mb
+
+    def prewarm(self, count: Optional[int] = None) -> None:
+        self._ensure_process()
+        count = self.size if count is None else min(count, self.size)
+        while True:
+            with self._lock:
+                if self._created >= count:
+                    return
+                self._created += 1
+            try:
+                self._idle.put(self._create())
+            except Exception:
+                with self._lock:
+                    self._created -= 1
+                raise
+
+    def acquire(self, timeout: Optional[float] = None):
+        self._ensure_process()
+        try:
+            driver = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if not can_create:
+                driver = self._idle.get(timeout=timeout)
+            else:
+                try:
+                    return self._create()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+
+        return self.recycle_if_needed(driver)
+
+    # 기준을 넘었거나 세션이 죽은 드라이버는 종료하고 새 드라이버 반환
+    def recycle_if_needed(self, driver):
+        try:
+            driver.current_url
+            if not self.needs_recycle(driver):
+                return driver
+        except WebDriverException:
+            pass
+
+        self._quit(driver)
+        try:
+            return self._create()
+        except Exception:
+            with self._lock:
+                self._created -= 1
+            raise
+
+    # 새 브라우저를 띄운 것과 같은 상태로 (쿠키, 캐시, 방문한 origin 의 스토리지 삭제)
+    # delete_all_cookies / localStorage.clear() 는 현재 origin 만 지우므로 CDP 로 지움
+    # (Storage.clearDataForOrigin 은 "*" 같은 와일드카드를 받지 않으므로 방문한 origin 마다 호출)
+    def _reset_session(self, driver) -> bool:
+        try:
+            waiter = adaptive_wait(driver)
+            origins = set(waiter.origins)
+            current_origin = url_origin(driver.current_url)
+            if current_origin is not None:
+                origins.add(current_origin)
+
+            driver.get("about:blank")
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+            driver.execute_cdp_cmd("Network.clearBrowserCache", {})
+            for origin in sorted(origins):
+                driver.execute_cdp_cmd(
+                    "Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"}
+                )
+            waiter.origins.clear()
+            return True
+        except WebDriverException as e:
+            logging.getLogger(__name__).warning(f"Error resetting driver session: {e}")
+            return False
+
+    def release(self, driver, discard: bool = False) -> None:
+        self._ensure_process()
+        if not discard and self.reset_on_release:
+            discard = not self._reset_session(driver)
+
+        if discard:
+            self._quit(driver)
+            with self._lock:
+                self._created -= 1
+            return
+
+        adaptive_wait(driver).finish_page()
+        self._idle.put(driver)
+
+    @contextmanager
+    def session(self):
+        driver = self.acquire()
+        discard = False
+        try:
+            yield driver
+        except WebDriverException:
+            discard = True
+            raise
+        finally:
+            self.release(driver, discard=discard)
+
+    def close(self) -> None:
+        if self._pid != os.getpid():
+            return
+        while True:
+            try:
+                driver = self._idle.get_nowait()
+            except queue.Empty:
+                break
+            self._quit(driver)
+            with self._lock:
+                self._created -= 1
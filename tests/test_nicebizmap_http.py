@@ -0,0 +1,101 @@
+import os
+
+import pytest
+
+from app.crud.dimension_cache import DimensionCache
+from app.schemas.rising_business import RisingBusinessInsert
+from app.service import nicebizmap_http
+from app.service.nicebizmap_http import (
+    NiceBizMapHttpCrawler,
+    ReplayFetchBackend,
+    load_http_config,
+)
+
+
+FIXTURE_PATH = os.path.join(os.path.dirname(__file__), "fixtures", "nicebizmap_replay.jsonl")
+EXAMPLE_CONFIG_PATH = os.path.join(
+    os.path.dirname(__file__), "..", "app", "data", "nicebizmap", "endpoints.example.json"
+)
+
+
+# DB 없이 이름 -> id 를 돌려주도록 미리 채운 차원 캐시
+@pytest.fixture
+def crawler(monkeypatch):
+    cache = DimensionCache()
+    cache._loaded = True
+    cache._ids["city"][("서울특별시",)] = 9
+    cache._ids["district"][(9, "종로구")] = 101
+    cache._ids["sub_district"][(9, 101, "청운효자동")] = 1001
+    cache._ids["biz_main_category"][("음식",)] = 1
+    cache._ids["biz_sub_category"][(1, "한식")] = 11
+    cache._ids["biz_detail_category"][(11, "백반/한정식")] = 111
+    cache._detail_categories["백반/한정식"] = (1, 11, 111)
+    # 캐시에 없는 업종명은 DB 조회 대신 없음으로 처리
+    monkeypatch.setattr(cache, "biz_categories_by_detail_name", lambda name: cache._detail_categories.get(name))
+    monkeypatch.setattr(nicebizmap_http, "dimension_cache", cache)
+
+    return NiceBizMapHttpCrawler(ReplayFetchBackend(FIXTURE_PATH), load_http_config(EXAMPLE_CONFIG_PATH))
+
+
+def sub_district_context(crawler):
+    regions = list(crawler.iter_sub_districts())
+    assert regions == [
+        {
+            "city_code": "11",
+            "city_name": "서울특별시",
+            "district_code": "11110",
+            "district_name": "종로구",
+            "sub_district_code": "1111051500",
+            "sub_district_name": "청운효자동",
+        }
+    ]
+    return regions[0]
+
+
+def test_fetch_commercial_district(crawler):
+    categories = crawler.list_detail_categories()
+    assert [category["detail_category_code"] for category in categories] == ["Q01A01"]
+
+    data = crawler.fetch_commercial_district(dict(sub_district_context(crawler), **categories[0]), "2024-11-30")
+
+    assert data["city_id"] == 9
+    assert data["district_id"] == 101
+    assert data["sub_district_id"] == 1001
+    assert (data["biz_main_category_id"], data["biz_sub_category_id"], data["biz_detail_category_id"]) == (1, 11, 111)
+    assert (data["national_density"], data["city_density"], data["district_density"], data["sub_district_density"]) == (
+        2.5,
+        3.1,
+        4.0,
+        5.25,
+    )
+    assert data["market_size"] == 12340000
+    assert data["average_sales"] == 5670000
+    assert data["average_payment"] == 12000
+    # "-" 처럼 값이 없는 숫자 항목은 0
+    assert data["usage_count"] == 0
+    assert data["operating_cost"] == 0
+    assert (data["top_menu_1"], data["top_menu_2"], data["top_menu_3"]) == ("김치찌개", "된장찌개", None)
+    assert str(data["y_m"]) == "2024-11-30"
+
+
+def test_fetch_rising_businesses(crawler):
+    data_list = crawler.fetch_rising_businesses(sub_district_context(crawler))
+
+    # 캐시에 없는 업종은 건너뜀
+    assert len(data_list) == 1
+    assert isinstance(data_list[0], RisingBusinessInsert)
+    assert data_list[0].sub_district_id == 1001
+    assert data_list[0].biz_detail_category_id == 111
+    assert data_list[0].growth_rate == 12.5
+    assert data_list[0].sub_district_rank == 1
+
+
+def test_replay_backend_rejects_unrecorded_request():
+    backend = ReplayFetchBackend(FIXTURE_PATH)
+    with pytest.raises(LookupError):
+        backend.fetch({"method": "POST", "path": "/analysis/unknown", "params": None, "data": None, "json": None})
+
+
+def test_missing_config_message(tmp_path):
+    with pytest.raises(FileNotFoundError, match="endpoints.example.json"):
+        load_http_config(str(tmp_path / "endpoints.json"))